@@ -13,6 +13,8 @@ Environment Variables Required:
 Schedule:
     - Runs daily at 3:00 AM UTC (4:00 AM CET in summer, 3:00 AM CET in winter)
     - NCRONTAB: "0 0 3 * * *" (sec min hour day month weekday)
+    - Catch-up: every hour at :30, resumes a pass that throttling or a worker
+      restart cut short ("resume_only" -- a no-op when nothing is unfinished)
 
 Deployment:
     - Automated via GitHub Actions on push to main branch
@@ -31,28 +33,10 @@ app = func.FunctionApp()
 # Note: logging.info() goes to Application Insights in Azure Functions
 
 
-@app.function_name(name="DailyContactSync")
-@app.timer_trigger(
-    schedule="0 0 3 * * *",  # Daily at 3:00 AM UTC
-    arg_name="timer",
-    run_on_startup=False,
-    use_monitor=True
-)
-def daily_contact_sync(timer: func.TimerRequest) -> None:
-    """
-    Scheduled function to sync all Crush.lu profiles to Outlook contacts.
-
-    This ensures contacts stay synchronized even if real-time signals fail.
-    Also handles cleanup of orphaned contacts.
-
-    Runs daily at 3:00 AM UTC to avoid peak usage hours.
-    """
+def _trigger_sync(label: str, options: dict) -> None:
+    """POST to the Django sync endpoint; raise so failures count as Failed."""
     utc_timestamp = datetime.utcnow().isoformat()
-
-    if timer.past_due:
-        logging.warning(f"Timer is past due! Current time: {utc_timestamp}")
-
-    logging.info(f"Starting daily Outlook contact sync at {utc_timestamp}")
+    logging.info(f"Starting {label} at {utc_timestamp}")
 
     # Get configuration from environment
     command_url = os.environ.get('DJANGO_MANAGEMENT_COMMAND_URL')
@@ -91,7 +75,7 @@ def daily_contact_sync(timer: func.TimerRequest) -> None:
             json={
                 'command': 'sync_contacts_to_outlook',
                 'args': [],
-                'options': {}
+                'options': options
             },
             headers={
                 'Authorization': f'Bearer {api_key}',
@@ -105,20 +89,60 @@ def daily_contact_sync(timer: func.TimerRequest) -> None:
         result = response.json()
 
         if response.status_code == 202:
-            logging.info("Daily contact sync triggered successfully (running in background on server)")
+            logging.info(f"{label} triggered successfully (running in background on server)")
         elif result.get('success'):
-            logging.info("Daily contact sync request accepted")
+            logging.info(f"{label} request accepted")
         else:
             error_msg = result.get('error', 'Unknown error')
-            logging.error(f"Daily contact sync failed: {error_msg}")
+            logging.error(f"{label} failed: {error_msg}")
             raise RuntimeError(f"Sync endpoint returned error: {error_msg}")
 
     except requests.exceptions.Timeout:
-        logging.error("Daily contact sync request timed out")
+        logging.error(f"{label} request timed out")
         raise  # Let Azure Functions mark this as Failed
     except requests.exceptions.RequestException as e:
         logging.error(f"Error calling Django management command: {e}")
         raise  # Let Azure Functions mark this as Failed
     except Exception as e:
-        logging.error(f"Unexpected error during daily contact sync: {e}")
+        logging.error(f"Unexpected error during {label}: {e}")
         raise  # Let Azure Functions mark this as Failed
+
+
+@app.function_name(name="DailyContactSync")
+@app.timer_trigger(
+    schedule="0 0 3 * * *",  # Daily at 3:00 AM UTC
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True
+)
+def daily_contact_sync(timer: func.TimerRequest) -> None:
+    """
+    Scheduled function to sync all Crush.lu profiles to Outlook contacts.
+
+    This ensures contacts stay synchronized even if real-time signals fail.
+    Profiles whose contact is already up to date are skipped server-side, and
+    a pass that is still unfinished from earlier is resumed, not restarted.
+
+    Runs daily at 3:00 AM UTC to avoid peak usage hours.
+    """
+    if timer.past_due:
+        logging.warning(f"Timer is past due! Current time: {datetime.utcnow().isoformat()}")
+
+    _trigger_sync("daily Outlook contact sync", {})
+
+
+@app.function_name(name="ContactSyncCatchUp")
+@app.timer_trigger(
+    schedule="0 30 * * * *",  # Hourly at :30
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True
+)
+def contact_sync_catch_up(timer: func.TimerRequest) -> None:
+    """
+    Resume a daily pass that stopped early (Graph throttling, app restart).
+
+    The server checkpoints the pass after every batch of contacts; this only
+    continues from that checkpoint and does nothing once the pass is done.
+    """
+    _trigger_sync("Outlook contact sync catch-up", {'resume_only': True})
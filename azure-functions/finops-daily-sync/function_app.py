@@ -12,6 +12,7 @@ import azure.functions as func
 import logging
 import requests
 import os
+import time
 from datetime import datetime
 
 app = func.FunctionApp()
@@ -60,6 +61,7 @@ def daily_cost_sync(timer: func.TimerRequest) -> None:
     logging.info(f'[{timestamp}] Initiating FinOps daily cost sync')
     logging.info(f'[{timestamp}] Target webhook: {webhook_url}')
 
+    started = time.monotonic()
     try:
         # Call Django webhook endpoint
         response = requests.post(
@@ -80,10 +82,19 @@ def daily_cost_sync(timer: func.TimerRequest) -> None:
         message = result.get('message', 'No message provided')
 
         # Log success
-        logging.info(f'[{timestamp}] Sync completed successfully')
+        logging.info(
+            f'[{timestamp}] Sync completed successfully in '
+            f'{time.monotonic() - started:.1f}s'
+        )
         logging.info(f'[{timestamp}] Status: {status}')
         logging.info(f'[{timestamp}] Message: {message}')
 
+        # Surface the server-side timing lines (overall run and the
+        # aggregation phases) from the command output
+        for line in (result.get('output') or '').splitlines():
+            if 'Timings:' in line or 'completed in' in line:
+                logging.info(f'[{timestamp}] {line.strip()}')
+
         # Log additional details if available
         if 'details' in result:
             details = result['details']
@@ -38,6 +38,10 @@ Environment Variables Required:
     - DJANGO_EVENT_RECAPS_URL: e.g. https://crush.lu/api/admin/event-recaps/
     - DJANGO_EVENT_FEEDBACK_URL: e.g. https://crush.lu/api/admin/event-feedback/
     - DJANGO_ECHO_SYNC_URL: e.g. https://crush.lu/api/admin/echo-sync/
+    - DJANGO_MATCH_SCORE_QUEUE_URL: e.g. https://crush.lu/api/admin/match-score-queue/
+    - DJANGO_CONNECT_POOL_RECONCILE_URL: e.g. https://crush.lu/api/admin/connect-pool-reconcile/
+    - DJANGO_DAILY_DROP_PREGENERATE_URL: e.g. https://crush.lu/api/admin/daily-drop-pregenerate/
+    - DJANGO_ACTIVITY_FLUSH_URL: e.g. https://crush.lu/api/admin/activity-flush/
     - ADMIN_API_KEY: Bearer token shared with the Django ADMIN_API_KEY setting
     - HYBRID_MAINTENANCE_ENABLED: Should be 'true' in production; anything
       else skips both triggers (safe-default: functions are deployed disabled
@@ -446,3 +450,88 @@ def echo_lu_sync(timer: func.TimerRequest) -> None:
         logging.warning("EchoLuSync: timer past due at %s", ts)
     logging.info("EchoLuSync: starting at %s", ts)
     _call_admin_endpoint("EchoLuSync", "DJANGO_ECHO_SYNC_URL", timeout=110)
+
+
+@app.function_name(name="MatchScoreQueue")
+@app.timer_trigger(
+    schedule="0 8,23,38,53 * * * *",  # Every 15 minutes, clear of the :x0/:x5 jobs
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True,
+)
+def match_score_queue(timer: func.TimerRequest) -> None:
+    """Drain the Crush Connect MatchScore dirty-member queue.
+
+    Trait and profile saves only queue the member; this recomputes their
+    rows against the current pool. Members whose trait fingerprint did not
+    move are dequeued without rescoring, so an idle queue costs one query.
+    """
+    ts = datetime.utcnow().isoformat()
+    if timer.past_due:
+        logging.warning("MatchScoreQueue: timer past due at %s", ts)
+    logging.info("MatchScoreQueue: starting at %s", ts)
+    _call_admin_endpoint("MatchScoreQueue", "DJANGO_MATCH_SCORE_QUEUE_URL")
+
+
+@app.function_name(name="ConnectPoolReconcile")
+@app.timer_trigger(
+    schedule="0 40 3 * * *",  # Daily at 03:40 UTC (off-peak)
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True,
+)
+def connect_pool_reconcile(timer: func.TimerRequest) -> None:
+    """Rebuild the materialized Crush Connect pool from its source tables.
+
+    Save signals keep the candidate and pair-exclusion tables current; this
+    repairs whatever bulk updates slipped past them.
+    """
+    ts = datetime.utcnow().isoformat()
+    if timer.past_due:
+        logging.warning("ConnectPoolReconcile: timer past due at %s", ts)
+    logging.info("ConnectPoolReconcile: starting at %s", ts)
+    _call_admin_endpoint(
+        "ConnectPoolReconcile", "DJANGO_CONNECT_POOL_RECONCILE_URL", timeout=110
+    )
+
+
+@app.function_name(name="DailyDropPregenerate")
+@app.timer_trigger(
+    schedule="0 10 3 * * *",  # Daily at 03:10 UTC — before the 06:00 Luxembourg unlock in CET and CEST
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True,
+)
+def daily_drop_pregenerate(timer: func.TimerRequest) -> None:
+    """Build the next Crush Connect Daily Drop for every eligible member.
+
+    Moves pool resolution and weighted sampling off the morning's first page
+    views; members who already have the Drop are skipped.
+    """
+    ts = datetime.utcnow().isoformat()
+    if timer.past_due:
+        logging.warning("DailyDropPregenerate: timer past due at %s", ts)
+    logging.info("DailyDropPregenerate: starting at %s", ts)
+    _call_admin_endpoint(
+        "DailyDropPregenerate", "DJANGO_DAILY_DROP_PREGENERATE_URL", timeout=110
+    )
+
+
+@app.function_name(name="ActivityFlush")
+@app.timer_trigger(
+    schedule="0 2-59/5 * * * *",  # Every 5 minutes, offset from the :x0/:x5 jobs
+    arg_name="timer",
+    run_on_startup=False,
+    use_monitor=True,
+)
+def activity_flush(timer: func.TimerRequest) -> None:
+    """Apply the UserActivity events buffered by the write-behind middleware.
+
+    With USER_ACTIVITY_WRITE_BEHIND off the buffer stays empty and each run
+    costs one Redis read.
+    """
+    ts = datetime.utcnow().isoformat()
+    if timer.past_due:
+        logging.warning("ActivityFlush: timer past due at %s", ts)
+    logging.info("ActivityFlush: starting at %s", ts)
+    _call_admin_endpoint("ActivityFlush", "DJANGO_ACTIVITY_FLUSH_URL")
@@ -149,6 +149,10 @@ $settings = @(
     "DJANGO_EVENT_RECAPS_URL=https://$DJANGO_HOST/api/admin/event-recaps/",
     "DJANGO_EVENT_FEEDBACK_URL=https://$DJANGO_HOST/api/admin/event-feedback/",
     "DJANGO_ECHO_SYNC_URL=https://$DJANGO_HOST/api/admin/echo-sync/",
+    "DJANGO_MATCH_SCORE_QUEUE_URL=https://$DJANGO_HOST/api/admin/match-score-queue/",
+    "DJANGO_CONNECT_POOL_RECONCILE_URL=https://$DJANGO_HOST/api/admin/connect-pool-reconcile/",
+    "DJANGO_DAILY_DROP_PREGENERATE_URL=https://$DJANGO_HOST/api/admin/daily-drop-pregenerate/",
+    "DJANGO_ACTIVITY_FLUSH_URL=https://$DJANGO_HOST/api/admin/activity-flush/",
     "ApplicationInsightsAgent_EXTENSION_VERSION=disabled"
 )
 if (-not [string]::IsNullOrWhiteSpace($APPINSIGHTS_CONN)) {
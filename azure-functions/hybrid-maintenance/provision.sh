@@ -100,6 +100,10 @@ SETTINGS=(
   "DJANGO_EVENT_RECAPS_URL=https://crush.lu/api/admin/event-recaps/"
   "DJANGO_EVENT_FEEDBACK_URL=https://crush.lu/api/admin/event-feedback/"
   "DJANGO_ECHO_SYNC_URL=https://crush.lu/api/admin/echo-sync/"
+  "DJANGO_MATCH_SCORE_QUEUE_URL=https://crush.lu/api/admin/match-score-queue/"
+  "DJANGO_CONNECT_POOL_RECONCILE_URL=https://crush.lu/api/admin/connect-pool-reconcile/"
+  "DJANGO_DAILY_DROP_PREGENERATE_URL=https://crush.lu/api/admin/daily-drop-pregenerate/"
+  "DJANGO_ACTIVITY_FLUSH_URL=https://crush.lu/api/admin/activity-flush/"
   # HYBRID_MAINTENANCE_ENABLED is deliberately NOT in this array — it is
   # written separately below, and only when it does not already exist.
   #
@@ -3,7 +3,7 @@ ASGI config for azureproject project.
 
 Supports both HTTP and WebSocket protocols via Django Channels.
 HTTP requests are handled by the standard Django ASGI application.
-WebSocket connections are routed to crush_lu consumers.
+WebSocket connections are routed to crush_lu and Pixel War consumers.
 Static files are served at the ASGI level via WhiteNoise to avoid
 Django's StreamingHttpResponse sync-iterator warning under ASGI.
 
@@ -37,6 +37,9 @@ from django.core.asgi import get_asgi_application  # noqa: E402
 from whitenoise import WhiteNoise  # noqa: E402
 
 from crush_lu.routing import websocket_urlpatterns  # noqa: E402
+from entreprinder.vibe.routing import (  # noqa: E402
+    websocket_urlpatterns as vibe_websocket_urlpatterns,
+)
 
 logger = logging.getLogger("azureproject.asgi")
 
@@ -181,7 +184,9 @@ class StaticFilesASGI:
 
 _http_app = StaticFilesASGI(django_asgi_app)
 _websocket_app = AllowedHostsOriginValidator(
-    AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    AuthMiddlewareStack(
+        URLRouter(websocket_urlpatterns + vibe_websocket_urlpatterns)
+    )
 )
 
 
@@ -114,29 +114,15 @@ def _is_test_environment():
     return False
 
 
-def send_domain_email(subject, message, recipient_list, request=None, domain=None,
-                     html_message=None, from_email=None, cc=None, fail_silently=False,
-                     attachments=None):
+def get_domain_email_connection(request=None, domain=None, from_email=None,
+                                fail_silently=False):
     """
-    Send email using domain-specific configuration (Graph API, SMTP, or Console in DEBUG).
-
-    In test environments, uses Django's in-memory backend to avoid sending real emails.
+    Email connection for a domain (Graph API, SMTP, or a local backend in
+    test / staging / DEBUG), as send_domain_email uses it.
 
-    Args:
-        subject: Email subject
-        message: Plain text message body
-        recipient_list: List of recipient email addresses
-        request: Django request object (optional, for auto-detecting domain)
-        domain: Explicit domain string (optional)
-        html_message: HTML message body (optional)
-        from_email: Override from email (optional)
-        cc: List of CC email addresses (optional)
-        fail_silently: Whether to suppress exceptions (default: False)
-        attachments: Optional iterable of (filename, content, mimetype) tuples
-            to attach to the message (e.g. a calendar .ics file).
-
-    Returns:
-        int: Number of successfully sent emails
+    Graph connections share a process-wide token cache and keep-alive HTTP
+    session, so reusing one connection for a batch costs a single token
+    lookup.
     """
     from django.core.mail import get_connection
     from django.conf import settings
@@ -145,80 +131,80 @@ def send_domain_email(subject, message, recipient_list, request=None, domain=Non
 
     # Get domain-specific configuration
     config = get_domain_email_config(request=request, domain=domain)
-
-    # Use configured from_email or domain default
     email_from = from_email or config['DEFAULT_FROM_EMAIL']
 
     # In TEST mode, use in-memory backend (no real emails sent)
     if _is_test_environment():
         logger.info(f"📧 [TEST] Using in-memory email backend (from {email_from})")
-        connection = get_connection(
+        return get_connection(
             backend='django.core.mail.backends.locmem.EmailBackend',
             fail_silently=fail_silently,
         )
     # In STAGING mode, use console backend (prints to Azure logs, no real emails)
-    elif os.getenv('STAGING_MODE', '').lower() in ('true', '1', 'yes'):
+    if os.getenv('STAGING_MODE', '').lower() in ('true', '1', 'yes'):
         logger.info(f"📧 [STAGING] Using console email backend - no real emails sent (from {email_from})")
-        logger.info(f"📧 Recipients: {', '.join(recipient_list)}")
-        logger.info(f"📧 Subject: {subject}")
-        connection = get_connection(
+        return get_connection(
             backend='django.core.mail.backends.console.EmailBackend',
             fail_silently=fail_silently,
         )
     # In DEBUG mode, use file backend to save emails (avoids Windows console encoding issues)
-    elif settings.DEBUG:
+    if settings.DEBUG:
         email_folder = os.path.join(settings.BASE_DIR, 'sent_emails')
         os.makedirs(email_folder, exist_ok=True)
         logger.info(f"📧 [DEBUG] Saving email to {email_folder} (from {email_from})")
-        connection = get_connection(
+        return get_connection(
             backend='django.core.mail.backends.filebased.EmailBackend',
             file_path=email_folder,
             fail_silently=fail_silently,
         )
-    else:
-        # PRODUCTION: Check if Graph API should be used (for crush.lu)
-        use_graph = config.get('USE_GRAPH_API', False)
-        has_graph_credentials = all([
-            config.get('GRAPH_TENANT_ID'),
-            config.get('GRAPH_CLIENT_ID'),
-            config.get('GRAPH_CLIENT_SECRET')
-        ])
-
-        if use_graph and has_graph_credentials:
-            # Use Microsoft Graph API
-            from azureproject.graph_email_backend import GraphEmailBackend
-            logger.info(f"Using Microsoft Graph API to send email from {email_from}")
-
-            connection = GraphEmailBackend(
-                fail_silently=fail_silently,
-                tenant_id=config['GRAPH_TENANT_ID'],
-                client_id=config['GRAPH_CLIENT_ID'],
-                client_secret=config['GRAPH_CLIENT_SECRET'],
-                from_email=email_from
-            )
-        elif use_graph:
-            logger.error("Graph API enabled but credentials missing; refusing SMTP fallback")
-            raise ValueError("Graph API credentials are required for this domain.")
-        else:
-            # Use SMTP backend (for domains that don't have Graph API configured)
-
-            # Get SMTP settings with defaults to avoid KeyError
-            connection = get_connection(
-                backend='django.core.mail.backends.smtp.EmailBackend',
-                host=config.get('EMAIL_HOST', 'smtp.office365.com'),
-                port=config.get('EMAIL_PORT', 587),
-                username=config.get('EMAIL_HOST_USER', ''),
-                password=config.get('EMAIL_HOST_PASSWORD', ''),
-                use_tls=config.get('EMAIL_USE_TLS', True),
-                use_ssl=config.get('EMAIL_USE_SSL', False),
-                fail_silently=fail_silently,
-            )
 
+    # PRODUCTION: Check if Graph API should be used (for crush.lu)
+    use_graph = config.get('USE_GRAPH_API', False)
+    has_graph_credentials = all([
+        config.get('GRAPH_TENANT_ID'),
+        config.get('GRAPH_CLIENT_ID'),
+        config.get('GRAPH_CLIENT_SECRET')
+    ])
+
+    if use_graph and has_graph_credentials:
+        # Use Microsoft Graph API
+        from azureproject.graph_email_backend import GraphEmailBackend
+        logger.info(f"Using Microsoft Graph API to send email from {email_from}")
+
+        return GraphEmailBackend(
+            fail_silently=fail_silently,
+            tenant_id=config['GRAPH_TENANT_ID'],
+            client_id=config['GRAPH_CLIENT_ID'],
+            client_secret=config['GRAPH_CLIENT_SECRET'],
+            from_email=email_from
+        )
+    if use_graph:
+        logger.error("Graph API enabled but credentials missing; refusing SMTP fallback")
+        raise ValueError("Graph API credentials are required for this domain.")
+
+    # Use SMTP backend (for domains that don't have Graph API configured)
+
+    # Get SMTP settings with defaults to avoid KeyError
+    return get_connection(
+        backend='django.core.mail.backends.smtp.EmailBackend',
+        host=config.get('EMAIL_HOST', 'smtp.office365.com'),
+        port=config.get('EMAIL_PORT', 587),
+        username=config.get('EMAIL_HOST_USER', ''),
+        password=config.get('EMAIL_HOST_PASSWORD', ''),
+        use_tls=config.get('EMAIL_USE_TLS', True),
+        use_ssl=config.get('EMAIL_USE_SSL', False),
+        fail_silently=fail_silently,
+    )
+
+
+def build_domain_email(subject, message, recipient_list, from_email, html_message=None,
+                       cc=None, attachments=None, connection=None):
+    """EmailMessage exactly as send_domain_email sends it (UTF-8, HTML body if given)."""
     # Create email message with proper UTF-8 encoding
     email = EmailMessage(
         subject=subject,
         body=html_message if html_message else message,
-        from_email=email_from,
+        from_email=from_email,
         to=recipient_list,
         cc=cc or [],
         connection=connection,
@@ -236,10 +222,99 @@ def send_domain_email(subject, message, recipient_list, request=None, domain=Non
         for filename, content, mimetype in attachments:
             email.attach(filename, content, mimetype)
 
+    return email
+
+
+def send_domain_email(subject, message, recipient_list, request=None, domain=None,
+                     html_message=None, from_email=None, cc=None, fail_silently=False,
+                     attachments=None):
+    """
+    Send email using domain-specific configuration (Graph API, SMTP, or Console in DEBUG).
+
+    In test environments, uses Django's in-memory backend to avoid sending real emails.
+
+    Args:
+        subject: Email subject
+        message: Plain text message body
+        recipient_list: List of recipient email addresses
+        request: Django request object (optional, for auto-detecting domain)
+        domain: Explicit domain string (optional)
+        html_message: HTML message body (optional)
+        from_email: Override from email (optional)
+        cc: List of CC email addresses (optional)
+        fail_silently: Whether to suppress exceptions (default: False)
+        attachments: Optional iterable of (filename, content, mimetype) tuples
+            to attach to the message (e.g. a calendar .ics file).
+
+    Returns:
+        int: Number of successfully sent emails
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+
+    config = get_domain_email_config(request=request, domain=domain)
+    email_from = from_email or config['DEFAULT_FROM_EMAIL']
+
+    connection = get_domain_email_connection(
+        request=request, domain=domain, from_email=email_from,
+        fail_silently=fail_silently,
+    )
+    if os.getenv('STAGING_MODE', '').lower() in ('true', '1', 'yes') and not _is_test_environment():
+        logger.info(f"📧 Recipients: {', '.join(recipient_list)}")
+        logger.info(f"📧 Subject: {subject}")
+
+    email = build_domain_email(
+        subject, message, recipient_list, email_from,
+        html_message=html_message, cc=cc, attachments=attachments,
+        connection=connection,
+    )
+
     # Send email
     return email.send(fail_silently=fail_silently)
 
 
+def send_domain_email_batch(email_messages, request=None, domain=None, from_email=None):
+    """
+    Send many prepared EmailMessages over one domain connection.
+
+    On Graph this goes through JSON $batch (20 messages per call, throttled
+    items retried); other backends send them one by one over the same open
+    connection. Never raises for an individual message.
+
+    Args:
+        email_messages: EmailMessage objects, e.g. from build_domain_email()
+        request / domain / from_email: as for send_domain_email
+
+    Returns:
+        list: One entry per message -- None if sent, else the exception
+    """
+    email_messages = list(email_messages)
+    if not email_messages:
+        return []
+
+    connection = get_domain_email_connection(
+        request=request, domain=domain, from_email=from_email,
+    )
+    if hasattr(connection, 'send_messages_detailed'):
+        return connection.send_messages_detailed(email_messages)
+
+    errors = []
+    try:
+        connection.open()
+    except Exception as e:
+        return [e] * len(email_messages)
+    try:
+        for email in email_messages:
+            try:
+                connection.send_messages([email])
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+    finally:
+        connection.close()
+    return errors
+
+
 def get_domain_from_email(request=None, domain=None):
     """
     Get the default from email address for a domain.
@@ -3,17 +3,161 @@
 Microsoft Graph API email backend for Django.
 Sends emails using Microsoft Graph instead of SMTP.
 """
+import base64
+import hashlib
 import logging
+import os
+import threading
+import time
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+GRAPH_SCOPE = ["https://graph.microsoft.com/.default"]
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+
+# Refresh the app token this long before it expires, so a send never starts
+# with a token that lapses halfway through a batch
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Graph JSON batching takes at most 20 requests per $batch call
+GRAPH_BATCH_SIZE = 20
+# Items that come back 429 are retried this many times, for at most this many
+# seconds of Retry-After sleeping in total per send_messages call. The budget
+# stays well inside the maintenance timers' 110s HTTP timeout; whatever is
+# still throttled after it fails with GraphThrottled, for the next run.
+BATCH_MAX_RETRIES = 3
+BATCH_RETRY_BUDGET_SECONDS = 20
+DEFAULT_RETRY_AFTER = 10
+
+REQUEST_TIMEOUT = 30
+
+# Process-wide MSAL apps and tokens, keyed by tenant, client and a fingerprint
+# of the secret (so a rotated secret gets a new app). A new
+# ConfidentialClientApplication per send starts with an empty token cache, so
+# every email used to pay a token round trip.
+_msal_apps = {}
+_tokens = {}
+_token_lock = threading.Lock()
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+class GraphThrottled(Exception):
+    """Graph throttled a message past the retry budget; it was not sent."""
+
+
+def _credentials_key(tenant_id, client_id, client_secret):
+    fingerprint = hashlib.sha256((client_secret or "").encode()).hexdigest()[:16]
+    return (tenant_id, client_id, fingerprint)
+
+
+def _get_msal_app(tenant_id, client_id, client_secret):
+    """Return the process-wide MSAL confidential client for these credentials."""
+    key = _credentials_key(tenant_id, client_id, client_secret)
+    app = _msal_apps.get(key)
+    if app is None:
+        try:
+            import msal
+        except ImportError:
+            raise ImportError("msal package is required for Graph API email backend. "
+                            "Install with: pip install msal")
+
+        # Note: Do NOT use azure_region with client credentials flow.
+        # Regional endpoints only work with managed identities, not app-only auth.
+        # Using azure_region causes AADSTS100007 error.
+        app = msal.ConfidentialClientApplication(
+            client_id,
+            authority=f"https://login.microsoftonline.com/{tenant_id}",
+            client_credential=client_secret,
+        )
+        _msal_apps[key] = app
+    return app
+
+
+def get_graph_token(tenant_id, client_id, client_secret):
+    """
+    App-only Graph token, cached per process and refreshed proactively.
+
+    Raises:
+        Exception: If token acquisition fails
+    """
+    key = _credentials_key(tenant_id, client_id, client_secret)
+    cached = _tokens.get(key)
+    if cached and cached[1] - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+        return cached[0]
+
+    with _token_lock:
+        # Another thread may have refreshed it while we waited
+        cached = _tokens.get(key)
+        if cached and cached[1] - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return cached[0]
+
+        app = _get_msal_app(tenant_id, client_id, client_secret)
+        result = app.acquire_token_for_client(scopes=GRAPH_SCOPE)
+        if "access_token" not in result:
+            error = result.get("error_description", result.get("error", "Unknown error"))
+            logger.error(f"Failed to acquire Graph API access token: {error}")
+            raise Exception(f"Failed to acquire access token: {error}")
+
+        expires_in = int(result.get("expires_in") or 3600)
+        _tokens[key] = (result["access_token"], time.time() + expires_in)
+        return result["access_token"]
+
+
+def get_graph_session():
+    """
+    Process-wide keep-alive session for Graph calls.
+
+    Re-created after a fork so worker processes never share sockets with
+    their parent.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+            except ImportError:
+                raise ImportError("requests package is required for Graph API email backend. "
+                                "Install with: pip install requests")
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+def _retry_after(headers):
+    """Seconds from a Retry-After header (case-insensitive dict), or the default"""
+    for name, value in (headers or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                break
+    return DEFAULT_RETRY_AFTER
+
 
 class GraphEmailBackend(BaseEmailBackend):
     """
     Email backend that uses Microsoft Graph API to send emails.
     More modern and recommended approach than SMTP for Microsoft 365.
+
+    A single message goes out as one sendMail call. Several messages go
+    through Graph JSON batching, 20 sendMail requests per $batch call, and
+    items Graph throttles (429) are retried after their Retry-After.
+    send_messages_detailed() reports the outcome per message for callers that
+    track recipients individually (newsletters, campaigns); a GraphThrottled
+    outcome was never sent and can be retried later.
     """
 
     def __init__(self, fail_silently=False, **kwargs):
@@ -30,70 +174,150 @@ class GraphEmailBackend(BaseEmailBackend):
 
     def get_access_token(self):
         """Get access token using client credentials flow (app-only authentication)"""
-        try:
-            import msal
-        except ImportError:
-            raise ImportError("msal package is required for Graph API email backend. "
-                            "Install with: pip install msal")
-
-        authority = f"https://login.microsoftonline.com/{self.tenant_id}"
-        scope = ["https://graph.microsoft.com/.default"]
-
-        # Note: Do NOT use azure_region with client credentials flow.
-        # Regional endpoints only work with managed identities, not app-only auth.
-        # Using azure_region causes AADSTS100007 error.
-        app = msal.ConfidentialClientApplication(
-            self.client_id,
-            authority=authority,
-            client_credential=self.client_secret,
-        )
-
-        # Try to get token from cache first
-        result = app.acquire_token_silent(scope, account=None)
-        if not result:
-            # No cached token, acquire new one
-            result = app.acquire_token_for_client(scopes=scope)
-
-        if "access_token" in result:
-            return result["access_token"]
-        else:
-            error = result.get("error_description", result.get("error", "Unknown error"))
-            logger.error(f"Failed to acquire Graph API access token: {error}")
-            raise Exception(f"Failed to acquire access token: {error}")
+        return get_graph_token(self.tenant_id, self.client_id, self.client_secret)
 
     def send_messages(self, email_messages):
         """Send one or more EmailMessage objects"""
         if not email_messages:
             return 0
 
+        errors = self.send_messages_detailed(email_messages)
+        for message, error in zip(email_messages, errors):
+            if error is not None:
+                logger.error(f"Failed to send email to {message.to}: {error}")
+                if not self.fail_silently:
+                    raise error
+        return sum(1 for error in errors if error is None)
+
+    def send_messages_detailed(self, email_messages):
+        """
+        Send EmailMessages and report the outcome of each.
+
+        Returns:
+            list: One entry per message, in order -- None if it was sent,
+                otherwise the exception it failed with (GraphThrottled if it
+                was throttled past the retry budget)
+        """
+        email_messages = list(email_messages)
+        if not email_messages:
+            return []
+
         try:
             token = self.get_access_token()
         except Exception as e:
             logger.error(f"Failed to get access token: {e}")
-            if not self.fail_silently:
-                raise
-            return 0
-
-        sent_count = 0
-        for message in email_messages:
+            return [e] * len(email_messages)
+
+        errors = [None] * len(email_messages)
+        batchable = []
+        for index, message in enumerate(email_messages):
+            # Attachments can push a $batch body past Graph's 4 MB limit;
+            # those messages go out on their own
+            if message.attachments or len(email_messages) == 1:
+                try:
+                    self._send_message(message, token)
+                except Exception as e:
+                    errors[index] = e
+            else:
+                batchable.append(index)
+
+        budget = [BATCH_RETRY_BUDGET_SECONDS]
+        for start in range(0, len(batchable), GRAPH_BATCH_SIZE):
+            chunk = batchable[start:start + GRAPH_BATCH_SIZE]
             try:
-                self._send_message(message, token)
-                sent_count += 1
+                outcome = self._send_batch(
+                    [email_messages[index] for index in chunk], token, budget
+                )
             except Exception as e:
-                logger.error(f"Failed to send email to {message.to}: {e}")
-                if not self.fail_silently:
-                    raise
-
-        return sent_count
-
-    def _send_message(self, message, token):
-        """Send a single EmailMessage using Graph API"""
-        try:
-            import requests
-        except ImportError:
-            raise ImportError("requests package is required for Graph API email backend. "
-                            "Install with: pip install requests")
-
+                outcome = [e] * len(chunk)
+            for index, error in zip(chunk, outcome):
+                errors[index] = error
+        return errors
+
+    def _send_batch(self, messages, token, budget):
+        """
+        POST up to 20 sendMail requests as one $batch call.
+
+        Items answered with 429 are resent (alone, in a smaller batch) after
+        the longest Retry-After among them, while the shared sleep budget
+        lasts. A request the $batch reply has no answer for counts as failed.
+        Returns one error-or-None per message.
+        """
+        session = get_graph_session()
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        errors = [None] * len(messages)
+        pending = list(range(len(messages)))
+
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            requests_payload = [
+                {
+                    "id": str(index),
+                    "method": "POST",
+                    "url": f"/users/{messages[index].from_email or self.from_email}/sendMail",
+                    "headers": {"Content-Type": "application/json"},
+                    "body": self._build_payload(messages[index]),
+                }
+                for index in pending
+            ]
+            response = session.post(
+                f"{GRAPH_BASE_URL}/$batch",
+                headers=headers,
+                json={"requests": requests_payload},
+                timeout=REQUEST_TIMEOUT,
+            )
+
+            if response.status_code == 429:
+                throttled = pending
+                wait = _retry_after(response.headers)
+            elif response.status_code != 200:
+                error_msg = response.text
+                logger.error(f"Graph API $batch error (status {response.status_code}): {error_msg}")
+                raise Exception(f"Failed to send email batch via Graph API: HTTP {response.status_code} - {error_msg}")
+            else:
+                throttled = []
+                wait = 0
+                unanswered = set(pending)
+                for item in response.json().get("responses", []):
+                    index = int(item["id"])
+                    unanswered.discard(index)
+                    status = item.get("status")
+                    if status in (200, 202):
+                        errors[index] = None
+                        logger.info(f"Email sent successfully via Graph API to {messages[index].to}")
+                    elif status == 429:
+                        throttled.append(index)
+                        wait = max(wait, _retry_after(item.get("headers")))
+                    else:
+                        body = item.get("body")
+                        errors[index] = Exception(
+                            f"Failed to send email via Graph API: HTTP {status} - {body}"
+                        )
+                for index in unanswered:
+                    # Possibly sent, so not retried
+                    errors[index] = Exception(
+                        "Failed to send email via Graph API: no response in the $batch reply"
+                    )
+
+            for index in throttled:
+                errors[index] = GraphThrottled(
+                    "Failed to send email via Graph API: HTTP 429 - throttled"
+                )
+            if not throttled or attempt >= BATCH_MAX_RETRIES or wait > budget[0]:
+                break
+            logger.warning(
+                f"Graph API throttled {len(throttled)} batched email(s); retrying in {wait}s"
+            )
+            time.sleep(wait)
+            budget[0] -= wait
+            pending = sorted(throttled)
+
+        return errors
+
+    def _build_payload(self, message):
+        """sendMail request body for an EmailMessage"""
         # Prepare recipients
         to_recipients = [{"emailAddress": {"address": addr}} for addr in message.to]
         cc_recipients = [{"emailAddress": {"address": addr}} for addr in message.cc] if message.cc else []
@@ -129,7 +353,6 @@ class GraphEmailBackend(BaseEmailBackend):
                     filename, content, mimetype = attachment[0], attachment[1], attachment[2] if len(attachment) > 2 else 'application/octet-stream'
 
                     # Encode content to base64
-                    import base64
                     if isinstance(content, str):
                         content = content.encode('utf-8')
                     encoded_content = base64.b64encode(content).decode('utf-8')
@@ -144,18 +367,29 @@ class GraphEmailBackend(BaseEmailBackend):
             if attachments:
                 email_payload["message"]["attachments"] = attachments
 
+        return email_payload
+
+    def _send_message(self, message, token):
+        """Send a single EmailMessage using Graph API"""
+        email_payload = self._build_payload(message)
+
         # Determine sender (use from_email from message or default)
         from_email = message.from_email or self.from_email
 
         # Send email via Graph API
-        endpoint = f"https://graph.microsoft.com/v1.0/users/{from_email}/sendMail"
+        endpoint = f"{GRAPH_BASE_URL}/users/{from_email}/sendMail"
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
 
-        response = requests.post(endpoint, headers=headers, json=email_payload, timeout=30)
+        response = get_graph_session().post(
+            endpoint, headers=headers, json=email_payload, timeout=REQUEST_TIMEOUT
+        )
 
+        if response.status_code == 429:
+            logger.warning(f"Graph API throttled the email to {message.to}")
+            raise GraphThrottled("Failed to send email via Graph API: HTTP 429 - throttled")
         if response.status_code not in [200, 202]:
             error_msg = response.text
             logger.error(f"Graph API error (status {response.status_code}): {error_msg}")
@@ -177,14 +411,6 @@ def create_outlook_draft(subject, html_content, recipient_email, from_email=None
     Returns:
         dict: {'success': True, 'web_link': '...'} or {'success': False, 'error': '...'}
     """
-    import os
-    import requests
-
-    try:
-        import msal
-    except ImportError:
-        return {'success': False, 'error': 'msal package not installed'}
-
     # Get Graph API credentials
     tenant_id = os.getenv('GRAPH_TENANT_ID')
     client_id = os.getenv('GRAPH_CLIENT_ID')
@@ -194,25 +420,12 @@ def create_outlook_draft(subject, html_content, recipient_email, from_email=None
     if not all([tenant_id, client_id, client_secret]):
         return {'success': False, 'error': 'Graph API credentials not configured'}
 
-    # Get access token
-    authority = f"https://login.microsoftonline.com/{tenant_id}"
-    scope = ["https://graph.microsoft.com/.default"]
-
-    app = msal.ConfidentialClientApplication(
-        client_id,
-        authority=authority,
-        client_credential=client_secret,
-    )
-
-    result = app.acquire_token_silent(scope, account=None)
-    if not result:
-        result = app.acquire_token_for_client(scopes=scope)
-
-    if "access_token" not in result:
-        error = result.get("error_description", result.get("error", "Unknown error"))
-        return {'success': False, 'error': f'Failed to get access token: {error}'}
-
-    token = result["access_token"]
+    try:
+        token = get_graph_token(tenant_id, client_id, client_secret)
+    except ImportError:
+        return {'success': False, 'error': 'msal package not installed'}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
 
     # Create draft email payload
     draft_payload = {
@@ -227,13 +440,15 @@ def create_outlook_draft(subject, html_content, recipient_email, from_email=None
     }
 
     # Create draft via Graph API
-    endpoint = f"https://graph.microsoft.com/v1.0/users/{from_email}/messages"
+    endpoint = f"{GRAPH_BASE_URL}/users/{from_email}/messages"
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
-    response = requests.post(endpoint, headers=headers, json=draft_payload, timeout=30)
+    response = get_graph_session().post(
+        endpoint, headers=headers, json=draft_payload, timeout=REQUEST_TIMEOUT
+    )
 
     if response.status_code in [200, 201]:
         data = response.json()
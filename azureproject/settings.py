@@ -72,6 +72,25 @@ CRUSH_LEAD_REMINDERS_ENABLED = _env_bool("CRUSH_LEAD_REMINDERS_ENABLED", False)
 # environment explicitly opts in.
 CAMPAIGN_DISPATCH_ENABLED = _env_bool("CAMPAIGN_DISPATCH_ENABLED", False)
 
+# Write-behind activity tracking (crush_lu UserActivityMiddleware). ON = the
+# middleware only buffers (user, time, pwa) events and the ActivityFlush Azure
+# Function timer applies them in bulk via /api/admin/activity-flush/. OFF keeps
+# the synchronous, cache-throttled writes on the request path.
+USER_ACTIVITY_WRITE_BEHIND = _env_bool("USER_ACTIVITY_WRITE_BEHIND", False)
+
+# Crush Connect pool read path. OFF = get_eligible_pool evaluates every rule
+# live; ON = it reads the ConnectCandidate / ConnectPairExclusion tables kept
+# by crush_lu.services.connect_pool. Both are always maintained, so run
+# `reconcile_connect_pool --check` before flipping this on.
+CONNECT_MATERIALIZED_POOL = _env_bool("CONNECT_MATERIALIZED_POOL", False)
+
+# Event registration admission. OFF = event_register locks the event row and
+# recounts seats for every attempt; ON = it claims a seat from the counters in
+# crush_lu.services.seat_inventory (Redis-backed when the cache is) and writes
+# the registration without the lock. `reconcile_seat_inventory --check`
+# compares the counters with the database.
+EVENT_SEAT_INVENTORY = _env_bool("EVENT_SEAT_INVENTORY", False)
+
 # Recipients for the weekly Crush.lu KPI digest email (send_weekly_kpis command,
 # driven on Mondays by the hybrid-maintenance Azure Function). Comma-separated
 # env var; empty means "compute + persist the snapshot but email no one".
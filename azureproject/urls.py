@@ -28,6 +28,10 @@ urlpatterns = [
     # Add vibe API URLs outside i18n_patterns (merged into entreprinder)
     path('vibe-coding/api/canvas-state/', vibe_views.get_canvas_state, name='canvas_state_api'),
     path('vibe-coding/api/canvas-state/<int:canvas_id>/', vibe_views.get_canvas_state, name='canvas_state_by_id_api'),
+    path('vibe-coding/api/canvas-snapshot/', vibe_views.get_canvas_snapshot, name='canvas_snapshot_api'),
+    path('vibe-coding/api/canvas-snapshot/<int:canvas_id>/', vibe_views.get_canvas_snapshot, name='canvas_snapshot_by_id_api'),
+    path('vibe-coding/api/canvas-delta/', vibe_views.get_canvas_delta, name='canvas_delta_api'),
+    path('vibe-coding/api/canvas-delta/<int:canvas_id>/', vibe_views.get_canvas_delta, name='canvas_delta_by_id_api'),
     path('vibe-coding/api/place-pixel/', vibe_views.place_pixel, name='place_pixel_api'),
     path('vibe-coding/api/pixel-history/', vibe_views.get_pixel_history, name='pixel_history_api'),
     # Add direct access to road trip music game
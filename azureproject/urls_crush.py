@@ -365,6 +365,14 @@ urlpatterns = [
     # timer). Language-neutral so the Function App can hardcode it.
     path('api/admin/gdpr-retention/', api_admin_metrics.gdpr_retention_sweep, name='api_admin_gdpr_retention'),
 
+    # Crush Connect MatchScore dirty-member queue (MatchScoreQueue Function
+    # timer). Language-neutral so the Function App can hardcode it.
+    path('api/admin/match-score-queue/', api_admin_metrics.match_score_queue_sweep, name='api_admin_match_score_queue'),
+    path('api/admin/connect-pool-reconcile/', api_admin_metrics.connect_pool_reconcile, name='api_admin_connect_pool_reconcile'),
+    path('api/admin/daily-drop-pregenerate/', api_admin_metrics.daily_drop_pregenerate, name='api_admin_daily_drop_pregenerate'),
+    # Write-behind UserActivity buffer (ActivityFlush Function timer)
+    path('api/admin/activity-flush/', api_admin_metrics.activity_flush_sweep, name='api_admin_activity_flush'),
+
     # Event email lifecycle (EventReminders / EventRecaps / EventFeedback Function
     # timers). Language-neutral so the Function App can hardcode them. Before these
     # existed the three send_event_* commands had no scheduler of any kind.
@@ -316,7 +316,7 @@ def _parse_composer_form(request):
         from crush_lu.newsletter_service import LEGACY_SEGMENT_ALIASES
         known_keys = {
             segment['key']
-            for group in get_segment_definitions().values()
+            for group in get_segment_definitions(with_counts=False).values()
             for segment in group.get('segments', [])
         }
         if segment_key not in known_keys and segment_key not in LEGACY_SEGMENT_ALIASES:
@@ -32,6 +32,7 @@ from crush_lu.models import (
     PresentationQueue,
 )
 from crush_lu.models.events import SEAT_HOLDING_STATUSES
+from crush_lu.services.seat_inventory import adjust_seats
 from .filters import EventCapacityFilter
 from .quiz import QuizEventInline
 
@@ -1506,9 +1507,14 @@ class EventRegistrationAdmin(admin.ModelAdmin):
                 if showing is None or by_user[profile.user_id] < _key(showing):
                     restored_google_profiles.append(profile)
 
+        # Seats taken, for the seat inventory: .update() skips the
+        # registration signals that would otherwise count them
+        taken_seats = list(restoring.values_list("event_id", "user_id"))
+
         updated = EventRegistration.objects.filter(pk__in=eligible_ids).update(
             status="confirmed"
         )
+        adjust_seats(taken_seats, 1)
 
         # .update() emits no signals, so the per-registration receiver never
         # runs here and the restored tickets would stay voided forever.
@@ -1567,7 +1573,14 @@ class EventRegistrationAdmin(admin.ModelAdmin):
             .values_list("apple_wallet_ticket_serial", flat=True)
         )
 
+        freed_seats = list(
+            queryset.filter(status__in=SEAT_HOLDING_STATUSES).values_list(
+                "event_id", "user_id"
+            )
+        )
+
         updated = queryset.update(status="waitlist")
+        adjust_seats(freed_seats, -1)
 
         if voiding_serials:
             try:
@@ -11,19 +11,28 @@ Provides admin dashboard for viewing and managing user segments:
 - Unsubscribed from emails
 - Profile reminder tracking
 
+Segment definitions are cheap (unevaluated querysets); their counts come from
+a cached count table computed with one aggregate query per model, and CSV
+exports stream.
+
 Access: Superadmins only (due to bulk email capability)
 """
 
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.shortcuts import render, redirect
+from django.core.cache import cache
 from django.db.models import Count, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from collections import Counter, defaultdict
 from datetime import timedelta, date
+from itertools import islice
 
 from crush_lu.models.events import SEAT_HOLDING_STATUSES
+from crush_lu.services.demographics import AGE_BANDS, profile_demographics
 import csv
 
 from crush_lu.models import (
@@ -66,62 +75,43 @@ def get_demographic_stats():
     Return demographic statistics for active CrushProfiles.
     Includes gender, looking-for, age range, language, location distributions,
     and a gender x age cross-tabulation matrix.
+
+    Everything but the location list comes from the cached aggregates in
+    crush_lu.services.demographics (shared with the coach dashboard).
     """
     active_profiles = CrushProfile.objects.filter(is_active=True)
-    approved_profiles = active_profiles.filter(verification_status="verified")
+    active = profile_demographics(active=True)
+    approved = profile_demographics(active=True, verified=True)
 
-    total_active = active_profiles.count()
-    total_approved = approved_profiles.count()
+    total_active = active["total"]
+    total_approved = approved["total"]
 
     # Gender distribution
     gender_labels = dict(CrushProfile.GENDER_CHOICES)
-    gender_all = list(
-        active_profiles.exclude(gender="")
-        .values("gender")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
-    gender_approved = list(
-        approved_profiles.exclude(gender="")
-        .values("gender")
-        .annotate(count=Count("id"))
-        .order_by("-count")
-    )
-    gender_all_total = sum(g["count"] for g in gender_all)
-    gender_approved_total = sum(g["count"] for g in gender_approved)
 
-    for g in gender_all:
-        g["label"] = str(gender_labels.get(g["gender"], g["gender"]))
-        g["pct"] = (
-            round(g["count"] / gender_all_total * 100, 1) if gender_all_total else 0
-        )
-
-    for g in gender_approved:
-        g["label"] = str(gender_labels.get(g["gender"], g["gender"]))
-        g["pct"] = (
-            round(g["count"] / gender_approved_total * 100, 1)
-            if gender_approved_total
-            else 0
-        )
-
-    # Age range distribution (using helper). 5-year bands, only 60+ grouped.
-    age_ranges = [
-        ("18-24", 18, 24),
-        ("25-29", 25, 29),
-        ("30-34", 30, 34),
-        ("35-39", 35, 39),
-        ("40-44", 40, 44),
-        ("45-49", 45, 49),
-        ("50-54", 50, 54),
-        ("55-59", 55, 59),
-        ("60+", 60, None),
-    ]
+    def _distribution(counts, key, label):
+        """``[{key, count, label, pct}]`` by descending count, blanks dropped."""
+        dist = [
+            {key: value, "count": count, "label": label(value)}
+            for value, count in counts.most_common()
+            if value and count
+        ]
+        total = sum(item["count"] for item in dist)
+        for item in dist:
+            item["pct"] = round(item["count"] / total * 100, 1) if total else 0
+        return dist
+
+    def gender_label(code):
+        return str(gender_labels.get(code, code))
+
+    gender_all = _distribution(active["gender"], "gender", gender_label)
+    gender_approved = _distribution(approved["gender"], "gender", gender_label)
+
+    # Age range distribution. 5-year bands, only 60+ grouped.
     age_dist = []
-    profiles_with_dob = active_profiles.exclude(date_of_birth__isnull=True)
-    age_total = profiles_with_dob.count()
-
-    for label, min_age, max_age in age_ranges:
-        count = _age_range_queryset(active_profiles, min_age, max_age).count()
+    age_total = active["with_birth_date"]
+    for label, _min_age, _max_age in AGE_BANDS:
+        count = sum(active["age_gender"][label].values())
         pct = round(count / age_total * 100, 1) if age_total else 0
         age_dist.append({"label": label, "count": count, "pct": pct})
 
@@ -133,53 +123,34 @@ def get_demographic_stats():
         ("O", "Other"),
         ("P", "Prefer Not to Say"),
     ]
-    matrix_age_ranges = [
-        ("18-24", 18, 24),
-        ("25-29", 25, 29),
-        ("30-34", 30, 34),
-        ("35-39", 35, 39),
-        ("40-44", 40, 44),
-        ("45-49", 45, 49),
-        ("50-54", 50, 54),
-        ("55-59", 55, 59),
-        ("60+", 60, None),
-    ]
+    matrix_age_labels = [label for label, _min_age, _max_age in AGE_BANDS]
     gender_age_matrix = []
     for gender_code, gender_label in matrix_genders:
-        row = {
-            "gender": gender_code,
-            "label": gender_label,
-            "cells": [],
-            "total": 0,
-        }
-        gender_qs = approved_profiles.filter(gender=gender_code)
-        for age_label, min_age, max_age in matrix_age_ranges:
-            count = _age_range_queryset(gender_qs, min_age, max_age).count()
-            row["cells"].append(count)
-            row["total"] += count
-        gender_age_matrix.append(row)
+        cells = [
+            approved["age_gender"][age_label][gender_code]
+            for age_label in matrix_age_labels
+        ]
+        gender_age_matrix.append(
+            {
+                "gender": gender_code,
+                "label": gender_label,
+                "cells": cells,
+                "total": sum(cells),
+            }
+        )
 
     # Column totals for the matrix
     matrix_col_totals = []
-    for i in range(len(matrix_age_ranges)):
+    for i in range(len(matrix_age_labels)):
         matrix_col_totals.append(sum(row["cells"][i] for row in gender_age_matrix))
 
     # Language distribution
     language_flags = {"en": "🇬🇧", "de": "🇩🇪", "fr": "🇫🇷"}
-    lang_dist = list(
-        active_profiles.exclude(preferred_language="")
-        .values("preferred_language")
-        .annotate(count=Count("id"))
-        .order_by("-count")
+    lang_dist = _distribution(
+        active["preferred_language"],
+        "preferred_language",
+        lambda code: language_flags.get(code, "") + " " + code.upper(),
     )
-    lang_total = sum(l["count"] for l in lang_dist)
-    for l in lang_dist:
-        l["label"] = (
-            language_flags.get(l["preferred_language"], "")
-            + " "
-            + l["preferred_language"].upper()
-        )
-        l["pct"] = round(l["count"] / lang_total * 100, 1) if lang_total else 0
 
     # Location distribution (top 10 cities)
     location_dist = list(
@@ -200,7 +171,7 @@ def get_demographic_stats():
         "gender_approved": gender_approved,
         "age_ranges": age_dist,
         "gender_age_matrix": gender_age_matrix,
-        "matrix_age_labels": [label for label, _, _ in matrix_age_ranges],
+        "matrix_age_labels": matrix_age_labels,
         "matrix_col_totals": matrix_col_totals,
         "matrix_grand_total": sum(matrix_col_totals),
         "languages": lang_dist,
@@ -213,10 +184,13 @@ def get_demographic_stats():
 # ============================================================================
 
 
-def get_segment_definitions():
+def get_segment_definitions(with_counts=True, refresh_counts=False):
     """
     Return all segment definitions with their queries and metadata.
-    Each segment has: name, description, query, count, action_url
+    Each segment has: name, key, description, queryset (unevaluated), color
+    and, with ``with_counts``, its count from the cached count table (see
+    segment_counts()). Callers that only resolve a key to its queryset pass
+    ``with_counts=False`` and run no count queries at all.
 
     Categories (17 total):
     1-7: Operational (profile, reviews, activity, engagement, email, reminders, unverified)
@@ -426,7 +400,7 @@ def get_segment_definitions():
         user__pwa_installations__form_factor="desktop",
     ).distinct()
 
-    return {
+    definitions = {
         # ── Operational segments ──────────────────────────────────────
         "profile_completion": {
             "title": "Profile Completion",
@@ -438,7 +412,6 @@ def get_segment_definitions():
                     "key": "not_started",
                     "description": "Users who created account but never started profile",
                     "queryset": incomplete_not_started,
-                    "count": incomplete_not_started.count(),
                     "color": "red",
                 },
                 {
@@ -446,7 +419,6 @@ def get_segment_definitions():
                     "key": "step1",
                     "description": "Started profile basics, stopped before personal info",
                     "queryset": incomplete_step1,
-                    "count": incomplete_step1.count(),
                     "color": "orange",
                 },
                 {
@@ -454,7 +426,6 @@ def get_segment_definitions():
                     "key": "step2",
                     "description": "Completed personal info, stopped before photos",
                     "queryset": incomplete_step2,
-                    "count": incomplete_step2.count(),
                     "color": "yellow",
                 },
                 {
@@ -462,7 +433,6 @@ def get_segment_definitions():
                     "key": "step3",
                     "description": "Added photos, never submitted for review",
                     "queryset": incomplete_step3,
-                    "count": incomplete_step3.count(),
                     "color": "blue",
                 },
             ],
@@ -477,7 +447,6 @@ def get_segment_definitions():
                     "key": "pending_urgent",
                     "description": "Profiles waiting for review more than 72 hours",
                     "queryset": pending_reviews_urgent,
-                    "count": pending_reviews_urgent.count(),
                     "color": "red",
                     "is_urgent": True,
                 },
@@ -486,7 +455,6 @@ def get_segment_definitions():
                     "key": "pending_normal",
                     "description": "Profiles waiting for review less than 72 hours",
                     "queryset": pending_reviews_normal,
-                    "count": pending_reviews_normal.count(),
                     "color": "green",
                 },
             ],
@@ -501,7 +469,6 @@ def get_segment_definitions():
                     "key": "inactive_7d",
                     "description": "Users not seen for 7-14 days",
                     "queryset": inactive_7d,
-                    "count": inactive_7d.count(),
                     "color": "yellow",
                 },
                 {
@@ -509,7 +476,6 @@ def get_segment_definitions():
                     "key": "inactive_14d",
                     "description": "Users not seen for 14-30 days",
                     "queryset": inactive_14d,
-                    "count": inactive_14d.count(),
                     "color": "orange",
                 },
                 {
@@ -517,7 +483,6 @@ def get_segment_definitions():
                     "key": "inactive_30d",
                     "description": "Users not seen for over 30 days",
                     "queryset": inactive_30d,
-                    "count": inactive_30d.count(),
                     "color": "red",
                 },
             ],
@@ -532,7 +497,6 @@ def get_segment_definitions():
                     "key": "approved_no_events",
                     "description": "Approved profiles who never registered for an event",
                     "queryset": approved_no_events,
-                    "count": approved_no_events.count(),
                     "color": "orange",
                 },
                 {
@@ -540,7 +504,6 @@ def get_segment_definitions():
                     "key": "no_push",
                     "description": "Approved users without push notifications",
                     "queryset": no_push_subscription,
-                    "count": no_push_subscription.count(),
                     "color": "blue",
                 },
             ],
@@ -555,7 +518,6 @@ def get_segment_definitions():
                     "key": "unsubscribed_all",
                     "description": "Users who unsubscribed from all emails",
                     "queryset": unsubscribed_all,
-                    "count": unsubscribed_all.count(),
                     "color": "gray",
                 },
             ],
@@ -570,7 +532,6 @@ def get_segment_definitions():
                     "key": "reminder_24h",
                     "description": "Incomplete profiles signed up 24-48h ago, no reminder sent",
                     "queryset": eligible_24h_reminder,
-                    "count": eligible_24h_reminder.count(),
                     "color": "green",
                 },
                 {
@@ -578,7 +539,6 @@ def get_segment_definitions():
                     "key": "reminder_72h",
                     "description": "Incomplete profiles, 72-96h ago, received 24h reminder",
                     "queryset": eligible_72h_reminder,
-                    "count": eligible_72h_reminder.count(),
                     "color": "yellow",
                 },
                 {
@@ -586,7 +546,6 @@ def get_segment_definitions():
                     "key": "reminder_7d",
                     "description": "Incomplete profiles, 7-8 days ago, received 72h reminder",
                     "queryset": eligible_7d_reminder,
-                    "count": eligible_7d_reminder.count(),
                     "color": "orange",
                 },
             ],
@@ -602,7 +561,6 @@ def get_segment_definitions():
                     "key": "gender_male",
                     "description": "Active profiles identifying as male",
                     "queryset": gender_male,
-                    "count": gender_male.count(),
                     "color": "blue",
                 },
                 {
@@ -610,7 +568,6 @@ def get_segment_definitions():
                     "key": "gender_female",
                     "description": "Active profiles identifying as female",
                     "queryset": gender_female,
-                    "count": gender_female.count(),
                     "color": "pink",
                 },
                 {
@@ -618,7 +575,6 @@ def get_segment_definitions():
                     "key": "gender_nonbinary",
                     "description": "Active profiles identifying as non-binary",
                     "queryset": gender_nonbinary,
-                    "count": gender_nonbinary.count(),
                     "color": "purple",
                 },
                 {
@@ -626,7 +582,6 @@ def get_segment_definitions():
                     "key": "gender_other",
                     "description": "Active profiles with gender set to other",
                     "queryset": gender_other,
-                    "count": gender_other.count(),
                     "color": "green",
                 },
                 {
@@ -634,7 +589,6 @@ def get_segment_definitions():
                     "key": "gender_prefer_not",
                     "description": "Active profiles who prefer not to disclose gender",
                     "queryset": gender_prefer_not,
-                    "count": gender_prefer_not.count(),
                     "color": "gray",
                 },
             ],
@@ -649,7 +603,6 @@ def get_segment_definitions():
                     "key": "age_18_24",
                     "description": "Active profiles aged 18-24",
                     "queryset": age_18_24,
-                    "count": age_18_24.count(),
                     "color": "green",
                 },
                 {
@@ -657,7 +610,6 @@ def get_segment_definitions():
                     "key": "age_25_29",
                     "description": "Active profiles aged 25-29",
                     "queryset": age_25_29,
-                    "count": age_25_29.count(),
                     "color": "blue",
                 },
                 {
@@ -665,7 +617,6 @@ def get_segment_definitions():
                     "key": "age_30_34",
                     "description": "Active profiles aged 30-34",
                     "queryset": age_30_34,
-                    "count": age_30_34.count(),
                     "color": "purple",
                 },
                 {
@@ -673,7 +624,6 @@ def get_segment_definitions():
                     "key": "age_35_39",
                     "description": "Active profiles aged 35-39",
                     "queryset": age_35_39,
-                    "count": age_35_39.count(),
                     "color": "orange",
                 },
                 {
@@ -681,7 +631,6 @@ def get_segment_definitions():
                     "key": "age_40_44",
                     "description": "Active profiles aged 40-44",
                     "queryset": age_40_44,
-                    "count": age_40_44.count(),
                     "color": "orange",
                 },
                 {
@@ -689,7 +638,6 @@ def get_segment_definitions():
                     "key": "age_45_49",
                     "description": "Active profiles aged 45-49",
                     "queryset": age_45_49,
-                    "count": age_45_49.count(),
                     "color": "red",
                 },
                 {
@@ -697,7 +645,6 @@ def get_segment_definitions():
                     "key": "age_50_54",
                     "description": "Active profiles aged 50-54",
                     "queryset": age_50_54,
-                    "count": age_50_54.count(),
                     "color": "red",
                 },
                 {
@@ -705,7 +652,6 @@ def get_segment_definitions():
                     "key": "age_55_59",
                     "description": "Active profiles aged 55-59",
                     "queryset": age_55_59,
-                    "count": age_55_59.count(),
                     "color": "red",
                 },
                 {
@@ -713,7 +659,6 @@ def get_segment_definitions():
                     "key": "age_60_plus",
                     "description": "Active profiles aged 60 and over",
                     "queryset": age_60_plus,
-                    "count": age_60_plus.count(),
                     "color": "red",
                 },
             ],
@@ -728,7 +673,6 @@ def get_segment_definitions():
                     "key": "gender_m_age_18_24",
                     "description": "Approved males aged 18-24",
                     "queryset": gender_m_age_18_24,
-                    "count": gender_m_age_18_24.count(),
                     "color": "blue",
                 },
                 {
@@ -736,7 +680,6 @@ def get_segment_definitions():
                     "key": "gender_m_age_25_34",
                     "description": "Approved males aged 25-34",
                     "queryset": gender_m_age_25_34,
-                    "count": gender_m_age_25_34.count(),
                     "color": "blue",
                 },
                 {
@@ -744,7 +687,6 @@ def get_segment_definitions():
                     "key": "gender_m_age_35_plus",
                     "description": "Approved males aged 35 and over",
                     "queryset": gender_m_age_35_plus,
-                    "count": gender_m_age_35_plus.count(),
                     "color": "blue",
                 },
                 {
@@ -752,7 +694,6 @@ def get_segment_definitions():
                     "key": "gender_f_age_18_24",
                     "description": "Approved females aged 18-24",
                     "queryset": gender_f_age_18_24,
-                    "count": gender_f_age_18_24.count(),
                     "color": "pink",
                 },
                 {
@@ -760,7 +701,6 @@ def get_segment_definitions():
                     "key": "gender_f_age_25_34",
                     "description": "Approved females aged 25-34",
                     "queryset": gender_f_age_25_34,
-                    "count": gender_f_age_25_34.count(),
                     "color": "pink",
                 },
                 {
@@ -768,7 +708,6 @@ def get_segment_definitions():
                     "key": "gender_f_age_35_plus",
                     "description": "Approved females aged 35 and over",
                     "queryset": gender_f_age_35_plus,
-                    "count": gender_f_age_35_plus.count(),
                     "color": "pink",
                 },
                 {
@@ -776,7 +715,6 @@ def get_segment_definitions():
                     "key": "gender_nb_all",
                     "description": "Approved non-binary profiles (all ages)",
                     "queryset": gender_nb_all,
-                    "count": gender_nb_all.count(),
                     "color": "purple",
                 },
             ],
@@ -791,7 +729,6 @@ def get_segment_definitions():
                     "key": "lang_en",
                     "description": "Active profiles with preferred language English",
                     "queryset": lang_en,
-                    "count": lang_en.count(),
                     "color": "blue",
                 },
                 {
@@ -799,7 +736,6 @@ def get_segment_definitions():
                     "key": "lang_de",
                     "description": "Active profiles with preferred language German",
                     "queryset": lang_de,
-                    "count": lang_de.count(),
                     "color": "orange",
                 },
                 {
@@ -807,7 +743,6 @@ def get_segment_definitions():
                     "key": "lang_fr",
                     "description": "Active profiles with preferred language French",
                     "queryset": lang_fr,
-                    "count": lang_fr.count(),
                     "color": "red",
                 },
             ],
@@ -823,7 +758,6 @@ def get_segment_definitions():
                     "key": "unverified_never_submitted",
                     "description": "Has a profile but never submitted for coach review",
                     "queryset": unverified_never_submitted,
-                    "count": unverified_never_submitted.count(),
                     "color": "red",
                 },
                 {
@@ -831,7 +765,6 @@ def get_segment_definitions():
                     "key": "unverified_pending_review",
                     "description": "Submitted profile, waiting for a crush coach to review",
                     "queryset": unverified_pending_review,
-                    "count": unverified_pending_review.count(),
                     "color": "orange",
                 },
                 {
@@ -839,7 +772,6 @@ def get_segment_definitions():
                     "key": "unverified_revision",
                     "description": "Coach requested changes, awaiting user resubmission",
                     "queryset": unverified_revision,
-                    "count": unverified_revision.count(),
                     "color": "yellow",
                 },
                 {
@@ -847,7 +779,6 @@ def get_segment_definitions():
                     "key": "unverified_rejected",
                     "description": "Profile was rejected by a crush coach",
                     "queryset": unverified_rejected,
-                    "count": unverified_rejected.count(),
                     "color": "gray",
                 },
                 {
@@ -855,7 +786,6 @@ def get_segment_definitions():
                     "key": "unverified_recontact",
                     "description": "User needs to recontact their crush coach",
                     "queryset": unverified_recontact,
-                    "count": unverified_recontact.count(),
                     "color": "purple",
                 },
             ],
@@ -871,7 +801,6 @@ def get_segment_definitions():
                     "key": "event_super_attendee",
                     "description": "Approved profiles who attended 3 or more events",
                     "queryset": event_super_attendee,
-                    "count": event_super_attendee.count(),
                     "color": "green",
                 },
                 {
@@ -879,7 +808,6 @@ def get_segment_definitions():
                     "key": "event_single_attendee",
                     "description": "Approved profiles who attended exactly 1 event",
                     "queryset": event_single_attendee,
-                    "count": event_single_attendee.count(),
                     "color": "blue",
                 },
                 {
@@ -887,7 +815,6 @@ def get_segment_definitions():
                     "key": "event_registered_never_attended",
                     "description": "Registered for events but never marked as attended",
                     "queryset": event_registered_never_attended,
-                    "count": event_registered_never_attended.count(),
                     "color": "orange",
                 },
                 {
@@ -895,7 +822,6 @@ def get_segment_definitions():
                     "key": "event_upcoming_registrants",
                     "description": "Currently registered for a future event",
                     "queryset": event_upcoming_registrants,
-                    "count": event_upcoming_registrants.count(),
                     "color": "purple",
                 },
             ],
@@ -910,7 +836,6 @@ def get_segment_definitions():
                     "key": "conn_has_accepted",
                     "description": "Has at least one accepted connection",
                     "queryset": conn_has_accepted,
-                    "count": conn_has_accepted.count(),
                     "color": "green",
                 },
                 {
@@ -918,7 +843,6 @@ def get_segment_definitions():
                     "key": "conn_none",
                     "description": "Approved but zero connection requests (sent or received)",
                     "queryset": conn_none,
-                    "count": conn_none.count(),
                     "color": "red",
                 },
                 {
@@ -926,7 +850,6 @@ def get_segment_definitions():
                     "key": "conn_has_messaged",
                     "description": "Sent at least one connection message",
                     "queryset": conn_has_messaged,
-                    "count": conn_has_messaged.count(),
                     "color": "blue",
                 },
                 {
@@ -934,7 +857,6 @@ def get_segment_definitions():
                     "key": "conn_active_3plus",
                     "description": "Sent 3 or more connection requests",
                     "queryset": conn_active_3plus,
-                    "count": conn_active_3plus.count(),
                     "color": "purple",
                 },
             ],
@@ -949,7 +871,6 @@ def get_segment_definitions():
                     "key": "tier_basic",
                     "description": "Approved profiles on Basic tier",
                     "queryset": tier_basic,
-                    "count": tier_basic.count(),
                     "color": "gray",
                 },
                 {
@@ -957,7 +878,6 @@ def get_segment_definitions():
                     "key": "tier_bronze",
                     "description": "Approved profiles on Bronze tier",
                     "queryset": tier_bronze,
-                    "count": tier_bronze.count(),
                     "color": "orange",
                 },
                 {
@@ -965,7 +885,6 @@ def get_segment_definitions():
                     "key": "tier_silver",
                     "description": "Approved profiles on Silver tier",
                     "queryset": tier_silver,
-                    "count": tier_silver.count(),
                     "color": "blue",
                 },
                 {
@@ -973,7 +892,6 @@ def get_segment_definitions():
                     "key": "tier_gold",
                     "description": "Approved profiles on Gold tier",
                     "queryset": tier_gold,
-                    "count": tier_gold.count(),
                     "color": "yellow",
                 },
             ],
@@ -988,7 +906,6 @@ def get_segment_definitions():
                     "key": "lifecycle_new",
                     "description": "Created account within last 7 days",
                     "queryset": lifecycle_new,
-                    "count": lifecycle_new.count(),
                     "color": "green",
                 },
                 {
@@ -996,7 +913,6 @@ def get_segment_definitions():
                     "key": "lifecycle_recently_approved",
                     "description": "Approved in the last 7 days",
                     "queryset": lifecycle_recently_approved,
-                    "count": lifecycle_recently_approved.count(),
                     "color": "blue",
                 },
                 {
@@ -1004,7 +920,6 @@ def get_segment_definitions():
                     "key": "lifecycle_established",
                     "description": "Approved more than 30 days ago",
                     "queryset": lifecycle_established,
-                    "count": lifecycle_established.count(),
                     "color": "purple",
                 },
                 {
@@ -1012,7 +927,6 @@ def get_segment_definitions():
                     "key": "lifecycle_vip",
                     "description": "Gold tier or attended 5+ events",
                     "queryset": lifecycle_vip,
-                    "count": lifecycle_vip.count(),
                     "color": "yellow",
                 },
             ],
@@ -1027,7 +941,6 @@ def get_segment_definitions():
                     "key": "device_pwa",
                     "description": "Users who have installed the PWA",
                     "queryset": device_pwa,
-                    "count": device_pwa.count(),
                     "color": "blue",
                 },
                 {
@@ -1035,7 +948,6 @@ def get_segment_definitions():
                     "key": "device_ios",
                     "description": "PWA installed on iOS",
                     "queryset": device_ios,
-                    "count": device_ios.count(),
                     "color": "gray",
                 },
                 {
@@ -1043,7 +955,6 @@ def get_segment_definitions():
                     "key": "device_android",
                     "description": "PWA installed on Android",
                     "queryset": device_android,
-                    "count": device_android.count(),
                     "color": "green",
                 },
                 {
@@ -1051,13 +962,97 @@ def get_segment_definitions():
                     "key": "device_desktop",
                     "description": "PWA installed on desktop",
                     "queryset": device_desktop,
-                    "count": device_desktop.count(),
                     "color": "purple",
                 },
             ],
         },
     }
 
+    if with_counts:
+        _attach_counts(definitions, refresh=refresh_counts)
+    return definitions
+
+
+def _iter_segments(definitions):
+    for category in definitions.values():
+        yield from category["segments"]
+
+
+def find_segment(segment_key):
+    """``(category title, segment)`` for a key, or ``(None, None)``; no counts."""
+    for category in get_segment_definitions(with_counts=False).values():
+        for segment in category["segments"]:
+            if segment["key"] == segment_key:
+                return category["title"], segment
+    return None, None
+
+
+# ============================================================================
+# SEGMENT COUNTS
+# ============================================================================
+
+SEGMENT_COUNTS_CACHE_KEY = "crush_lu:segment_counts"
+# Counts are served from the table this long before a read recomputes them;
+# the dashboard shows the table's age and can force a refresh
+SEGMENT_COUNTS_MAX_AGE = 10 * 60
+
+
+def compute_segment_counts(definitions=None):
+    """
+    Count every segment with one query per model.
+
+    Segments over the same model become conditional aggregates of a single
+    query on that model's table (``COUNT(*) FILTER (WHERE pk IN (segment))``)
+    instead of one ``count()`` per segment.
+    """
+    if definitions is None:
+        definitions = get_segment_definitions(with_counts=False)
+
+    aggregates_by_model = defaultdict(dict)
+    keys_by_alias = {}
+    for index, segment in enumerate(_iter_segments(definitions)):
+        queryset = segment["queryset"]
+        alias = f"segment_{index}"
+        keys_by_alias[alias] = segment["key"]
+        aggregates_by_model[queryset.model][alias] = Count(
+            "pk", filter=Q(pk__in=queryset.values("pk"))
+        )
+
+    counts = {}
+    for model, aggregates in aggregates_by_model.items():
+        for alias, count in model.objects.aggregate(**aggregates).items():
+            counts[keys_by_alias[alias]] = count
+    return counts
+
+
+def segment_counts(definitions=None, refresh=False):
+    """
+    ``(counts by segment key, computed_at)`` from the cached count table.
+
+    The table is recomputed when missing, older than SEGMENT_COUNTS_MAX_AGE,
+    missing a segment (new definition), or when ``refresh`` is set.
+    """
+    if definitions is None:
+        definitions = get_segment_definitions(with_counts=False)
+    keys = {segment["key"] for segment in _iter_segments(definitions)}
+
+    table = None if refresh else cache.get(SEGMENT_COUNTS_CACHE_KEY)
+    if table is None or not keys <= table["counts"].keys():
+        table = {
+            "counts": compute_segment_counts(definitions),
+            "computed_at": timezone.now(),
+        }
+        cache.set(SEGMENT_COUNTS_CACHE_KEY, table, SEGMENT_COUNTS_MAX_AGE)
+    return table["counts"], table["computed_at"]
+
+
+def _attach_counts(definitions, refresh=False):
+    """Set each segment's ``count`` from the count table; returns its timestamp."""
+    counts, computed_at = segment_counts(definitions, refresh=refresh)
+    for segment in _iter_segments(definitions):
+        segment["count"] = counts[segment["key"]]
+    return computed_at
+
 
 # ============================================================================
 # VIEW FUNCTIONS
@@ -1073,7 +1068,10 @@ def user_segments_dashboard(request):
 
     Access: Superadmins only.
     """
-    segments = get_segment_definitions()
+    segments = get_segment_definitions(with_counts=False)
+    counts_computed_at = _attach_counts(
+        segments, refresh=request.GET.get("refresh") == "1"
+    )
     demographics = get_demographic_stats()
 
     # Preference stats for approved profiles
@@ -1082,30 +1080,22 @@ def user_segments_dashboard(request):
     approved_profiles = CrushProfile.objects.filter(verification_status="verified")
     pref_stats = get_preference_stats(approved_profiles)
 
-    # Approved-only event language distribution
+    # Approved-only event language distribution (cached aggregates shared
+    # with the coach dashboard)
+    approved_demographics = profile_demographics(verified=True)
     lang_label_map = dict(CrushProfile.EVENT_LANGUAGE_CHOICES)
     lang_flags = {"en": "🇬🇧", "de": "🇩🇪", "fr": "🇫🇷", "lu": "🇱🇺"}
-    lang_counts = {}
-    for langs in approved_profiles.exclude(event_languages=[]).values_list(
-        "event_languages", flat=True
-    ):
-        if isinstance(langs, list):
-            for code in langs:
-                lang_counts[code] = lang_counts.get(code, 0) + 1
+    lang_counts = approved_demographics["event_languages"]
     lang_total = sum(lang_counts.values()) or 1
-    approved_language_stats = sorted(
-        [
-            {
-                "code": code,
-                "label": f"{lang_flags.get(code, '')} {lang_label_map.get(code, code)}",
-                "count": count,
-                "pct": round(count * 100 / lang_total, 1),
-            }
-            for code, count in lang_counts.items()
-        ],
-        key=lambda x: x["count"],
-        reverse=True,
-    )
+    approved_language_stats = [
+        {
+            "code": code,
+            "label": f"{lang_flags.get(code, '')} {lang_label_map.get(code, code)}",
+            "count": count,
+            "pct": round(count * 100 / lang_total, 1),
+        }
+        for code, count in lang_counts.most_common()
+    ]
 
     # Gender x Event Language matrix
     lang_codes = [code for code, _ in CrushProfile.EVENT_LANGUAGE_CHOICES]
@@ -1113,57 +1103,32 @@ def user_segments_dashboard(request):
         f"{lang_flags.get(code, '')} {label}"
         for code, label in CrushProfile.EVENT_LANGUAGE_CHOICES
     ]
+    gender_languages = approved_demographics["gender_languages"]
+    other_languages = sum(
+        (counts for gender, counts in gender_languages.items() if gender not in ("F", "M")),
+        Counter(),
+    )
     gender_lang_matrix = []
-    for gender_code, gender_label in [("F", "Women"), ("M", "Men"), ("other", "Other")]:
-        row = {"label": gender_label, "cells": [], "total": 0}
-        if gender_code == "other":
-            qs = approved_profiles.exclude(gender__in=["F", "M"]).exclude(event_languages=[])
-        else:
-            qs = approved_profiles.filter(gender=gender_code).exclude(event_languages=[])
-        gender_lang_counts = {}
-        for langs_list in qs.values_list("event_languages", flat=True):
-            if isinstance(langs_list, list):
-                for code in langs_list:
-                    gender_lang_counts[code] = gender_lang_counts.get(code, 0) + 1
-        for code in lang_codes:
-            count = gender_lang_counts.get(code, 0)
-            row["cells"].append(count)
-            row["total"] += count
-        gender_lang_matrix.append(row)
+    for counts, gender_label in [
+        (gender_languages["F"], "Women"),
+        (gender_languages["M"], "Men"),
+        (other_languages, "Other"),
+    ]:
+        cells = [counts[code] for code in lang_codes]
+        gender_lang_matrix.append(
+            {"label": gender_label, "cells": cells, "total": sum(cells)}
+        )
     gender_lang_col_totals = [
         sum(row["cells"][i] for row in gender_lang_matrix)
         for i in range(len(lang_codes))
     ]
 
     # Age x Event Language matrix
-    today = date.today()
-    age_ranges = [
-        {"label": "18-24", "min": 18, "max": 24},
-        {"label": "25-29", "min": 25, "max": 29},
-        {"label": "30-34", "min": 30, "max": 34},
-        {"label": "35-39", "min": 35, "max": 39},
-        {"label": "40-44", "min": 40, "max": 44},
-        {"label": "45-49", "min": 45, "max": 49},
-        {"label": "50-54", "min": 50, "max": 54},
-        {"label": "55-59", "min": 55, "max": 59},
-        {"label": "60+", "min": 60, "max": 999},
-    ]
-    age_lang_matrix = [
-        {"label": ar["label"], "cells": [0] * len(lang_codes), "total": 0}
-        for ar in age_ranges
-    ]
-    for dob, langs_list in approved_profiles.exclude(
-        date_of_birth__isnull=True
-    ).exclude(event_languages=[]).values_list("date_of_birth", "event_languages"):
-        age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-        if isinstance(langs_list, list):
-            for idx, ar in enumerate(age_ranges):
-                if ar["min"] <= age <= ar["max"]:
-                    for code in langs_list:
-                        if code in lang_codes:
-                            age_lang_matrix[idx]["cells"][lang_codes.index(code)] += 1
-                            age_lang_matrix[idx]["total"] += 1
-                    break
+    age_lang_matrix = []
+    for label, _min_age, _max_age in AGE_BANDS:
+        counts = approved_demographics["age_languages"][label]
+        cells = [counts[code] for code in lang_codes]
+        age_lang_matrix.append({"label": label, "cells": cells, "total": sum(cells)})
     age_lang_col_totals = [
         sum(row["cells"][i] for row in age_lang_matrix)
         for i in range(len(lang_codes))
@@ -1199,6 +1164,7 @@ def user_segments_dashboard(request):
         "gender_lang_col_totals": gender_lang_col_totals,
         "age_lang_matrix": age_lang_matrix,
         "age_lang_col_totals": age_lang_col_totals,
+        "counts_computed_at": counts_computed_at,
         "title": "User Segments",
         "site_header": "💕 Crush.lu Administration",
     }
@@ -1215,21 +1181,7 @@ def segment_detail(request, segment_key):
 
     Access: Superadmins only.
     """
-    segments = get_segment_definitions()
-
-    # Find the segment
-    target_segment = None
-    category_title = None
-
-    for category_key, category in segments.items():
-        for segment in category["segments"]:
-            if segment["key"] == segment_key:
-                target_segment = segment
-                category_title = category["title"]
-                break
-        if target_segment:
-            break
-
+    category_title, target_segment = find_segment(segment_key)
     if not target_segment:
         messages.error(request, _("Segment '%(key)s' not found.") % {"key": segment_key})
         return redirect("user_segments_dashboard")
@@ -1269,7 +1221,9 @@ def segment_detail(request, segment_key):
         "category_title": category_title,
         "users": users,
         "is_profile_segment": is_profile_segment,
-        "total_count": target_segment["count"],
+        # Only this segment, counted live: the detail page is the one place an
+        # exact, current number matters
+        "total_count": queryset.count(),
         "title": f"Segment: {target_segment['name']}",
         "site_header": "💕 Crush.lu Administration",
     }
@@ -1277,36 +1231,37 @@ def segment_detail(request, segment_key):
     return render(request, "admin/crush_lu/segment_detail.html", context)
 
 
-def export_segment_csv(queryset, segment_key, segment_name):
-    """
-    Export segment users to CSV file.
-    """
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = (
-        f'attachment; filename="segment_{segment_key}_{timezone.now().strftime("%Y%m%d")}.csv"'
-    )
+# Rows fetched per database round trip while streaming a CSV export
+EXPORT_CHUNK_SIZE = 500
+
 
-    writer = csv.writer(response)
+class _Echo:
+    """Pseudo-buffer for csv.writer: write() hands the line back."""
+
+    def write(self, value):
+        return value
+
+
+def _segment_csv_rows(queryset, segment_name):
+    """Header then one row per member, read with ``iterator(chunk_size=...)``."""
     model = queryset.model
 
     if model == CrushProfile:
-        writer.writerow(
-            [
-                "Email",
-                "First Name",
-                "Last Name",
-                "Gender",
-                "Age",
-                "Location",
-                "Phone Verified",
-                "Language",
-                "Is Approved",
-                "Event Count",
-                "Connection Count",
-                "Created At",
-                "Segment",
-            ]
-        )
+        yield [
+            "Email",
+            "First Name",
+            "Last Name",
+            "Gender",
+            "Age",
+            "Location",
+            "Phone Verified",
+            "Language",
+            "Is Approved",
+            "Event Count",
+            "Connection Count",
+            "Created At",
+            "Segment",
+        ]
         gender_labels = dict(CrushProfile.GENDER_CHOICES)
         profiles = queryset.select_related("user").annotate(
             event_count=Count("user__eventregistration", distinct=True),
@@ -1315,75 +1270,104 @@ def export_segment_csv(queryset, segment_key, segment_name):
                 "user__connection_requests_received", distinct=True
             ),
         )
-        for profile in profiles:
+        for profile in profiles.iterator(chunk_size=EXPORT_CHUNK_SIZE):
             try:
                 age = profile.age
             except Exception:
                 age = ""
-            writer.writerow(
-                [
-                    profile.user.email,
-                    profile.user.first_name,
-                    profile.user.last_name,
-                    str(gender_labels.get(profile.gender, profile.gender)),
-                    age if age else "",
-                    profile.location,
-                    "Yes" if profile.phone_verified else "No",
-                    profile.preferred_language,
-                    "Yes" if profile.is_approved else "No",
-                    profile.event_count,
-                    profile.sent_connections + profile.received_connections,
-                    profile.created_at.strftime("%Y-%m-%d %H:%M"),
-                    segment_name,
-                ]
-            )
+            yield [
+                profile.user.email,
+                profile.user.first_name,
+                profile.user.last_name,
+                str(gender_labels.get(profile.gender, profile.gender)),
+                age if age else "",
+                profile.location,
+                "Yes" if profile.phone_verified else "No",
+                profile.preferred_language,
+                "Yes" if profile.is_approved else "No",
+                profile.event_count,
+                profile.sent_connections + profile.received_connections,
+                profile.created_at.strftime("%Y-%m-%d %H:%M"),
+                segment_name,
+            ]
     elif model == ProfileSubmission:
-        writer.writerow(["Email", "First Name", "Last Name", "Created At", "Segment"])
-        for submission in queryset.select_related("profile__user"):
-            writer.writerow(
-                [
-                    submission.profile.user.email,
-                    submission.profile.user.first_name,
-                    submission.profile.user.last_name,
-                    (
-                        submission.submitted_at.strftime("%Y-%m-%d %H:%M")
-                        if submission.submitted_at
-                        else ""
-                    ),
-                    segment_name,
-                ]
-            )
+        yield ["Email", "First Name", "Last Name", "Created At", "Segment"]
+        submissions = queryset.select_related("profile__user")
+        for submission in submissions.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                submission.profile.user.email,
+                submission.profile.user.first_name,
+                submission.profile.user.last_name,
+                (
+                    submission.submitted_at.strftime("%Y-%m-%d %H:%M")
+                    if submission.submitted_at
+                    else ""
+                ),
+                segment_name,
+            ]
     elif model == UserActivity:
-        writer.writerow(["Email", "First Name", "Last Name", "Created At", "Segment"])
-        for activity in queryset.select_related("user"):
-            writer.writerow(
-                [
-                    activity.user.email,
-                    activity.user.first_name,
-                    activity.user.last_name,
-                    (
-                        activity.last_seen.strftime("%Y-%m-%d %H:%M")
-                        if activity.last_seen
-                        else ""
-                    ),
-                    segment_name,
-                ]
-            )
+        yield ["Email", "First Name", "Last Name", "Created At", "Segment"]
+        activities = queryset.select_related("user")
+        for activity in activities.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                activity.user.email,
+                activity.user.first_name,
+                activity.user.last_name,
+                (
+                    activity.last_seen.strftime("%Y-%m-%d %H:%M")
+                    if activity.last_seen
+                    else ""
+                ),
+                segment_name,
+            ]
     elif model == EmailPreference:
-        writer.writerow(["Email", "First Name", "Last Name", "Created At", "Segment"])
-        for pref in queryset.select_related("user"):
-            writer.writerow(
-                [
-                    pref.user.email,
-                    pref.user.first_name,
-                    pref.user.last_name,
-                    (
-                        pref.created_at.strftime("%Y-%m-%d %H:%M")
-                        if hasattr(pref, "created_at")
-                        else ""
-                    ),
-                    segment_name,
-                ]
-            )
+        yield ["Email", "First Name", "Last Name", "Created At", "Segment"]
+        prefs = queryset.select_related("user")
+        for pref in prefs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                pref.user.email,
+                pref.user.first_name,
+                pref.user.last_name,
+                (
+                    pref.created_at.strftime("%Y-%m-%d %H:%M")
+                    if hasattr(pref, "created_at")
+                    else ""
+                ),
+                segment_name,
+            ]
+
+
+def _next_csv_chunk(rows, writer):
+    return "".join(writer.writerow(row) for row in islice(rows, EXPORT_CHUNK_SIZE))
+
 
+async def _stream_csv(rows):
+    # Served over ASGI, where Django would buffer a synchronous streaming
+    # iterator in full before sending it; pulling one chunk of rows per await
+    # keeps memory flat. thread_sensitive pins every chunk (and so the
+    # queryset's cursor) to the same thread.
+    writer = csv.writer(_Echo())
+    while True:
+        chunk = await sync_to_async(_next_csv_chunk, thread_sensitive=True)(
+            rows, writer
+        )
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_segment_csv(queryset, segment_key, segment_name):
+    """
+    Export segment users to CSV file.
+
+    Streamed: rows are read in chunks and written out as they arrive instead
+    of building the whole file in memory.
+    """
+    response = StreamingHttpResponse(
+        _stream_csv(_segment_csv_rows(queryset, segment_name)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="segment_{segment_key}_{timezone.now().strftime("%Y%m%d")}.csv"'
+    )
     return response
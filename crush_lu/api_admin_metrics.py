@@ -160,3 +160,128 @@ def gdpr_retention_sweep(request):
         {"status": "ok", "timestamp": started.isoformat()},
         status=202,
     )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def match_score_queue_sweep(request):
+    """POST /api/admin/match-score-queue/
+
+    Drain the Crush Connect MatchScore dirty-member queue (see the
+    ``drain_match_score_queue`` command). Idempotent — an empty queue is a
+    no-op, and members whose traits did not actually change are dequeued
+    without rescoring. Invoked every 15 minutes by the ``MatchScoreQueue``
+    Azure Function timer.
+    """
+    if not _authenticate_admin_request(request):
+        return _unauthorized(request)
+
+    started = timezone.now()
+    buffer = StringIO()
+    try:
+        call_command("drain_match_score_queue", stdout=buffer, stderr=buffer)
+    except CommandError:
+        logger.exception("[match_score_queue] Command error")
+        return JsonResponse({"error": "command_error"}, status=500)
+    except Exception:  # noqa: BLE001
+        logger.exception("[match_score_queue] Unhandled error")
+        return JsonResponse({"error": "internal_error"}, status=500)
+
+    logger.info("[match_score_queue] completed: %s", buffer.getvalue().strip())
+    return JsonResponse(
+        {"status": "ok", "timestamp": started.isoformat()},
+        status=202,
+    )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def activity_flush_sweep(request):
+    """POST /api/admin/activity-flush/
+
+    Apply the activity events UserActivityMiddleware buffered in write-behind
+    mode (see the ``flush_user_activity`` command). Idempotent — an empty
+    buffer is a no-op, and an overlapping run backs off on the flush lock.
+    Invoked every 5 minutes by the ``ActivityFlush`` Azure Function timer.
+    """
+    if not _authenticate_admin_request(request):
+        return _unauthorized(request)
+
+    started = timezone.now()
+    buffer = StringIO()
+    try:
+        call_command("flush_user_activity", stdout=buffer, stderr=buffer)
+    except CommandError:
+        logger.exception("[activity_flush] Command error")
+        return JsonResponse({"error": "command_error"}, status=500)
+    except Exception:  # noqa: BLE001
+        logger.exception("[activity_flush] Unhandled error")
+        return JsonResponse({"error": "internal_error"}, status=500)
+
+    logger.info("[activity_flush] completed: %s", buffer.getvalue().strip())
+    return JsonResponse(
+        {"status": "ok", "timestamp": started.isoformat()},
+        status=202,
+    )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def connect_pool_reconcile(request):
+    """POST /api/admin/connect-pool-reconcile/
+
+    Rebuild the materialized Crush Connect pool (see the
+    ``reconcile_connect_pool`` command). Idempotent — only rows that drifted
+    from the source tables are written. Invoked nightly by the
+    ``ConnectPoolReconcile`` Azure Function timer.
+    """
+    if not _authenticate_admin_request(request):
+        return _unauthorized(request)
+
+    started = timezone.now()
+    buffer = StringIO()
+    try:
+        call_command("reconcile_connect_pool", stdout=buffer, stderr=buffer)
+    except CommandError:
+        logger.exception("[connect_pool_reconcile] Command error")
+        return JsonResponse({"error": "command_error"}, status=500)
+    except Exception:  # noqa: BLE001
+        logger.exception("[connect_pool_reconcile] Unhandled error")
+        return JsonResponse({"error": "internal_error"}, status=500)
+
+    logger.info("[connect_pool_reconcile] completed: %s", buffer.getvalue().strip())
+    return JsonResponse(
+        {"status": "ok", "timestamp": started.isoformat()},
+        status=202,
+    )
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def daily_drop_pregenerate(request):
+    """POST /api/admin/daily-drop-pregenerate/
+
+    Build the next Crush Connect Daily Drop for every eligible member (see the
+    ``pregenerate_daily_drops`` command). Idempotent — members who already
+    have that Drop are skipped. Invoked nightly, before the 06:00 unlock, by
+    the ``DailyDropPregenerate`` Azure Function timer.
+    """
+    if not _authenticate_admin_request(request):
+        return _unauthorized(request)
+
+    started = timezone.now()
+    buffer = StringIO()
+    try:
+        call_command("pregenerate_daily_drops", stdout=buffer, stderr=buffer)
+    except CommandError:
+        logger.exception("[daily_drop_pregenerate] Command error")
+        return JsonResponse({"error": "command_error"}, status=500)
+    except Exception:  # noqa: BLE001
+        logger.exception("[daily_drop_pregenerate] Unhandled error")
+        return JsonResponse({"error": "internal_error"}, status=500)
+
+    logger.info("[daily_drop_pregenerate] completed: %s", buffer.getvalue().strip())
+    return JsonResponse(
+        {"status": "ok", "timestamp": started.isoformat()},
+        status=202,
+    )
@@ -5,6 +5,7 @@ Called by Azure Function on scheduled basis
 Secured with Bearer token authentication
 """
 
+import json
 import logging
 import threading
 from django.conf import settings
@@ -51,6 +52,11 @@ def sync_contacts_endpoint(request):
         "options": {}
     }
 
+    A pass left unfinished (throttling, worker restart) is resumed from its
+    checkpoint. Options: {"restart": true} starts over from the first
+    profile; {"resume_only": true} only continues an unfinished pass, which
+    is what the catch-up timers send.
+
     Response:
     {
         "success": true,
@@ -95,17 +101,30 @@ def sync_contacts_endpoint(request):
             'error': 'Outlook contact sync is not operational'
         }, status=500)
 
+    try:
+        options = json.loads(request.body or b"{}").get("options") or {}
+    except (ValueError, AttributeError):
+        options = {}
+    if not isinstance(options, dict):
+        options = {}
+    restart = options.get("restart") is True
+    resume_only = options.get("resume_only") is True
+
     # Run sync in background thread to avoid App Service request timeout (230s)
     def _run_sync():
         try:
             import django
             django.db.connections.close_all()
             logger.info("Starting scheduled Outlook contact sync via admin API (background)")
-            stats = service.sync_all_profiles(dry_run=False)
+            stats = service.sync_all_profiles(
+                dry_run=False, restart=restart, resume_only=resume_only
+            )
             logger.info(
-                f"Scheduled contact sync completed: "
+                f"Scheduled contact sync {'completed' if stats['complete'] else 'paused'}: "
                 f"total={stats['total']}, synced={stats['synced']}, "
-                f"skipped={stats['skipped']}, errors={stats['errors']}"
+                f"unchanged={stats['unchanged']}, skipped={stats['skipped']}, "
+                f"errors={stats['errors']}, resumed_from={stats['resumed_from']}, "
+                f"stopped={stats['stopped'] or '-'}"
             )
         except Exception as e:
             logger.error(f"Error during scheduled contact sync: {e}", exc_info=True)
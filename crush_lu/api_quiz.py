@@ -354,6 +354,11 @@ def score_table(request, quiz_id):
     # before the all-tables-scored reveal fires). Once locked, returns 409.
     from django.db import transaction
 
+    from crush_lu.services.quiz_leaderboard import (
+        apply_score_deltas,
+        individual_score_deltas,
+    )
+
     with transaction.atomic():
         # Same lock, same order as the consumer's twin and the rotation
         # helpers (#721). This path already had its seat read and its
@@ -442,6 +447,10 @@ def score_table(request, quiz_id):
                 )
             )
 
+        user_deltas = individual_score_deltas(
+            quiz.pk, question.pk, rotation_users, points, overwrite=not created
+        )
+
         # On first score, get_or_create. On re-score, update existing
         # IndividualScore rows so leaderboards reflect the corrected
         # state.
@@ -470,6 +479,16 @@ def score_table(request, quiz_id):
                     },
                 )
 
+        # Under the quiz row lock, which orders the event against rebuilds.
+        full_points = question.points * (2 if question.round.is_bonus else 1)
+        if is_correct:
+            table_delta = full_points
+        else:
+            table_delta = 0 if created else -full_points
+        apply_score_deltas(
+            quiz.pk, table.table_number, table_delta, user_deltas=user_deltas
+        )
+
     total_tables = QuizTable.objects.filter(quiz=quiz).count()
     scored_count = TableRoundScore.objects.filter(
         quiz=quiz, question=question
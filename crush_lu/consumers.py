@@ -1405,6 +1405,10 @@ class QuizConsumer(AsyncJsonWebsocketConsumer):
             QuizTableMembership,
             TableRoundScore,
         )
+        from crush_lu.services.quiz_leaderboard import (
+            apply_score_deltas,
+            individual_score_deltas,
+        )
 
         from django.db import transaction
 
@@ -1525,6 +1529,10 @@ class QuizConsumer(AsyncJsonWebsocketConsumer):
                     )
                 )
 
+            user_deltas = individual_score_deltas(
+                quiz.pk, question.pk, rotation_users, points, overwrite=not created
+            )
+
             # On a re-score, refresh existing IndividualScore rows so
             # leaderboards and per-user scores reflect the corrected state.
             # On the first scoring, get_or_create avoids overwriting
@@ -1555,6 +1563,16 @@ class QuizConsumer(AsyncJsonWebsocketConsumer):
                         },
                     )
 
+            # Under the quiz row lock, which orders the event against rebuilds.
+            full_points = question.points * (2 if question.round.is_bonus else 1)
+            if is_correct:
+                table_delta = full_points
+            else:
+                table_delta = 0 if created else -full_points
+            apply_score_deltas(
+                quiz.pk, table.table_number, table_delta, user_deltas=user_deltas
+            )
+
         # Check if all tables have been scored for this question
         total_tables = QuizTable.objects.filter(quiz=quiz).count()
         scored_count = TableRoundScore.objects.filter(
@@ -1740,7 +1758,12 @@ class QuizConsumer(AsyncJsonWebsocketConsumer):
     @database_sync_to_async
     def score_answer(self, user_id, question_id, answer):
         """Legacy: individual answer scoring for non-quiz-night events."""
-        from crush_lu.models.quiz import IndividualScore, QuizQuestion
+        from django.db import transaction
+
+        from crush_lu.models.quiz import IndividualScore, QuizEvent, QuizQuestion
+        from crush_lu.services.quiz_leaderboard import (
+            apply_score_deltas,
+        )
 
         try:
             question = QuizQuestion.objects.get(
@@ -1776,17 +1799,23 @@ class QuizConsumer(AsyncJsonWebsocketConsumer):
 
         points = question.points if is_correct else 0
 
-        # Atomic get_or_create to prevent race conditions on duplicate submissions
-        _obj, created = IndividualScore.objects.get_or_create(
-            quiz_id=self.quiz_id,
-            user_id=user_id,
-            question_id=question_id,
-            defaults={
-                "answer": answer,
-                "is_correct": is_correct,
-                "points_earned": points,
-            },
-        )
+        with transaction.atomic():
+            # The quiz row lock the table scorers take, which orders this
+            # event against leaderboard rebuilds the way it orders theirs.
+            QuizEvent.objects.select_for_update().filter(pk=self.quiz_id).first()
+            # Atomic get_or_create to prevent race conditions on duplicate submissions
+            _obj, created = IndividualScore.objects.get_or_create(
+                quiz_id=self.quiz_id,
+                user_id=user_id,
+                question_id=question_id,
+                defaults={
+                    "answer": answer,
+                    "is_correct": is_correct,
+                    "points_earned": points,
+                },
+            )
+            if created:
+                apply_score_deltas(self.quiz_id, user_deltas={user_id: points})
         if not created:
             return {"already_answered": True}
 
@@ -1847,62 +1876,12 @@ def build_leaderboard(quiz_id):
     Module level so a plain HTTP view can build the same payload the consumer
     broadcasts — an undo that removes someone's IndividualScore rows changes
     what everyone in the room is looking at, not just the people at their
-    table, and `views_checkin` has no consumer to ask.
+    table, and `views_checkin` has no consumer to ask. Served from the cached
+    projection in services.quiz_leaderboard.
     """
-    from django.db.models import Sum
+    from crush_lu.services.quiz_leaderboard import get_leaderboard
 
-    from crush_lu.models.quiz import IndividualScore, QuizTable
-
-    tables = QuizTable.objects.filter(quiz_id=quiz_id).order_by("table_number")
-    leaderboard = []
-    for table in tables:
-        score = table.get_total_score()
-        leaderboard.append(
-            {
-                "table_number": table.table_number,
-                "total_score": score,
-            }
-        )
-    leaderboard.sort(key=lambda x: x["total_score"], reverse=True)
-
-    # Individual top scorers (using display_name for privacy)
-    from crush_lu.models import CrushProfile
-
-    top_individuals = (
-        IndividualScore.objects.filter(quiz_id=quiz_id)
-        .values("user_id")
-        .annotate(total=Sum("points_earned"))
-        .order_by("-total")[:10]
-    )
-
-    individual_scores = []
-    for entry in top_individuals:
-        try:
-            profile = CrushProfile.objects.get(user_id=entry["user_id"])
-            name = profile.display_name
-            has_photo = bool(getattr(profile, "photo_1", None))
-            photo_url = (
-                f"/api/quiz/photo/{entry['user_id']}/" if has_photo else None
-            )
-        except CrushProfile.DoesNotExist:
-            name = "Anonymous"
-            photo_url = None
-        from crush_lu.views_quiz import _member_color, _member_initials
-
-        individual_scores.append(
-            {
-                "display_name": name,
-                "total_score": entry["total"],
-                "initials": _member_initials(name),
-                "color": _member_color(name),
-                "photo_url": photo_url,
-            }
-        )
-
-    return {
-        "tables": leaderboard,
-        "individuals": individual_scores,
-    }
+    return get_leaderboard(quiz_id)
 
 
 class CheckinConsumer(AsyncJsonWebsocketConsumer):
@@ -6,24 +6,17 @@ These make variables available to all templates
 import logging
 import time
 
-from datetime import timedelta
-from django.db.models import Q
-from django.utils import timezone
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 from django.utils.translation import gettext_lazy as _
 from .models import (
-    EventConnection,
     CrushProfile,
     SpecialUserExperience,
     JourneyProgress,
     ProfileSubmission,
     EventRegistration,
-    CrushSpark,
-    MeetupEvent,
 )
 
-from crush_lu.models.events import SEAT_HOLDING_STATUSES
-
 logger = logging.getLogger(__name__)
 
 # Simple in-memory cache for site config (avoids DB hit on every request)
@@ -97,111 +90,36 @@ def crush_user_context(request):
     }
 
     def _fill_authenticated_context():
-        # Runs the authenticated-user DB queries that populate the navbar and
-        # badge counts. Kept as a nested closure so the guard wrapper below can
-        # catch any transient backend fault (DB error, or the broken async
-        # sync-executor under the uvicorn worker) without re-indenting the
-        # whole block. It mutates the enclosing ``context`` dict in place.
-        # Email-verification flag — drives the verification banner in the
-        # onboarding stepper. We rely on allauth's EmailAddress.verified;
-        # social-login users always have at least one verified address
-        # because providers we trust (Google, Microsoft, Apple, LuxID,
-        # Facebook) are listed in SOCIALACCOUNT_EMAIL_VERIFIED_PROVIDERS.
-        try:
-            from allauth.account.models import EmailAddress
-
-            context["email_verified"] = EmailAddress.objects.filter(
-                user=request.user, verified=True
-            ).exists()
-        except Exception:
-            # Allauth not installed in some test contexts — assume verified
-            # to avoid spurious banners.
-            context["email_verified"] = True
-
-        # Blocked counterparts are hidden from every connection surface; reuse the
-        # same id set so badge counts can't advertise a pair the lists now hide.
-        from .services.blocking import blocked_user_ids
-
-        blocked_ids = blocked_user_ids(request.user)
-
-        # Connection count for badge. Excludes blocked counterparts — a `shared`
-        # connection isn't terminated on block (contact was already exchanged),
-        # so without this it would keep inflating the active count while
-        # my_connections hides it. Pre-`shared` crush leads are private: the
-        # recipient's badge must not increment the moment a crush is declared
-        # (or when the coach starts review), and the crusher's lead is not a
-        # connection yet — it renders as a neutral lead, not a connection.
-        connection_count = (
-            EventConnection.objects.filter(
-                Q(requester=request.user) | Q(recipient=request.user),
-                status__in=["accepted", "coach_reviewing", "coach_approved", "shared"],
-            )
-            .excluding_unshared_crushes()
-            .exclude(Q(requester_id__in=blocked_ids) | Q(recipient_id__in=blocked_ids))
-            .count()
-        )
-
-        # Pending connection requests (received). Exclude blocked requesters so
-        # the nav/dashboard badge can't advertise a request the page itself hides
-        # (defence-in-depth; blocking also declines the underlying connection).
-        # Crush leads are never pending-visible to the recipient.
-        pending_requests_count = (
-            EventConnection.objects.filter(recipient=request.user, status="pending")
-            .exclude(flow=EventConnection.FLOW_CRUSH)
-            .exclude(requester_id__in=blocked_ids)
-            .count()
+        # Populates the navbar and badge counts from the member's cached
+        # navigation state (services.nav_badges): one cache read on a warm
+        # page, the full set of queries only when the entry was dropped by a
+        # signal or expired. Kept as a nested closure so the guard wrapper
+        # below can catch any transient backend fault (DB error, or the broken
+        # async sync-executor under the uvicorn worker). It mutates the
+        # enclosing ``context`` dict in place.
+        from .services.nav_badges import nav_badges
+
+        user = request.user
+        state = nav_badges(user)
+
+        context["email_verified"] = state["email_verified"]
+        context["connection_count"] = state["connection_count"]
+        context["pending_requests_count"] = state["pending_requests_count"]
+        context["actionable_sparks_count"] = state["actionable_sparks_count"]
+        context["connect_pending_sparks_count"] = state["connect_pending_sparks_count"]
+
+        # Model instances are not cached: pages that use them get lazy
+        # objects that query on first access, the navbar itself never does.
+        context["profile"] = (
+            SimpleLazyObject(lambda: CrushProfile.objects.filter(user=user).first())
+            if state["has_profile"]
+            else None
         )
-
-        context["connection_count"] = connection_count
-        context["pending_requests_count"] = pending_requests_count
-
-        # Sparks needing action (approved by coach, waiting for journey creation)
-        actionable_sparks_count = CrushSpark.objects.filter(
-            sender=request.user,
-            status__in=["coach_approved", "coach_assigned"],
-        ).count()
-        context["actionable_sparks_count"] = actionable_sparks_count
-
-        # Crush Connect: pending received Sparks — drives the Connect nav badge
-        # (sub-nav, navbar menu, mobile bottom-nav). Computed only when the
-        # Connect nav is actually visible (onboarded membership, or staff) so it
-        # stays off every other page's query budget.
-        connect_pending_sparks_count = 0
-        try:
-            from crush_lu.connect_phase import candidate_access_open
-
-            # Candidates receive Sparks too, so the badge follows candidate access
-            # (open in the beta), not just the full launch flag.
-            connect_open = candidate_access_open()
-            membership = getattr(request.user, "crush_connect_membership", None)
-            nav_visible = request.user.is_staff or (
-                connect_open and membership is not None and membership.is_onboarded
-            )
-            if nav_visible:
-                from .models import CuriositySpark
-
-                # Reuse the already-computed blocked_ids (finding H4 — this was
-                # a duplicate blocked_user_ids query on every authenticated page).
-                connect_pending_sparks_count = (
-                    CuriositySpark.objects.filter(
-                        recipient=request.user, status="pending"
-                    )
-                    .exclude(sender_id__in=blocked_ids)
-                    .count()
-                )
-        except Exception:
-            connect_pending_sparks_count = 0
-        context["connect_pending_sparks_count"] = connect_pending_sparks_count
-
-        # Profile submission status for visual indicators
-        profile_submission = None
-        profile = CrushProfile.objects.filter(user=request.user).first()
-        context["profile"] = profile
         # Template-safe existence flag for base.html (see _SAFE_NAV_DEFAULTS):
         # avoids a bare {% if user.crushprofile %} reverse lookup in the nav.
-        context["nav_has_profile"] = profile is not None
-        if profile:
-            verification_status = profile.verification_status
+        context["nav_has_profile"] = state["has_profile"]
+        if state["has_profile"]:
+            verification_status = state["verification_status"]
             context["profile_completion_status"] = (
                 verification_status  # backward compat alias
             )
@@ -228,116 +146,60 @@ def crush_user_context(request):
             # a verified-but-is_approved=False profile that those views would
             # then bounce/403 — is_approved is the consistent predicate until
             # those gates migrate off the legacy flag.
-            context["profile_is_approved"] = profile.is_approved
-
-            # Expired submissions are closed-out pre-pivot reviews — the navbar
-            # must not resurrect "needs action" / coach labels for them, not
-            # even from an older non-expired row.
-            profile_submission = ProfileSubmission.latest_for_profile(
-                profile, select_related=("coach__user",)
-            )
-
-            if profile_submission:
-                context["profile_submission"] = profile_submission
-                context["profile_status"] = profile_submission.status
-                context["profile_needs_action"] = profile_submission.status in (
+            context["profile_is_approved"] = state["profile_is_approved"]
+
+            submission_id = state["submission_id"]
+            if submission_id:
+                context["profile_submission"] = SimpleLazyObject(
+                    lambda: ProfileSubmission.objects.select_related(
+                        "coach__user"
+                    ).get(pk=submission_id)
+                )
+                context["profile_status"] = state["submission_status"]
+                context["profile_needs_action"] = state["submission_status"] in (
                     "revision",
                     "recontact_coach",
                 )
-
-                # Coach name for pending review / recontact navbar display
-                if profile_submission.coach and profile_submission.status in (
-                    "pending",
-                    "recontact_coach",
-                ):
-                    context["assigned_coach_name"] = (
-                        profile_submission.coach.user.first_name
-                    )
+                if state["assigned_coach_name"] is not None:
+                    context["assigned_coach_name"] = state["assigned_coach_name"]
         else:
             # No profile yet - show step 0
             context["profile_completion_step"] = 0
             context["profile_step_label"] = _("Get started")
 
-        # Upcoming events for user (includes ongoing events until end_time)
-        # Use a generous cutoff to include events that may still be ongoing,
-        # then filter precisely in Python. This avoids timedelta * F()
-        # which is not supported on SQLite. The cutoff is the enforced max
-        # event duration, so a still-live event is never dropped from the nav
-        # regardless of its length (see MeetupEvent.live_lookback_cutoff).
-        now = timezone.now()
-        generous_cutoff = MeetupEvent.live_lookback_cutoff(now)
-        upcoming_registrations = list(
-            EventRegistration.objects.filter(
-                user=request.user,
-                event__date_time__gte=generous_cutoff,
-                status__in=[*SEAT_HOLDING_STATUSES, "waitlist"],
+        registration_ids = state["upcoming_registration_ids"]
+        context["upcoming_events"] = (
+            SimpleLazyObject(
+                lambda: list(
+                    EventRegistration.objects.filter(pk__in=registration_ids)
+                    .select_related("event")
+                    .order_by("event__date_time")
+                )
             )
-            .select_related("event")
-            .order_by("event__date_time")
-        )
-        # Filter precisely: keep events whose end_time hasn't passed, and drop
-        # any whose event has since been cancelled or unpublished. my_events
-        # skips those rows outright, so counting them here made the nav promise
-        # personal events that the page it links to would not show -- a member
-        # whose only seat was on a cancelled event landed on an empty page.
-        upcoming_registrations = [
-            reg
-            for reg in upcoming_registrations
-            if reg.event.is_published
-            and not reg.event.is_cancelled
-            and reg.event.date_time + timedelta(minutes=reg.event.duration_minutes or 0)
-            >= now
-        ][:5]
-
-        context["upcoming_events"] = upcoming_registrations
-        context["upcoming_events_count"] = len(upcoming_registrations)
-
-        # Coach flag drives the coach navigation branch in base.html. Compute
-        # it here (inside the guard) so the template never dereferences the
-        # crushcoach reverse relation directly — that lookup re-raises under a
-        # broken backend and would 500 the page even with this processor
-        # guarded. Resolve once and reuse (the reverse OneToOne caches on the
-        # instance, so this is a single query).
-        nav_is_active_coach = (
-            hasattr(request.user, "crushcoach") and request.user.crushcoach.is_active
+            if registration_ids
+            else []
         )
-        context["nav_is_active_coach"] = nav_is_active_coach
+        context["upcoming_events_count"] = len(registration_ids)
 
-        # Pending screening calls count for coaches
+        nav_is_active_coach = state["is_active_coach"]
+        context["nav_is_active_coach"] = nav_is_active_coach
         if nav_is_active_coach:
-            pending_screening_count = ProfileSubmission.objects.filter(
-                coach=request.user.crushcoach,
-                status__in=["pending", "recontact_coach"],
-                review_call_completed=False,
-            ).count()
-            context["pending_screening_count"] = pending_screening_count
-
+            context["pending_screening_count"] = state["pending_screening_count"]
             # Count pending invitations to review (future feature)
             context["pending_invitations_count"] = 0
 
-        # Check for special journey experience
-        # Prioritize linked_user (gifts), then fall back to name match (legacy)
-        special_experience = SpecialUserExperience.objects.filter(
-            Q(is_active=True)
-            & (
-                Q(linked_user=request.user)  # Direct link (gifts)
-                | Q(
-                    first_name__iexact=request.user.first_name,
-                    last_name__iexact=request.user.last_name,
-                    linked_user__isnull=True,  # Only name-match if no linked_user
-                )
-            )
-        ).first()
-
-        if special_experience:
+        special_experience_id = state["special_experience_id"]
+        if special_experience_id:
             context["has_special_journey"] = True
-            context["special_experience"] = special_experience
-
-            # Check if journey is already started
-            journey_progress = JourneyProgress.objects.filter(user=request.user).first()
-            context["journey_started"] = journey_progress is not None
-            if journey_progress:
-                context["journey_progress"] = journey_progress
+            context["special_experience"] = SimpleLazyObject(
+                lambda: SpecialUserExperience.objects.get(pk=special_experience_id)
+            )
+            journey_progress_id = state["journey_progress_id"]
+            context["journey_started"] = journey_progress_id is not None
+            if journey_progress_id:
+                context["journey_progress"] = SimpleLazyObject(
+                    lambda: JourneyProgress.objects.get(pk=journey_progress_id)
+                )
 
     if request.user.is_authenticated:
         try:
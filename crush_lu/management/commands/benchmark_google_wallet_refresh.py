@@ -0,0 +1,129 @@
+"""
+Measure Google Wallet object refresh throughput against a local stand-in API.
+
+Starts a throwaway HTTP server on 127.0.0.1 that answers every PATCH with 200
+after a configurable delay (a stand-in for the Wallet Objects API), then sends
+the same prepared payload for N in-memory objects twice: once one PATCH at a
+time, as update_all_google_wallet_passes used to, once through the concurrent
+pipeline it uses now. Nothing is read from or written to the database and
+neither Google endpoint is contacted.
+
+The stand-in speaks plain-text HTTP/1.1, so the concurrent run spreads over up
+to ``--concurrency`` keep-alive connections here; against Google, where TLS
+negotiates HTTP/2, the same requests share one multiplexed connection.
+
+    python manage.py benchmark_google_wallet_refresh                 # 200 objects, 80ms
+    python manage.py benchmark_google_wallet_refresh --objects 1000 --latency-ms 120
+    python manage.py benchmark_google_wallet_refresh --skip-serial   # concurrent only
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+CLASS_ID = "3388000000000000000.crush-benchmark"
+
+
+def _stand_in_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def do_PATCH(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _fake_job(pk):
+    """An unsaved holder and a payload shaped like _build_generic_object_payload's."""
+    object_id = f"3388000000000000000.crush-{pk}-{pk:016x}"
+    profile = SimpleNamespace(
+        pk=pk, user_id=pk, google_wallet_object_id=object_id, preferred_language="en"
+    )
+    payload = {
+        "id": object_id,
+        "classId": CLASS_ID,
+        "state": "active",
+        "header": {"defaultValue": {"language": "en-US", "value": "Meet & get rewarded!"}},
+        "subheader": {"defaultValue": {"language": "en-US", "value": f"Member {pk}"}},
+        "textModulesData": [
+            {"id": "points_counter", "header": "POINTS", "body": f"{pk * 10:,}"},
+            {"id": "next_event", "header": "Next Event", "body": "Speed Dating\nJan 15"},
+        ],
+        "barcode": {"type": "QR_CODE", "value": f"https://crush.lu/r/CODE{pk}/"},
+        "hexBackgroundColor": "#9B59B6",
+    }
+    return profile, payload, ""
+
+
+class Command(BaseCommand):
+    help = "Benchmark serial vs concurrent Google Wallet PATCHes against a local stand-in."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--objects", type=int, default=200)
+        parser.add_argument(
+            "--latency-ms",
+            type=int,
+            default=80,
+            help="Stand-in Wallet API response delay per request.",
+        )
+        parser.add_argument("--concurrency", type=int, default=None)
+        parser.add_argument(
+            "--skip-serial",
+            action="store_true",
+            help="Only run the concurrent pipeline.",
+        )
+
+    def handle(self, *args, **options):
+        from crush_lu.wallet import google_api
+
+        objects = options["objects"]
+        concurrency = options["concurrency"] or google_api.GOOGLE_WALLET_PATCH_CONCURRENCY
+        server = _stand_in_server(options["latency_ms"] / 1000)
+        jobs = [_fake_job(pk) for pk in range(1, objects + 1)]
+        self.stdout.write(
+            f"{objects} object(s), {options['latency_ms']}ms stand-in latency, "
+            f"concurrency {concurrency}"
+        )
+
+        api_base = google_api.GOOGLE_WALLET_API_BASE
+        google_api.GOOGLE_WALLET_API_BASE = (
+            f"http://127.0.0.1:{server.server_address[1]}/walletobjects/v1"
+        )
+        try:
+            if not options["skip_serial"]:
+                self._run(google_api, "serial", jobs, 1)
+            self._run(google_api, "concurrent", jobs, concurrency)
+        finally:
+            google_api.GOOGLE_WALLET_API_BASE = api_base
+            server.shutdown()
+            server.server_close()
+
+    def _run(self, google_api, label, jobs, concurrency):
+        started = time.perf_counter()
+        with google_api._wallet_client(concurrency) as client:
+            outcomes = google_api._patch_concurrently(
+                jobs, CLASS_ID, client, lambda: "benchmark-token", concurrency
+            )
+        elapsed = time.perf_counter() - started
+        updated = sum(1 for outcome, _, _ in outcomes if outcome == "updated")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>10}: {updated}/{len(jobs)} updated in {elapsed:.2f}s "
+                f"({len(jobs) / elapsed:.0f} objects/s)"
+            )
+        )
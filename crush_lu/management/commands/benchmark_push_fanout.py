@@ -0,0 +1,144 @@
+"""
+Measure Web Push fan-out throughput against a local stand-in push service.
+
+Starts a throwaway HTTP server on 127.0.0.1 that answers every POST with 201
+after a configurable delay (a stand-in for FCM / Mozilla autopush latency),
+then sends the same notification to N in-memory subscriptions twice: once
+through the serial per-device ``pywebpush.webpush`` path, once through
+``deliver_push_batch``. Nothing is read from or written to the database and
+no real push service is contacted.
+
+    python manage.py benchmark_push_fanout                      # 200 devices, 50ms
+    python manage.py benchmark_push_fanout --devices 1000 --latency-ms 80
+    python manage.py benchmark_push_fanout --skip-serial        # batched only
+"""
+import base64
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.core.management.base import BaseCommand
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).strip(b"=").decode()
+
+
+def _fake_subscription(pk, endpoint):
+    """An unsaved subscription with real keys, so encryption cost is real."""
+    public = ec.generate_private_key(ec.SECP256R1()).public_key()
+    return SimpleNamespace(
+        pk=pk,
+        endpoint=endpoint,
+        p256dh_key=_b64(public.public_bytes(
+            serialization.Encoding.X962,
+            serialization.PublicFormat.UncompressedPoint,
+        )),
+        auth_key=_b64(os.urandom(16)),
+    )
+
+
+def _stand_in_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like a real push service
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Command(BaseCommand):
+    help = "Benchmark serial vs batched Web Push fan-out against a local stand-in."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--devices", type=int, default=200)
+        parser.add_argument(
+            "--latency-ms",
+            type=int,
+            default=50,
+            help="Stand-in push service response delay per request.",
+        )
+        parser.add_argument("--concurrency", type=int, default=None)
+        parser.add_argument(
+            "--skip-serial",
+            action="store_true",
+            help="Only run the batched sender.",
+        )
+
+    def handle(self, *args, **options):
+        from py_vapid import Vapid
+        from pywebpush import webpush
+
+        from crush_lu.push_notifications import (
+            PUSH_BATCH_CONCURRENCY,
+            PUSH_SENT,
+            build_push_payload,
+            deliver_push_batch,
+        )
+
+        devices = options["devices"]
+        concurrency = options["concurrency"] or PUSH_BATCH_CONCURRENCY
+        server = _stand_in_server(options["latency_ms"] / 1000)
+        endpoint = f"http://127.0.0.1:{server.server_address[1]}/push"
+
+        vapid = Vapid()
+        vapid.generate_keys()
+        subscriptions = [
+            _fake_subscription(pk, f"{endpoint}/{pk}") for pk in range(1, devices + 1)
+        ]
+        payload = build_push_payload("Benchmark", "Hello from the push benchmark")
+        self.stdout.write(
+            f"{devices} device(s), {options['latency_ms']}ms stand-in latency, "
+            f"concurrency {concurrency}"
+        )
+
+        try:
+            if not options["skip_serial"]:
+                started = time.perf_counter()
+                for sub in subscriptions:
+                    webpush(
+                        subscription_info={
+                            "endpoint": sub.endpoint,
+                            "keys": {"p256dh": sub.p256dh_key, "auth": sub.auth_key},
+                        },
+                        data=json.dumps(payload),
+                        vapid_private_key=vapid,
+                        vapid_claims={"sub": "mailto:benchmark@crush.lu"},
+                    )
+                self._report("serial", devices, devices, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            outcomes = deliver_push_batch(
+                [(sub, payload) for sub in subscriptions],
+                vapid=vapid,
+                concurrency=concurrency,
+            )
+            delivered = sum(1 for outcome in outcomes.values() if outcome == PUSH_SENT)
+            self._report("batched", devices, delivered, time.perf_counter() - started)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _report(self, label, devices, delivered, elapsed):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>8}: {delivered}/{devices} delivered in {elapsed:.2f}s "
+                f"({devices / elapsed:.0f} pushes/s)"
+            )
+        )
@@ -1,27 +1,47 @@
 """
-Management command to clean up orphaned blob storage folders.
+Management command to clean up orphaned blobs in storage.
 
-When users are deleted, their storage folders (users/{user_id}/) may remain
-in Azure Blob Storage. This command identifies and removes those orphaned folders.
+Diffs every blob under the scanned prefixes (default: users/) against the
+file names the database refers to, across all apps, and deletes the blobs
+nothing refers to: folders of deleted users, replaced photos, files of
+deleted rewards and gifts. Listings run concurrently and deletions use Blob
+Batch requests; see crush_lu/services/orphan_storage.py.
+
+An interrupted run resumes from its checkpoint file.
 
 Usage:
-    # Dry run - see what would be deleted
-    python manage.py cleanup_orphan_storage --dry-run
+    # Dry run - see what would be deleted, with a CSV of every orphan
+    python manage.py cleanup_orphan_storage --dry-run --report orphans.csv
 
-    # Actually delete orphaned folders
+    # Actually delete orphaned blobs
     python manage.py cleanup_orphan_storage
 
-    # Verbose output
+    # Discard a previous run's checkpoint and scan everything again
+    python manage.py cleanup_orphan_storage --restart
+
+    # Verbose output (lists every orphan)
     python manage.py cleanup_orphan_storage --dry-run -v 2
+
+Local testing against Azurite: set USE_AZURITE=true (see settings.py).
 """
 
+import csv
+import os
+import tempfile
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
-from crush_lu.storage import list_user_storage_folders, delete_user_storage
+
+from crush_lu.services.orphan_storage import (
+    DEFAULT_MIN_AGE,
+    DEFAULT_PREFIXES,
+    DEFAULT_WORKERS,
+    OrphanStorageScanner,
+)
 
 
 class Command(BaseCommand):
-    help = 'Clean up orphaned blob storage folders for deleted users'
+    help = 'Clean up orphaned blobs that no database row refers to'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -29,6 +49,38 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be deleted without making changes',
         )
+        parser.add_argument(
+            '--prefix',
+            action='append',
+            dest='prefixes',
+            help=f'Blob name prefix to scan (repeatable, default: {", ".join(DEFAULT_PREFIXES)})',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=DEFAULT_MIN_AGE.total_seconds() / 3600,
+            help='Never treat blobs modified more recently as orphans (default: 24)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f'Concurrent listings (default: {DEFAULT_WORKERS})',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=os.path.join(tempfile.gettempdir(), 'cleanup_orphan_storage.json'),
+            help='Checkpoint file an interrupted run resumes from',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Discard the checkpoint and scan every partition again',
+        )
+        parser.add_argument(
+            '--report',
+            help='Write every orphan found to this CSV file',
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
@@ -37,75 +89,76 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN - No changes will be made\n'))
 
-        # Get all user IDs from storage
-        self.stdout.write('Scanning blob storage for user folders...')
-        storage_user_ids = list_user_storage_folders()
-
-        if not storage_user_ids:
-            self.stdout.write(self.style.SUCCESS('No user storage folders found.'))
-            return
-
-        self.stdout.write(f'Found {len(storage_user_ids)} user folder(s) in storage.\n')
-
-        # Get all existing user IDs from database
-        self.stdout.write('Checking database for existing users...')
-        db_user_ids = set(User.objects.values_list('id', flat=True))
-        self.stdout.write(f'Found {len(db_user_ids)} user(s) in database.\n')
-
-        # Find orphaned folders (in storage but not in DB)
-        orphan_user_ids = storage_user_ids - db_user_ids
-
-        if not orphan_user_ids:
-            self.stdout.write(self.style.SUCCESS(
-                'No orphaned storage folders found. All folders belong to existing users.'
-            ))
-            return
-
-        self.stdout.write(self.style.WARNING(
-            f'\nFound {len(orphan_user_ids)} orphaned folder(s):\n'
-        ))
-
-        deleted_count = 0
-        error_count = 0
-        total_blobs_deleted = 0
-
-        for user_id in sorted(orphan_user_ids):
-            if dry_run:
-                self.stdout.write(f'  Would delete: users/{user_id}/')
-                deleted_count += 1
-            else:
-                try:
-                    success, blobs_deleted = delete_user_storage(user_id)
-                    if success:
-                        deleted_count += 1
-                        total_blobs_deleted += blobs_deleted
-                        self.stdout.write(self.style.SUCCESS(
-                            f'  Deleted: users/{user_id}/ ({blobs_deleted} blob(s))'
-                        ))
-                    else:
-                        error_count += 1
-                        self.stdout.write(self.style.ERROR(
-                            f'  Failed: users/{user_id}/'
-                        ))
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(self.style.ERROR(
-                        f'  Error deleting users/{user_id}/: {str(e)}'
-                    ))
+        scanner = OrphanStorageScanner(
+            prefixes=options['prefixes'] or DEFAULT_PREFIXES,
+            min_age=timedelta(hours=options['min_age_hours']),
+            dry_run=dry_run,
+            checkpoint_path=options['checkpoint'],
+            workers=options['workers'],
+        )
+        if options['restart']:
+            scanner.clear_checkpoint()
+
+        def on_partition(result):
+            if verbosity >= 2 or result.orphans:
+                self.stdout.write(
+                    f'  {result.storage} {result.prefix}*: {result.scanned} blob(s), '
+                    f'{len(result.orphans)} orphan(s)'
+                )
+            if verbosity >= 2:
+                for blob in result.orphans:
+                    self.stdout.write(f'    {blob.name} ({blob.size} bytes)')
+
+        self.stdout.write('Scanning storage against database references...')
+        results = scanner.run(on_partition=on_partition)
+
+        if options['report']:
+            with open(options['report'], 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['storage', 'name', 'size', 'last_modified'])
+                for result in results:
+                    for blob in result.orphans:
+                        writer.writerow([
+                            result.storage, blob.name, blob.size,
+                            blob.last_modified.isoformat(),
+                        ])
+            self.stdout.write(f'Report written to {options["report"]}')
+
+        resumed = sum(1 for result in results if result.resumed)
+        scanned = sum(result.scanned for result in results)
+        orphans = sum(len(result.orphans) for result in results)
+        orphan_bytes = sum(result.orphan_bytes for result in results)
+        deleted = sum(result.deleted for result in results)
+        errors = sum(
+            len(result.orphans) - result.deleted
+            for result in results
+            if not result.resumed
+        )
 
         # Summary
         self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(
+            f'Referenced files: {len(scanner.index)}, blobs scanned: {scanned}'
+        )
+        if resumed:
+            self.stdout.write(
+                f'Resumed: {resumed} partition(s) were finished by an earlier run'
+            )
         if dry_run:
             self.stdout.write(self.style.WARNING(
-                f'Would delete {deleted_count} orphaned folder(s)'
+                f'Would delete {orphans} orphaned blob(s) '
+                f'({orphan_bytes / 1024 / 1024:.1f} MB)'
             ))
-            self.stdout.write(self.style.WARNING(
-                '\nDRY RUN - No changes were made'
-            ))
-            self.stdout.write('Run without --dry-run to delete the folders')
+            self.stdout.write(self.style.WARNING('\nDRY RUN - No changes were made'))
+            self.stdout.write('Run without --dry-run to delete the blobs')
         else:
             self.stdout.write(self.style.SUCCESS(
-                f'Deleted {deleted_count} orphaned folder(s) ({total_blobs_deleted} total blob(s))'
+                f'Deleted {deleted} orphaned blob(s) '
+                f'({orphan_bytes / 1024 / 1024:.1f} MB)'
+            ))
+            if errors:
+                self.stdout.write(self.style.ERROR(f'Errors: {errors}'))
+        if scanner.failed:
+            self.stdout.write(self.style.ERROR(
+                f'{scanner.failed} partition(s) failed; run again to resume'
             ))
-            if error_count:
-                self.stdout.write(self.style.ERROR(f'Errors: {error_count}'))
@@ -0,0 +1,52 @@
+"""
+Recompute MatchScores for Crush Connect members queued by a trait/profile save.
+
+Save paths for the scorer's inputs (membership traits and preferences, profile
+gender / date of birth / event languages / approval) stamp
+``MatchMemberState.dirty_since``; this command rescores only those members
+against the current pool. Members whose trait fingerprint is unchanged since
+their last recompute are dequeued without writing any MatchScore rows.
+Members who turned a year older since their last recompute are queued first,
+since age is a scoring input no save touches. Run
+from a dev shell, or let the Azure Function timer drive it via
+``/api/admin/match-score-queue/``.
+
+    python manage.py drain_match_score_queue               # whole queue
+    python manage.py drain_match_score_queue --limit 200   # oldest 200 only
+    python manage.py drain_match_score_queue --dry-run     # queue depth only
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Recompute match scores for members queued by trait changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Process at most this many queued members (oldest first).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the queue depth without recomputing anything.",
+        )
+
+    def handle(self, *args, **options):
+        from crush_lu.matching import drain_match_score_queue
+        from crush_lu.models import MatchMemberState
+
+        if options["dry_run"]:
+            depth = MatchMemberState.objects.filter(dirty_since__isnull=False).count()
+            self.stdout.write(f"{depth} member(s) queued for match score recompute")
+            return
+
+        result = drain_match_score_queue(limit=options.get("limit"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. {result['processed']} processed, "
+                f"{result['rescored']} rescored, {result['skipped']} unchanged, "
+                f"{result['scores']} score(s) written."
+            )
+        )
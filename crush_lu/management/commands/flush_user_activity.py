@@ -0,0 +1,52 @@
+"""
+Apply activity events buffered by UserActivityMiddleware in write-behind mode.
+
+With ``USER_ACTIVITY_WRITE_BEHIND`` on, requests only append an event to
+``crush_lu.services.activity_buffer``; this drains the buffer, coalesces the
+events per user and writes UserActivity / DailyUserActivity in bulk. Run from
+a dev shell, or let the Azure Function timer drive it via
+``/api/admin/activity-flush/``.
+
+    python manage.py flush_user_activity             # drain the buffer
+    python manage.py flush_user_activity --dry-run   # buffer depth only
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Apply buffered user activity events in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Events applied per transaction (default: FLUSH_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the buffer depth without applying anything.",
+        )
+
+    def handle(self, *args, **options):
+        from crush_lu.services.activity_buffer import (
+            FLUSH_BATCH_SIZE,
+            flush_activity_buffer,
+            pending_events,
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(f"{pending_events()} activity event(s) buffered")
+            return
+
+        result = flush_activity_buffer(limit=options.get("limit") or FLUSH_BATCH_SIZE)
+        if result["skipped"]:
+            self.stdout.write("Another flush is running; nothing done.")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. {result['events']} event(s) for {result['users']} user(s) "
+                f"in {result['batches']} batch(es), {result['days']} daily row(s) "
+                "touched."
+            )
+        )
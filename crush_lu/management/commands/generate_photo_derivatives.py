@@ -0,0 +1,88 @@
+"""
+Management command to build resized WebP/AVIF renditions of profile photos.
+
+New uploads get theirs from the CrushProfile post_save signal; this backfills
+photos uploaded before the pipeline existed and repairs any the background
+task missed. Safe to re-run: photos with up-to-date renditions are skipped
+(names are content-hashed, so --force rewrites nothing that is unchanged).
+
+    python manage.py generate_photo_derivatives --dry-run
+    python manage.py generate_photo_derivatives
+    python manage.py generate_photo_derivatives --user-id 42 --force
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from crush_lu.models import CrushProfile
+from crush_lu.services.photo_derivatives import (
+    photos_needing_derivatives,
+    refresh_photo_derivatives,
+)
+
+
+class Command(BaseCommand):
+    help = "Build resized WebP/AVIF renditions of profile photos (backfill)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the photos that need renditions without building them",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild renditions even for photos that have them",
+        )
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Process photos for a specific user ID only",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Profiles read per query (default: 100)",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        force = options["force"]
+
+        profiles = CrushProfile.objects.filter(
+            ~Q(photo_1="") | ~Q(photo_2="") | ~Q(photo_3="")
+        ).only("pk", "user_id", "photo_1", "photo_2", "photo_3", "photo_derivatives")
+        if options["user_id"]:
+            profiles = profiles.filter(user_id=options["user_id"])
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN - no changes will be made"))
+
+        stats = {"profiles": 0, "photos": 0, "errors": 0}
+        for profile in profiles.iterator(chunk_size=options["batch_size"]):
+            pending = photos_needing_derivatives(profile)
+            if not pending and not force:
+                continue
+            stats["profiles"] += 1
+            if dry_run:
+                self.stdout.write(
+                    f"  [DRY RUN] Would build user={profile.user_id}: "
+                    f"{', '.join(pending) or 'all (forced)'}"
+                )
+                continue
+            try:
+                stats["photos"] += refresh_photo_derivatives(profile.pk, force=force)
+            except Exception as e:
+                stats["errors"] += 1
+                self.stdout.write(
+                    self.style.ERROR(f"  Error for user={profile.user_id}: {e}")
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Profiles: {stats['profiles']}, "
+                f"photos built: {stats['photos']}, errors: {stats['errors']}"
+            )
+        )
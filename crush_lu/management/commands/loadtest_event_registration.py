@@ -0,0 +1,259 @@
+"""
+Fire concurrent registrations at one event and check nothing was oversold.
+
+Creates a throwaway event, unpublished so it stays off every listing
+(event_register does not require publishing), and ``--members`` members with
+profiles, logs each one in on its own test Client, and releases them together
+from a barrier so every POST to event_register lands at once. Afterwards the
+seat-holding registrations are compared with the event's caps — in total,
+for non-premium members against the public capacity, and per gender pool with
+``--gender-caps`` — and the command fails if any cap was exceeded or a request
+errored. Everything it created is deleted again, however the run ends.
+
+LOCAL-ONLY: refuses to run when DEBUG is False. Runs against the configured
+database, which must allow concurrent writers: on PostgreSQL this measures
+the admission path, on SQLite mostly its file lock. With EVENT_SEAT_INVENTORY
+on admission goes through crush_lu.services.seat_inventory; ``--legacy``
+forces the event-row lock for comparison, ``--inventory`` forces the
+inventory on.
+
+    python manage.py loadtest_event_registration                       # 300 members, 40 seats
+    python manage.py loadtest_event_registration --members 600 --capacity 100 --gender-caps
+    python manage.py loadtest_event_registration --premium-seats 5 --legacy
+"""
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+GENDERS = ["M", "F", "NB"]
+
+
+class Command(BaseCommand):
+    help = "Load-test event registration with concurrent members and check for oversell."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=300)
+        parser.add_argument("--capacity", type=int, default=40)
+        parser.add_argument(
+            "--premium-seats",
+            type=int,
+            default=0,
+            help="Reserved premium seats; one member in ten gets a coach.",
+        )
+        parser.add_argument(
+            "--gender-caps",
+            action="store_true",
+            help="Split the capacity into per-gender caps.",
+        )
+        parser.add_argument("--threads", type=int, default=100)
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument("--inventory", action="store_true")
+        mode.add_argument("--legacy", action="store_true")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        if not settings.DEBUG:
+            raise CommandError(
+                "Refusing to run with DEBUG=False: the load test creates and "
+                "deletes members in the configured database."
+            )
+
+        inventory = getattr(settings, "EVENT_SEAT_INVENTORY", False)
+        if options["inventory"]:
+            inventory = True
+        elif options["legacy"]:
+            inventory = False
+
+        run_id = uuid.uuid4().hex[:8]
+        try:
+            event, members = self._create(run_id, options)
+            with override_settings(EVENT_SEAT_INVENTORY=inventory):
+                elapsed, statuses = self._fire(event, members, options["threads"])
+            self._report(event, members, inventory, elapsed, statuses)
+        finally:
+            # Also after a failure half-way through _create
+            self._delete(run_id)
+
+    def _create(self, run_id, options):
+        from django.contrib.auth import get_user_model
+
+        from crush_lu.models import (
+            CrushCoach,
+            CrushProfile,
+            MeetupEvent,
+            UserDataConsent,
+        )
+
+        User = get_user_model()
+        capacity = options["capacity"]
+        gender_caps = {}
+        if options["gender_caps"]:
+            third = capacity // 3
+            gender_caps = {
+                "max_participants_m": third,
+                "max_participants_f": third,
+                "max_participants_nb": capacity - 2 * third,
+            }
+        now = timezone.now()
+        event = MeetupEvent.objects.create(
+            title=f"Load test {run_id}",
+            description="Throwaway event created by loadtest_event_registration.",
+            event_type="speed_dating",
+            date_time=now + timedelta(days=30),
+            location="Luxembourg",
+            address="1 Rue du Test",
+            max_participants=capacity,
+            reserved_premium_seats=options["premium_seats"],
+            registration_deadline=now + timedelta(days=29),
+            profile_requirement="profile_exists",
+            is_published=False,
+            **gender_caps,
+        )
+
+        coach = None
+        if options["premium_seats"]:
+            coach_user = User.objects.create_user(
+                username=f"loadtest-{run_id}-coach@example.com",
+                email=f"loadtest-{run_id}-coach@example.com",
+            )
+            coach = CrushCoach.objects.create(user=coach_user, is_active=True)
+
+        members = []
+        for i in range(options["members"]):
+            user = User.objects.create_user(
+                username=f"loadtest-{run_id}-{i}@example.com",
+                email=f"loadtest-{run_id}-{i}@example.com",
+                first_name=f"Load{i}",
+            )
+            CrushProfile.objects.create(
+                user=user,
+                date_of_birth=date(1992, 6, 1),
+                gender=GENDERS[i % len(GENDERS)],
+                location="Luxembourg City",
+                verification_status="verified",
+                is_approved=True,
+                assigned_coach=coach if coach and i % 10 == 0 else None,
+            )
+            UserDataConsent.objects.update_or_create(
+                user=user, defaults={"crushlu_consent_given": True}
+            )
+            members.append(user)
+        self.stdout.write(
+            f"Event {event.pk}: {capacity} seats, {options['premium_seats']} premium, "
+            f"gender caps {list(gender_caps.values()) or 'off'}; {len(members)} members"
+        )
+        return event, members
+
+    def _fire(self, event, members, threads):
+        from django.test import Client
+        from django.urls import reverse
+
+        url = reverse(
+            "crush_lu:event_register",
+            args=[event.pk],
+            urlconf="azureproject.urls_crush",
+        )
+        pending = list(members)
+        lock = threading.Lock()
+        started = []
+        # Timed from the barrier's release, not from the logins before it
+        barrier = threading.Barrier(
+            min(threads, len(members)),
+            action=lambda: started.append(time.perf_counter()),
+        )
+        statuses = Counter()
+
+        def worker():
+            clients = []
+            with lock:
+                while pending and len(clients) < -(-len(members) // threads):
+                    client = Client()
+                    client.force_login(pending.pop())
+                    clients.append(client)
+            try:
+                barrier.wait(timeout=60)
+                for client in clients:
+                    try:
+                        response = client.post(url, {"age_confirmation": "on"})
+                        status = response.status_code
+                    except Exception as e:  # noqa: BLE001 — counted as a failure
+                        status = type(e).__name__
+                    with lock:
+                        statuses[status] += 1
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(barrier.parties)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return time.perf_counter() - started[0], statuses
+
+    def _report(self, event, members, inventory, elapsed, statuses):
+        from crush_lu.models import EventRegistration, MeetupEvent
+        from crush_lu.models.events import SEAT_HOLDING_STATUSES
+
+        event.refresh_from_db()
+        registrations = EventRegistration.objects.filter(event=event).select_related(
+            "user__crushprofile"
+        )
+        held = [r for r in registrations if r.status in SEAT_HOLDING_STATUSES]
+        waitlisted = sum(1 for r in registrations if r.status == "waitlist")
+        public_held = sum(
+            1 for r in held if not r.user.crushprofile.assigned_coach_id
+        )
+        pools = Counter(
+            MeetupEvent.GENDER_POOL_MAP.get(r.user.crushprofile.gender) for r in held
+        )
+
+        self.stdout.write(
+            f"{'inventory' if inventory else 'row lock'}: {len(members)} requests in "
+            f"{elapsed:.2f}s ({len(members) / elapsed:.0f}/s); responses {dict(statuses)}"
+        )
+        self.stdout.write(
+            f"Seats held {len(held)}/{event.max_participants} "
+            f"(public {public_held}/{event.public_capacity}), waitlisted {waitlisted}, "
+            f"pools {dict(pools)}"
+        )
+
+        problems = []
+        if len(held) > event.max_participants:
+            problems.append(f"{len(held)} seats held for {event.max_participants}")
+        if public_held > event.public_capacity:
+            problems.append(
+                f"{public_held} public seats held for {event.public_capacity}"
+            )
+        if event.gender_limits_active:
+            for pool, codes in MeetupEvent.POOL_TO_CODES.items():
+                cap = event.get_gender_pool_limit(codes[0])
+                if pools[pool] > cap:
+                    problems.append(f"pool {pool}: {pools[pool]} seats held for {cap}")
+        failed = sum(n for status, n in statuses.items() if status != 302)
+        if failed:
+            problems.append(f"{failed} request(s) did not redirect")
+        if len(registrations) + failed < len(members):
+            problems.append(
+                f"{len(members) - len(registrations)} member(s) have no registration"
+            )
+        if problems:
+            raise CommandError("Oversell check failed: " + "; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("No oversell."))
+
+    def _delete(self, run_id):
+        from django.contrib.auth import get_user_model
+
+        from crush_lu.models import MeetupEvent
+
+        MeetupEvent.objects.filter(title=f"Load test {run_id}").delete()
+        get_user_model().objects.filter(
+            username__startswith=f"loadtest-{run_id}-"
+        ).delete()
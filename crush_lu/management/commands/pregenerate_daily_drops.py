@@ -0,0 +1,46 @@
+"""
+Pre-generate Crush Connect Daily Drops for every eligible member.
+
+Builds the next Drop to unlock (06:00 local) in one pass, sharing a single
+pool snapshot, MatchScore fetch and interest lookup across all viewers, so the
+morning's first page views only read a pinned snapshot. Members who already
+have a Drop for the date are skipped, and so are members with an open coach
+pick, which replaces their Drop. Run from a dev shell, or let the Azure
+Function timer drive it via ``/api/admin/daily-drop-pregenerate/``.
+
+    python manage.py pregenerate_daily_drops                    # next Drop
+    python manage.py pregenerate_daily_drops --date 2026-06-01
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Pre-generate the next Crush Connect Daily Drop for all eligible members."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Drop date to generate (YYYY-MM-DD). Defaults to the next Drop to unlock.",
+        )
+
+    def handle(self, *args, **options):
+        from crush_lu.services.crush_connect import pregenerate_daily_drops
+
+        drop_date = None
+        if options.get("date"):
+            try:
+                drop_date = date.fromisoformat(options["date"])
+            except ValueError as exc:
+                raise CommandError(f"Invalid --date: {options['date']}") from exc
+
+        result = pregenerate_daily_drops(drop_date)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. {result['generated']} Drop(s) generated for "
+                f"{result['drop_date'].isoformat()} from a catalogue of "
+                f"{result['candidates']} candidate(s); {result['coach_picks']} "
+                f"member(s) skipped for an open coach pick."
+            )
+        )
@@ -2,14 +2,17 @@
 Management command to recalculate match scores.
 
 Usage:
-    python manage.py recalculate_match_scores           # All approved users
+    python manage.py recalculate_match_scores           # Full pair matrix (batch)
     python manage.py recalculate_match_scores --user-id 42  # Single user
     python manage.py recalculate_match_scores --dry-run     # Preview only
 """
 
 from django.core.management.base import BaseCommand
 
-from crush_lu.matching import update_match_scores_for_user
+from crush_lu.matching import (
+    recalculate_all_match_scores,
+    update_match_scores_for_user,
+)
 from crush_lu.models import CrushProfile
 
 
@@ -50,6 +53,18 @@ class Command(BaseCommand):
                 self.stdout.write(f"  Would recalculate for: {profile.user} (pk={profile.user.pk})")
             return
 
+        if not user_id:
+            # One pool load + one in-memory pair matrix + batched upserts,
+            # instead of re-loading the pool once per user.
+            total_updated = recalculate_all_match_scores()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Done. {total_updated} total score(s) created/updated "
+                    f"across {total} user(s)."
+                )
+            )
+            return
+
         total_updated = 0
         for i, profile in enumerate(profiles, 1):
             count = update_match_scores_for_user(profile.user)
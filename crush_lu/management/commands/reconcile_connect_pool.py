@@ -0,0 +1,72 @@
+"""
+Rebuild the materialized Crush Connect pool from its source tables.
+
+``ConnectCandidate`` and ``ConnectPairExclusion`` are kept current by save
+signals; this command recomputes both from scratch and writes only the diff,
+repairing anything a queryset ``.update()`` slipped past the signals. Run from
+a dev shell, or let the Azure Function timer drive it nightly via
+``/api/admin/connect-pool-reconcile/``.
+
+    python manage.py reconcile_connect_pool                 # rebuild
+    python manage.py reconcile_connect_pool --check         # rebuild, then diff live vs materialized
+    python manage.py reconcile_connect_pool --check --user-id 42
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized Crush Connect pool and optionally verify it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare each requester's materialized pool with the live query.",
+        )
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Limit --check to one requester.",
+        )
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+
+        from crush_lu.services.connect_pool import (
+            check_pool_consistency,
+            reconcile_connect_pool,
+        )
+
+        result = reconcile_connect_pool()
+        self.stdout.write(
+            f"Candidates: {result['candidates']} "
+            f"({result['candidates_changed']} changed, "
+            f"{result['candidates_removed']} removed). "
+            f"Exclusions: {result['exclusions']} "
+            f"({result['exclusions_added']} added, "
+            f"{result['exclusions_removed']} removed)."
+        )
+
+        if not options["check"]:
+            return
+
+        users = None
+        if options.get("user_id") is not None:
+            users = get_user_model().objects.filter(pk=options["user_id"])
+            if not users.exists():
+                raise CommandError(f"User {options['user_id']} not found")
+
+        mismatches = check_pool_consistency(users)
+        for mismatch in mismatches:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"User {mismatch['user_id']}: missing {mismatch['missing']}, "
+                    f"extra {mismatch['extra']}"
+                )
+            )
+        if mismatches:
+            raise CommandError(
+                f"{len(mismatches)} requester(s) have a materialized pool that "
+                "differs from the live query"
+            )
+        self.stdout.write(self.style.SUCCESS("Materialized pool matches the live query."))
@@ -0,0 +1,65 @@
+"""
+Reseed the event seat inventory from the database.
+
+The seat counters behind event_register (crush_lu.services.seat_inventory)
+follow registrations through save signals; a queryset ``.update()`` or a
+profile's gender change slips past them. This drops the counters of every
+upcoming event so the next registration attempt reseeds them from the
+seat-holding rows. An event with a registration in flight is skipped and
+reported as busy; run again to catch it.
+
+    python manage.py reconcile_seat_inventory                 # every upcoming event
+    python manage.py reconcile_seat_inventory --check         # print counters vs database first
+    python manage.py reconcile_seat_inventory --event-id 42
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Drop the seat counters of upcoming events so they reseed from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Print each event's counters next to the database counts.",
+        )
+        parser.add_argument("--event-id", type=int, help="Limit to one event.")
+
+    def handle(self, *args, **options):
+        from crush_lu.models import MeetupEvent
+        from crush_lu.services.seat_inventory import (
+            database_seat_counts,
+            inventory_enabled,
+            inventory_seat_counts,
+            reconcile_seat_inventory,
+        )
+
+        if not inventory_enabled():
+            self.stdout.write("EVENT_SEAT_INVENTORY is off; nothing to reconcile.")
+            return
+
+        events = MeetupEvent.objects.filter(
+            date_time__gt=timezone.now(), is_cancelled=False
+        )
+        if options.get("event_id") is not None:
+            events = MeetupEvent.objects.filter(pk=options["event_id"])
+        event_ids = list(events.values_list("pk", flat=True))
+
+        if options["check"]:
+            for event_id in event_ids:
+                counters = inventory_seat_counts(event_id)
+                if counters is None:
+                    continue
+                stored = database_seat_counts(event_id)
+                marker = "" if counters == stored else "  <- drifted"
+                self.stdout.write(
+                    f"Event {event_id}: counters {counters}, database {stored}{marker}"
+                )
+
+        result = reconcile_seat_inventory(event_ids)
+        self.stdout.write(
+            f"Events: {len(event_ids)} ({result['reset']} reset, "
+            f"{result['busy']} busy)."
+        )
@@ -0,0 +1,47 @@
+"""
+Bring the daily KPI rollup (``crush_lu.services.daily_metrics``) up to date.
+
+The completed days after the last rolled-up one are processed, and the
+trailing ``RESTATE_DAYS`` are rewritten so recent status changes reach their
+rows. ``send_weekly_kpis`` runs this before computing snapshots, so running it
+separately is only needed to restate older days after correcting source data
+(``--since``), or to spread the first (whole-history) rollup out of the
+Monday-morning run.
+
+    python manage.py rollup_daily_metrics                       # up to yesterday
+    python manage.py rollup_daily_metrics --since 2026-06-01    # restate from a day
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Roll up per-day KPI counts for the days since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="Replace the rollup from this day (YYYY-MM-DD) onwards.",
+        )
+
+    def handle(self, *args, **options):
+        from crush_lu.services.daily_metrics import (
+            last_rolled_up_day,
+            rollup_daily_metrics,
+        )
+
+        since = None
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError as exc:
+                raise CommandError(f"Invalid --since: {exc}") from exc
+
+        days = rollup_daily_metrics(since=since)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {days} day(s); rollup now runs through {last_rolled_up_day()}."
+            )
+        )
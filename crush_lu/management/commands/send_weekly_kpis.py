@@ -8,10 +8,14 @@ shell, or let the Azure Function timer drive it via the
     python manage.py send_weekly_kpis                       # last full week, email it
     python manage.py send_weekly_kpis --week-start 2026-06-08
     python manage.py send_weekly_kpis --no-email            # compute + persist only
+    python manage.py send_weekly_kpis --backfill-weeks 52   # also recompute the year before
 
 Recipients come from ``settings.WEEKLY_KPI_RECIPIENTS`` (env-driven). With no
 recipients configured the command still computes and persists the snapshot, and
 just warns that nothing was emailed.
+
+The daily KPI rollup is brought up to date (restating its trailing window)
+before any snapshot is computed; snapshots only read it.
 """
 
 import json
@@ -23,7 +27,9 @@ from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 
+from crush_lu.services.daily_metrics import rollup_daily_metrics
 from crush_lu.services.weekly_kpis import (
+    backfill_snapshots,
     last_completed_week_start,
     snapshot_with_deltas,
     upsert_snapshot,
@@ -161,6 +167,12 @@ class Command(BaseCommand):
             action="store_true",
             help="Compute and persist the snapshot without sending the email.",
         )
+        parser.add_argument(
+            "--backfill-weeks",
+            type=int,
+            default=0,
+            help="Also recompute and persist this many weeks before the reported one.",
+        )
         parser.add_argument(
             "--json",
             action="store_true",
@@ -180,6 +192,15 @@ class Command(BaseCommand):
             # Normalise to that week's Monday so the unique key stays consistent.
             week_start = week_start - timedelta(days=week_start.weekday())
 
+        rollup_daily_metrics(through=week_start + timedelta(days=6))
+
+        if options["backfill_weeks"] > 0:
+            weeks = backfill_snapshots(
+                week_start - timedelta(weeks=options["backfill_weeks"]),
+                week_start - timedelta(weeks=1),
+            )
+            self.stdout.write(f"Backfilled {weeks} earlier week(s)")
+
         _, created = upsert_snapshot(week_start)
         self.stdout.write(
             self.style.SUCCESS(
@@ -12,6 +12,12 @@ Usage:
     # Dry run (preview only)
     python manage.py sync_contacts_to_outlook --dry-run
 
+    # A full sync resumes an unfinished pass by default; start over instead
+    python manage.py sync_contacts_to_outlook --restart
+
+    # Only continue an unfinished pass, and stop (resumably) after 10 minutes
+    python manage.py sync_contacts_to_outlook --resume-only --max-seconds 600
+
     # Single user by profile ID
     python manage.py sync_contacts_to_outlook --profile-id 123
 
@@ -49,6 +55,21 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete all synced contacts from Outlook (use with caution)'
         )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Discard an unfinished sync pass and start from the first profile'
+        )
+        parser.add_argument(
+            '--resume-only',
+            action='store_true',
+            help='Only continue an unfinished sync pass; do nothing if there is none'
+        )
+        parser.add_argument(
+            '--max-seconds',
+            type=float,
+            help='Stop the full sync after about this many seconds (resumable)'
+        )
         parser.add_argument(
             '--force',
             action='store_true',
@@ -113,7 +134,13 @@ class Command(BaseCommand):
             return
 
         # Full sync
-        self._handle_full_sync(service, dry_run)
+        self._handle_full_sync(
+            service,
+            dry_run,
+            restart=options['restart'],
+            resume_only=options['resume_only'],
+            time_budget=options['max_seconds'],
+        )
 
     def _handle_delete_all(self, service: GraphContactsService):
         """Delete all synced contacts from Outlook."""
@@ -193,7 +220,14 @@ class Command(BaseCommand):
                     self.style.ERROR('  Failed to sync.\n')
                 )
 
-    def _handle_full_sync(self, service: GraphContactsService, dry_run: bool):
+    def _handle_full_sync(
+        self,
+        service: GraphContactsService,
+        dry_run: bool,
+        restart: bool = False,
+        resume_only: bool = False,
+        time_budget: float = None,
+    ):
         """Sync all profiles to Outlook."""
         total_profiles = CrushProfile.objects.count()
         profiles_with_phone = CrushProfile.objects.exclude(
@@ -213,7 +247,12 @@ class Command(BaseCommand):
         if not dry_run:
             self.stdout.write('Syncing...\n')
 
-        stats = service.sync_all_profiles(dry_run=dry_run)
+        stats = service.sync_all_profiles(
+            dry_run=dry_run,
+            restart=restart,
+            resume_only=resume_only,
+            time_budget=time_budget,
+        )
 
         if dry_run:
             self.stdout.write(
@@ -221,16 +260,36 @@ class Command(BaseCommand):
                     f'\nDry run complete!\n'
                     f'  Total profiles: {stats["total"]}\n'
                     f'  Would sync: {stats["synced"]}\n'
-                    f'  Would skip (no phone): {stats["skipped"]}\n'
+                    f'  Unchanged: {stats["unchanged"]}\n'
+                    f'  Would skip (test users): {stats["skipped"]}\n'
+                )
+            )
+            return
+
+        if stats['stopped'] in ('locked', 'idle'):
+            self.stdout.write(
+                self.style.WARNING(
+                    '\nAnother sync pass is running.\n'
+                    if stats['stopped'] == 'locked'
+                    else '\nNo unfinished sync pass to resume.\n'
                 )
             )
+            return
+
+        summary = (
+            f'  Total profiles: {stats["total"]}\n'
+            f'  Resumed after profile: {stats["resumed_from"]}\n'
+            f'  Synced: {stats["synced"]}\n'
+            f'  Unchanged: {stats["unchanged"]}\n'
+            f'  Skipped (test users): {stats["skipped"]}\n'
+            f'  Errors: {stats["errors"]}\n'
+        )
+        if stats['complete']:
+            self.stdout.write(self.style.SUCCESS(f'\nSync complete!\n{summary}'))
         else:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'\nSync complete!\n'
-                    f'  Total profiles: {stats["total"]}\n'
-                    f'  Synced: {stats["synced"]}\n'
-                    f'  Skipped (no phone): {stats["skipped"]}\n'
-                    f'  Errors: {stats["errors"]}\n'
+                self.style.WARNING(
+                    f'\nSync paused ({stats["stopped"]}); the next run resumes it.\n'
+                    f'{summary}'
                 )
             )
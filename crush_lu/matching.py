@@ -14,13 +14,17 @@ sought_qualities, astro_enabled, preferred gender/age) now lives on the opt-in
 ``CrushConnectMembership``, not ``CrushProfile`` — so trait matching is
 Crush Connect-only. Identity used by the scorer (gender, date_of_birth, age,
 event_languages) still comes from ``CrushProfile``. The scoring helpers are
-duck-typed on attribute access, so they work for either source; the driver
-``update_match_scores_for_user`` feeds them a ``_member_match_data`` adapter
-that bundles membership traits with profile identity.
+duck-typed on attribute access, so they work for either source.
+
+Persistence goes through the batch scorer: ``load_match_vectors`` flattens the
+whole Connect pool (traits as bitsets, zodiac as table indexes) in a few
+queries, ``score_match_vectors`` is the query-free pairwise equivalent of
+``passes_hard_filters`` + ``compute_match_score``, and results are written with
+``bulk_upsert_match_scores``.
 """
 
+import hashlib
 import logging
-from types import SimpleNamespace
 
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
@@ -265,6 +269,11 @@ def compute_chinese_zodiac_score(dob_a, dob_b):
     if not animal_a or not animal_b:
         return 0.5
 
+    return _chinese_animal_score(animal_a, animal_b)
+
+
+def _chinese_animal_score(animal_a, animal_b):
+    """Compatibility of two Chinese zodiac animals (see compute_chinese_zodiac_score)."""
     pair = frozenset({animal_a, animal_b})
 
     # Same animal
@@ -574,31 +583,391 @@ def get_score_display(score):
 
 
 # =============================================================================
-# Score Persistence
+# Batch Scoring
 # =============================================================================
 
+# Rows per INSERT ... ON CONFLICT statement when persisting scores.
+MATCH_SCORE_BATCH_SIZE = 500
+
+MATCH_SCORE_FIELDS = (
+    "score_qualities",
+    "score_zodiac_west",
+    "score_zodiac_cn",
+    "score_language",
+    "score_age_fit",
+    "score_final",
+)
+
+# Precomputed lookup tables so the pair loop never re-derives zodiac data.
+_ELEMENT_CODES = {"fire": 0, "air": 1, "earth": 2, "water": 3}
+_ELEMENT_SCORES = [
+    [ELEMENT_COMPAT[(a, b)] for b in _ELEMENT_CODES] for a in _ELEMENT_CODES
+]
+_CHINESE_SCORES = [
+    [_chinese_animal_score(a, b) for b in CHINESE_ANIMALS] for a in CHINESE_ANIMALS
+]
+
+
+class MatchVector:
+    """One onboarded Connect member, flattened for pairwise scoring.
+
+    Trait M2Ms become integer bitsets (bit = Trait pk) so set overlap is a
+    single ``&`` + ``bit_count()``; zodiac sign/animal become table indexes.
+    Built by ``load_match_vectors`` from a handful of queries, so scoring a
+    member against the whole pool never touches the database.
+    """
+
+    __slots__ = (
+        "user_id",
+        "qualities",
+        "defects",
+        "sought",
+        "astro_enabled",
+        "preferred_genders",
+        "age_min",
+        "age_max",
+        "default_age_range",
+        "gender",
+        "has_dob",
+        "element",
+        "animal",
+        "age",
+        "languages",
+    )
+
+    def __init__(self, user_id, *, qualities, defects, sought, astro_enabled,
+                 preferred_genders, age_min, age_max, gender, date_of_birth,
+                 age, languages):
+        self.user_id = user_id
+        self.qualities = qualities
+        self.defects = defects
+        self.sought = sought
+        self.astro_enabled = astro_enabled
+        self.preferred_genders = preferred_genders
+        self.age_min = age_min
+        self.age_max = age_max
+        self.default_age_range = age_min == 18 and age_max == 99
+        self.gender = gender
+        self.has_dob = bool(date_of_birth)
+        self.element = (
+            _ELEMENT_CODES[get_western_element(get_western_zodiac(date_of_birth))]
+            if date_of_birth
+            else None
+        )
+        self.animal = (
+            CHINESE_ANIMALS.index(get_chinese_zodiac(date_of_birth))
+            if date_of_birth
+            else None
+        )
+        self.age = age
+        self.languages = languages
+
+    @property
+    def has_matching_profile(self):
+        return bool(self.qualities and self.defects and self.sought)
+
+    @property
+    def fingerprint(self):
+        """Digest of every input ``score_match_vectors`` reads.
+
+        Two vectors with the same fingerprint score identically against any
+        pool, so an unchanged fingerprint means the member's rows are current.
+        """
+        payload = repr((
+            self.qualities,
+            self.defects,
+            self.sought,
+            self.astro_enabled,
+            sorted(self.preferred_genders),
+            self.age_min,
+            self.age_max,
+            self.gender,
+            self.has_dob,
+            self.element,
+            self.animal,
+            self.age,
+            sorted(self.languages),
+        ))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _age_on(date_of_birth, today):
+    """Age in whole years — same arithmetic as ``CrushProfile.age``."""
+    if not date_of_birth or not hasattr(date_of_birth, "year"):
+        return None
+    return (
+        today.year
+        - date_of_birth.year
+        - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+    )
+
+
+def load_match_vectors(user_ids=None):
+    """Load every scoreable Connect member as a ``MatchVector``.
+
+    Scoreable = onboarded, not coach-excluded, approved CrushProfile — the same
+    population ``update_match_scores_for_user`` has always scored against.
+    Costs four queries regardless of pool size (members + three trait M2Ms).
+
+    Args:
+        user_ids: optional iterable restricting the load to these users.
+
+    Returns:
+        dict mapping user_id -> MatchVector
+    """
+    from django.utils import timezone
+
+    from crush_lu.models import CrushConnectMembership
+
+    members = CrushConnectMembership.objects.filter(
+        onboarded_at__isnull=False,
+        excluded_by_coach=False,
+        user__crushprofile__is_approved=True,
+    )
+    if user_ids is not None:
+        members = members.filter(user_id__in=list(user_ids))
+    rows = list(
+        members.values_list(
+            "pk",
+            "user_id",
+            "astro_enabled",
+            "preferred_genders",
+            "preferred_age_min",
+            "preferred_age_max",
+            "user__crushprofile__gender",
+            "user__crushprofile__date_of_birth",
+            "user__crushprofile__event_languages",
+        )
+    )
+    if not rows:
+        return {}
+
+    membership_ids = [row[0] for row in rows]
+    bitsets = {}
+    for field in ("qualities", "defects", "sought_qualities"):
+        through = getattr(CrushConnectMembership, field).through
+        bits = dict.fromkeys(membership_ids, 0)
+        for membership_id, trait_id in through.objects.filter(
+            crushconnectmembership_id__in=membership_ids
+        ).values_list("crushconnectmembership_id", "trait_id"):
+            bits[membership_id] |= 1 << trait_id
+        bitsets[field] = bits
+
+    today = timezone.now().date()
+    vectors = {}
+    for (membership_id, user_id, astro_enabled, preferred_genders, age_min,
+         age_max, gender, date_of_birth, languages) in rows:
+        vectors[user_id] = MatchVector(
+            user_id,
+            qualities=bitsets["qualities"][membership_id],
+            defects=bitsets["defects"][membership_id],
+            sought=bitsets["sought_qualities"][membership_id],
+            astro_enabled=astro_enabled,
+            preferred_genders=frozenset(preferred_genders or []),
+            age_min=age_min,
+            age_max=age_max,
+            gender=gender,
+            date_of_birth=date_of_birth,
+            age=_age_on(date_of_birth, today),
+            languages=frozenset(languages or []),
+        )
+    return vectors
+
+
+def score_match_vectors(a, b):
+    """Score one pair of ``MatchVector``s.
+
+    Mirrors ``passes_hard_filters`` + ``compute_match_score`` exactly (same
+    float operations, same rounding) without any per-pair queries.
+
+    Returns:
+        dict of score fields, or None when the pair fails the hard filters.
+    """
+    # --- hard filters (see passes_hard_filters) ---
+    if not a.has_matching_profile or not b.has_matching_profile:
+        return None
+    if a.preferred_genders and b.preferred_genders:
+        a_wants_b = b.gender in a.preferred_genders if b.gender else True
+        b_wants_a = a.gender in b.preferred_genders if a.gender else True
+        if not a_wants_b and not b_wants_a:
+            return None
+    langs_a, langs_b = a.languages, b.languages
+    if langs_a and langs_b and not (langs_a & langs_b):
+        return None
+    age_a, age_b = a.age, b.age
+    if age_a is not None and age_b is not None:
+        if not b.default_age_range and not b.age_min <= age_a <= b.age_max:
+            return None
+        if not a.default_age_range and not a.age_min <= age_b <= a.age_max:
+            return None
+
+    # --- signals (see compute_match_score) ---
+    q_score = (
+        (a.sought & b.qualities).bit_count() / 5
+        + (b.sought & a.qualities).bit_count() / 5
+    ) / 2
+
+    if not langs_a or not langs_b:
+        lang_score = 0.5
+    else:
+        lang_score = len(langs_a & langs_b) / min(len(langs_a), len(langs_b))
+
+    if age_a is None or age_b is None:
+        age_score = 0.5
+    else:
+        age_score = (
+            _age_fit_one_direction(age_b, a.age_min, a.age_max)
+            + _age_fit_one_direction(age_a, b.age_min, b.age_max)
+        ) / 2
+
+    if a.astro_enabled and b.astro_enabled and a.has_dob and b.has_dob:
+        z_west = _ELEMENT_SCORES[a.element][b.element]
+        z_cn = _CHINESE_SCORES[a.animal][b.animal]
+        final = (
+            WEIGHT_QUALITIES * q_score
+            + WEIGHT_ZODIAC_WEST * z_west
+            + WEIGHT_ZODIAC_CN * z_cn
+            + WEIGHT_LANGUAGE * lang_score
+            + WEIGHT_AGE_FIT * age_score
+        )
+    else:
+        z_west = 0.0
+        z_cn = 0.0
+        remaining = WEIGHT_QUALITIES + WEIGHT_LANGUAGE + WEIGHT_AGE_FIT
+        final = (
+            (WEIGHT_QUALITIES / remaining) * q_score
+            + (WEIGHT_LANGUAGE / remaining) * lang_score
+            + (WEIGHT_AGE_FIT / remaining) * age_score
+        )
+
+    return {
+        "score_qualities": round(q_score, 4),
+        "score_zodiac_west": round(z_west, 4),
+        "score_zodiac_cn": round(z_cn, 4),
+        "score_language": round(lang_score, 4),
+        "score_age_fit": round(age_score, 4),
+        "score_final": round(final, 4),
+    }
+
+
+def score_vector_against_pool(vector, pool):
+    """Score one member against every other vector in ``pool``.
+
+    Returns:
+        dict mapping (user_a_id, user_b_id) -> scores, keyed with
+        user_a_id < user_b_id (the MatchScore convention).
+    """
+    results = {}
+    for other in pool.values():
+        if other.user_id == vector.user_id:
+            continue
+        scores = score_match_vectors(vector, other)
+        if scores is None:
+            continue
+        key = (
+            (vector.user_id, other.user_id)
+            if vector.user_id < other.user_id
+            else (other.user_id, vector.user_id)
+        )
+        results[key] = scores
+    return results
+
 
-def _member_match_data(profile, membership):
-    """Bundle the fields the scorer reads into one duck-typed object.
+def score_all_pairs(pool):
+    """Score every unordered pair in ``pool`` (the full recompute matrix).
 
-    Traits and match preferences come from the Crush Connect ``membership``;
-    identity (gender, date_of_birth, age, event_languages) stays on the
-    ``profile``. The scoring helpers only do attribute access, so this works as
-    a drop-in for the CrushProfile they used to receive.
+    Returns:
+        dict mapping (user_a_id, user_b_id) -> scores, user_a_id < user_b_id.
+    """
+    vectors = sorted(pool.values(), key=lambda v: v.user_id)
+    # Members missing a trait group fail every pair — drop them up front.
+    vectors = [v for v in vectors if v.has_matching_profile]
+    results = {}
+    for i, a in enumerate(vectors):
+        for b in vectors[i + 1:]:
+            scores = score_match_vectors(a, b)
+            if scores is not None:
+                results[(a.user_id, b.user_id)] = scores
+    return results
+
+
+def bulk_upsert_match_scores(pair_scores, batch_size=MATCH_SCORE_BATCH_SIZE):
+    """Persist ``{(user_a_id, user_b_id): scores}`` with INSERT ... ON CONFLICT.
+
+    One statement per ``batch_size`` rows instead of one ``update_or_create``
+    (SELECT + INSERT/UPDATE) per pair.
     """
-    return SimpleNamespace(
-        qualities=membership.qualities,
-        defects=membership.defects,
-        sought_qualities=membership.sought_qualities,
-        astro_enabled=membership.astro_enabled,
-        preferred_genders=membership.preferred_genders,
-        preferred_age_min=membership.preferred_age_min,
-        preferred_age_max=membership.preferred_age_max,
-        gender=profile.gender,
-        date_of_birth=profile.date_of_birth,
-        age=profile.age,
-        event_languages=profile.event_languages,
+    from crush_lu.models import MatchScore
+
+    if not pair_scores:
+        return 0
+    objs = [
+        MatchScore(user_a_id=user_a_id, user_b_id=user_b_id, **scores)
+        for (user_a_id, user_b_id), scores in pair_scores.items()
+    ]
+    MatchScore.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["user_a", "user_b"],
+        update_fields=[*MATCH_SCORE_FIELDS, "computed_at"],
     )
+    return len(objs)
+
+
+def recalculate_all_match_scores(batch_size=MATCH_SCORE_BATCH_SIZE):
+    """Rebuild every MatchScore row from one pool load.
+
+    Scores the full pair matrix in memory, upserts it in batches and deletes
+    every stored row that is no longer a valid pair (member left Connect, was
+    coach-excluded, or the pair now fails the hard filters).
+
+    Returns:
+        int: number of scores created or updated
+    """
+    from django.db import transaction
+    from django.utils import timezone
+
+    from crush_lu.models import MatchMemberState, MatchScore
+
+    started_at = timezone.now()
+    pool = load_match_vectors()
+    pair_scores = score_all_pairs(pool)
+
+    with transaction.atomic():
+        count = bulk_upsert_match_scores(pair_scores, batch_size=batch_size)
+        stale_ids = [
+            pk
+            for pk, user_a_id, user_b_id in MatchScore.objects.values_list(
+                "pk", "user_a_id", "user_b_id"
+            ).iterator(chunk_size=2000)
+            if (user_a_id, user_b_id) not in pair_scores
+        ]
+        deleted = 0
+        for start in range(0, len(stale_ids), batch_size):
+            chunk = stale_ids[start:start + batch_size]
+            deleted += MatchScore.objects.filter(pk__in=chunk).delete()[0]
+        # Every member is current now — record fingerprints and drop the
+        # queue, including members who left the pool (their rows are gone).
+        _store_fingerprints(pool.values(), batch_size=batch_size)
+        MatchMemberState.objects.exclude(user_id__in=list(pool)).update(
+            trait_fingerprint="", scored_at=started_at
+        )
+        MatchMemberState.objects.filter(dirty_since__lte=started_at).update(
+            dirty_since=None
+        )
+
+    if deleted:
+        logger.info("Deleted %d stale match scores during full recompute", deleted)
+    logger.info(
+        "Recomputed %d match scores across %d Connect members", count, len(pool)
+    )
+    return count
+
+
+# =============================================================================
+# Score Persistence
+# =============================================================================
 
 
 def update_match_scores_for_user(user):
@@ -610,13 +979,14 @@ def update_match_scores_for_user(user):
     Connect Drop weighting treats a missing pair as neutral, so absent scores
     are safe.
 
+    The pool is loaded once as ``MatchVector``s and the results written with
+    ``bulk_upsert_match_scores``, so the query count is constant in pool size.
+
     Convention: user_a.pk < user_b.pk to avoid duplicates.
 
     Returns:
         int: number of scores created or updated
     """
-    from crush_lu.models import CrushConnectMembership, MatchScore
-
     profile = getattr(user, "crushprofile", None)
     if profile is None or not profile.is_approved:
         return 0
@@ -624,53 +994,33 @@ def update_match_scores_for_user(user):
     if membership is None or not membership.is_onboarded:
         return 0
 
-    user_data = _member_match_data(profile, membership)
-
-    # All other onboarded Connect members (the only candidates for trait scoring).
-    other_members = (
-        CrushConnectMembership.objects.filter(onboarded_at__isnull=False)
-        .exclude(user=user)
-        .select_related("user", "user__crushprofile")
+    count = _rescore_member(user.pk, load_match_vectors())
+    logger.info(
+        "Updated %d match scores for user %s (pk=%s)", count, user, user.pk
     )
+    return count
 
-    count = 0
-    valid_counterpart_ids = set()
-    for other_membership in other_members:
-        other_user = other_membership.user
-        other_profile = getattr(other_user, "crushprofile", None)
-        if other_profile is None or not other_profile.is_approved:
-            continue
-        if other_membership.excluded_by_coach:
-            continue
 
-        other_data = _member_match_data(other_profile, other_membership)
+def _rescore_member(user_id, pool):
+    """Recompute one member's rows against ``pool`` and record their fingerprint.
 
-        # Enforce user_a.pk < user_b.pk
-        if user.pk < other_user.pk:
-            user_a, user_b = user, other_user
-        else:
-            user_a, user_b = other_user, user
+    A member missing from ``pool`` (left Connect, coach-excluded, unapproved)
+    ends up with no rows at all.
 
-        # Hard filter: skip incompatible pairs
-        if not passes_hard_filters(user_data, other_data):
-            continue
+    Returns:
+        int: number of scores created or updated
+    """
+    from django.utils import timezone
 
-        scores = compute_match_score(user_data, other_data)
-
-        MatchScore.objects.update_or_create(
-            user_a=user_a,
-            user_b=user_b,
-            defaults={
-                "score_qualities": scores["score_qualities"],
-                "score_zodiac_west": scores["score_zodiac_west"],
-                "score_zodiac_cn": scores["score_zodiac_cn"],
-                "score_language": scores["score_language"],
-                "score_age_fit": scores["score_age_fit"],
-                "score_final": scores["score_final"],
-            },
-        )
-        count += 1
-        valid_counterpart_ids.add(other_user.pk)
+    from crush_lu.models import MatchMemberState, MatchScore
+
+    vector = pool.get(user_id)
+    pair_scores = score_vector_against_pool(vector, pool) if vector else {}
+    count = bulk_upsert_match_scores(pair_scores)
+    valid_counterpart_ids = {
+        user_b_id if user_a_id == user_id else user_a_id
+        for user_a_id, user_b_id in pair_scores
+    }
 
     # Connect-only scoring: the only valid MatchScore rows for this user are the
     # ones we just (re)computed against eligible onboarded members. Delete every
@@ -678,18 +1028,203 @@ def update_match_scores_for_user(user):
     # never opted in, opted out, were coach-excluded, or now fail the hard
     # filters — so get_matches_for_user / coach views never surface a
     # non-Connect match after the switch to Connect-only scoring.
-    stale = MatchScore.objects.filter(Q(user_a=user) | Q(user_b=user)).exclude(
-        Q(user_a=user, user_b_id__in=valid_counterpart_ids)
-        | Q(user_b=user, user_a_id__in=valid_counterpart_ids)
+    stale = MatchScore.objects.filter(
+        Q(user_a_id=user_id) | Q(user_b_id=user_id)
+    ).exclude(
+        Q(user_a_id=user_id, user_b_id__in=valid_counterpart_ids)
+        | Q(user_b_id=user_id, user_a_id__in=valid_counterpart_ids)
     )
     deleted, _ = stale.delete()
     if deleted:
-        logger.info("Deleted %d stale match scores for user %s", deleted, user.pk)
+        logger.info("Deleted %d stale match scores for user %s", deleted, user_id)
 
+    if vector is not None:
+        _store_fingerprints([vector])
+    else:
+        MatchMemberState.objects.filter(user_id=user_id).update(
+            trait_fingerprint="", scored_at=timezone.now()
+        )
+    return count
+
+
+def _store_fingerprints(vectors, batch_size=MATCH_SCORE_BATCH_SIZE):
+    """Upsert ``MatchMemberState.trait_fingerprint`` for freshly scored vectors."""
+    from django.utils import timezone
+
+    from crush_lu.models import MatchMemberState
+
+    now = timezone.now()
+    MatchMemberState.objects.bulk_create(
+        [
+            MatchMemberState(
+                user_id=v.user_id, trait_fingerprint=v.fingerprint, scored_at=now
+            )
+            for v in vectors
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["trait_fingerprint", "scored_at"],
+    )
+
+
+# =============================================================================
+# Incremental Recomputation (dirty-member queue)
+# =============================================================================
+
+
+def mark_match_scores_dirty(user_ids):
+    """Queue members for ``drain_match_score_queue``.
+
+    Cheap enough for save paths: one INSERT ... ON CONFLICT, no scoring. A
+    member re-marked while a drain is running keeps the newer ``dirty_since``
+    and is picked up by the next drain.
+    """
+    from django.utils import timezone
+
+    from crush_lu.models import MatchMemberState
+
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return
+    now = timezone.now()
+    MatchMemberState.objects.bulk_create(
+        [MatchMemberState(user_id=uid, dirty_since=now) for uid in user_ids],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["dirty_since"],
+    )
+
+
+def mark_aged_members_dirty(today=None):
+    """Queue members who have had a birthday since their last recompute.
+
+    Age is a scoring input (hard filter and age fit) that changes without any
+    save, so nothing else would queue these members: their stored rows and
+    fingerprint would keep the old age. Comparing the age at ``scored_at``
+    with today's also catches birthdays on days no drain ran.
+
+    Returns the number of members queued.
+    """
+    from datetime import timezone as dt_timezone
+
+    from django.db.models import Case, F, IntegerField, Value, When
+    from django.db.models.functions import ExtractDay, ExtractMonth, ExtractYear
+    from django.utils import timezone
+
+    from crush_lu.models import MatchMemberState
+
+    today = today or timezone.now().date()
+    date_of_birth = "user__crushprofile__date_of_birth"
+    # _age_on in SQL, on scored_at's UTC date as scored_at.date() reads it
+    scored_before_birthday = Case(
+        When(
+            Q(scored_month__lt=F("born_month"))
+            | Q(scored_month=F("born_month"), scored_day__lt=F("born_day")),
+            then=Value(1),
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    today_before_birthday = Case(
+        When(
+            Q(born_month__gt=today.month)
+            | Q(born_month=today.month, born_day__gt=today.day),
+            then=Value(1),
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    aged = list(
+        MatchMemberState.objects.filter(
+            dirty_since__isnull=True,
+            scored_at__isnull=False,
+            user__crushprofile__date_of_birth__isnull=False,
+        )
+        .alias(
+            born_year=ExtractYear(date_of_birth),
+            born_month=ExtractMonth(date_of_birth),
+            born_day=ExtractDay(date_of_birth),
+            scored_year=ExtractYear("scored_at", tzinfo=dt_timezone.utc),
+            scored_month=ExtractMonth("scored_at", tzinfo=dt_timezone.utc),
+            scored_day=ExtractDay("scored_at", tzinfo=dt_timezone.utc),
+        )
+        .alias(
+            age_then=F("scored_year") - F("born_year") - scored_before_birthday,
+            age_now=Value(today.year) - F("born_year") - today_before_birthday,
+        )
+        .exclude(age_then=F("age_now"))
+        .values_list("user_id", flat=True)
+    )
+    mark_match_scores_dirty(aged)
+    return len(aged)
+
+
+def drain_match_score_queue(user_ids=None, limit=None):
+    """Recompute MatchScore rows for queued members only.
+
+    Loads the pool once, then for each dirty member compares the current
+    fingerprint with the stored one: unchanged members are just dequeued,
+    changed ones are rescored against the current pool. A full drain first
+    queues members whose age moved on (``mark_aged_members_dirty``).
+
+    Args:
+        user_ids: only drain these members' entries — used by save paths
+            that want the editing member's rows fresh right after commit.
+        limit: cap on queued members processed per call (oldest first).
+
+    Returns:
+        dict with ``processed``, ``rescored``, ``skipped`` and ``scores``.
+    """
+    from django.db.models import Case, F, When
+    from django.utils import timezone
+
+    from crush_lu.models import MatchMemberState
+
+    if user_ids is None:
+        mark_aged_members_dirty()
+
+    started_at = timezone.now()
+    queued = MatchMemberState.objects.filter(
+        dirty_since__isnull=False, dirty_since__lte=started_at
+    ).order_by("dirty_since")
+    if user_ids is not None:
+        queued = queued.filter(user_id__in=list(user_ids))
+    if limit:
+        queued = queued[:limit]
+    user_ids = list(queued.values_list("user_id", flat=True))
+
+    result = {"processed": len(user_ids), "rescored": 0, "skipped": 0, "scores": 0}
+    if not user_ids:
+        return result
+
+    stored = dict(
+        MatchMemberState.objects.filter(user_id__in=user_ids).values_list(
+            "user_id", "trait_fingerprint"
+        )
+    )
+    pool = load_match_vectors()
+    for user_id in user_ids:
+        vector = pool.get(user_id)
+        current = vector.fingerprint if vector is not None else ""
+        if user_id in stored and stored[user_id] == current:
+            result["skipped"] += 1
+            continue
+        result["scores"] += _rescore_member(user_id, pool)
+        result["rescored"] += 1
+
+    MatchMemberState.objects.filter(user_id__in=user_ids).update(
+        dirty_since=Case(
+            When(dirty_since__lte=started_at, then=None),
+            default=F("dirty_since"),
+        )
+    )
     logger.info(
-        "Updated %d match scores for user %s (pk=%s)", count, user, user.pk
+        "Match score queue drained: %(processed)d processed, %(rescored)d "
+        "rescored, %(skipped)d unchanged, %(scores)d scores written",
+        result,
     )
-    return count
+    return result
 
 
 def get_matches_for_user(user, min_score=THRESHOLD_POSSIBLE):
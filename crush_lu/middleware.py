@@ -4,6 +4,7 @@ Handles user activity tracking and PWA detection.
 """
 
 import logging
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import F
@@ -65,6 +66,8 @@ class UserActivityMiddleware:
     - Skips static files, API endpoints, and health checks
     - Throttles DB updates to every 5 minutes per user
     - Uses F() expression for atomic counter increment
+    - With USER_ACTIVITY_WRITE_BEHIND, only appends an event to
+      ``services.activity_buffer``; a periodic flush applies it
     """
 
     def __init__(self, get_response):
@@ -105,6 +108,12 @@ class UserActivityMiddleware:
             user = request.user
             now = timezone.now()
 
+            if getattr(settings, "USER_ACTIVITY_WRITE_BEHIND", False):
+                from .services.activity_buffer import record_activity
+
+                record_activity(user.pk, now, pwa=self._is_pwa_request(request))
+                return
+
             # Per-day activity rollup — recorded independently of the last_seen
             # throttle below, so the first request of each new calendar day is
             # always captured (even mid-session across midnight). Drives a stable
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.7 on 2026-10-16 20:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('crush_lu', '0220_echo_lu_venue_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchMemberState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='match_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('trait_fingerprint', models.CharField(blank=True, default='', max_length=64)),
+                ('dirty_since', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('scored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Match Member State',
+                'verbose_name_plural': 'Match Member States',
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.7 on 2026-10-16 20:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('crush_lu', '0221_match_member_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConnectCandidate',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='connect_candidate', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('is_listed', models.BooleanField(default=False)),
+                ('has_luxid', models.BooleanField(default=False)),
+                ('has_photo', models.BooleanField(default=False)),
+                ('gender', models.CharField(blank=True, max_length=2)),
+                ('date_of_birth', models.DateField(blank=True, null=True)),
+                ('preferred_genders_key', models.CharField(blank=True, max_length=32)),
+                ('preferred_age_min', models.PositiveSmallIntegerField(default=18)),
+                ('preferred_age_max', models.PositiveSmallIntegerField(default=99)),
+                ('last_login', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Connect Candidate',
+                'verbose_name_plural': 'Connect Candidates',
+                'indexes': [models.Index(fields=['is_listed', 'last_login'], name='connect_cand_listed_login'), models.Index(fields=['gender', 'date_of_birth'], name='connect_cand_gender_dob')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ConnectPairExclusion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('connection', 'Existing connection'), ('block', 'Block'), ('coach', 'Coach and assigned member')], max_length=12)),
+                ('hidden', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('viewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Connect Pair Exclusion',
+                'verbose_name_plural': 'Connect Pair Exclusions',
+                'constraints': [models.UniqueConstraint(fields=('viewer', 'hidden', 'reason'), name='connect_pair_exclusion_unique')],
+            },
+        ),
+    ]
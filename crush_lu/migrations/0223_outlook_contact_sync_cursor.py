@@ -0,0 +1,33 @@
+# Generated by Django 6.0.7 on 2026-10-16 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crush_lu', '0222_connect_materialized_pool'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutlookContactSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cursor_profile_id', models.PositiveIntegerField(default=0, help_text='Last profile ID processed by the pass in progress (0 = none)')),
+                ('pass_started_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('last_completed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Outlook Contact Sync State',
+                'verbose_name_plural': 'Outlook Contact Sync State',
+            },
+        ),
+        migrations.AddField(
+            model_name='crushprofile',
+            name='outlook_contact_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the contact payload last written to Outlook, so the bulk sync skips profiles whose contact would not change', max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.7 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crush_lu', '0223_outlook_contact_sync_cursor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Local (Europe/Luxembourg) calendar day.')),
+                ('metric', models.CharField(max_length=64)),
+                ('value', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily metric',
+                'verbose_name_plural': 'Daily metrics',
+                'ordering': ['day', 'metric'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'metric'), name='unique_daily_metric_per_day')],
+            },
+        ),
+    ]
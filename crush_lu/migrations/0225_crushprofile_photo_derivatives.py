@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-16 23:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crush_lu', '0224_daily_metric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crushprofile',
+            name='photo_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
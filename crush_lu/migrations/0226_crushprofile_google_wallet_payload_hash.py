@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crush_lu', '0225_crushprofile_photo_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crushprofile',
+            name='google_wallet_payload_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the object payload last PATCHed to Google Wallet, so refreshes skip passes that would not change', max_length=64),
+        ),
+    ]
@@ -442,8 +442,20 @@ class CrushConnectMembership(models.Model):
 
     @property
     def is_onboarded(self) -> bool:
+        # Keep in step with onboarded_q
         return self.onboarded_at is not None and not self.excluded_by_coach
 
+    @staticmethod
+    def onboarded_q(prefix: str = "") -> models.Q:
+        """``is_onboarded`` as a lookup; ``prefix`` is the path to the membership,
+        e.g. ``"crush_connect_membership__"`` from User."""
+        return models.Q(
+            **{
+                f"{prefix}onboarded_at__isnull": False,
+                f"{prefix}excluded_by_coach": False,
+            }
+        )
+
     @property
     def active_gate_questions(self):
         """The member's 3 ordered gate questions (with their truth answers)."""
@@ -768,3 +780,102 @@ class ConnectCoachPick(models.Model):
 
     def __str__(self):
         return f"{self.coach} → {self.member}: {self.candidate} ({self.status})"
+
+
+class ConnectCandidate(models.Model):
+    """
+    Materialized Crush Connect catalogue row — one per onboarded member.
+
+    Denormalizes every candidate-side input of ``get_eligible_pool`` (identity,
+    match preferences, LuxID/photo flags, last login) so the pool is a single
+    indexed query over this table plus ``ConnectPairExclusion``. ``is_listed``
+    folds the static catalogue gates (verified, not coach-excluded, photo
+    consent, photo, LuxID) into one column; the 30-day activity window is
+    applied at query time against ``last_login``.
+
+    Maintained by ``services.connect_pool`` from save signals and rebuilt by
+    the nightly ``reconcile_connect_pool`` sweep, which also catches writes
+    that bypass signals (queryset ``.update()``).
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="connect_candidate",
+    )
+    is_listed = models.BooleanField(default=False)
+    has_luxid = models.BooleanField(default=False)
+    has_photo = models.BooleanField(default=False)
+    gender = models.CharField(max_length=2, blank=True)
+    date_of_birth = models.DateField(null=True, blank=True)
+    # "|F|M|" — pipe-delimited so "accepts gender X" is a plain LIKE that works
+    # on SQLite, where JSON containment on preferred_genders is unreliable.
+    # Empty = no preference.
+    preferred_genders_key = models.CharField(max_length=32, blank=True)
+    preferred_age_min = models.PositiveSmallIntegerField(default=18)
+    preferred_age_max = models.PositiveSmallIntegerField(default=99)
+    last_login = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Connect Candidate")
+        verbose_name_plural = _("Connect Candidates")
+        indexes = [
+            models.Index(
+                fields=["is_listed", "last_login"], name="connect_cand_listed_login"
+            ),
+            models.Index(
+                fields=["gender", "date_of_birth"], name="connect_cand_gender_dob"
+            ),
+        ]
+
+    def __str__(self):
+        state = "listed" if self.is_listed else "unlisted"
+        return f"{self.user_id}: {state}"
+
+
+class ConnectPairExclusion(models.Model):
+    """
+    Directional "``viewer`` must never see ``hidden``" row for Connect pools.
+
+    Precomputed from the three pair rules ``get_eligible_pool`` evaluates per
+    query: existing EventConnections (directional — an incoming, not-yet-shared
+    crush declaration does not hide the crusher), peer blocks (symmetric) and
+    coach ↔ assigned-member pairs (symmetric). One row per rule so each source
+    can be refreshed independently.
+    """
+
+    REASON_CONNECTION = "connection"
+    REASON_BLOCK = "block"
+    REASON_COACH = "coach"
+    REASON_CHOICES = [
+        (REASON_CONNECTION, _("Existing connection")),
+        (REASON_BLOCK, _("Block")),
+        (REASON_COACH, _("Coach and assigned member")),
+    ]
+
+    viewer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    hidden = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    reason = models.CharField(max_length=12, choices=REASON_CHOICES)
+
+    class Meta:
+        verbose_name = _("Connect Pair Exclusion")
+        verbose_name_plural = _("Connect Pair Exclusions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["viewer", "hidden", "reason"],
+                name="connect_pair_exclusion_unique",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.viewer_id} ✕ {self.hidden_id} ({self.reason})"
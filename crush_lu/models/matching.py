@@ -101,3 +101,34 @@ class MatchScore(models.Model):
 
     def __str__(self):
         return f"{self.user_a} ↔ {self.user_b}: {self.score_final:.0%}"
+
+
+class MatchMemberState(models.Model):
+    """Per-member bookkeeping for incremental MatchScore recomputation.
+
+    ``dirty_since`` is the queue: save paths for the inputs the scorer reads
+    (CrushConnectMembership traits/preferences, CrushProfile identity) stamp
+    it, and ``crush_lu.matching.drain_match_score_queue`` recomputes only those
+    members. ``trait_fingerprint`` is a digest of the member's scoring inputs
+    at the last recompute, so a save that changed nothing the scorer reads
+    (e.g. the profile save on every Microsoft sign-in) is dequeued without
+    touching MatchScore.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="match_state",
+    )
+    trait_fingerprint = models.CharField(max_length=64, blank=True, default="")
+    dirty_since = models.DateTimeField(null=True, blank=True, db_index=True)
+    scored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Match Member State")
+        verbose_name_plural = _("Match Member States")
+
+    def __str__(self):
+        state = "dirty" if self.dirty_since else "clean"
+        return f"{self.user_id}: {state}"
@@ -40,3 +40,30 @@ class WeeklyMetricsSnapshot(models.Model):
 
     def __str__(self):
         return f"KPIs for week of {self.week_start.isoformat()}"
+
+
+class DailyMetric(models.Model):
+    """One day's value of one KPI building block, as rolled up.
+
+    Filled in by ``crush_lu.services.daily_metrics.rollup_daily_metrics`` for
+    completed days only, and rewritten while the day is within the rollup's
+    trailing restatement window; every weekly snapshot covering the day reads
+    the row back.
+    """
+
+    day = models.DateField(help_text="Local (Europe/Luxembourg) calendar day.")
+    metric = models.CharField(max_length=64)
+    value = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["day", "metric"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "metric"], name="unique_daily_metric_per_day"
+            ),
+        ]
+        verbose_name = "Daily metric"
+        verbose_name_plural = "Daily metrics"
+
+    def __str__(self):
+        return f"{self.metric} on {self.day.isoformat()}: {self.value:g}"
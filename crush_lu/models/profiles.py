@@ -634,6 +634,11 @@ class CrushProfile(models.Model):
     photo_3 = models.ImageField(
         upload_to=user_photo_path, blank=True, null=True, storage=crush_photo_storage
     )
+    # Resized WebP/AVIF renditions of the photos above, stored next to them
+    # (services/photo_derivatives.py):
+    # {"photo_1": {"source": <original name>, "hash": ..., "widths": [...],
+    #              "formats": [...]}, ...}
+    photo_derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     # Privacy Settings
     show_full_name = models.BooleanField(
@@ -732,6 +737,14 @@ class CrushProfile(models.Model):
     google_wallet_object_id = models.CharField(
         max_length=128, blank=True, help_text=_("Google Wallet object ID")
     )
+    google_wallet_payload_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text=_(
+            "SHA-256 of the object payload last PATCHed to Google Wallet, so "
+            "refreshes skip passes that would not change"
+        ),
+    )
     show_photo_on_wallet = models.BooleanField(
         default=True, help_text=_("Show profile photo on wallet card")
     )
@@ -750,6 +763,14 @@ class CrushProfile(models.Model):
             "unchanged photos are not re-uploaded on every sync"
         ),
     )
+    outlook_contact_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text=_(
+            "SHA-256 of the contact payload last written to Outlook, so the "
+            "bulk sync skips profiles whose contact would not change"
+        ),
+    )
 
     # Referral Rewards
     MEMBERSHIP_TIER_CHOICES = [
@@ -1210,6 +1231,45 @@ class CrushProfile(models.Model):
         )
 
 
+class OutlookContactSyncState(models.Model):
+    """
+    Resume cursor for the bulk Outlook contact sync (singleton, pk=1).
+
+    A full pass walks phone-verified profiles in primary-key order and moves
+    the cursor forward after every Graph batch, so a pass cut short by a
+    deploy, a worker restart or Exchange throttling continues from the last
+    finished batch instead of starting over. heartbeat_at doubles as a lease:
+    while it is fresh, a second trigger does not start a concurrent pass.
+    """
+
+    cursor_profile_id = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Last profile ID processed by the pass in progress (0 = none)"),
+    )
+    pass_started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    last_completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Outlook Contact Sync State")
+        verbose_name_plural = _("Outlook Contact Sync State")
+
+    def __str__(self):
+        if self.cursor_profile_id:
+            return f"Outlook sync in progress after profile {self.cursor_profile_id}"
+        return "Outlook sync idle"
+
+    def save(self, *args, **kwargs):
+        self.pk = 1
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_state(cls):
+        state, _ = cls.objects.get_or_create(pk=1)
+        return state
+
+
 class ProfileSubmission(models.Model):
     """Track profile submissions for coach review"""
 
@@ -2185,6 +2245,9 @@ class PushSubscription(models.Model):
         verbose_name = _("Push Notification Subscription")
         verbose_name_plural = _("Push Notification Subscriptions")
 
+    # Consecutive failed deliveries before the subscription is deleted
+    MAX_FAILURES = 5
+
     def __str__(self):
         device = self.device_name or "Unknown Device"
         return f"{self.user.username} - {device}"
@@ -2198,7 +2261,7 @@ class PushSubscription(models.Model):
     def mark_failure(self):
         """Mark failed notification delivery (auto-delete after 5 failures)"""
         self.failure_count += 1
-        if self.failure_count >= 5:
+        if self.failure_count >= self.MAX_FAILURES:
             # Subscription likely expired/invalid - delete it
             self.delete()
         else:
@@ -3,28 +3,44 @@ Newsletter send service for Crush.lu.
 
 Handles audience resolution, rate-limited sending via Microsoft Graph API,
 and per-recipient tracking for resumability.
+
+Recipients are processed in chunks: one query loads a chunk's users with
+their profile and email preferences, NewsletterRecipient claims and outcomes
+are written with one bulk upsert each, and on Graph the whole chunk goes out
+in a single $batch call.
 """
 import logging
-import time
 
 from django.contrib.auth.models import User
 from django.db.models import Q
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 from django.utils import timezone, translation
 from django.utils.html import strip_tags
 
-from azureproject.email_utils import send_domain_email
-from .email_helpers import can_send_email, get_social_links
+from azureproject.email_utils import (
+    build_domain_email,
+    get_domain_email_connection,
+    send_domain_email,
+    send_domain_email_batch,
+)
+from azureproject.graph_email_backend import GraphThrottled
+from .email_helpers import get_social_links
 from .models.newsletter import NewsletterRecipient
+from .services.graph_contacts import TokenBucket
 from .utils.i18n import build_absolute_url, get_user_preferred_language
 
 from crush_lu.models.events import SEAT_HOLDING_STATUSES
 logger = logging.getLogger(__name__)
 
-# Rate limiting: 25 emails per batch, 62s pause (Graph API limit is 30/min)
+# Rate limiting: 25 emails per 62s on average (Graph API limit is 30/min)
 BATCH_SIZE = 25
 BATCH_PAUSE_SECONDS = 62
 
+# Recipients loaded, claimed and recorded together; one Graph $batch call
+SEND_CHUNK_SIZE = 20
+
+NEWSLETTER_FROM_EMAIL = 'love@crush.lu'
+
 
 def resolve_audience(audience, segment_key=''):
     """
@@ -151,7 +167,7 @@ def _get_segment_users(segment_key):
     """
     from .admin.user_segments import get_segment_definitions
 
-    segments = get_segment_definitions()
+    segments = get_segment_definitions(with_counts=False)
 
     # Search through all segment groups for matching key
     for group in segments.values():
@@ -206,12 +222,17 @@ def send_newsletter(newsletter, dry_run=False, limit=None, stdout=None,
         link_rewriter: Optional callable(html, user) applied to the rendered
             HTML body just before sending — used by campaign sends for click
             tracking. None (the default) keeps output byte-identical.
-        should_abort: Optional zero-arg callable checked before each send;
-            returning True stops the run without finalizing (used by campaign
-            sends so a cancellation halts the batch mid-flight).
+        should_abort: Optional zero-arg callable checked before each send
+            (before each chunk when Graph sends a chunk at once); returning
+            True stops the run without finalizing (used by campaign sends so
+            a cancellation halts the batch mid-flight).
 
     Returns:
-        dict: {'sent': int, 'failed': int, 'skipped': int}
+        dict: {'sent', 'failed', 'skipped'} counts for this run, plus
+            'complete' (the newsletter was finalized) and 'remaining'
+            (recipients still eligible for a later run). A run left
+            'sending' also reports 'aborted'. A dry run returns the three
+            counts only.
     """
     def log(msg, style=None):
         if stdout:
@@ -267,84 +288,130 @@ def send_newsletter(newsletter, dry_run=False, limit=None, stdout=None,
     sent = 0
     failed = 0
     skipped = 0
-    batch_count = 0
 
     # Materialize the queryset to avoid issues with batching
     user_ids = list(recipients.values_list('id', flat=True))
 
+    # Pace sends to BATCH_SIZE per BATCH_PAUSE_SECONDS on average instead of
+    # sleeping a full pause after every batch
+    bucket = None
+    if BATCH_PAUSE_SECONDS:
+        bucket = TokenBucket(
+            rate=BATCH_SIZE / BATCH_PAUSE_SECONDS, capacity=BATCH_SIZE,
+        )
+    # Graph sends a whole chunk per $batch call; other backends (SMTP, and the
+    # local backends in dev/test) go recipient by recipient
+    batched = hasattr(
+        get_domain_email_connection(
+            domain='crush.lu', from_email=NEWSLETTER_FROM_EMAIL,
+        ),
+        'send_messages_detailed',
+    )
+    renderer = _NewsletterRenderer(newsletter)
+
     aborted = False
-    for i, user_id in enumerate(user_ids):
+    # Graph throttled past its retry budget: the rest waits for the next run
+    throttled = False
+    for start in range(0, len(user_ids), SEND_CHUNK_SIZE):
         if should_abort is not None and should_abort():
-            log("  Send aborted by caller signal")
             aborted = True
             break
 
-        # Rate limiting: pause between batches
-        if batch_count > 0 and batch_count % BATCH_SIZE == 0:
-            log(f"  Batch pause ({BATCH_PAUSE_SECONDS}s) after {batch_count} emails...")
-            time.sleep(BATCH_PAUSE_SECONDS)
-
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            skipped += 1
-            continue
-
-        # Double-check preference (may have changed since queryset evaluation)
-        if not can_send_email(user, 'newsletter'):
-            NewsletterRecipient.objects.update_or_create(
+        chunk_ids = user_ids[start:start + SEND_CHUNK_SIZE]
+        users = _fetch_recipient_chunk(chunk_ids)
+        # Users deleted since the queryset was evaluated
+        skipped += len(chunk_ids) - len(users)
+
+        outcomes = []
+        claimed = []
+        for user in users:
+            # Double-check preference (may have changed since queryset
+            # evaluation)
+            if user.email_preference.can_send('newsletter'):
+                claimed.append(user)
+                continue
+            outcomes.append(NewsletterRecipient(
                 newsletter=newsletter,
                 user=user,
-                defaults={
-                    'email': user.email,
-                    'status': 'skipped',
-                    'error_message': 'User opted out of newsletters',
-                },
-            )
+                email=user.email,
+                status='skipped',
+                error_message='User opted out of newsletters',
+            ))
             skipped += 1
-            continue
 
-        # Durable pre-send claim: a crash after the Graph send but before the
-        # receipt write must not cause a duplicate email on the next bounded
-        # run (stale claims are swept to 'failed' below).
-        NewsletterRecipient.objects.update_or_create(
-            newsletter=newsletter,
-            user=user,
-            defaults={'email': user.email, 'status': 'pending'},
+        # Durable pre-send claim: a crash after the Graph send but before
+        # the receipt write must not cause a duplicate email on the next
+        # bounded run (stale claims are swept to 'failed' below).
+        # Existing rows first, so released claims get their history back
+        prior = _recipient_states(newsletter, claimed)
+        _upsert_recipients(
+            [
+                NewsletterRecipient(
+                    newsletter=newsletter, user=user,
+                    email=user.email, status='pending',
+                )
+                for user in claimed
+            ],
+            ['email', 'status'],
         )
 
-        try:
-            _send_newsletter_to_user(newsletter, user, link_rewriter)
-            NewsletterRecipient.objects.update_or_create(
-                newsletter=newsletter,
-                user=user,
-                defaults={
-                    'email': user.email,
-                    'status': 'sent',
-                    'sent_at': timezone.now(),
-                },
+        if batched:
+            results = _send_chunk_batched(
+                renderer, claimed, link_rewriter, bucket,
+            )
+        else:
+            results, aborted = _send_chunk_individually(
+                renderer, claimed, link_rewriter, bucket, should_abort,
             )
-            sent += 1
-            batch_count += 1
-            if stdout and (sent % 10 == 0):
-                log(f"  Sent {sent}/{recipient_count}...")
 
-        except Exception as e:
-            error_msg = str(e)[:500]
-            NewsletterRecipient.objects.update_or_create(
+        now = timezone.now()
+        deferred = []
+        for user, error in results:
+            if isinstance(error, GraphThrottled):
+                # Never sent: handed back to the next run
+                deferred.append(user)
+                continue
+            if error is None:
+                outcomes.append(NewsletterRecipient(
+                    newsletter=newsletter,
+                    user=user,
+                    email=user.email,
+                    status='sent',
+                    sent_at=now,
+                ))
+                sent += 1
+                continue
+            outcomes.append(NewsletterRecipient(
                 newsletter=newsletter,
                 user=user,
-                defaults={
-                    'email': user.email,
-                    'status': 'failed',
-                    'error_message': error_msg,
-                },
-            )
+                email=user.email,
+                status='failed',
+                error_message=str(error)[:500],
+            ))
             failed += 1
             logger.error(
-                f"Failed to send newsletter #{newsletter.pk} to {user.email}: {e}",
-                exc_info=True,
+                f"Failed to send newsletter #{newsletter.pk} to "
+                f"{user.email}: {error}",
+                exc_info=error,
             )
+        _upsert_recipients(
+            outcomes, ['email', 'status', 'sent_at', 'error_message'],
+        )
+
+        if aborted:
+            _release_claims(newsletter, claimed[len(results):], prior)
+            break
+        if deferred:
+            _release_claims(newsletter, deferred, prior)
+            throttled = True
+            break
+        if stdout:
+            log(f"  Sent {sent}/{recipient_count}...")
+
+    if aborted:
+        log("  Send aborted by caller signal")
+    if throttled:
+        log("  Throttled by Graph; the remaining recipients wait for the next run")
 
     # Any recipient still 'pending' now is a stale claim from an interrupted
     # earlier run — the outcome is unknown, so count it as failed instead of
@@ -376,16 +443,16 @@ def send_newsletter(newsletter, dry_run=False, limit=None, stdout=None,
         ).count()
     )
 
-    if limit is not None or aborted:
+    if limit is not None or aborted or throttled:
         remaining = (
             get_newsletter_recipients(newsletter)
             .exclude(id__in=_unresumable_recipient_ids(newsletter))
             .count()
         )
-        if remaining > 0 or aborted:
-            # Bounded batch with recipients still eligible (or an aborted
-            # run): stay 'sending' so a later run continues where this one
-            # stopped instead of prematurely finalizing the newsletter.
+        if remaining > 0 or aborted or throttled:
+            # Bounded batch with recipients still eligible (or an aborted or
+            # throttled run): stay 'sending' so a later run continues where
+            # this one stopped instead of prematurely finalizing the newsletter.
             newsletter.save(update_fields=[
                 'total_sent', 'total_failed', 'total_skipped', 'updated_at',
             ])
@@ -435,68 +502,135 @@ def _unresumable_recipient_ids(newsletter):
     ).values_list('user_id', flat=True)
 
 
-def render_event_announcement(event, user, lang):
+def _fetch_recipient_chunk(user_ids):
     """
-    Render the event announcement email template for a specific user and language.
-
-    Uses translation.override() so that event.title/description return the
-    translated version, and all {% trans %} tags render in the user's language.
+    Users for one chunk of ids, in send order, with profile and email
+    preferences loaded.
 
-    Returns:
-        tuple: (subject, html_message)
+    One query for the users; users without an EmailPreference row get theirs
+    in one bulk insert (what get_or_create_for_user would do one by one).
     """
     from .models import EmailPreference
 
-    email_prefs = EmailPreference.get_or_create_for_user(user)
-    unsubscribe_url = build_absolute_url(
-        'crush_lu:email_unsubscribe',
-        lang=lang,
-        kwargs={'token': email_prefs.unsubscribe_token},
-    )
-    event_url = build_absolute_url(
-        'crush_lu:event_detail',
-        lang=lang,
-        kwargs={'event_id': event.pk},
-    )
+    by_id = {
+        user.id: user
+        for user in User.objects.filter(id__in=user_ids).select_related(
+            'crushprofile', 'email_preference',
+        )
+    }
+    missing = [
+        user for user in by_id.values()
+        if not hasattr(user, 'email_preference')
+    ]
+    if missing:
+        EmailPreference.objects.bulk_create(
+            [EmailPreference(user=user) for user in missing],
+            ignore_conflicts=True,
+        )
+        # Re-read rather than trust the instances: a concurrent creator's row
+        # (and its unsubscribe token) wins the conflict
+        created = {
+            pref.user_id: pref
+            for pref in EmailPreference.objects.filter(user__in=missing)
+        }
+        for user in missing:
+            user.email_preference = created[user.id]
+    return [by_id[user_id] for user_id in user_ids if user_id in by_id]
+
+
+def _upsert_recipients(rows, update_fields):
+    """Insert NewsletterRecipient rows, updating existing (newsletter, user) rows."""
+    if rows:
+        NewsletterRecipient.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['newsletter', 'user'],
+            update_fields=update_fields,
+        )
 
-    # Get event image URL if available
-    event_image_url = None
-    if event.image:
-        try:
-            event_image_url = event.image.url
-        except Exception:
-            pass
 
-    with translation.override(lang):
-        subject = translation.gettext("New Event: %(title)s") % {
-            'title': event.title,
-        }
+def _recipient_states(newsletter, users):
+    """{user_id: (status, error_message)} of existing rows, for _release_claims."""
+    return {
+        user_id: (status, error_message)
+        for user_id, status, error_message in NewsletterRecipient.objects.filter(
+            newsletter=newsletter, user__in=users,
+        ).values_list('user_id', 'status', 'error_message')
+    }
 
-        context = {
-            'user': user,
-            'first_name': user.first_name,
-            'event': event,
-            'event_title': event.title,
-            'event_description': event.description,
-            'event_image_url': event_image_url,
-            'event_url': event_url,
-            'spots_remaining': event.spots_remaining,
-            'unsubscribe_url': unsubscribe_url,
-            'home_url': build_absolute_url('crush_lu:home', lang=lang),
-            'about_url': build_absolute_url('crush_lu:about', lang=lang),
-            'events_url': build_absolute_url('crush_lu:event_list', lang=lang),
-            'settings_url': build_absolute_url(
-                'crush_lu:account_settings', lang=lang
-            ),
-            'social_links': get_social_links(),
-            'LANGUAGE_CODE': lang,
-        }
 
-        html_message = render_to_string(
-            'crush_lu/emails/event_announcement.html', context
+def _release_claims(newsletter, users, prior):
+    """
+    Undo the pre-send claims of users an aborted run never got to.
+
+    Left 'pending', they would read as a crashed send: excluded from every
+    bounded run and swept to 'failed' without ever being attempted.
+    """
+    if not users:
+        return
+    _upsert_recipients(
+        [
+            NewsletterRecipient(
+                newsletter=newsletter, user=user, email=user.email,
+                status=prior[user.id][0], error_message=prior[user.id][1],
+            )
+            for user in users if user.id in prior
+        ],
+        ['status', 'error_message'],
+    )
+    NewsletterRecipient.objects.filter(
+        newsletter=newsletter,
+        user__in=[user for user in users if user.id not in prior],
+    ).delete()
+
+
+def _send_chunk_batched(renderer, users, link_rewriter, bucket):
+    """Render a chunk and hand it to the transport in one call."""
+    results = []
+    messages = []
+    for user in users:
+        try:
+            messages.append((user, build_domain_email(
+                **_newsletter_email_kwargs(renderer, user, link_rewriter)
+            )))
+        except Exception as e:
+            results.append((user, e))
+    if messages:
+        if bucket is not None:
+            bucket.acquire(len(messages))
+        errors = send_domain_email_batch(
+            [email for _, email in messages],
+            domain='crush.lu',
+            from_email=NEWSLETTER_FROM_EMAIL,
         )
+        results.extend(zip([user for user, _ in messages], errors))
+    return results
+
+
+def _send_chunk_individually(renderer, users, link_rewriter, bucket,
+                             should_abort):
+    """
+    Send a chunk one message at a time, checking should_abort between sends.
 
-    return subject, html_message
+    Returns:
+        tuple: ([(user, exception or None), ...] for the users attempted,
+            whether the run was aborted)
+    """
+    results = []
+    for i, user in enumerate(users):
+        # The chunk loop already asked before the first user
+        if i and should_abort is not None and should_abort():
+            return results, True
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            _send_newsletter_to_user(
+                renderer.newsletter, user, link_rewriter, renderer=renderer,
+            )
+            results.append((user, None))
+        except Exception as e:
+            results.append((user, e))
+    return results, False
 
 
 NEWSLETTER_TEMPLATE_MAP = {
@@ -505,80 +639,143 @@ NEWSLETTER_TEMPLATE_MAP = {
 }
 
 
-def _send_newsletter_to_user(newsletter, user, link_rewriter=None):
+class _NewsletterRenderer:
     """
-    Render and send a newsletter email to a single user.
+    Renders one newsletter for many recipients.
 
-    Uses the user's preferred language for template rendering and URL generation.
-    For event announcements, renders event_announcement.html with translated content.
-    For standard/patch_notes newsletters, selects the template based on newsletter_type
-    and reads translated fields inside translation.override() for correct language.
-    Sends from love@crush.lu via Graph API.
+    The template, subject and every URL that does not depend on the recipient
+    are resolved once per language; per user only the greeting and the
+    unsubscribe link change.
+
+    Event announcements auto-generate their content from the event in each
+    user's language. Standard/patch_notes newsletters select the template by
+    newsletter_type and read translated fields inside translation.override()
+    so modeltranslation returns the right language variant.
     """
-    from .models import EmailPreference
 
-    lang = get_user_preferred_language(user=user, default='en')
+    def __init__(self, newsletter):
+        self.newsletter = newsletter
+        self.social_links = get_social_links()
+        self._languages = {}
 
-    if newsletter.event_id:
-        # Event announcement: auto-generate content per-user in their language
-        subject, html_message = render_event_announcement(
-            newsletter.event, user, lang
-        )
-        plain_message = strip_tags(html_message)
-    else:
-        email_prefs = EmailPreference.get_or_create_for_user(user)
-        unsubscribe_url = build_absolute_url(
-            'crush_lu:email_unsubscribe',
-            lang=lang,
-            kwargs={'token': email_prefs.unsubscribe_token},
-        )
+    def _prepare(self, lang):
+        newsletter = self.newsletter
+        context = {
+            'home_url': build_absolute_url('crush_lu:home', lang=lang),
+            'about_url': build_absolute_url('crush_lu:about', lang=lang),
+            'events_url': build_absolute_url('crush_lu:event_list', lang=lang),
+            'settings_url': build_absolute_url(
+                'crush_lu:account_settings', lang=lang
+            ),
+            'social_links': self.social_links,
+            'LANGUAGE_CODE': lang,
+        }
 
-        # Select template based on newsletter type
-        template_name = NEWSLETTER_TEMPLATE_MAP.get(
-            newsletter.newsletter_type, 'crush_lu/emails/newsletter.html'
-        )
+        with translation.override(lang):
+            if newsletter.event_id:
+                event = newsletter.event
+                template_name = 'crush_lu/emails/event_announcement.html'
+                subject = translation.gettext("New Event: %(title)s") % {
+                    'title': event.title,
+                }
+                body_text = ''
+
+                # Get event image URL if available
+                event_image_url = None
+                if event.image:
+                    try:
+                        event_image_url = event.image.url
+                    except Exception:
+                        pass
+
+                context.update({
+                    'event': event,
+                    'event_title': event.title,
+                    'event_description': event.description,
+                    'event_image_url': event_image_url,
+                    'event_url': build_absolute_url(
+                        'crush_lu:event_detail',
+                        lang=lang,
+                        kwargs={'event_id': event.pk},
+                    ),
+                    'spots_remaining': event.spots_remaining,
+                })
+            else:
+                template_name = NEWSLETTER_TEMPLATE_MAP.get(
+                    newsletter.newsletter_type, 'crush_lu/emails/newsletter.html'
+                )
+                subject = newsletter.subject
+                body_text = newsletter.body_text
+                context['body_html'] = newsletter.body_html
+
+        return get_template(template_name), subject, body_text, context
+
+    def render(self, user, lang):
+        """
+        Returns:
+            tuple: (subject, plain_message, html_message)
+        """
+        if lang not in self._languages:
+            self._languages[lang] = self._prepare(lang)
+        template, subject, body_text, shared = self._languages[lang]
 
-        # Read translated fields and render template inside translation.override()
-        # so that modeltranslation returns the correct language variant
+        context = {
+            **shared,
+            'user': user,
+            'first_name': user.first_name,
+            'unsubscribe_url': build_absolute_url(
+                'crush_lu:email_unsubscribe',
+                lang=lang,
+                kwargs={'token': _email_preference(user).unsubscribe_token},
+            ),
+        }
         with translation.override(lang):
-            subject = newsletter.subject
-            body_html = newsletter.body_html
-            body_text = newsletter.body_text
-
-            context = {
-                'user': user,
-                'first_name': user.first_name,
-                'body_html': body_html,
-                'unsubscribe_url': unsubscribe_url,
-                'home_url': build_absolute_url('crush_lu:home', lang=lang),
-                'about_url': build_absolute_url('crush_lu:about', lang=lang),
-                'events_url': build_absolute_url(
-                    'crush_lu:event_list', lang=lang
-                ),
-                'settings_url': build_absolute_url(
-                    'crush_lu:account_settings', lang=lang
-                ),
-                'social_links': get_social_links(),
-                'LANGUAGE_CODE': lang,
-            }
+            html_message = template.render(context)
 
-            html_message = render_to_string(template_name, context)
+        plain_message = body_text or strip_tags(html_message)
+        return subject, plain_message, html_message
 
-        if body_text:
-            plain_message = body_text
-        else:
-            plain_message = strip_tags(html_message)
+
+def _email_preference(user):
+    """The user's EmailPreference, created on first use."""
+    from .models import EmailPreference
+
+    try:
+        return user.email_preference
+    except EmailPreference.DoesNotExist:
+        return EmailPreference.get_or_create_for_user(user)
+
+
+def _newsletter_email_kwargs(renderer, user, link_rewriter=None):
+    """send_domain_email / build_domain_email arguments for one recipient."""
+    lang = get_user_preferred_language(user=user, default='en')
+    subject, plain_message, html_message = renderer.render(user, lang)
 
     if link_rewriter is not None:
         # After plain_message is derived, so the text part keeps direct URLs.
         html_message = link_rewriter(html_message, user)
 
+    return {
+        'subject': subject,
+        'message': plain_message,
+        'html_message': html_message,
+        'recipient_list': [user.email],
+        'from_email': NEWSLETTER_FROM_EMAIL,
+    }
+
+
+def _send_newsletter_to_user(newsletter, user, link_rewriter=None,
+                             renderer=None):
+    """
+    Render and send a newsletter email to a single user.
+
+    Uses the user's preferred language for template rendering and URL
+    generation. Sends from love@crush.lu via Graph API. send_newsletter passes
+    its run's ``renderer``, so per-language work is not repeated.
+    """
+    renderer = renderer or _NewsletterRenderer(newsletter)
     send_domain_email(
-        subject=subject,
-        message=plain_message,
-        html_message=html_message,
-        recipient_list=[user.email],
-        from_email='love@crush.lu',
+        **_newsletter_email_kwargs(renderer, user, link_rewriter),
         domain='crush.lu',
         fail_silently=False,
     )
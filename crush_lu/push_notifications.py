@@ -3,12 +3,23 @@ Crush.lu Push Notification Utilities
 Handles Web Push API notifications for PWA users
 """
 
+import base64
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import http_ece
+import httpx
+from cryptography.hazmat.primitives.asymmetric import ec
 from django.conf import settings
+from django.db.models import F
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import override, gettext as _
+from py_vapid import Vapid
 from pywebpush import webpush, WebPushException
 from .models import PushSubscription
 from .utils.i18n import get_user_preferred_language
@@ -68,6 +79,18 @@ def get_user_language_url(user, url_name, **kwargs):
         return reverse(url_name, **kwargs)
 
 
+def build_push_payload(title, body, url='/', tag='crush-notification', icon=None, badge=None):
+    """The JSON payload the service worker turns into a notification."""
+    return {
+        'title': title,
+        'body': body,
+        'url': url,
+        'tag': tag,
+        'icon': icon or '/static/crush_lu/icons/icon-192x192.png',
+        'badge': badge or '/static/crush_lu/icons/icon-72x72.png',
+    }
+
+
 def send_push_notification(user, title, body, url='/', tag='crush-notification', icon=None, badge=None):
     """
     Send a push notification to all of a user's subscribed devices.
@@ -99,25 +122,16 @@ def send_push_notification(user, title, body, url='/', tag='crush-notification',
         return {'success': 0, 'failed': 0, 'total': 0}
 
     # Get all active subscriptions for this user
-    subscriptions = PushSubscription.objects.filter(user=user, enabled=True)
+    subscriptions = list(PushSubscription.objects.filter(user=user, enabled=True))
 
-    if not subscriptions.exists():
+    if not subscriptions:
         logger.info(f"No active push subscriptions for user {user.username}")
         return {'success': 0, 'failed': 0, 'total': 0}
 
-    # Prepare notification payload
-    payload = {
-        'title': title,
-        'body': body,
-        'url': url,
-        'tag': tag,
-        'icon': icon or '/static/crush_lu/icons/icon-192x192.png',
-        'badge': badge or '/static/crush_lu/icons/icon-72x72.png',
-    }
+    payload = build_push_payload(title, body, url=url, tag=tag, icon=icon, badge=badge)
 
-    # Track results
-    success_count = 0
-    failed_count = 0
+    # Per-device outcomes, written back in bulk once every device was tried
+    outcomes = {}
 
     # Send to each subscription
     for subscription in subscriptions:
@@ -141,9 +155,7 @@ def send_push_notification(user, title, body, url='/', tag='crush-notification',
                 }
             )
 
-            # Mark success
-            subscription.mark_success()
-            success_count += 1
+            outcomes[subscription.pk] = PUSH_SENT
             logger.info(f"Push notification sent to {user.username} ({subscription.device_name})")
 
         except WebPushException as e:
@@ -152,20 +164,22 @@ def send_push_notification(user, title, body, url='/', tag='crush-notification',
             # 410 Gone = subscription permanently invalid, delete immediately
             if e.response is not None and e.response.status_code == 410:
                 logger.info(f"Deleting expired subscription for {user.username} ({subscription.device_name})")
-                subscription.delete()
+                outcomes[subscription.pk] = PUSH_GONE
             else:
-                subscription.mark_failure()  # Auto-deletes after 5 failures
-            failed_count += 1
+                outcomes[subscription.pk] = PUSH_FAILED  # Auto-deletes after 5 failures
 
         except Exception as e:
             # Catch-all for unexpected errors
             logger.error(f"Unexpected error sending push to {user.username}: {e}")
-            failed_count += 1
+            outcomes[subscription.pk] = PUSH_ERROR
+
+    record_push_outcomes(outcomes)
+    success_count = sum(1 for outcome in outcomes.values() if outcome == PUSH_SENT)
 
     return {
         'success': success_count,
-        'failed': failed_count,
-        'total': subscriptions.count()
+        'failed': len(subscriptions) - success_count,
+        'total': len(subscriptions)
     }
 
 
@@ -201,15 +215,7 @@ def send_push_to_subscription(subscription, title, body, url='/', tag='crush-not
     if not subscription.enabled:
         return {'success': False, 'error': 'Subscription is disabled'}
 
-    # Prepare notification payload
-    payload = {
-        'title': title,
-        'body': body,
-        'url': url,
-        'tag': tag,
-        'icon': icon or '/static/crush_lu/icons/icon-192x192.png',
-        'badge': badge or '/static/crush_lu/icons/icon-72x72.png',
-    }
+    payload = build_push_payload(title, body, url=url, tag=tag, icon=icon, badge=badge)
 
     try:
         # Prepare subscription info for pywebpush
@@ -248,6 +254,180 @@ def send_push_to_subscription(subscription, title, body, url='/', tag='crush-not
         return {'success': False, 'error': str(e)}
 
 
+# =============================================================================
+# Batched fan-out (campaigns)
+# =============================================================================
+#
+# send_push_notification above talks to one user's handful of devices and is
+# fine serially. A campaign tick fans out to hundreds of devices, where serial
+# HTTPS round-trips (plus a fresh VAPID signature and connection per request
+# inside pywebpush) dominate. send_push_batch instead:
+#
+# - signs one VAPID JWT per push-service origin (FCM, Mozilla, Apple, ...),
+# - encrypts and POSTs from a bounded thread pool over one pooled HTTP/2
+#   client, so requests to the same service share connections,
+# - writes device health back in a handful of bulk statements at the end.
+
+PUSH_BATCH_CONCURRENCY = 16
+PUSH_REQUEST_TIMEOUT = 10.0
+# RFC 8292 caps VAPID JWTs at 24h; 12h matches pywebpush.
+VAPID_TOKEN_LIFETIME = 12 * 60 * 60
+
+# Per-device outcomes, as recorded by record_push_outcomes().
+PUSH_SENT = 'sent'
+PUSH_GONE = 'gone'  # 410: the browser dropped the subscription
+PUSH_FAILED = 'failed'  # rejected by the push service; counts towards deletion
+PUSH_ERROR = 'error'  # our side / network; device health is left alone
+
+
+def record_push_outcomes(outcomes):
+    """Apply ``{subscription_id: outcome}`` to PushSubscription in bulk.
+
+    Same bookkeeping as ``PushSubscription.mark_success``/``mark_failure``
+    and the 410 delete, in at most four statements however many devices
+    were tried.
+    """
+    by_outcome = {}
+    for subscription_id, outcome in outcomes.items():
+        by_outcome.setdefault(outcome, []).append(subscription_id)
+
+    if by_outcome.get(PUSH_SENT):
+        PushSubscription.objects.filter(pk__in=by_outcome[PUSH_SENT]).update(
+            last_used_at=timezone.now(), failure_count=0
+        )
+    if by_outcome.get(PUSH_GONE):
+        PushSubscription.objects.filter(pk__in=by_outcome[PUSH_GONE]).delete()
+    if by_outcome.get(PUSH_FAILED):
+        failed = PushSubscription.objects.filter(pk__in=by_outcome[PUSH_FAILED])
+        failed.update(failure_count=F('failure_count') + 1)
+        failed.filter(
+            failure_count__gte=PushSubscription.MAX_FAILURES
+        ).delete()
+
+
+def _b64decode(value):
+    value = value.encode('utf8') if isinstance(value, str) else value
+    return base64.urlsafe_b64decode(value + b'=' * (-len(value) % 4))
+
+
+def _push_origin(endpoint):
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _encrypt_payload(subscription, data):
+    """RFC 8291 aes128gcm body for one subscription (what pywebpush does)."""
+    return http_ece.encrypt(
+        data,
+        private_key=ec.generate_private_key(ec.SECP256R1()),
+        dh=_b64decode(subscription.p256dh_key),
+        auth_secret=_b64decode(subscription.auth_key),
+        version='aes128gcm',
+    )
+
+
+def _push_client(concurrency, timeout):
+    """Pooled client shared by every worker thread of one batch."""
+    return httpx.Client(
+        http2=True,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+    )
+
+
+def _deliver(client, subscription, data, vapid_headers):
+    """Encrypt and POST one message; returns a PUSH_* outcome."""
+    try:
+        body = _encrypt_payload(subscription, data)
+    except Exception as e:
+        # Malformed keys can never decrypt: same as a push-service rejection
+        logger.warning(f"Cannot encrypt push for subscription {subscription.pk}: {e}")
+        return PUSH_FAILED
+
+    headers = dict(vapid_headers)
+    headers.update({'Content-Encoding': 'aes128gcm', 'TTL': '0'})
+    try:
+        response = client.post(subscription.endpoint, content=body, headers=headers)
+    except httpx.HTTPError as e:
+        logger.warning(f"Push request failed for subscription {subscription.pk}: {e}")
+        return PUSH_ERROR
+
+    if response.status_code <= 202:
+        return PUSH_SENT
+    if response.status_code == 410:
+        return PUSH_GONE
+    logger.warning(
+        f"Push service rejected subscription {subscription.pk}: "
+        f"{response.status_code} {response.text[:200]}"
+    )
+    return PUSH_FAILED
+
+
+def deliver_push_batch(deliveries, vapid=None, concurrency=PUSH_BATCH_CONCURRENCY, timeout=PUSH_REQUEST_TIMEOUT):
+    """
+    Encrypt and send many notifications concurrently, without touching the DB.
+
+    Args:
+        deliveries: iterable of ``(PushSubscription, payload)`` pairs, the
+            payload as returned by build_push_payload()
+        vapid: py_vapid.Vapid signer (default: settings.VAPID_PRIVATE_KEY)
+        concurrency: maximum requests in flight
+        timeout: per-request timeout in seconds
+
+    Returns:
+        dict: {subscription_id: PUSH_SENT | PUSH_GONE | PUSH_FAILED | PUSH_ERROR}
+    """
+    deliveries = list(deliveries)
+    if not deliveries:
+        return {}
+    if vapid is None:
+        vapid = Vapid.from_string(private_key=settings.VAPID_PRIVATE_KEY)
+
+    # One signature per push service, not per device
+    expires = int(time.time()) + VAPID_TOKEN_LIFETIME
+    vapid_headers = {
+        origin: vapid.sign({
+            'sub': f"mailto:{getattr(settings, 'VAPID_ADMIN_EMAIL', 'noreply@crush.lu')}",
+            'aud': origin,
+            'exp': expires,
+        })
+        for origin in {_push_origin(sub.endpoint) for sub, _ in deliveries}
+    }
+
+    with _push_client(concurrency, timeout) as client, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            subscription.pk: pool.submit(
+                _deliver,
+                client,
+                subscription,
+                json.dumps(payload).encode('utf8'),
+                vapid_headers[_push_origin(subscription.endpoint)],
+            )
+            for subscription, payload in deliveries
+        }
+        return {pk: future.result() for pk, future in futures.items()}
+
+
+def send_push_batch(deliveries, concurrency=PUSH_BATCH_CONCURRENCY, timeout=PUSH_REQUEST_TIMEOUT):
+    """
+    Fan out many notifications and record device health in bulk.
+
+    See deliver_push_batch() for the arguments and return value. Returns
+    an empty dict when VAPID is not configured.
+    """
+    if not getattr(settings, 'VAPID_PRIVATE_KEY', '') or not getattr(settings, 'VAPID_PUBLIC_KEY', ''):
+        logger.error("VAPID keys not configured in settings")
+        return {}
+
+    outcomes = deliver_push_batch(deliveries, concurrency=concurrency, timeout=timeout)
+    record_push_outcomes(outcomes)
+    return outcomes
+
+
 def send_event_reminder(user, event):
     """
     Send event reminder notification.
@@ -0,0 +1,330 @@
+# crush_lu/services/activity_buffer.py
+"""
+Write-behind buffer for UserActivityMiddleware.
+
+With ``USER_ACTIVITY_WRITE_BEHIND`` on, the middleware no longer touches the
+database: every tracked request appends one ``(user_id, timestamp, pwa)``
+event here, and ``flush_activity_buffer()`` later coalesces the events per user
+and applies them with a handful of bulk statements. The activity tables' write
+rate then follows the number of active users per flush instead of the request
+rate.
+
+Where the events live:
+- Redis (a capped list) when the default cache is django-redis, so every
+  worker shares one buffer and the ``flush_user_activity`` command — driven by
+  the ActivityFlush Azure Function timer via ``/api/admin/activity-flush/`` —
+  drains it.
+- Otherwise an in-process ring buffer (local dev, tests, or while Redis is
+  unreachable). Nothing outside the process can drain that, so the process
+  flushes it itself on a short-lived background thread once it is large or old
+  enough.
+
+Both buffers are bounded: under a flusher outage the oldest events are dropped
+rather than growing without limit. Losing a few last_seen bumps is the same
+trade the cache-gated synchronous path already makes.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache, caches
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "crush_lu:activity_buffer"
+MAX_BUFFERED_EVENTS = 100_000
+
+# Events applied per transaction; a flush runs batches until the buffer is
+# empty or FLUSH_TIME_BUDGET_SECONDS is spent, leaving the rest to the next run.
+# The budget stays inside the ActivityFlush timer's 60s HTTP timeout.
+FLUSH_BATCH_SIZE = 20_000
+FLUSH_TIME_BUDGET_SECONDS = 45
+
+# In-process buffer: flush once it holds this many events or its oldest event
+# is this old, whichever comes first
+LOCAL_FLUSH_EVENTS = 500
+LOCAL_FLUSH_SECONDS = 60
+
+FLUSH_LOCK_KEY = "crush_lu:activity_flush_lock"
+FLUSH_LOCK_TIMEOUT = 300
+
+_local_events = deque(maxlen=MAX_BUFFERED_EVENTS)
+_local_lock = threading.Lock()
+_local_oldest = None
+_local_flushing = False
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _encode(user_id, when, pwa):
+    # Integer microseconds: a float round trip would drift last_seen
+    micros = (when - _EPOCH) // timedelta(microseconds=1)
+    return f"{user_id}|{micros}|{1 if pwa else 0}"
+
+
+def _decode(raw):
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    user_id, micros, pwa = raw.split("|")
+    return int(user_id), _EPOCH + timedelta(microseconds=int(micros)), pwa == "1"
+
+
+def _redis():
+    """Raw Redis client when Redis backs the default cache, else None."""
+    if "RedisCache" not in caches["default"].__class__.__name__:
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def record_activity(user_id, when=None, pwa=False):
+    """Append one activity event. Never raises and never queries the DB."""
+    event = _encode(user_id, when or timezone.now(), pwa)
+    try:
+        client = _redis()
+        if client is not None:
+            pipe = client.pipeline(transaction=False)
+            pipe.rpush(REDIS_KEY, event)
+            pipe.ltrim(REDIS_KEY, -MAX_BUFFERED_EVENTS, -1)
+            pipe.execute()
+            return
+    except Exception as e:  # noqa: BLE001 — fall back to the local buffer
+        logger.debug("activity buffer push failed (%s); buffering in-process", e)
+
+    _append_local(event)
+
+
+def _append_local(event):
+    global _local_oldest, _local_flushing
+
+    now = time.monotonic()
+    with _local_lock:
+        _local_events.append(event)
+        if _local_oldest is None:
+            _local_oldest = now
+        due = (
+            len(_local_events) >= LOCAL_FLUSH_EVENTS
+            or now - _local_oldest >= LOCAL_FLUSH_SECONDS
+        )
+        if not due or _local_flushing:
+            return
+        _local_flushing = True
+
+    threading.Thread(
+        target=_flush_local_in_background, name="activity-flush", daemon=True
+    ).start()
+
+
+def _flush_local_in_background():
+    global _local_flushing
+    try:
+        flush_activity_buffer(include_redis=False)
+    except Exception:  # noqa: BLE001 — a background flush must never crash
+        logger.exception("[activity_buffer] background flush failed")
+    finally:
+        _local_flushing = False
+        # This thread opened its own connection; don't leak it
+        connection.close()
+
+
+def _drain_local(limit):
+    global _local_oldest
+    with _local_lock:
+        count = min(limit, len(_local_events))
+        events = [_local_events.popleft() for _ in range(count)]
+        _local_oldest = time.monotonic() if _local_events else None
+    return events
+
+
+def _drain_redis(limit):
+    client = _redis()
+    if client is None:
+        return []
+    pipe = client.pipeline(transaction=True)
+    pipe.lrange(REDIS_KEY, 0, limit - 1)
+    pipe.ltrim(REDIS_KEY, limit, -1)
+    events, _ = pipe.execute()
+    return events
+
+
+def _requeue_local(events):
+    """Put a failed batch back at the head of the in-process buffer."""
+    global _local_oldest
+    with _local_lock:
+        room = MAX_BUFFERED_EVENTS - len(_local_events)
+        # Over the cap the oldest events go, as on append
+        _local_events.extendleft(reversed(events[max(0, len(events) - room):]))
+        if _local_events and _local_oldest is None:
+            _local_oldest = time.monotonic()
+
+
+def _requeue_redis(events):
+    """Put a failed batch back at the head of the Redis list."""
+    client = _redis()
+    if client is None or not events:
+        return
+    pipe = client.pipeline(transaction=True)
+    pipe.lpush(REDIS_KEY, *reversed(events))
+    pipe.ltrim(REDIS_KEY, -MAX_BUFFERED_EVENTS, -1)
+    pipe.execute()
+
+
+def pending_events():
+    """Events waiting in the buffer (Redis plus this process)."""
+    count = len(_local_events)
+    client = _redis()
+    if client is not None:
+        count += client.llen(REDIS_KEY)
+    return count
+
+
+def flush_activity_buffer(
+    limit=FLUSH_BATCH_SIZE, include_redis=True, time_budget=FLUSH_TIME_BUDGET_SECONDS
+):
+    """
+    Drain buffered activity events and apply them in bulk.
+
+    Runs batches of ``limit`` events, each in its own transaction, until the
+    buffer is empty or ``time_budget`` seconds have passed. A batch that fails
+    to apply is put back at the head of the buffer before the error
+    propagates, so nothing is lost to a failed write.
+
+    Serialized with a cache lock: visit counts are computed from the stored
+    last_seen, so two overlapping flushes would overwrite each other's
+    increments.
+
+    Returns:
+        dict: events, users and daily rows processed, and the batches run;
+            ``skipped`` is True when another flush held the lock
+    """
+    from crush_lu.middleware import ACTIVITY_UPDATE_INTERVAL
+
+    if not cache.add(FLUSH_LOCK_KEY, 1, FLUSH_LOCK_TIMEOUT):
+        return {"events": 0, "users": 0, "days": 0, "batches": 0, "skipped": True}
+
+    result = {"events": 0, "users": 0, "days": 0, "batches": 0, "skipped": False}
+    deadline = time.monotonic() + time_budget
+    try:
+        while True:
+            local = _drain_local(limit)
+            remote = []
+            if include_redis and len(local) < limit:
+                remote = _drain_redis(limit - len(local))
+            raw = local + remote
+            if not raw:
+                break
+
+            by_user = defaultdict(list)
+            for item in raw:
+                try:
+                    user_id, when, pwa = _decode(item)
+                except ValueError:
+                    continue
+                by_user[user_id].append((when, pwa))
+
+            try:
+                days = _apply_events(by_user, ACTIVITY_UPDATE_INTERVAL)
+            except Exception:
+                _requeue_local(local)
+                _requeue_redis(remote)
+                raise
+
+            result["events"] += len(raw)
+            result["users"] += len(by_user)
+            result["days"] += days
+            result["batches"] += 1
+            if len(raw) < limit or time.monotonic() >= deadline:
+                break
+        return result
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def _apply_events(by_user, visit_interval):
+    """Coalesce per user and write UserActivity + DailyUserActivity in bulk."""
+    from django.contrib.auth import get_user_model
+
+    from crush_lu.models import DailyUserActivity, UserActivity
+
+    if not by_user:
+        return 0
+
+    # Events can outlive their user (deleted between request and flush)
+    live_ids = set(
+        get_user_model().objects.filter(pk__in=by_user).values_list("pk", flat=True)
+    )
+    existing = {
+        activity.user_id: activity
+        for activity in UserActivity.objects.filter(user_id__in=live_ids)
+    }
+
+    to_create = []
+    to_update = []
+    daily = {}
+    for user_id in live_ids:
+        events = sorted(by_user[user_id])
+        activity = existing.get(user_id)
+
+        # Same visit semantics as the synchronous path: a request counts as a
+        # visit when it lands at least visit_interval after the last counted one
+        last_counted = activity.last_seen if activity else None
+        visits = 0
+        for ts, _pwa in events:
+            if last_counted is None or (ts - last_counted).total_seconds() >= visit_interval:
+                visits += 1
+                last_counted = ts
+
+        latest = events[-1][0]
+        pwa_times = [ts for ts, pwa in events if pwa]
+        if activity is not None and activity.is_pwa_user:
+            # Sticky: a known PWA user's visits keep counting as PWA visits
+            pwa_times.append(latest)
+
+        if activity is None:
+            activity = UserActivity(
+                user_id=user_id, last_seen=latest, total_visits=visits
+            )
+            to_create.append(activity)
+        else:
+            activity.last_seen = max(activity.last_seen, latest)
+            activity.total_visits += visits
+            to_update.append(activity)
+        if pwa_times:
+            activity.is_pwa_user = True
+            activity.last_pwa_visit = max(
+                [activity.last_pwa_visit or pwa_times[0], *pwa_times]
+            )
+
+        for ts, pwa in events:
+            key = (user_id, timezone.localdate(ts))
+            daily[key] = daily.get(key, False) or pwa
+
+    with transaction.atomic():
+        UserActivity.objects.bulk_create(to_create, ignore_conflicts=True)
+        UserActivity.objects.bulk_update(
+            to_update,
+            ["last_seen", "total_visits", "is_pwa_user", "last_pwa_visit"],
+        )
+        DailyUserActivity.objects.bulk_create(
+            [
+                DailyUserActivity(user_id=user_id, activity_date=day, was_pwa=pwa)
+                for (user_id, day), pwa in daily.items()
+            ],
+            ignore_conflicts=True,
+        )
+        # Rows that already existed keep their flag; upgrade, never downgrade
+        pwa_days = Q()
+        for (user_id, day), pwa in daily.items():
+            if pwa:
+                pwa_days |= Q(user_id=user_id, activity_date=day)
+        if pwa_days:
+            DailyUserActivity.objects.filter(pwa_days, was_pwa=False).update(was_pwa=True)
+
+    return len(daily)
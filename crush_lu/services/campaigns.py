@@ -45,10 +45,12 @@ logger = logging.getLogger(__name__)
 # - Email: exactly one Graph API batch (send_newsletter pauses 62s only
 #   *between* 25-email batches, so a 25-email run never sleeps).
 # - WhatsApp: sends are spaced ~1s apart (pair rate-limit hygiene).
-# - Push: webpush calls are fast but still network I/O.
+# - Push: fanned out concurrently (send_push_batch), PUSH_SEND_CHUNK users
+#   at a time, so a chunk costs roughly one request timeout at worst.
 EMAIL_LIMIT_PER_TICK = 25
 WHATSAPP_LIMIT_PER_TICK = 30
 PUSH_LIMIT_PER_TICK = 150
+PUSH_SEND_CHUNK = 50
 
 # Stop starting new channel batches once a tick has run this long.
 DISPATCH_TIME_BUDGET_SECONDS = 80
@@ -444,7 +446,7 @@ class WhatsAppAdapter:
 
 
 class PushAdapter:
-    """Web push broadcast — fans out per-user via push_notifications."""
+    """Web push broadcast — one concurrent fan-out per chunk of users."""
 
     key = Campaign.CHANNEL_PUSH
 
@@ -454,8 +456,6 @@ class PushAdapter:
         return _exclude_processed(users, campaign, self.key)
 
     def send_batch(self, campaign, limit, deadline=None, stdout=None):
-        from crush_lu.push_notifications import send_push_notification
-
         users = self.eligible_users(campaign)
         user_ids = list(users.values_list('id', flat=True)[:limit])
 
@@ -464,9 +464,9 @@ class PushAdapter:
             getattr(settings, 'VAPID_PRIVATE_KEY', '')
             and getattr(settings, 'VAPID_PUBLIC_KEY', '')
         ):
-            # Config failure, not an empty audience: send_push_notification
-            # would zero out every user and this batch would record them all
-            # as skipped, letting the campaign finalize as 'sent' without a
+            # Config failure, not an empty audience: send_push_batch would
+            # send nothing and this batch would record every user as
+            # skipped, letting the campaign finalize as 'sent' without a
             # single push attempted. Defer instead so a config fix resumes it.
             logger.error(
                 "Campaign #%s push batch deferred: VAPID keys are not "
@@ -475,89 +475,135 @@ class PushAdapter:
             result.interrupted = True
             result.remaining = users.count()
             return result
-        for user_id in user_ids:
+
+        # Deadline and cancellation are checked per chunk rather than per
+        # user: a chunk is one concurrent fan-out bounded by the request
+        # timeout, not PUSH_SEND_CHUNK sequential round-trips.
+        for start in range(0, len(user_ids), PUSH_SEND_CHUNK):
             if deadline is not None and time_module.monotonic() > deadline:
                 result.interrupted = True
                 break
             if _is_cancelled(campaign):
                 result.interrupted = True
                 break
+            self._send_chunk(
+                campaign, user_ids[start:start + PUSH_SEND_CHUNK], result,
+            )
 
-            user = User.objects.filter(id=user_id).first()
-            if user is None:
-                continue
+        result.remaining = self.eligible_users(campaign).count()
+        return result
+
+    def _send_chunk(self, campaign, user_ids, result):
+        from crush_lu.models import PushSubscription
+        from crush_lu.push_notifications import (
+            PUSH_SENT,
+            build_push_payload,
+            send_push_batch,
+        )
+
+        users = self._claim(campaign, user_ids)
+        if not users:
+            return
+
+        payloads = {}
+        for user in users:
             lang = get_user_preferred_language(user=user, default='en')
+            # Read the modeltranslation variants for the user's language.
+            with translation.override(lang):
+                title = campaign.push_title
+                body = campaign.push_body
+            payloads[user.pk] = build_push_payload(
+                title,
+                body,
+                url=self.build_push_url(campaign, user),
+                tag=f'campaign-{campaign.slug}',
+            )
 
-            # Durable pre-send claim (same pattern as WhatsApp): a worker
-            # dying after delivery but before the receipt lands must not
-            # cause a duplicate push on the next tick.
-            claim, created = CampaignRecipient.objects.get_or_create(
-                campaign=campaign,
-                channel=self.key,
-                user=user,
-                defaults={
-                    'status': 'pending',
-                    'error_message': 'claimed for send',
-                },
+        subscriptions = list(PushSubscription.objects.filter(
+            user_id__in=payloads, enabled=True,
+        ))
+        try:
+            outcomes = send_push_batch(
+                (sub, payloads[sub.user_id]) for sub in subscriptions
             )
-            if not created and claim.status != 'pending':
-                continue  # processed by a concurrent tick
+        except Exception as exc:  # noqa: BLE001 — record and continue
+            logger.exception(
+                "Campaign #%s push fan-out crashed for %s users",
+                campaign.pk, len(payloads),
+            )
+            self._record(
+                campaign, list(payloads), 'failed', error=str(exc)[:500],
+            )
+            result.failed += len(payloads)
+            return
+
+        delivered, attempted = set(), set()
+        for sub in subscriptions:
+            attempted.add(sub.user_id)
+            if outcomes.get(sub.pk) == PUSH_SENT:
+                delivered.add(sub.user_id)
+        failed = attempted - delivered
+        skipped = set(payloads) - attempted
+
+        self._record(campaign, delivered, 'sent')
+        self._record(
+            campaign, failed, 'failed', error='All push subscriptions failed',
+        )
+        self._record(
+            campaign, skipped, 'skipped', error='No active push subscriptions',
+        )
+        result.sent += len(delivered)
+        result.failed += len(failed)
+        result.skipped += len(skipped)
 
-            try:
-                # Read the modeltranslation variants for the user's language.
-                with translation.override(lang):
-                    title = campaign.push_title
-                    body = campaign.push_body
-                outcome = send_push_notification(
-                    user,
-                    title,
-                    body,
-                    url=self.build_push_url(campaign, user),
-                    tag=f'campaign-{campaign.slug}',
-                )
-            except Exception as exc:  # noqa: BLE001 — record and continue
-                logger.exception(
-                    "Campaign #%s push send crashed for user %s",
-                    campaign.pk, user_id,
-                )
-                self._record(campaign, user, 'failed', error=str(exc)[:500])
-                result.failed += 1
-                continue
+    def _claim(self, campaign, user_ids):
+        """Durable pre-send claim for a chunk (same pattern as WhatsApp).
 
-            if outcome.get('success', 0) > 0:
-                self._record(campaign, user, 'sent')
-                result.sent += 1
-            elif outcome.get('total', 0) == 0:
-                self._record(
-                    campaign, user, 'skipped',
-                    error='No active push subscriptions',
-                )
-                result.skipped += 1
-            else:
-                self._record(
-                    campaign, user, 'failed',
-                    error='All push subscriptions failed',
+        A worker dying after delivery but before the receipts land must not
+        cause a duplicate push on the next tick. Returns the claimed users;
+        rows a concurrent tick already finalized are left out.
+        """
+        CampaignRecipient.objects.bulk_create(
+            [
+                CampaignRecipient(
+                    campaign=campaign,
+                    channel=self.key,
+                    user_id=user_id,
+                    status='pending',
+                    error_message='claimed for send',
                 )
-                result.failed += 1
-
-        result.remaining = self.eligible_users(campaign).count()
-        return result
+                for user_id in user_ids
+            ],
+            ignore_conflicts=True,
+        )
+        claimed_ids = CampaignRecipient.objects.filter(
+            campaign=campaign,
+            channel=self.key,
+            user_id__in=user_ids,
+            status='pending',
+        ).values_list('user_id', flat=True)
+        return list(
+            User.objects.filter(id__in=claimed_ids)
+            .select_related('crushprofile')
+            .order_by('id')
+        )
 
     def build_push_url(self, campaign, user):
         return build_tracked_url(
             campaign.push_url or '/', campaign, self.key, user,
         )
 
-    def _record(self, campaign, user, status, error=''):
-        CampaignRecipient.objects.update_or_create(
+    def _record(self, campaign, user_ids, status, error=''):
+        if not user_ids:
+            return
+        CampaignRecipient.objects.filter(
             campaign=campaign,
             channel=self.key,
-            user=user,
-            defaults={
-                'status': status,
-                'sent_at': timezone.now() if status == 'sent' else None,
-                'error_message': error,
-            },
+            user_id__in=user_ids,
+        ).update(
+            status=status,
+            sent_at=timezone.now() if status == 'sent' else None,
+            error_message=error,
         )
 
 
@@ -0,0 +1,446 @@
+"""
+Materialized Crush Connect eligibility pool.
+
+``get_live_eligible_pool`` re-derives every catalogue gate (verification,
+onboarding, photo consent, photo, LuxID via two SocialAccount subqueries) and
+every pair rule (connections, blocks, coach pairs) on each call, for every
+candidate. This module keeps the result of that work in two tables:
+
+- ``ConnectCandidate`` — one row per onboarded member with the candidate-side
+  inputs denormalized and the static gates folded into ``is_listed``;
+- ``ConnectPairExclusion`` — directional "viewer never sees hidden" rows.
+
+Rows are refreshed from save signals on the source models
+(crush_lu/signals.py) and rebuilt by ``reconcile_connect_pool``, which also
+repairs writes that bypass signals. ``get_eligible_pool`` reads this path
+when ``settings.CONNECT_MATERIALIZED_POOL`` is on; ``check_pool_consistency``
+diffs it against the live path before and after that flag is flipped.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from crush_lu.services.crush_connect import (
+    CONNECT_INACTIVITY_WINDOW_DAYS,
+    _years_ago,
+    assigned_coach_pair_user_ids,
+    get_live_eligible_pool,
+    pool_requester,
+)
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+CANDIDATE_BATCH_SIZE = 500
+
+# Columns compared (and rewritten) by the candidate refresh. refreshed_at is
+# auto_now and deliberately left out so unchanged rows are not rewritten.
+CANDIDATE_FIELDS = (
+    "is_listed",
+    "has_luxid",
+    "has_photo",
+    "gender",
+    "date_of_birth",
+    "preferred_genders_key",
+    "preferred_age_min",
+    "preferred_age_max",
+    "last_login",
+)
+
+
+# ---------------------------------------------------------------------------
+# Candidate catalogue
+# ---------------------------------------------------------------------------
+
+
+def preferred_genders_key(genders) -> str:
+    """Encode a ``preferred_genders`` list as ``"|F|M|"`` (empty = any)."""
+    codes = sorted({g for g in (genders or []) if g})
+    return f"|{'|'.join(codes)}|" if codes else ""
+
+
+def _build_candidates(user_ids=None):
+    """Unsaved ``ConnectCandidate`` rows computed from the source tables.
+
+    One row per onboarded membership (optionally restricted to ``user_ids``),
+    in two queries — the LuxID lookups are ``Exists`` annotations, as in the
+    live pool.
+    """
+    from crush_lu.models import ConnectCandidate, CrushConnectMembership, CrushProfile
+
+    native_subq, oidc_subq = CrushProfile.luxid_account_querysets(OuterRef("user_id"))
+    memberships = (
+        CrushConnectMembership.objects.filter(onboarded_at__isnull=False)
+        .annotate(
+            _has_luxid_native=Exists(native_subq),
+            _has_luxid_oidc=Exists(oidc_subq),
+        )
+        .select_related("user", "user__crushprofile")
+    )
+    if user_ids is not None:
+        memberships = memberships.filter(user_id__in=list(user_ids))
+
+    rows = []
+    for membership in memberships.iterator(chunk_size=CANDIDATE_BATCH_SIZE):
+        profile = getattr(membership.user, "crushprofile", None)
+        has_photo = bool(profile is not None and profile.photo_1)
+        has_luxid = membership._has_luxid_native or membership._has_luxid_oidc
+        rows.append(
+            ConnectCandidate(
+                user_id=membership.user_id,
+                is_listed=(
+                    profile is not None
+                    and profile.verification_status == "verified"
+                    and not membership.excluded_by_coach
+                    and membership.photo_share_consent
+                    and has_photo
+                    and has_luxid
+                ),
+                has_luxid=has_luxid,
+                has_photo=has_photo,
+                gender=(profile.gender or "") if profile is not None else "",
+                date_of_birth=profile.date_of_birth if profile is not None else None,
+                preferred_genders_key=preferred_genders_key(
+                    membership.preferred_genders
+                ),
+                preferred_age_min=membership.preferred_age_min,
+                preferred_age_max=membership.preferred_age_max,
+                last_login=membership.user.last_login,
+            )
+        )
+    return rows
+
+
+def _sync_candidates(rows, existing_qs):
+    """Upsert ``rows`` that differ from ``existing_qs`` and drop the rest.
+
+    Returns ``(changed, removed)`` counts.
+    """
+    from crush_lu.models import ConnectCandidate
+
+    existing = {
+        values[0]: values[1:]
+        for values in existing_qs.values_list("user_id", *CANDIDATE_FIELDS)
+    }
+    changed = [
+        row
+        for row in rows
+        if existing.get(row.user_id)
+        != tuple(getattr(row, field) for field in CANDIDATE_FIELDS)
+    ]
+    stale_ids = set(existing) - {row.user_id for row in rows}
+
+    with transaction.atomic():
+        if changed:
+            ConnectCandidate.objects.bulk_create(
+                changed,
+                batch_size=CANDIDATE_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=[*CANDIDATE_FIELDS, "refreshed_at"],
+            )
+        removed = 0
+        if stale_ids:
+            removed, _ = ConnectCandidate.objects.filter(
+                user_id__in=stale_ids
+            ).delete()
+    return len(changed), removed
+
+
+def refresh_connect_candidates(user_ids) -> int:
+    """Recompute the ``ConnectCandidate`` rows of ``user_ids``.
+
+    Members without an onboarded membership lose their row. Returns the number
+    of rows written or removed.
+    """
+    from crush_lu.models import ConnectCandidate
+
+    user_ids = [uid for uid in set(user_ids) if uid]
+    if not user_ids:
+        return 0
+    changed, removed = _sync_candidates(
+        _build_candidates(user_ids),
+        ConnectCandidate.objects.filter(user_id__in=user_ids),
+    )
+    return changed + removed
+
+
+def touch_candidate_last_login(user_id, last_login) -> None:
+    """Mirror a login onto the candidate row (no-op for non-members)."""
+    from crush_lu.models import ConnectCandidate
+
+    ConnectCandidate.objects.filter(user_id=user_id).update(last_login=last_login)
+
+
+# ---------------------------------------------------------------------------
+# Pair exclusions
+# ---------------------------------------------------------------------------
+
+
+def _connection_edges(rows):
+    """Directional exclusion edges for ``(requester, recipient, flow, status)``.
+
+    Mirrors the live rule: the requester never sees the recipient; the
+    recipient stops seeing the requester unless it is a still-secret (not yet
+    ``shared``) My Crush! declaration.
+    """
+    from crush_lu.models import EventConnection
+
+    for requester_id, recipient_id, flow, status in rows:
+        if requester_id == recipient_id:
+            continue
+        yield requester_id, recipient_id
+        if not (flow == EventConnection.FLOW_CRUSH and status != "shared"):
+            yield recipient_id, requester_id
+
+
+def _symmetric_edges(pairs):
+    for a, b in pairs:
+        if a and b and a != b:
+            yield a, b
+            yield b, a
+
+
+def _exclusion_rows(edges, reason):
+    from crush_lu.models import ConnectPairExclusion
+
+    return [
+        ConnectPairExclusion(viewer_id=viewer, hidden_id=hidden, reason=reason)
+        for viewer, hidden in set(edges)
+    ]
+
+
+def refresh_pair_exclusions(user_a_id, user_b_id) -> None:
+    """Recompute the connection and block exclusions between two users."""
+    from crush_lu.models import ConnectPairExclusion, EventConnection, UserBlock
+
+    if not user_a_id or not user_b_id or user_a_id == user_b_id:
+        return
+
+    connections = EventConnection.objects.filter(
+        Q(requester_id=user_a_id, recipient_id=user_b_id)
+        | Q(requester_id=user_b_id, recipient_id=user_a_id)
+    ).values_list("requester_id", "recipient_id", "flow", "status")
+    blocks = UserBlock.objects.between(user_a_id, user_b_id).values_list(
+        "blocker_id", "blocked_id"
+    )
+    rows = _exclusion_rows(
+        _connection_edges(connections), ConnectPairExclusion.REASON_CONNECTION
+    ) + _exclusion_rows(_symmetric_edges(blocks), ConnectPairExclusion.REASON_BLOCK)
+
+    with transaction.atomic():
+        ConnectPairExclusion.objects.filter(
+            Q(viewer_id=user_a_id, hidden_id=user_b_id)
+            | Q(viewer_id=user_b_id, hidden_id=user_a_id),
+            reason__in=[
+                ConnectPairExclusion.REASON_CONNECTION,
+                ConnectPairExclusion.REASON_BLOCK,
+            ],
+        ).delete()
+        ConnectPairExclusion.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def refresh_coach_exclusions(user_id) -> None:
+    """Recompute every coach ↔ assigned-member exclusion involving ``user_id``."""
+    from crush_lu.models import ConnectPairExclusion
+
+    user = (
+        User.objects.select_related("crushprofile", "crushcoach")
+        .filter(pk=user_id)
+        .first()
+    )
+    counterparts = assigned_coach_pair_user_ids(user) if user is not None else set()
+    rows = _exclusion_rows(
+        _symmetric_edges((user_id, other) for other in counterparts),
+        ConnectPairExclusion.REASON_COACH,
+    )
+    with transaction.atomic():
+        ConnectPairExclusion.objects.filter(
+            Q(viewer_id=user_id) | Q(hidden_id=user_id),
+            reason=ConnectPairExclusion.REASON_COACH,
+        ).delete()
+        ConnectPairExclusion.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def desired_pair_exclusions():
+    """Every ``(viewer_id, hidden_id, reason)`` the source tables imply."""
+    from crush_lu.models import (
+        ConnectPairExclusion,
+        CrushProfile,
+        EventConnection,
+        UserBlock,
+    )
+
+    desired = set()
+    connections = EventConnection.objects.values_list(
+        "requester_id", "recipient_id", "flow", "status"
+    )
+    for edge in _connection_edges(connections.iterator(chunk_size=2000)):
+        desired.add((*edge, ConnectPairExclusion.REASON_CONNECTION))
+
+    blocks = UserBlock.objects.values_list("blocker_id", "blocked_id")
+    for edge in _symmetric_edges(blocks.iterator(chunk_size=2000)):
+        desired.add((*edge, ConnectPairExclusion.REASON_BLOCK))
+
+    coach_pairs = CrushProfile.objects.filter(
+        assigned_coach__isnull=False
+    ).values_list("user_id", "assigned_coach__user_id")
+    for edge in _symmetric_edges(coach_pairs.iterator(chunk_size=2000)):
+        desired.add((*edge, ConnectPairExclusion.REASON_COACH))
+    return desired
+
+
+# ---------------------------------------------------------------------------
+# Reconciliation & reads
+# ---------------------------------------------------------------------------
+
+
+def reconcile_connect_pool() -> dict:
+    """Rebuild both tables from the source of truth, writing only the diff.
+
+    Returns counts; non-zero ``*_changed``/``*_removed``/``*_added`` after a
+    quiet period mean some write path bypassed the signals.
+    """
+    from crush_lu.models import ConnectCandidate, ConnectPairExclusion
+
+    rows = _build_candidates()
+    candidates_changed, candidates_removed = _sync_candidates(
+        rows, ConnectCandidate.objects.all()
+    )
+
+    desired = desired_pair_exclusions()
+    existing = {}
+    for pk, viewer, hidden, reason in ConnectPairExclusion.objects.values_list(
+        "pk", "viewer_id", "hidden_id", "reason"
+    ).iterator(chunk_size=2000):
+        existing[(viewer, hidden, reason)] = pk
+    missing = desired - set(existing)
+    stale_pks = [pk for key, pk in existing.items() if key not in desired]
+
+    with transaction.atomic():
+        ConnectPairExclusion.objects.bulk_create(
+            [
+                ConnectPairExclusion(viewer_id=v, hidden_id=h, reason=r)
+                for v, h, r in missing
+            ],
+            batch_size=CANDIDATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        for start in range(0, len(stale_pks), CANDIDATE_BATCH_SIZE):
+            ConnectPairExclusion.objects.filter(
+                pk__in=stale_pks[start : start + CANDIDATE_BATCH_SIZE]
+            ).delete()
+
+    return {
+        "candidates": len(rows),
+        "candidates_changed": candidates_changed,
+        "candidates_removed": candidates_removed,
+        "exclusions": len(desired),
+        "exclusions_added": len(missing),
+        "exclusions_removed": len(stale_pks),
+    }
+
+
+def get_materialized_pool(user, candidate_pk=None):
+    """:func:`get_eligible_pool` read from the materialized tables.
+
+    One query: the listed candidates active within the inactivity window,
+    minus ``user``'s exclusion rows, narrowed by mutual gender and age
+    preferences — all as indexed column filters on ``ConnectCandidate``.
+    """
+    from crush_lu.models import ConnectPairExclusion
+
+    requester = pool_requester(user)
+    if requester is None:
+        return User.objects.none()
+    user_profile, user_membership = requester
+
+    inactivity_cutoff = timezone.now() - timedelta(days=CONNECT_INACTIVITY_WINDOW_DAYS)
+    qs = (
+        User.objects.filter(
+            connect_candidate__is_listed=True,
+            connect_candidate__last_login__gte=inactivity_cutoff,
+        )
+        .exclude(pk=user.pk)
+        .annotate(
+            _excluded=Exists(
+                ConnectPairExclusion.objects.filter(
+                    viewer_id=user.pk, hidden_id=OuterRef("pk")
+                )
+            )
+        )
+        .filter(_excluded=False)
+    )
+
+    if candidate_pk is not None:
+        qs = qs.filter(pk=candidate_pk)
+
+    user_pref_genders = user_membership.preferred_genders or []
+    if user_pref_genders:
+        qs = qs.filter(connect_candidate__gender__in=user_pref_genders)
+    if user_profile.gender:
+        qs = qs.filter(
+            Q(connect_candidate__preferred_genders_key="")
+            | Q(connect_candidate__preferred_genders_key__contains=f"|{user_profile.gender}|")
+        )
+
+    user_age = user_profile.age
+    if user_age is not None:
+        qs = qs.filter(
+            connect_candidate__preferred_age_min__lte=user_age,
+            connect_candidate__preferred_age_max__gte=user_age,
+        )
+
+    pref_min = user_membership.preferred_age_min or 18
+    pref_max = user_membership.preferred_age_max or 99
+    qs = qs.filter(
+        connect_candidate__date_of_birth__lte=_years_ago(pref_min),
+        connect_candidate__date_of_birth__gte=_years_ago(pref_max + 1)
+        + timedelta(days=1),
+    )
+
+    return qs.select_related("crushprofile", "crush_connect_membership").order_by("pk")
+
+
+def check_pool_consistency(users=None) -> list:
+    """Diff the live and materialized pools for each requester.
+
+    ``users`` defaults to every onboarded member; those not eligible to receive
+    a pool are skipped. Returns one ``{"user_id", "missing", "extra"}`` dict per
+    requester whose pools differ — ``missing`` are live candidates absent from
+    the materialized pool, ``extra`` the reverse.
+    """
+    if users is None:
+        users = User.objects.filter(
+            crush_connect_membership__onboarded_at__isnull=False
+        ).select_related("crushprofile", "crush_connect_membership", "crushcoach")
+
+    mismatches = []
+    for user in users:
+        if pool_requester(user) is None:
+            continue
+        live = set(get_live_eligible_pool(user).values_list("pk", flat=True))
+        materialized = set(get_materialized_pool(user).values_list("pk", flat=True))
+        if live != materialized:
+            mismatches.append(
+                {
+                    "user_id": user.pk,
+                    "missing": sorted(live - materialized),
+                    "extra": sorted(materialized - live),
+                }
+            )
+    if mismatches:
+        logger.warning(
+            "Connect pool drift for %d requester(s): %s",
+            len(mismatches),
+            [m["user_id"] for m in mismatches],
+        )
+    return mismatches
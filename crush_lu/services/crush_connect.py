@@ -25,8 +25,10 @@ import hashlib
 import math
 import random
 from datetime import date, timedelta
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, List, Tuple
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.db.models import Exists, OuterRef, Q, QuerySet
@@ -164,60 +166,57 @@ def exclude_assigned_coach_pairs(qs, user, field="pk"):
     return qs.exclude(**{f"{field}__in": pair_ids})
 
 
-def get_eligible_pool(user, candidate_pk=None) -> "QuerySet[User]":
-    """
-    Return the queryset of users eligible to appear in ``user``'s Crush Connect Drop.
+def pool_requester(user):
+    """``(profile, membership)`` when ``user`` may RECEIVE a pool, else ``None``.
 
-    The requester must be eligible to RECEIVE (profile approved, PREMIUM =
-    active PremiumMembership, onboarded into Crush Connect, not
-    coach-excluded), otherwise an empty queryset. Candidates don't need
-    Premium — the catalogue requires LuxID + opt-in instead (asymmetric model).
-
-    ``candidate_pk`` narrows the pool to a single candidate BEFORE the Python
-    gender-preference step below — point lookups ("is X in the pool?") must use
-    it, otherwise the whole pool is materialized just to check one row.
+    The requester must have an approved profile, an ACTIVE PremiumMembership
+    and a Crush Connect onboarding. Shared by the live and materialized pool
+    paths so the two can never disagree on who gets a pool at all.
     """
-    from crush_lu.models import CrushProfile, EventConnection
-    from crush_lu.services.blocking import block_exists_subquery
-
-    # --- Requester self-eligibility -----------------------------------------
     user_profile = getattr(user, "crushprofile", None)
     if user_profile is None or not user_profile.is_approved:
-        return User.objects.none()
+        return None
 
     # Premium gate: receiving Drops requires an ACTIVE PremiumMembership.
     # assigned_coach alone is NOT the entitlement (backfill / attendance
     # auto-assign set it without payment).
     if not user_profile.has_active_premium:
-        return User.objects.none()
+        return None
 
     user_membership = getattr(user, "crush_connect_membership", None)
     if user_membership is None or not user_membership.is_onboarded:
         # Not opted in to Crush Connect yet — no Drop for them.
-        return User.objects.none()
+        return None
 
-    # --- Target filters ------------------------------------------------------
-    inactivity_cutoff = timezone.now() - timedelta(days=CONNECT_INACTIVITY_WINDOW_DAYS)
+    return user_profile, user_membership
 
-    # Pairs with an existing EventConnection are excluded from each other's
-    # pools. The pre-`shared` crush exemption is **directional**, because the
-    # privacy reason only exists on one side:
-    #
-    #  - incoming (someone declared on `user`): secret. Excluding the crusher
-    #    would make an open Coach's Pick of them vanish, betraying the
-    #    declaration — so the row is ignored and the pool is unchanged.
-    #  - outgoing (`user` declared on the candidate): already known to them.
-    #    Ignoring it would leave a Coach's Pick for their own crush live and
-    #    acceptable, running a parallel Connect journey against the same
-    #    person while the lead is open. It excludes like any other connection.
-    existing_connection_subq = EventConnection.objects.filter(
-        Q(requester=user, recipient=OuterRef("pk"))
-        | (
-            Q(requester=OuterRef("pk"), recipient=user)
-            & ~(Q(flow=EventConnection.FLOW_CRUSH) & ~Q(status="shared"))
+
+def pool_requester_q() -> Q:
+    """:func:`pool_requester` as a ``User`` lookup, for the batch paths."""
+    from crush_lu.models import CrushConnectMembership, PremiumMembership
+
+    return (
+        Q(crushprofile__is_approved=True)
+        & Q(
+            Exists(
+                PremiumMembership.objects.filter(
+                    user_id=OuterRef("pk"), status="active"
+                )
+            )
         )
+        & CrushConnectMembership.onboarded_q("crush_connect_membership__")
     )
 
+
+def catalogue_queryset(inactivity_cutoff) -> "QuerySet[User]":
+    """Every member who may appear in *someone's* pool, before pair rules.
+
+    The viewer-independent half of :func:`get_live_eligible_pool`: verified,
+    onboarded, not coach-excluded, photo consent, a photo, LuxID, and a login
+    since ``inactivity_cutoff``.
+    """
+    from crush_lu.models import CrushProfile
+
     # LuxID is mandatory for the candidate catalogue. SocialAccount is the
     # authoritative store — verification_method only records the FIRST
     # verification path, so coach-verified members who linked LuxID later
@@ -228,7 +227,7 @@ def get_eligible_pool(user, candidate_pk=None) -> "QuerySet[User]":
         OuterRef("pk")
     )
 
-    qs = (
+    return (
         User.objects.filter(
             crushprofile__verification_status="verified",
             crush_connect_membership__onboarded_at__isnull=False,
@@ -245,14 +244,84 @@ def get_eligible_pool(user, candidate_pk=None) -> "QuerySet[User]":
         # their photo after onboarding. They must not be surfaced in Drops.
         .exclude(Q(crushprofile__photo_1="") | Q(crushprofile__photo_1__isnull=True))
         .annotate(
-            _has_connection=Exists(existing_connection_subq),
-            _has_block=block_exists_subquery(user),
             _has_luxid_native=Exists(luxid_native_subq),
             _has_luxid_oidc=Exists(luxid_oidc_subq),
         )
+        .filter(Q(_has_luxid_native=True) | Q(_has_luxid_oidc=True))
+    )
+
+
+def get_eligible_pool(user, candidate_pk=None) -> "QuerySet[User]":
+    """
+    Return the queryset of users eligible to appear in ``user``'s Crush Connect Drop.
+
+    The requester must be eligible to RECEIVE (profile approved, PREMIUM =
+    active PremiumMembership, onboarded into Crush Connect, not
+    coach-excluded), otherwise an empty queryset. Candidates don't need
+    Premium — the catalogue requires LuxID + opt-in instead (asymmetric model).
+
+    ``candidate_pk`` narrows the pool to a single candidate — point lookups
+    ("is X in the pool?") must use it, otherwise the whole pool is evaluated
+    just to check one row.
+
+    With ``settings.CONNECT_MATERIALIZED_POOL`` on, this reads the
+    precomputed ``ConnectCandidate`` / ``ConnectPairExclusion`` tables
+    (services.connect_pool); otherwise it evaluates every rule live.
+    """
+    if getattr(settings, "CONNECT_MATERIALIZED_POOL", False):
+        from crush_lu.services.connect_pool import get_materialized_pool
+
+        return get_materialized_pool(user, candidate_pk=candidate_pk)
+    return get_live_eligible_pool(user, candidate_pk=candidate_pk)
+
+
+def get_live_eligible_pool(user, candidate_pk=None) -> "QuerySet[User]":
+    """
+    :func:`get_eligible_pool` evaluated from the source tables.
+
+    The reference implementation: ``check_pool_consistency`` diffs the
+    materialized pool against it. ``candidate_pk`` is applied BEFORE the Python
+    gender-preference step below.
+    """
+    from crush_lu.models import EventConnection
+    from crush_lu.services.blocking import block_exists_subquery
+
+    # --- Requester self-eligibility -----------------------------------------
+    requester = pool_requester(user)
+    if requester is None:
+        return User.objects.none()
+    user_profile, user_membership = requester
+
+    # --- Target filters ------------------------------------------------------
+    inactivity_cutoff = timezone.now() - timedelta(days=CONNECT_INACTIVITY_WINDOW_DAYS)
+
+    # Pairs with an existing EventConnection are excluded from each other's
+    # pools. The pre-`shared` crush exemption is **directional**, because the
+    # privacy reason only exists on one side:
+    #
+    #  - incoming (someone declared on `user`): secret. Excluding the crusher
+    #    would make an open Coach's Pick of them vanish, betraying the
+    #    declaration — so the row is ignored and the pool is unchanged.
+    #  - outgoing (`user` declared on the candidate): already known to them.
+    #    Ignoring it would leave a Coach's Pick for their own crush live and
+    #    acceptable, running a parallel Connect journey against the same
+    #    person while the lead is open. It excludes like any other connection.
+    existing_connection_subq = EventConnection.objects.filter(
+        Q(requester=user, recipient=OuterRef("pk"))
+        | (
+            Q(requester=OuterRef("pk"), recipient=user)
+            & ~(Q(flow=EventConnection.FLOW_CRUSH) & ~Q(status="shared"))
+        )
+    )
+
+    qs = (
+        catalogue_queryset(inactivity_cutoff)
+        .annotate(
+            _has_connection=Exists(existing_connection_subq),
+            _has_block=block_exists_subquery(user),
+        )
         .filter(_has_connection=False)
         .filter(_has_block=False)
-        .filter(Q(_has_luxid_native=True) | Q(_has_luxid_oidc=True))
         .exclude(pk=user.pk)
         .select_related("crushprofile", "crush_connect_membership")
     )
@@ -355,24 +424,30 @@ def _weight_for(
 
     # A *missing* pair is neutral (0.5 → base 1.0); a *stored* score_final of 0
     # is intentionally distinct (base 0.5, lower odds) — don't collapse them.
-    match_score = match_scores.get(candidate.pk, MATCHSCORE_NEUTRAL)
-
-    cand_languages = frozenset(membership.languages or [])
-    language_boost = (
-        SHARED_LANGUAGE_BOOST if (viewer_languages & cand_languages) else 1.0
+    return _blend_weight(
+        match_score=match_scores.get(candidate.pk, MATCHSCORE_NEUTRAL),
+        shared_language=bool(viewer_languages & frozenset(membership.languages or [])),
+        interest_overlap=len(
+            viewer_interest_ids & frozenset(i.pk for i in membership.interests.all())
+        ),  # prefetched
+        onboarded_on=timezone.localtime(membership.onboarded_at).date(),
+        today=today,
     )
 
-    cand_interest_ids = frozenset(
-        i.pk for i in membership.interests.all()
-    )  # prefetched
-    overlap = len(viewer_interest_ids & cand_interest_ids)
+
+def _blend_weight(
+    *, match_score, shared_language, interest_overlap, onboarded_on, today
+) -> float:
+    """The ``_weight_for`` formula on precomputed inputs.
+
+    Shared with :func:`pregenerate_daily_drops`, which derives the inputs from
+    one snapshot for every viewer instead of per-candidate model instances.
+    """
+    language_boost = SHARED_LANGUAGE_BOOST if shared_language else 1.0
     interest_boost = 1.0 + INTEREST_OVERLAP_BOOST_PER * min(
-        overlap, INTEREST_OVERLAP_CAP
+        interest_overlap, INTEREST_OVERLAP_CAP
     )
-
-    days_since_onboarding = (
-        today - timezone.localtime(membership.onboarded_at).date()
-    ).days
+    days_since_onboarding = (today - onboarded_on).days
     new_member_boost = (
         NEW_MEMBER_BOOST
         if 0 <= days_since_onboarding <= NEW_MEMBER_BOOST_WINDOW_DAYS
@@ -424,6 +499,28 @@ def _seeded_weighted_pick(
     return [cand for _, _, cand in keyed[:k]]
 
 
+def current_drop_date(now=None) -> date:
+    """The local date of the Drop a visitor sees right now.
+
+    Drops unlock at 06:00 local time. Visiting between 00:00–05:59 shows the
+    previous day's drop, not the upcoming one hours early.
+    """
+    now = timezone.localtime(now)
+    return (now - timedelta(days=1)).date() if now.hour < 6 else now.date()
+
+
+def next_drop_date(now=None) -> date:
+    """The local date of the next Drop to unlock (the pre-generation target)."""
+    return current_drop_date(now) + timedelta(days=1)
+
+
+def _drop_seed(user_pk, drop_date: date) -> int:
+    return int.from_bytes(
+        hashlib.sha256(f"{user_pk}:{drop_date.isoformat()}".encode()).digest()[:8],
+        "big",
+    )
+
+
 def get_or_create_daily_drop(user, drop_date: date | None = None):
     """
     Idempotently return the user's ``ConnectDailyDrop`` for the given date.
@@ -439,10 +536,7 @@ def get_or_create_daily_drop(user, drop_date: date | None = None):
     from crush_lu.models import ConnectDailyDrop, MatchScore
 
     if drop_date is None:
-        # Drops unlock at 06:00 local time. Visiting between 00:00–05:59 should
-        # show the previous day's drop, not the upcoming one hours early.
-        now = timezone.localtime()
-        drop_date = (now - timedelta(days=1)).date() if now.hour < 6 else now.date()
+        drop_date = current_drop_date()
 
     try:
         return ConnectDailyDrop.objects.get(user=user, drop_date=drop_date)
@@ -499,13 +593,10 @@ def get_or_create_daily_drop(user, drop_date: date | None = None):
         )
         for c in candidates
     ]
-    seed = int.from_bytes(
-        hashlib.sha256(f"{user.pk}:{drop_date.isoformat()}".encode()).digest()[:8],
-        "big",
+    chosen = _seeded_weighted_pick(
+        candidates, weights, DAILY_DROP_SIZE, _drop_seed(user.pk, drop_date)
     )
 
-    chosen = _seeded_weighted_pick(candidates, weights, DAILY_DROP_SIZE, seed)
-
     with transaction.atomic():
         drop, _created = ConnectDailyDrop.objects.get_or_create(
             user=user, drop_date=drop_date
@@ -515,6 +606,245 @@ def get_or_create_daily_drop(user, drop_date: date | None = None):
     return drop
 
 
+# Viewers handled per write transaction in pregenerate_daily_drops.
+DROP_PREGEN_BATCH_SIZE = 500
+
+
+def _drop_viewers(drop_date: date, user_ids=None):
+    """Members who will receive ``drop_date``'s Drop but don't have one yet.
+
+    :func:`pool_requester_q`, so the same members :func:`pool_requester`
+    admits: approved profile, ACTIVE PremiumMembership, onboarded and not
+    coach-excluded.
+    """
+    from crush_lu.models import ConnectDailyDrop
+
+    qs = (
+        User.objects.filter(pool_requester_q())
+        .exclude(
+            Exists(
+                ConnectDailyDrop.objects.filter(
+                    user_id=OuterRef("pk"), drop_date=drop_date
+                )
+            )
+        )
+        .select_related("crushprofile", "crush_connect_membership")
+        .order_by("pk")
+    )
+    if user_ids is not None:
+        qs = qs.filter(pk__in=user_ids)
+    return qs
+
+
+def pregenerate_daily_drops(drop_date: date | None = None, user_ids=None) -> dict:
+    """
+    Build ``drop_date``'s Drop for every eligible member in one pass.
+
+    :func:`get_or_create_daily_drop` pays for pool resolution, weighting and
+    sampling on the first page view of the day. This moves that work into a
+    scheduled job: the catalogue, every MatchScore, every interest set and the
+    pair exclusions are each loaded ONCE and shared by all viewers, the
+    per-viewer pool rules run in memory, and the Drops and their recipients
+    are written with bulk inserts. Request time is then the unique-index read
+    at the top of ``get_or_create_daily_drop``.
+
+    Selection is identical to the lazy path — same pool rules, same
+    ``_blend_weight`` and the same ``(user, date)`` seed — so a pre-generated
+    Drop is the one that member would have rolled on first view. Members who
+    already have a Drop for the date are left alone; an empty pool still
+    records an empty Drop, as the lazy path does. Members with an open coach
+    pick get no Drop, as on the page: Drop snapshots authorize Sparks, and
+    the pick replaces the Drop (see :func:`get_active_coach_pick`).
+
+    ``drop_date`` defaults to the next Drop to unlock. Returns counts.
+    """
+    from crush_lu.models import (
+        ConnectCoachPick,
+        ConnectDailyDrop,
+        CrushConnectMembership,
+        MatchScore,
+    )
+    from crush_lu.services.connect_pool import desired_pair_exclusions
+
+    if drop_date is None:
+        drop_date = next_drop_date()
+
+    viewers = list(_drop_viewers(drop_date, user_ids))
+    result = {
+        "drop_date": drop_date,
+        "viewers": len(viewers),
+        "candidates": 0,
+        "generated": 0,
+        "coach_picks": 0,
+    }
+    if not viewers:
+        return result
+
+    # --- One snapshot, shared by every viewer ---------------------------------
+    inactivity_cutoff = timezone.now() - timedelta(days=CONNECT_INACTIVITY_WINDOW_DAYS)
+    catalogue = list(
+        catalogue_queryset(inactivity_cutoff)
+        .order_by("pk")
+        .values_list(
+            "pk",
+            "crushprofile__gender",
+            "crushprofile__date_of_birth",
+            "crush_connect_membership__preferred_genders",
+            "crush_connect_membership__preferred_age_min",
+            "crush_connect_membership__preferred_age_max",
+            "crush_connect_membership__languages",
+            "crush_connect_membership__onboarded_at",
+        )
+    )
+    result["candidates"] = len(catalogue)
+
+    interests = {}
+    for user_id, interest_id in CrushConnectMembership.interests.through.objects.filter(
+        crushconnectmembership__onboarded_at__isnull=False
+    ).values_list("crushconnectmembership__user_id", "interest_id"):
+        interests.setdefault(user_id, set()).add(interest_id)
+
+    viewer_ids = {v.pk for v in viewers}
+    hidden = {}
+    for viewer_id, hidden_id, _reason in desired_pair_exclusions():
+        if viewer_id in viewer_ids:
+            hidden.setdefault(viewer_id, set()).add(hidden_id)
+
+    # Symmetric store (user_a < user_b): keyed by the sorted pair.
+    match_scores = {
+        (a, b): score
+        for a, b, score in MatchScore.objects.filter(
+            Q(user_a_id__in=viewer_ids) | Q(user_b_id__in=viewer_ids)
+        ).values_list("user_a_id", "user_b_id", "score_final").iterator(chunk_size=2000)
+    }
+
+    # Each viewer's latest proposed pick, as (candidate, coach); it is open
+    # when get_active_coach_pick would show it: the candidate is still in the
+    # viewer's pool and the viewer's current coach made it.
+    latest_picks = {}
+    for member_id, candidate_id, coach_id in (
+        ConnectCoachPick.objects.filter(member_id__in=viewer_ids, status="proposed")
+        .order_by("member_id", "-created_at")
+        .values_list("member_id", "candidate_id", "coach_id")
+    ):
+        latest_picks.setdefault(member_id, (candidate_id, coach_id))
+
+    # Lightweight stand-ins for the pool's User rows — _seeded_weighted_pick
+    # only reads .pk.
+    candidates = [
+        SimpleNamespace(
+            pk=pk,
+            gender=gender,
+            dob=dob,
+            preferred_genders=prefs or [],
+            age_min=age_min,
+            age_max=age_max,
+            languages=frozenset(languages or []),
+            interests=frozenset(interests.get(pk, ())),
+            onboarded_on=timezone.localtime(onboarded_at).date(),
+        )
+        for pk, gender, dob, prefs, age_min, age_max, languages, onboarded_at in catalogue
+    ]
+
+    # --- Per-viewer selection, in memory --------------------------------------
+    picks = {}
+    for viewer in viewers:
+        profile = viewer.crushprofile
+        membership = viewer.crush_connect_membership
+        viewer_gender = profile.gender
+        viewer_age = profile.age
+        wanted_genders = membership.preferred_genders or []
+        latest_dob = _years_ago(membership.preferred_age_min or 18)
+        earliest_dob = _years_ago((membership.preferred_age_max or 99) + 1) + timedelta(
+            days=1
+        )
+        viewer_hidden = hidden.get(viewer.pk, ())
+        viewer_languages = frozenset(membership.languages or [])
+        viewer_interests = frozenset(interests.get(viewer.pk, ()))
+
+        pool, weights = [], []
+        for cand in candidates:
+            pk = cand.pk
+            if pk == viewer.pk or pk in viewer_hidden:
+                continue
+            if wanted_genders and cand.gender not in wanted_genders:
+                continue
+            if (
+                viewer_gender
+                and cand.preferred_genders
+                and viewer_gender not in cand.preferred_genders
+            ):
+                continue
+            if viewer_age is not None and not (
+                cand.age_min <= viewer_age <= cand.age_max
+            ):
+                continue
+            if cand.dob is None or not (earliest_dob <= cand.dob <= latest_dob):
+                continue
+            pool.append(cand)
+            weights.append(
+                _blend_weight(
+                    match_score=match_scores.get(
+                        (min(viewer.pk, pk), max(viewer.pk, pk)), MATCHSCORE_NEUTRAL
+                    ),
+                    shared_language=bool(viewer_languages & cand.languages),
+                    interest_overlap=len(viewer_interests & cand.interests),
+                    onboarded_on=cand.onboarded_on,
+                    today=drop_date,
+                )
+            )
+        coach_pick = latest_picks.get(viewer.pk)
+        if (
+            coach_pick is not None
+            and coach_pick[1] == profile.assigned_coach_id
+            and any(cand.pk == coach_pick[0] for cand in pool)
+        ):
+            result["coach_picks"] += 1
+            continue
+        chosen = _seeded_weighted_pick(
+            pool,
+            weights,
+            DAILY_DROP_SIZE,
+            _drop_seed(viewer.pk, drop_date),
+        )
+        picks[viewer.pk] = [c.pk for c in chosen]
+
+    # --- Bulk write -----------------------------------------------------------
+    Recipient = ConnectDailyDrop.recipients.through
+    viewer_order = list(picks)
+    for start in range(0, len(viewer_order), DROP_PREGEN_BATCH_SIZE):
+        batch = viewer_order[start : start + DROP_PREGEN_BATCH_SIZE]
+        with transaction.atomic():
+            # ignore_conflicts: a member who opened the app mid-run already
+            # rolled (the same) Drop lazily — keep theirs.
+            ConnectDailyDrop.objects.bulk_create(
+                [ConnectDailyDrop(user_id=uid, drop_date=drop_date) for uid in batch],
+                ignore_conflicts=True,
+            )
+            drop_ids = dict(
+                ConnectDailyDrop.objects.filter(
+                    drop_date=drop_date, user_id__in=batch
+                ).values_list("user_id", "pk")
+            )
+            filled = set(
+                Recipient.objects.filter(
+                    connectdailydrop_id__in=drop_ids.values()
+                ).values_list("connectdailydrop_id", flat=True)
+            )
+            Recipient.objects.bulk_create(
+                [
+                    Recipient(connectdailydrop_id=drop_ids[uid], user_id=recipient_id)
+                    for uid in batch
+                    if drop_ids[uid] not in filled
+                    for recipient_id in picks[uid]
+                ],
+                ignore_conflicts=True,
+            )
+        result["generated"] += len(batch)
+
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Weekly question rotation (M8)
 # ---------------------------------------------------------------------------
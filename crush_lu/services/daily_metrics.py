@@ -0,0 +1,324 @@
+"""
+Daily metrics rollup behind the weekly KPI digest.
+
+``DailyMetric`` keeps one row per (local day, metric): how many profiles,
+submissions, registrations, … fell on that day. ``rollup_daily_metrics()``
+is incremental — one ``GROUP BY day`` query per metric over the days it
+(re)writes — so the weekly snapshot, and every cumulative total, sums
+``DailyMetric`` rows instead of re-scanning the source tables from the
+beginning of time for every week.
+
+Some counts still move after their day is over: a verification is revoked, an
+event is cancelled, a registration is marked no-show, a Crush profile is
+deleted. Each run therefore restates the trailing ``RESTATE_DAYS`` before
+writing the new days, which catches those changes for every metric alike.
+Older days stay as rolled up; ``rollup_daily_metrics(since=...)`` (the
+command's ``--since``) restates them after a correction. Distinct-user
+engagement (WAU is not a sum of daily actives) stays a live query in
+``weekly_kpis``.
+
+Reading (``metric_totals``) never writes: the rollup runs from the scheduled
+``send_weekly_kpis`` job and the ``rollup_daily_metrics`` command.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# Totals up to the end of the week (``metric_totals(None, end, ...)``)
+CUMULATIVE_METRICS = (
+    "new_signups",
+    "profiles_verified",
+    "new_connect_optins",
+    "waitlist_new",
+)
+
+# Events with a capacity held that day, and the sum of their fill percentages;
+# the weekly average fill rate is one divided by the other
+FILL_EVENTS = "fill_events"
+FILL_PCT_SUM = "fill_pct_sum"
+
+# Trailing days each rollup run rewrites, so a status change (a no-show, a
+# revoked verification, a deleted profile) reaches the rows of recent days
+RESTATE_DAYS = 35
+
+
+def _count_sources():
+    """``(metric, queryset, datetime field)`` for every per-day count."""
+    # Imported here (not at module load) to avoid import-time coupling between
+    # the services package and the large models package.
+    from crush_lu.models import CrushProfile, ProfileSubmission
+    from crush_lu.models.connections import EventConnection
+    from crush_lu.models.crush_connect import (
+        CrushConnectMembership,
+        CrushConnectWaitlist,
+    )
+    from crush_lu.models.event_lobby import (
+        ConfirmedEncounter,
+        EventLobbyParticipation,
+        EventMeetSignal,
+    )
+    from crush_lu.models.events import EventRegistration, MeetupEvent
+    from crush_lu.models.profiles import PremiumMembership
+    from crush_lu.models.referrals import ReferralAttribution
+
+    return [
+        # Crush users only — see the note in compute_weekly_snapshot
+        ("new_signups", User.objects.filter(crushprofile__isnull=False), "date_joined"),
+        ("new_profiles", CrushProfile.objects.all(), "created_at"),
+        (
+            "phone_verifications",
+            CrushProfile.objects.filter(phone_verified=True),
+            "phone_verified_at",
+        ),
+        ("profiles_submitted", ProfileSubmission.objects.all(), "submitted_at"),
+        (
+            "profiles_verified",
+            CrushProfile.objects.filter(verification_status="verified"),
+            "approved_at",
+        ),
+        (
+            "new_premium",
+            PremiumMembership.objects.filter(payment_confirmed=True),
+            "payment_date",
+        ),
+        ("new_connect_optins", CrushConnectMembership.objects.all(), "onboarded_at"),
+        ("waitlist_new", CrushConnectWaitlist.objects.all(), "joined_at"),
+        (
+            "paid_event_registrations",
+            EventRegistration.objects.filter(payment_confirmed=True),
+            "payment_date",
+        ),
+        (
+            "events_held",
+            MeetupEvent.objects.filter(is_published=True, is_cancelled=False),
+            "date_time",
+        ),
+        ("registrations", EventRegistration.objects.all(), "registered_at"),
+        (
+            "attended",
+            EventRegistration.objects.filter(status="attended"),
+            "checked_in_at",
+        ),
+        (
+            "no_show",
+            EventRegistration.objects.filter(status="no_show"),
+            "event__date_time",
+        ),
+        ("connections_requested", EventConnection.objects.all(), "requested_at"),
+        (
+            "connections_shared",
+            EventConnection.objects.filter(shared_at__isnull=False),
+            "shared_at",
+        ),
+        (
+            "referrals_converted",
+            ReferralAttribution.objects.filter(status="converted"),
+            "converted_at",
+        ),
+        ("lobby_participants", EventLobbyParticipation.objects.all(), "joined_at"),
+        (
+            "onboarded_at_event",
+            EventLobbyParticipation.objects.filter(
+                eligibility_source="onboarding_completed"
+            ),
+            "joined_at",
+        ),
+        ("meet_signals", EventMeetSignal.objects.all(), "created_at"),
+        (
+            # Canonical direction only: a reveal stamps both rows of the pair
+            "mutual_reveals",
+            EventMeetSignal.objects.filter(
+                mutual_revealed_at__isnull=False,
+                sender_id__lt=F("recipient_id"),
+            ),
+            "mutual_revealed_at",
+        ),
+        ("encounters_confirmed", ConfirmedEncounter.objects.all(), "created_at"),
+    ]
+
+
+def _in_range(field, start, end):
+    """Lookups for ``field`` falling on a local day in ``[start, end]``."""
+    lookups = {f"{field}__date__lte": end}
+    if start is not None:
+        lookups[f"{field}__date__gte"] = start
+    return lookups
+
+
+def _counts_by_day(qs, field, start, end):
+    """``{day: count}`` for rows whose ``field`` falls on a local day in range."""
+    rows = (
+        qs.filter(**_in_range(field, start, end))
+        .annotate(day=TruncDate(field))
+        .order_by()  # default orderings would leak into the GROUP BY
+        .values("day")
+        .annotate(n=Count("pk"))
+    )
+    return {row["day"]: row["n"] for row in rows}
+
+
+def _fill_by_day(start, end):
+    """``{day: (events, summed fill %)}`` for capacity-limited events held."""
+    from crush_lu.models.events import SEAT_HOLDING_STATUSES, MeetupEvent
+
+    events = (
+        MeetupEvent.objects.filter(
+            is_published=True,
+            is_cancelled=False,
+            max_participants__gt=0,
+            **_in_range("date_time", start, end),
+        )
+        .annotate(
+            confirmed_count=Count(
+                "eventregistration",
+                filter=Q(eventregistration__status__in=SEAT_HOLDING_STATUSES),
+            )
+        )
+        .values_list("date_time", "confirmed_count", "max_participants")
+    )
+    fill = defaultdict(lambda: [0, 0.0])
+    for held_at, confirmed, capacity in events:
+        day_fill = fill[timezone.localdate(held_at)]
+        day_fill[0] += 1
+        day_fill[1] += confirmed * 100.0 / capacity
+    return fill
+
+
+def compute_daily_metrics(start: date | None, end: date, metrics=None) -> dict:
+    """Compute each metric for each local day in ``[start, end]`` from source.
+
+    ``start=None`` reaches back to the earliest row. ``metrics`` limits the
+    computation to those names (default: all). Returns
+    ``{day: {metric: value}}`` with only the non-zero values present.
+    """
+    values: dict = defaultdict(dict)
+    for metric, qs, field in _count_sources():
+        if metrics is not None and metric not in metrics:
+            continue
+        for day, count in _counts_by_day(qs, field, start, end).items():
+            values[day][metric] = count
+    if metrics is None or FILL_EVENTS in metrics or FILL_PCT_SUM in metrics:
+        for day, (events, pct_sum) in _fill_by_day(start, end).items():
+            values[day][FILL_EVENTS] = events
+            values[day][FILL_PCT_SUM] = pct_sum
+    return values
+
+
+def metric_names():
+    """Every metric the rollup writes a row for, each day."""
+    return [metric for metric, _, _ in _count_sources()] + [FILL_EVENTS, FILL_PCT_SUM]
+
+
+def _first_day():
+    """Earliest local day any rolled-up metric can fall on (None: no data)."""
+    from crush_lu.models.events import MeetupEvent
+
+    candidates = [
+        User.objects.aggregate(first=Min("date_joined"))["first"],
+        MeetupEvent.objects.aggregate(first=Min("date_time"))["first"],
+    ]
+    candidates = [timezone.localdate(c) for c in candidates if c is not None]
+    return min(candidates) if candidates else None
+
+
+def last_rolled_up_day():
+    """The rollup's high-water mark (None before the first run)."""
+    from crush_lu.models import DailyMetric
+
+    return DailyMetric.objects.aggregate(last=Max("day"))["last"]
+
+
+def rollup_daily_metrics(through: date | None = None, since: date | None = None) -> int:
+    """Roll up the completed days after the last rolled-up one.
+
+    The last ``RESTATE_DAYS`` up to ``through`` are rewritten as well, so
+    status changes on recent days reach their rows.
+
+    Args:
+        through: Last day to roll up; defaults to, and is capped at, yesterday
+            — a day is only written once it is over.
+        since: Restate from this day instead: its existing rows and all later
+            ones up to ``through`` are replaced (e.g. after correcting source
+            data older than the trailing window).
+
+    Returns:
+        int: Number of days written.
+    """
+    from crush_lu.models import DailyMetric
+
+    yesterday = timezone.localdate() - timedelta(days=1)
+    through = min(through or yesterday, yesterday)
+
+    if since is not None:
+        start = since
+    else:
+        last = last_rolled_up_day()
+        if last is None:
+            start = _first_day()
+        else:
+            start = min(
+                last + timedelta(days=1),
+                through - timedelta(days=RESTATE_DAYS - 1),
+            )
+    if start is None or start > through:
+        return 0
+
+    names = metric_names()
+    values = compute_daily_metrics(start, through)
+    days = (through - start).days + 1
+    rows = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        day_values = values.get(day, {})
+        # Zeros too: the latest row is the rollup's high-water mark
+        rows.extend(
+            DailyMetric(day=day, metric=name, value=day_values.get(name, 0))
+            for name in names
+        )
+    with transaction.atomic():
+        DailyMetric.objects.filter(day__gte=start, day__lte=through).delete()
+        # A concurrent run may have written some of these days already
+        DailyMetric.objects.bulk_create(rows, batch_size=2000, ignore_conflicts=True)
+    return days
+
+
+def metric_totals(start: date | None, end: date, metrics=None) -> dict:
+    """Per-metric totals over the local days ``[start, end]``.
+
+    ``start=None`` counts from the beginning (cumulative totals). Totals sum
+    ``DailyMetric`` rows; days after the rollup's high-water mark (today
+    onwards, or everything before the first rollup) are computed from source
+    without being written.
+    """
+    from crush_lu.models import DailyMetric
+
+    names = [name for name in metric_names() if metrics is None or name in metrics]
+    totals = defaultdict(float, dict.fromkeys(names, 0))
+
+    rows = DailyMetric.objects.filter(day__lte=end, metric__in=names)
+    if start is not None:
+        rows = rows.filter(day__gte=start)
+    for row in rows.values("metric").annotate(total=Sum("value")).order_by():
+        totals[row["metric"]] = row["total"]
+
+    covered = last_rolled_up_day()
+    live_start = start
+    if covered is not None:
+        live_start = covered + timedelta(days=1)
+        if start is not None:
+            live_start = max(live_start, start)
+    if live_start is None or live_start <= end:
+        for day_values in compute_daily_metrics(
+            live_start, end, metrics=names
+        ).values():
+            for metric, value in day_values.items():
+                totals[metric] += value
+    return totals
@@ -0,0 +1,176 @@
+"""
+Member demographics shared by the coach dashboard and the admin segments page.
+
+Both pages used to pull every profile's date of birth, gender and event
+languages into Python on each view. Here one grouped query computes
+``age band x gender x preferred language`` counts (with per-event-language
+counts as conditional aggregates) for every profile either page can show, and
+the result is cached until a profile's demographic fields change:
+
+    rows = [(age_band, gender, is_active, verified, preferred_language,
+             count, {event_language: count}), ...]
+
+``profile_demographics(active=..., verified=...)`` folds those rows into the
+distributions for one audience, so a page view costs one cache read whatever
+the member count.
+"""
+
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import BooleanField, Case, CharField, Count, Q, Value, When
+from django.utils import timezone
+
+# 5-year age bands with only 60+ grouped together (see issue #190)
+AGE_BANDS = (
+    ("18-24", 18, 24),
+    ("25-29", 25, 29),
+    ("30-34", 30, 34),
+    ("35-39", 35, 39),
+    ("40-44", 40, 44),
+    ("45-49", 45, 49),
+    ("50-54", 50, 54),
+    ("55-59", 55, 59),
+    ("60+", 60, None),
+)
+# Date of birth set, but younger than the first band
+UNDER_AGE_BAND = ""
+
+# CrushProfile fields the aggregates are computed from; a save that changes
+# one of them invalidates the cache (see signals.py)
+DEMOGRAPHIC_FIELDS = (
+    "verification_status",
+    "is_active",
+    "gender",
+    "date_of_birth",
+    "preferred_language",
+    "event_languages",
+)
+
+# Safety net for writes that bypass save() (queryset .update())
+DEMOGRAPHICS_CACHE_TIMEOUT = 15 * 60
+
+
+def _cache_key(today):
+    # Ages move with the calendar, so each day gets its own entry
+    return f"crush_lu:demographics:{today.isoformat()}"
+
+
+def invalidate_demographics():
+    """Drop the cached aggregates; the next read recomputes them."""
+    cache.delete(_cache_key(timezone.localdate()))
+
+
+def _born_years_before(today, years):
+    """The date ``years`` before ``today`` (29 February falls back to the 28th)."""
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return date(today.year - years, 2, 28)
+
+
+def _age_band(today):
+    """SQL expression for a profile's age band label (NULL without a birth date)."""
+    whens = []
+    for label, min_age, max_age in AGE_BANDS:
+        condition = Q(date_of_birth__lte=_born_years_before(today, min_age))
+        if max_age is not None:
+            condition &= Q(date_of_birth__gt=_born_years_before(today, max_age + 1))
+        whens.append(When(condition, then=Value(label)))
+    whens.append(When(date_of_birth__isnull=False, then=Value(UNDER_AGE_BAND)))
+    return Case(*whens, default=None, output_field=CharField())
+
+
+def _compute_rows(today):
+    from crush_lu.models import CrushProfile
+
+    language_codes = [code for code, _label in CrushProfile.EVENT_LANGUAGE_CHOICES]
+    # event_languages is a JSON list of codes; matching the quoted code in its
+    # text form works on both PostgreSQL and SQLite
+    language_counts = {
+        f"lang_{code}": Count("id", filter=Q(event_languages__icontains=f'"{code}"'))
+        for code in language_codes
+    }
+    grouped = (
+        CrushProfile.objects.filter(
+            Q(is_active=True) | Q(verification_status="verified")
+        )
+        .annotate(
+            age_band=_age_band(today),
+            verified=Case(
+                When(verification_status="verified", then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        .order_by()
+        .values("age_band", "gender", "is_active", "verified", "preferred_language")
+        .annotate(count=Count("id"), **language_counts)
+    )
+    return [
+        (
+            row["age_band"],
+            row["gender"],
+            row["is_active"],
+            row["verified"],
+            row["preferred_language"],
+            row["count"],
+            {
+                code: row[f"lang_{code}"]
+                for code in language_codes
+                if row[f"lang_{code}"]
+            },
+        )
+        for row in grouped
+    ]
+
+
+def _rows():
+    today = timezone.localdate()
+    key = _cache_key(today)
+    rows = cache.get(key)
+    if rows is None:
+        rows = _compute_rows(today)
+        cache.set(key, rows, DEMOGRAPHICS_CACHE_TIMEOUT)
+    return rows
+
+
+def profile_demographics(active=None, verified=None):
+    """Distributions over the profiles matching ``active`` / ``verified``.
+
+    ``None`` means either value. Only active or verified profiles are
+    aggregated at all, which is every audience the dashboards show.
+
+    Returns:
+        dict: ``total``; ``with_birth_date``; Counters ``gender``,
+            ``preferred_language`` and ``event_languages``; and
+            ``{age band: Counter(gender)}`` / ``{age band: Counter(code)}`` /
+            ``{gender: Counter(code)}`` under ``age_gender``,
+            ``age_languages`` and ``gender_languages``
+    """
+    summary = {
+        "total": 0,
+        "with_birth_date": 0,
+        "gender": Counter(),
+        "preferred_language": Counter(),
+        "event_languages": Counter(),
+        "age_gender": defaultdict(Counter),
+        "age_languages": defaultdict(Counter),
+        "gender_languages": defaultdict(Counter),
+    }
+    for band, gender, is_active, is_verified, language, count, events in _rows():
+        if active is not None and is_active != active:
+            continue
+        if verified is not None and is_verified != verified:
+            continue
+        summary["total"] += count
+        summary["gender"][gender] += count
+        summary["preferred_language"][language] += count
+        summary["event_languages"].update(events)
+        summary["gender_languages"][gender].update(events)
+        if band is not None:
+            summary["with_birth_date"] += count
+            summary["age_gender"][band][gender] += count
+            summary["age_languages"][band].update(events)
+    return summary
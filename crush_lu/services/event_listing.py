@@ -0,0 +1,289 @@
+"""
+The shared part of the public event list (``views_events.event_list``).
+
+``/events/`` is mostly anonymous crawler traffic, and every view used to run
+the three listing queries, filter live events in Python and build the
+schema.org ItemList JSON-LD for each upcoming event. Here that work is done
+once per language and cached:
+
+    {"upcoming": [MeetupEvent, ...], "past": [MeetupEvent, ...],
+     "polls": [EventPoll, ...], "jsonld_items": [(event_id, item, member_item)],
+     "public_jsonld": str, "valid_until": datetime | None}
+
+The events carry their registration-count annotations and prefetched coaches,
+so rendering the cards costs no query. An anonymous view is served from the
+entry alone; a signed-in view layers its own bits on top (private-event
+visibility, attendance markers, the exact address in the JSON-LD) with
+``listing_jsonld``.
+
+The signals in the "Event listing" block of signals.py drop every language's
+entry when an event, a registration count, an event's coaches or a poll
+changes. The entry also goes stale by itself at the first moment the lists
+would change with the clock: an upcoming event ending, or a registration
+deadline passing (the JSON-LD availability). Event times are recorded at
+build time, so the key carries EVENT_LISTING_VERSION for shape changes.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import get_language
+from django.utils.translation import gettext as _
+
+# Bump when the cached dict changes shape
+EVENT_LISTING_VERSION = 1
+
+# Safety net for what no signal covers: queryset .update(), a coach renaming
+# themselves (the JSON-LD performer names)
+EVENT_LISTING_CACHE_TIMEOUT = 10 * 60
+
+
+def _cache_key(language):
+    return f"crush_lu:event_listing:v{EVENT_LISTING_VERSION}:{language}"
+
+
+def invalidate_event_listing():
+    """Drop the cached listing in every language, now and again on commit.
+
+    A public page rendered between the write and its commit would cache the
+    old state again, and this page is busy enough for that to happen.
+    """
+    keys = [_cache_key(code) for code, _name in settings.LANGUAGES]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def event_listing(now=None):
+    """The shared listing for the active language, from cache when current."""
+    now = now or timezone.now()
+    key = _cache_key(get_language())
+    listing = cache.get(key)
+    if listing is not None and (
+        listing["valid_until"] is None or now < listing["valid_until"]
+    ):
+        return listing
+    listing = build_event_listing(now)
+    cache.set(key, listing, EVENT_LISTING_CACHE_TIMEOUT)
+    return listing
+
+
+def build_event_listing(now=None):
+    """Compute the shared listing from the database."""
+    from crush_lu.models import MeetupEvent
+    from crush_lu.models.event_polls import EventPoll
+
+    now = now or timezone.now()
+
+    # Fetch published, non-cancelled events and split into upcoming/past
+    # in Python using the model's end_time property. This avoids
+    # timedelta * F() which is not supported on SQLite. The cutoff is the
+    # enforced max event duration, so an in-progress event is never dropped
+    # regardless of its length (see MeetupEvent.live_lookback_cutoff).
+    generous_cutoff = MeetupEvent.live_lookback_cutoff(now)
+    upcoming = list(
+        MeetupEvent.objects.with_registration_counts()
+        .filter(is_published=True, is_cancelled=False, date_time__gte=generous_cutoff)
+        .prefetch_related("coaches__user")
+        .order_by("date_time")
+    )
+    upcoming = [e for e in upcoming if e.end_time >= now]
+
+    boundary_past = [
+        event
+        for event in MeetupEvent.objects.with_registration_counts()
+        .filter(
+            is_published=True,
+            is_cancelled=False,
+            date_time__gte=generous_cutoff,
+            date_time__lt=now,
+        )
+        .order_by("-date_time")
+        if event.end_time < now
+    ]
+    older_past = list(
+        MeetupEvent.objects.with_registration_counts()
+        .filter(
+            is_published=True,
+            is_cancelled=False,
+            date_time__lt=generous_cutoff,
+        )
+        .order_by("-date_time")[:10]
+    )
+    past = (boundary_past + older_past)[:10]
+
+    jsonld_items = [
+        (
+            event.id,
+            _event_jsonld_item(event, exact_address=False),
+            _event_jsonld_item(event, exact_address=True),
+        )
+        for event in upcoming
+        if event.id
+    ]
+    public_ids = {event.id for event in upcoming if not event.is_private_invitation}
+
+    # The lists change with the clock when an upcoming event ends, and the
+    # JSON-LD availability when a registration deadline passes
+    changes = [event.end_time for event in upcoming] + [
+        event.registration_deadline
+        for event in upcoming
+        if event.registration_deadline and event.registration_deadline > now
+    ]
+
+    return {
+        "upcoming": upcoming,
+        "past": past,
+        # Active polls for the feedback banner; is_active is read per request
+        "polls": list(EventPoll.objects.filter(is_published=True)),
+        "jsonld_items": jsonld_items,
+        "public_jsonld": _item_list_jsonld(
+            [item for event_id, item, _member in jsonld_items if event_id in public_ids]
+        ),
+        "valid_until": min(changes, default=None),
+    }
+
+
+def listing_jsonld(listing, visible_ids, exact_address):
+    """The ItemList JSON-LD for a signed-in member's view of the listing."""
+    return _item_list_jsonld(
+        [
+            member_item if exact_address else item
+            for event_id, item, member_item in listing["jsonld_items"]
+            if event_id in visible_ids
+        ]
+    )
+
+
+def _item_list_jsonld(items):
+    # Built in Python to avoid template rendering issues (escapejs produces
+    # \x27 for apostrophes, which is invalid JSON)
+    return json.dumps(
+        {
+            "@context": "https://schema.org",
+            "@type": "ItemList",
+            "name": str(_("Upcoming Dating Events in Luxembourg")),
+            "description": str(
+                _(
+                    "Speed dating, social mixers, and singles meetups organized by Crush.lu"
+                )
+            ),
+            "itemListElement": [
+                {"@type": "ListItem", "position": position, "item": item}
+                for position, item in enumerate(items, start=1)
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _event_jsonld_item(event, exact_address):
+    """The schema.org SocialEvent for one upcoming event.
+
+    ``exact_address`` is for members with a profile; everyone else sees the
+    canton only.
+    """
+    event_url = reverse("crush_lu:event_detail", args=[event.id])
+    description = event.description or ""
+    words = description.split()
+    if len(words) > 50:
+        description = " ".join(words[:50]) + " …"
+
+    if exact_address:
+        location_data = {
+            "@type": "Place",
+            "name": event.location or "",
+            "address": {
+                "@type": "PostalAddress",
+                "streetAddress": event.address or "",
+                "addressLocality": event.location or "",
+                "addressCountry": "LU",
+            },
+        }
+    else:
+        canton = event.canton or "Luxembourg"
+        location_data = {
+            "@type": "Place",
+            "name": canton,
+            "address": {
+                "@type": "PostalAddress",
+                "addressLocality": canton,
+                "addressCountry": "LU",
+            },
+        }
+
+    if event.is_full:
+        availability = "https://schema.org/SoldOut"
+    elif event.is_registration_open:
+        availability = "https://schema.org/InStock"
+    else:
+        availability = "https://schema.org/OutOfStock"
+
+    # Event image URL (fallback to social preview)
+    if event.image:
+        image_url = event.image.url
+    else:
+        image_url = "https://crush.lu/static/crush_lu/crush_social_preview.jpg"
+
+    # Performer list from assigned coaches
+    performers = [
+        {"@type": "Person", "name": coach.user.first_name}
+        for coach in event.coaches.all()
+    ]
+
+    # Description fallback for events with empty descriptions
+    if not description:
+        description = "Dating event in Luxembourg organized by Crush.lu"
+
+    # Map event languages for inLanguage
+    lang_map = {"en": "en", "de": "de", "fr": "fr"}
+    event_languages = [
+        lang_map[lang] for lang in (event.languages or []) if lang in lang_map
+    ]
+
+    event_item = {
+        "@type": "SocialEvent",
+        "name": event.title or "",
+        "description": description,
+        "startDate": event.date_time.isoformat(),
+        "endDate": event.end_time.isoformat(),
+        "image": image_url,
+        "eventStatus": (
+            "https://schema.org/EventCancelled"
+            if event.is_cancelled
+            else "https://schema.org/EventScheduled"
+        ),
+        "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode",
+        "location": location_data,
+        "organizer": {
+            "@type": "Organization",
+            "name": "Crush.lu",
+            "url": "https://crush.lu",
+        },
+        "offers": {
+            "@type": "Offer",
+            "url": f"https://crush.lu{event_url}",
+            "price": format(event.registration_fee, ".2f"),
+            "priceCurrency": "EUR",
+            "availability": availability,
+            "validFrom": event.created_at.isoformat(),
+        },
+        "url": f"https://crush.lu{event_url}",
+        "audience": {
+            "@type": "PeopleAudience",
+            "suggestedMinAge": event.min_age,
+            "suggestedMaxAge": event.max_age,
+        },
+    }
+    if event_languages:
+        event_item["inLanguage"] = (
+            event_languages if len(event_languages) > 1 else event_languages[0]
+        )
+
+    if performers:
+        event_item["performer"] = performers
+
+    return event_item
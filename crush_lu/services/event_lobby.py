@@ -476,13 +476,18 @@ def _mutual_user_ids(user, event) -> set[int]:
     )
 
 
+# Roster tiles are a phone-width grid: the 320px rendition, never the original
+ROSTER_PHOTO_WIDTH = 320
+
+
 def _photo_url(event, handle) -> str:
     """Roster-authorized, handle-addressed photo route (§7.2 / §13 — never the
     durable user-id route used elsewhere)."""
-    return reverse(
+    url = reverse(
         "crush_lu:event_lobby_photo",
         kwargs={"event_id": event.pk, "handle": handle},
     )
+    return f"{url}?w={ROSTER_PHOTO_WIDTH}"
 
 
 def get_roster(viewer, event) -> list[dict]:
@@ -15,6 +15,7 @@ Graph API endpoints used:
 - DELETE /users/{mailbox}/contacts/{id} - Delete contact
 - GET /users/{mailbox}/contacts - List contacts
 - POST /users/{mailbox}/translateExchangeIds - Migrate IDs to immutable format
+- POST /$batch - Up to 20 of the above per call (bulk sync)
 
 Exchange constraints this module has to respect:
 - Contact IDs are not stable unless you ask for immutable ones, so every
@@ -33,17 +34,22 @@ Exchange constraints this module has to respect:
   https://learn.microsoft.com/graph/throttling-limits#outlook-service-limits
 """
 
+import hashlib
+import json
 import logging
 import os
 import re
 import threading
 import time
+from datetime import timedelta
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     import requests
 
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -62,9 +68,21 @@ CRUSH_CATEGORY = "Crush.lu"
 # https://learn.microsoft.com/graph/outlook-immutable-id
 IMMUTABLE_ID_PREFER = 'IdType="ImmutableId"'
 
-# Rate limiting: delay between profiles during bulk sync (seconds)
+# Rate limiting: delay between contacts during bulk delete (seconds)
 SYNC_DELAY_BETWEEN_PROFILES = 0.5
 
+# Bulk sync. Graph caps a JSON batch at 20 requests, and every request inside
+# it still counts against the 10,000 / 10 min mailbox budget (~16/s), so the
+# token bucket paces sub-requests, not batches, with headroom for the signal
+# path and photo uploads sharing the same budget.
+GRAPH_BATCH_LIMIT = 20
+SYNC_REQUESTS_PER_SECOND = 10.0
+SYNC_MIN_REQUESTS_PER_SECOND = 0.5
+
+# A pass that has not moved its cursor for this long is presumed dead (worker
+# recycled mid-pass) and the next trigger may take it over.
+SYNC_HEARTBEAT_STALE = timedelta(minutes=15)
+
 # Retry config for 429 responses
 MAX_RETRIES = 3
 DEFAULT_RETRY_AFTER = 10  # seconds, if Retry-After header is missing
@@ -119,6 +137,86 @@ def normalize_e164(raw) -> Optional[str]:
     return cleaned if _E164_RE.match(cleaned) else None
 
 
+def contact_payload_hash(payload: dict) -> str:
+    """
+    Stable fingerprint of a contact payload (see _build_contact_payload).
+
+    Stored on the profile after every successful write, so the bulk sync can
+    tell "nothing changed" without asking Outlook.
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TokenBucket:
+    """
+    Client-side pacer for the per-mailbox Graph request budget.
+
+    Refills at ``rate`` tokens per second up to ``capacity``; each Graph
+    request (including every sub-request of a $batch) costs one token. A 429
+    pauses the bucket for the server's Retry-After and halves the rate; every
+    clean batch then wins a tenth of the ceiling back. Exchange's budget is
+    shared with the signal-driven sync and the photo uploads, so holding to a
+    fixed rate would keep tripping it whenever those were busy.
+    """
+
+    def __init__(
+        self,
+        rate: float = SYNC_REQUESTS_PER_SECOND,
+        capacity: int = GRAPH_BATCH_LIMIT,
+        clock=None,
+        sleep=None,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._updated = self._clock()
+        self._paused_until = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        return now
+
+    def acquire(self, n: int = 1) -> None:
+        """Block until ``n`` requests may be sent."""
+        n = min(n, self.capacity)
+        while True:
+            now = self._refill()
+            if now < self._paused_until:
+                self._sleep(self._paused_until - now)
+                continue
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            self._sleep((n - self.tokens) / self.rate)
+
+    def throttled(self, retry_after: float) -> None:
+        """Graph answered 429: wait it out and slow down."""
+        self._refill()
+        self._paused_until = max(self._paused_until, self._clock() + retry_after)
+        self.tokens = 0.0
+        self.rate = max(SYNC_MIN_REQUESTS_PER_SECOND, self.rate / 2)
+
+    def recovered(self) -> None:
+        """A batch went through without throttling: speed back up."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def _retry_after_seconds(headers) -> int:
+    value = (headers or {}).get("Retry-After") or (headers or {}).get("retry-after")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
 # MSAL's token cache lives on the application object, so a fresh
 # ConfidentialClientApplication per call means acquire_token_silent always
 # misses and every Graph operation pays a round trip to login.microsoftonline.com.
@@ -275,7 +373,9 @@ class GraphContactsService:
             logger.error(f"Failed to acquire Graph API access token: {error}")
             raise Exception(f"Failed to acquire access token: {error}")
 
-    def _request_with_retry(self, method, url, **kwargs) -> "requests.Response":
+    def _request_with_retry(
+        self, method, url, on_throttle=None, **kwargs
+    ) -> "requests.Response":
         """
         Make an HTTP request with automatic retry on 429 (Too Many Requests).
 
@@ -287,6 +387,8 @@ class GraphContactsService:
         Args:
             method: HTTP method ('get', 'post', 'patch', 'put', 'delete')
             url: Request URL
+            on_throttle: Optional callable told each Retry-After (seconds), so
+                a TokenBucket pacing the caller slows down too.
             **kwargs: Passed to requests.request()
 
         Returns:
@@ -312,6 +414,8 @@ class GraphContactsService:
                     retry_after = int(retry_header)
                 except (ValueError, TypeError):
                     pass
+            if on_throttle is not None:
+                on_throttle(retry_after)
 
             if attempt >= MAX_RETRIES:
                 # All retries exhausted, return the 429 response
@@ -630,7 +734,14 @@ class GraphContactsService:
         )
         profile.outlook_contact_id = ""
         profile.outlook_photo_key = ""
-        profile.save(update_fields=["outlook_contact_id", "outlook_photo_key"])
+        profile.outlook_contact_hash = ""
+        profile.save(
+            update_fields=[
+                "outlook_contact_id",
+                "outlook_photo_key",
+                "outlook_contact_hash",
+            ]
+        )
 
     @staticmethod
     def _remember_photo_key(profile, photo_key: str) -> None:
@@ -648,6 +759,21 @@ class GraphContactsService:
                 outlook_photo_key=photo_key
             )
 
+    @staticmethod
+    def _remember_contact_hash(profile, payload: dict) -> None:
+        """
+        Record the payload now live on the Outlook contact.
+
+        QuerySet.update() for the same reason as _remember_photo_key.
+        """
+        from crush_lu.models import CrushProfile
+
+        profile.outlook_contact_hash = contact_payload_hash(payload)
+        if profile.pk:
+            CrushProfile.objects.filter(pk=profile.pk).update(
+                outlook_contact_hash=profile.outlook_contact_hash
+            )
+
     def create_contact(self, profile, force: bool = False) -> Optional[str]:
         """
         Create a new contact in Outlook.
@@ -686,6 +812,7 @@ class GraphContactsService:
                 logger.info(
                     f"Created Outlook contact for profile {profile.pk}: {contact_id}"
                 )
+                self._remember_contact_hash(profile, payload)
 
                 # Upload photo if available. force=True because this is a brand
                 # new contact with no photo on it, even if outlook_photo_key is
@@ -771,6 +898,7 @@ class GraphContactsService:
                     f"Updated Outlook contact for profile {profile.pk}: "
                     f"{profile.outlook_contact_id}"
                 )
+                self._remember_contact_hash(profile, payload)
 
                 # Update photo only if it actually changed
                 if profile.photo_1:
@@ -816,6 +944,7 @@ class GraphContactsService:
                         f"Updated Outlook contact for profile {profile.pk} "
                         f"on retry: {profile.outlook_contact_id}"
                     )
+                    self._remember_contact_hash(profile, payload)
                     if profile.photo_1:
                         self._upload_contact_photo(
                             profile.outlook_contact_id, profile, token
@@ -997,15 +1126,223 @@ class GraphContactsService:
                 return contact_id
             return None
 
-    def sync_all_profiles(self, dry_run: bool = False) -> dict:
+    # ------------------------------------------------------------------
+    # Bulk sync
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _photo_pending(profile) -> bool:
+        """True if photo_1 differs from the photo last uploaded to Outlook."""
+        return bool(profile.photo_1) and (
+            (profile.photo_1.name or "") != profile.outlook_photo_key
+        )
+
+    def _send_batch(self, subrequests: list, token: str, bucket: TokenBucket):
+        """
+        POST up to GRAPH_BATCH_LIMIT sub-requests to Graph's JSON $batch.
+
+        Returns:
+            dict: {sub-request id: sub-response dict}, or None if the batch
+                call itself failed. Sub-responses are not retried here.
+        """
+        response = self._request_with_retry(
+            "post",
+            f"{GRAPH_API_BASE}/$batch",
+            on_throttle=bucket.throttled,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            },
+            json={"requests": subrequests},
+        )
+        if response.status_code != 200:
+            logger.error(
+                f"Outlook contact batch failed: HTTP {response.status_code} - "
+                f"{response.text}"
+            )
+            return None
+        return {
+            item.get("id"): item for item in response.json().get("responses", [])
+        }
+
+    def _sync_batch(self, pending: list, bucket: TokenBucket, stats: dict) -> bool:
+        """
+        Create/update the contacts of up to GRAPH_BATCH_LIMIT profiles.
+
+        Sub-requests answered 429 are resent after the bucket has waited out
+        their Retry-After, up to MAX_RETRIES times. Updates that hit a
+        missing contact (404) or a concurrent edit (412) fall back to
+        sync_profile(), which owns the ETag and ID-dialect handling.
+
+        Args:
+            pending: [(profile, payload)] to write
+            bucket: Pacer shared by the whole pass
+            stats: sync_all_profiles() stats, updated in place
+
+        Returns:
+            bool: False if some profiles were still throttled after the last
+                retry (they are neither synced nor counted as errors).
+        """
+        prefer = {"Content-Type": "application/json", "Prefer": IMMUTABLE_ID_PREFER}
+
+        for attempt in range(MAX_RETRIES + 1):
+            if not pending:
+                return True
+
+            bucket.acquire(len(pending))
+            token = self.get_access_token()
+            subrequests = []
+            for index, (profile, payload) in enumerate(pending):
+                if profile.outlook_contact_id:
+                    method = "PATCH"
+                    url = f"/users/{self.mailbox}/contacts/{profile.outlook_contact_id}"
+                else:
+                    method = "POST"
+                    url = f"/users/{self.mailbox}/contacts"
+                subrequests.append(
+                    {
+                        "id": str(index),
+                        "method": method,
+                        "url": url,
+                        "headers": prefer,
+                        "body": payload,
+                    }
+                )
+
+            responses = self._send_batch(subrequests, token, bucket)
+            if responses is None:
+                stats["errors"] += len(pending)
+                return True
+
+            throttled = []
+            retry_after = 0
+            for index, (profile, payload) in enumerate(pending):
+                item = responses.get(str(index)) or {}
+                status = item.get("status")
+                if status == 429:
+                    throttled.append((profile, payload))
+                    retry_after = max(
+                        retry_after, _retry_after_seconds(item.get("headers"))
+                    )
+                    continue
+                try:
+                    if self._apply_batch_response(profile, payload, item, token, bucket):
+                        stats["synced"] += 1
+                    else:
+                        stats["errors"] += 1
+                except Exception as e:
+                    logger.error(f"Error syncing profile {profile.pk}: {e}")
+                    stats["errors"] += 1
+
+            if throttled:
+                logger.warning(
+                    f"Graph throttled {len(throttled)} of {len(pending)} contact "
+                    f"writes, retry {attempt + 1}/{MAX_RETRIES} after {retry_after}s"
+                )
+                bucket.throttled(retry_after)
+            else:
+                bucket.recovered()
+            pending = throttled
+
+        return not pending
+
+    def _apply_batch_response(self, profile, payload, item, token, bucket) -> bool:
+        """Record one $batch sub-response on its profile. True if synced."""
+        from crush_lu.models import CrushProfile
+
+        status = item.get("status")
+        created = not profile.outlook_contact_id
+
+        if created and status in (200, 201):
+            contact_id = (item.get("body") or {}).get("id")
+            if not contact_id:
+                logger.error(f"Outlook returned no contact ID for profile {profile.pk}")
+                return False
+            profile.outlook_contact_id = contact_id
+            profile.outlook_contact_hash = contact_payload_hash(payload)
+            # update() rather than save(): nothing the profile signals care
+            # about changed, and a save would re-queue this very sync.
+            CrushProfile.objects.filter(pk=profile.pk).update(
+                outlook_contact_id=contact_id,
+                outlook_contact_hash=profile.outlook_contact_hash,
+            )
+            if profile.photo_1:
+                bucket.acquire()
+                # Brand new contact: no photo on it whatever the stored key says.
+                self._upload_contact_photo(contact_id, profile, token, force=True)
+            return True
+
+        if not created and status in (200, 204):
+            self._remember_contact_hash(profile, payload)
+            if self._photo_pending(profile):
+                bucket.acquire()
+                self._upload_contact_photo(profile.outlook_contact_id, profile, token)
+            return True
+
+        if not created and status in (404, 412):
+            # Gone, still on a legacy ID, or edited concurrently; the
+            # single-profile path knows how to tell these apart.
+            return bool(self.sync_profile(profile))
+
+        logger.error(
+            f"Failed to {'create' if created else 'update'} Outlook contact for "
+            f"profile {profile.pk}: HTTP {status} - {item.get('body')}"
+        )
+        return False
+
+    def _claim_sync_pass(self, restart: bool, resume_only: bool):
+        """
+        Take the bulk-sync lease and position the cursor.
+
+        Returns:
+            OutlookContactSyncState, or None with the reason it was not taken:
+            "locked" (another pass holds a fresh heartbeat) or "idle"
+            (resume_only and no pass is in progress).
+        """
+        from crush_lu.models import OutlookContactSyncState
+
+        now = timezone.now()
+        with transaction.atomic():
+            OutlookContactSyncState.get_state()
+            state = OutlookContactSyncState.objects.select_for_update().get(pk=1)
+
+            if state.heartbeat_at and now - state.heartbeat_at < SYNC_HEARTBEAT_STALE:
+                return None, "locked"
+            if resume_only and state.pass_started_at is None:
+                return None, "idle"
+
+            if restart or state.pass_started_at is None:
+                state.cursor_profile_id = 0
+                state.pass_started_at = now
+            state.heartbeat_at = now
+            state.save()
+        return state, ""
+
+    def sync_all_profiles(
+        self,
+        dry_run: bool = False,
+        restart: bool = False,
+        resume_only: bool = False,
+        time_budget: Optional[float] = None,
+    ) -> dict:
         """
         Sync all phone-verified CrushProfiles to Outlook contacts.
 
         Syncs profiles with verified phone numbers to enable caller ID,
         regardless of approval status.
 
+        Profiles are walked in primary-key order, GRAPH_BATCH_LIMIT at a time,
+        and each group is written with one Graph $batch call paced by a
+        TokenBucket. Profiles whose payload hash and photo match what was last
+        written are skipped without a request. The position is checkpointed in
+        OutlookContactSyncState after every group, so a pass cut short by
+        throttling, time_budget or a restart picks up where it stopped.
+
         Args:
             dry_run: If True, only preview what would be synced
+            restart: Discard an unfinished pass and start from the first profile
+            resume_only: Only continue an unfinished pass; do nothing otherwise
+            time_budget: Stop (resumably) after about this many seconds
 
         Returns:
             dict: Statistics about the sync operation
@@ -1013,14 +1350,29 @@ class GraphContactsService:
                     'total': int,
                     'synced': int,
                     'skipped': int,
+                    'unchanged': int,
                     'errors': int,
-                    'dry_run': bool
+                    'dry_run': bool,
+                    'resumed_from': int,   # profile ID the pass continued after
+                    'complete': bool,      # the pass reached the last profile
+                    'stopped': str,        # why not: throttled, time_budget,
+                                           # locked or idle ('' if complete)
                 }
         """
-        from crush_lu.models import CrushProfile
+        from crush_lu.models import CrushProfile, OutlookContactSyncState
         from crush_lu.signals import is_test_user
 
-        stats = {"total": 0, "synced": 0, "skipped": 0, "errors": 0, "dry_run": dry_run}
+        stats = {
+            "total": 0,
+            "synced": 0,
+            "skipped": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "dry_run": dry_run,
+            "resumed_from": 0,
+            "complete": False,
+            "stopped": "",
+        }
 
         if not is_sync_enabled() and not dry_run:
             logger.warning("Outlook contact sync disabled for this environment")
@@ -1032,50 +1384,88 @@ class GraphContactsService:
             phone_verified=True,
             phone_number__isnull=False,
             user__is_active=True,
-        ).exclude(phone_number='')
+        ).exclude(phone_number='').order_by("pk")
         stats["total"] = profiles.count()
 
-        for profile in profiles:
-            # Skip test users
-            if is_test_user(profile.user):
-                stats["skipped"] += 1
-                if dry_run:
-                    logger.info(
-                        f"[DRY RUN] Would skip profile {profile.pk} "
-                        f"({profile.user.email}) - test user"
-                    )
-                continue
+        state = None
+        if not dry_run:
+            state, stats["stopped"] = self._claim_sync_pass(restart, resume_only)
+            if state is None:
+                logger.info(f"Outlook contact sync not started: {stats['stopped']}")
+                return stats
+            stats["resumed_from"] = state.cursor_profile_id
 
-            # Skip profiles without phone numbers
-            if not profile.phone_number:
-                stats["skipped"] += 1
-                if dry_run:
-                    logger.info(
-                        f"[DRY RUN] Would skip profile {profile.pk} "
-                        f"({profile.user.email}) - no phone number"
-                    )
-                continue
+        cursor = stats["resumed_from"]
+        bucket = TokenBucket()
+        deadline = time.monotonic() + time_budget if time_budget else None
 
-            if dry_run:
-                action = "update" if profile.outlook_contact_id else "create"
-                # Log without PII - only use profile ID and user ID
-                logger.info(
-                    f"[DRY RUN] Would {action} contact for profile {profile.pk} (user ID: {profile.user.id})"
-                )
-                stats["synced"] += 1
-            else:
-                try:
-                    result = self.sync_profile(profile)
-                    if result:
+        try:
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    stats["stopped"] = "time_budget"
+                    break
+
+                chunk = list(profiles.filter(pk__gt=cursor)[:GRAPH_BATCH_LIMIT])
+                if not chunk:
+                    stats["complete"] = True
+                    break
+
+                pending = []
+                for profile in chunk:
+                    # Skip test users
+                    if is_test_user(profile.user):
+                        stats["skipped"] += 1
+                        if dry_run:
+                            logger.info(
+                                f"[DRY RUN] Would skip profile {profile.pk} "
+                                f"({profile.user.email}) - test user"
+                            )
+                        continue
+
+                    payload = self._build_contact_payload(profile)
+                    if (
+                        profile.outlook_contact_id
+                        and profile.outlook_contact_hash == contact_payload_hash(payload)
+                        and not self._photo_pending(profile)
+                    ):
+                        stats["unchanged"] += 1
+                        continue
+
+                    if dry_run:
+                        action = "update" if profile.outlook_contact_id else "create"
+                        # Log without PII - only use profile ID and user ID
+                        logger.info(
+                            f"[DRY RUN] Would {action} contact for profile {profile.pk} (user ID: {profile.user.id})"
+                        )
                         stats["synced"] += 1
                     else:
-                        stats["errors"] += 1
-                except Exception as e:
-                    logger.error(f"Error syncing profile {profile.pk}: {e}")
-                    stats["errors"] += 1
+                        pending.append((profile, payload))
+
+                if pending and not self._sync_batch(pending, bucket, stats):
+                    # Leave the cursor before this group; what did get written
+                    # is hash-skipped when the pass resumes.
+                    stats["stopped"] = "throttled"
+                    break
 
-                # Rate limit: pause between profiles to avoid Graph API throttling
-                time.sleep(SYNC_DELAY_BETWEEN_PROFILES)
+                cursor = chunk[-1].pk
+                if state is not None:
+                    OutlookContactSyncState.objects.filter(pk=state.pk).update(
+                        cursor_profile_id=cursor, heartbeat_at=timezone.now()
+                    )
+        finally:
+            if state is not None:
+                if stats["complete"]:
+                    OutlookContactSyncState.objects.filter(pk=state.pk).update(
+                        cursor_profile_id=0,
+                        pass_started_at=None,
+                        heartbeat_at=None,
+                        last_completed_at=timezone.now(),
+                    )
+                else:
+                    # Release the lease so the next trigger resumes right away.
+                    OutlookContactSyncState.objects.filter(pk=state.pk).update(
+                        heartbeat_at=None
+                    )
 
         return stats
 
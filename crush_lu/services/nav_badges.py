@@ -0,0 +1,272 @@
+"""
+Per-member navigation state behind ``crush_user_context``.
+
+The context processor runs on every rendered page, and for a signed-in member
+it used to issue a dozen queries: email verification, connection and request
+counts, Spark counts, the profile and its latest submission, upcoming
+registrations, coach status, the special journey. Here all of that is
+computed once into a plain dict and cached under one key per member:
+
+    {"email_verified": bool, "connection_count": int, ...,
+     "upcoming_registration_ids": [int, ...], "valid_until": datetime | None}
+
+so a warm page header costs a single cache read. The signals that already
+fire on the underlying models drop the entry of every member whose header
+they change (see the "Navigation badges" block in signals.py). The key
+carries NAV_BADGES_VERSION, so a deploy that changes the shape never reads
+entries written by the old code.
+
+Model instances are deliberately not cached: templates that want the profile,
+submission, registrations or journey get lazy objects that query only if the
+page actually touches them.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from crush_lu.models.events import SEAT_HOLDING_STATUSES
+
+# Bump when the cached dict changes shape
+NAV_BADGES_VERSION = 1
+
+# Safety net for writes that bypass save() (queryset .update()) and for the
+# few inputs no signal covers (settings-driven Connect phase)
+NAV_BADGES_CACHE_TIMEOUT = 5 * 60
+
+
+def _cache_key(user):
+    # date_joined tells a reused id apart (test databases roll back sequences)
+    joined = int(user.date_joined.timestamp() * 1_000_000) if user.date_joined else 0
+    return f"crush_lu:nav_badges:v{NAV_BADGES_VERSION}:{user.pk}:{joined}"
+
+
+def invalidate_nav_badges(user_ids):
+    """Drop the cached navigation state of these members, now and again on commit.
+
+    ``user_ids`` is any iterable of ids, or a ``values("pk")``-style queryset
+    the lookup runs as a subquery. A page the same member renders between the
+    write and its commit would cache the old state again.
+    """
+    from django.contrib.auth import get_user_model
+
+    if isinstance(user_ids, (list, tuple, set)):
+        user_ids = [user_id for user_id in user_ids if user_id]
+        if not user_ids:
+            return
+    users = get_user_model().objects.filter(pk__in=user_ids).only("pk", "date_joined")
+    keys = [_cache_key(user) for user in users]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def nav_badges(user):
+    """The member's navigation state, from cache when it is still current."""
+    key = _cache_key(user)
+    state = cache.get(key)
+    if state is not None and (
+        state["valid_until"] is None or timezone.now() < state["valid_until"]
+    ):
+        return state
+    state = build_nav_badges(user)
+    cache.set(key, state, NAV_BADGES_CACHE_TIMEOUT)
+    return state
+
+
+def build_nav_badges(user):
+    """Compute the navigation state of ``user`` from the database."""
+    from crush_lu.models import (
+        CrushProfile,
+        CrushSpark,
+        EventConnection,
+        EventRegistration,
+        JourneyProgress,
+        MeetupEvent,
+        ProfileSubmission,
+        SpecialUserExperience,
+    )
+
+    state = {}
+
+    # Email-verification flag — drives the verification banner in the
+    # onboarding stepper. We rely on allauth's EmailAddress.verified;
+    # social-login users always have at least one verified address
+    # because providers we trust (Google, Microsoft, Apple, LuxID,
+    # Facebook) are listed in SOCIALACCOUNT_EMAIL_VERIFIED_PROVIDERS.
+    try:
+        from allauth.account.models import EmailAddress
+
+        state["email_verified"] = EmailAddress.objects.filter(
+            user=user, verified=True
+        ).exists()
+    except Exception:
+        # Allauth not installed in some test contexts — assume verified
+        # to avoid spurious banners.
+        state["email_verified"] = True
+
+    # Blocked counterparts are hidden from every connection surface; reuse the
+    # same id set so badge counts can't advertise a pair the lists now hide.
+    from crush_lu.services.blocking import blocked_user_ids
+
+    blocked_ids = blocked_user_ids(user)
+
+    # Connection count for badge. Excludes blocked counterparts — a `shared`
+    # connection isn't terminated on block (contact was already exchanged),
+    # so without this it would keep inflating the active count while
+    # my_connections hides it. Pre-`shared` crush leads are private: the
+    # recipient's badge must not increment the moment a crush is declared
+    # (or when the coach starts review), and the crusher's lead is not a
+    # connection yet — it renders as a neutral lead, not a connection.
+    state["connection_count"] = (
+        EventConnection.objects.filter(
+            Q(requester=user) | Q(recipient=user),
+            status__in=["accepted", "coach_reviewing", "coach_approved", "shared"],
+        )
+        .excluding_unshared_crushes()
+        .exclude(Q(requester_id__in=blocked_ids) | Q(recipient_id__in=blocked_ids))
+        .count()
+    )
+
+    # Pending connection requests (received). Exclude blocked requesters so
+    # the nav/dashboard badge can't advertise a request the page itself hides
+    # (defence-in-depth; blocking also declines the underlying connection).
+    # Crush leads are never pending-visible to the recipient.
+    state["pending_requests_count"] = (
+        EventConnection.objects.filter(recipient=user, status="pending")
+        .exclude(flow=EventConnection.FLOW_CRUSH)
+        .exclude(requester_id__in=blocked_ids)
+        .count()
+    )
+
+    # Sparks needing action (approved by coach, waiting for journey creation)
+    state["actionable_sparks_count"] = CrushSpark.objects.filter(
+        sender=user,
+        status__in=["coach_approved", "coach_assigned"],
+    ).count()
+
+    # Crush Connect: pending received Sparks — drives the Connect nav badge
+    # (sub-nav, navbar menu, mobile bottom-nav). Computed only when the
+    # Connect nav is actually visible (onboarded membership, or staff).
+    connect_pending_sparks_count = 0
+    try:
+        from crush_lu.connect_phase import candidate_access_open
+
+        # Candidates receive Sparks too, so the badge follows candidate access
+        # (open in the beta), not just the full launch flag.
+        connect_open = candidate_access_open()
+        membership = getattr(user, "crush_connect_membership", None)
+        nav_visible = user.is_staff or (
+            connect_open and membership is not None and membership.is_onboarded
+        )
+        if nav_visible:
+            from crush_lu.models import CuriositySpark
+
+            connect_pending_sparks_count = (
+                CuriositySpark.objects.filter(recipient=user, status="pending")
+                .exclude(sender_id__in=blocked_ids)
+                .count()
+            )
+    except Exception:
+        connect_pending_sparks_count = 0
+    state["connect_pending_sparks_count"] = connect_pending_sparks_count
+
+    # Profile and its latest submission, for the navbar progress indicator
+    profile = CrushProfile.objects.filter(user=user).first()
+    state["has_profile"] = profile is not None
+    state["verification_status"] = profile.verification_status if profile else None
+    state["profile_is_approved"] = profile.is_approved if profile else False
+    state["submission_id"] = None
+    state["submission_status"] = None
+    state["assigned_coach_name"] = None
+    if profile:
+        # Expired submissions are closed-out pre-pivot reviews — the navbar
+        # must not resurrect "needs action" / coach labels for them, not
+        # even from an older non-expired row.
+        submission = ProfileSubmission.latest_for_profile(
+            profile, select_related=("coach__user",)
+        )
+        if submission:
+            state["submission_id"] = submission.pk
+            state["submission_status"] = submission.status
+            # Coach name for pending review / recontact navbar display
+            if submission.coach and submission.status in (
+                "pending",
+                "recontact_coach",
+            ):
+                state["assigned_coach_name"] = submission.coach.user.first_name
+
+    # Upcoming events for user (includes ongoing events until end_time)
+    # Use a generous cutoff to include events that may still be ongoing,
+    # then filter precisely in Python. This avoids timedelta * F()
+    # which is not supported on SQLite. The cutoff is the enforced max
+    # event duration, so a still-live event is never dropped from the nav
+    # regardless of its length (see MeetupEvent.live_lookback_cutoff).
+    now = timezone.now()
+    registrations = (
+        EventRegistration.objects.filter(
+            user=user,
+            event__date_time__gte=MeetupEvent.live_lookback_cutoff(now),
+            status__in=[*SEAT_HOLDING_STATUSES, "waitlist"],
+        )
+        .select_related("event")
+        .order_by("event__date_time")
+    )
+    # Filter precisely: keep events whose end_time hasn't passed, and drop
+    # any whose event has since been cancelled or unpublished. my_events
+    # skips those rows outright, so counting them here made the nav promise
+    # personal events that the page it links to would not show -- a member
+    # whose only seat was on a cancelled event landed on an empty page.
+    upcoming = []
+    for registration in registrations:
+        event = registration.event
+        end_time = event.date_time + timedelta(minutes=event.duration_minutes or 0)
+        if event.is_published and not event.is_cancelled and end_time >= now:
+            upcoming.append((registration.pk, end_time))
+    upcoming = upcoming[:5]
+    state["upcoming_registration_ids"] = [pk for pk, _end_time in upcoming]
+    # The entry goes stale by itself once the first listed event ends
+    state["valid_until"] = min((end for _pk, end in upcoming), default=None)
+
+    # Coach flag drives the coach navigation branch in base.html, so the
+    # template never dereferences the crushcoach reverse relation directly.
+    # (A missing reverse OneToOne raises a subclass of AttributeError.)
+    coach = getattr(user, "crushcoach", None)
+    state["is_active_coach"] = bool(coach and coach.is_active)
+    state["pending_screening_count"] = (
+        ProfileSubmission.objects.filter(
+            coach=coach,
+            status__in=["pending", "recontact_coach"],
+            review_call_completed=False,
+        ).count()
+        if state["is_active_coach"]
+        else 0
+    )
+
+    # Special journey experience: linked_user (gifts) first, then the
+    # legacy name match
+    special_experience = SpecialUserExperience.objects.filter(
+        Q(is_active=True)
+        & (
+            Q(linked_user=user)  # Direct link (gifts)
+            | Q(
+                first_name__iexact=user.first_name,
+                last_name__iexact=user.last_name,
+                linked_user__isnull=True,  # Only name-match if no linked_user
+            )
+        )
+    ).first()
+    state["special_experience_id"] = special_experience.pk if special_experience else None
+    state["journey_progress_id"] = None
+    if special_experience:
+        state["journey_progress_id"] = (
+            JourneyProgress.objects.filter(user=user)
+            .values_list("pk", flat=True)
+            .first()
+        )
+
+    return state
@@ -0,0 +1,403 @@
+"""
+Orphaned blob scanner behind ``cleanup_orphan_storage``.
+
+The old cleanup listed every blob under ``users/`` serially and only caught
+whole folders of deleted users; files left behind by replaced photos, deleted
+rewards or gifts were never found. This scanner diffs storage against the
+database instead:
+
+1. One pass over every ``FileField``/``ImageField`` column of every installed
+   model (plus the names held in JSON: photo renditions, slideshow photos)
+   builds a set of 64-bit hashes of the referenced names per storage.
+2. Each scanned prefix is split into partitions (``users/0`` ... ``users/9``)
+   that are listed concurrently; a listed blob that is not referenced, is
+   older than ``min_age`` and is not a preserved file of a live user is an
+   orphan.
+3. Orphans are deleted with Blob Batch requests, partition by partition, and
+   every finished partition is written to a JSON checkpoint, so an
+   interrupted run resumes where it stopped.
+
+A hash collision can only make an orphan look referenced, so the compact set
+errs on the side of keeping files. Works against Azure, Azurite and the local
+filesystem storage used in development.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils import timezone
+
+from crush_lu.storage import delete_blobs_batched
+
+logger = logging.getLogger(__name__)
+
+# Only per-user folders by default: public containers also hold assets that
+# were uploaded by hand or generated without a model row
+DEFAULT_PREFIXES = ("users/",)
+
+# Written straight to storage rather than through a file field (see
+# social_photos.py); kept as long as the user exists
+PRESERVED_USER_SUBFOLDERS = ("social_cache",)
+
+# Skips uploads whose row is not committed yet, and files a request or task
+# is still writing
+DEFAULT_MIN_AGE = timedelta(hours=24)
+
+DEFAULT_WORKERS = 8
+
+CHECKPOINT_VERSION = 1
+
+
+def _path_key(name):
+    return int.from_bytes(
+        hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def storage_key(storage):
+    """Identity of the container (or directory) a storage writes to."""
+    if _is_azure(storage):
+        if not (storage.account_name or getattr(storage, "connection_string", None)):
+            return None  # Azure backend with no account configured (development)
+        return f"azure:{storage.account_name}/{storage.azure_container}"
+    if isinstance(storage, FileSystemStorage):
+        return f"file:{os.path.abspath(storage.location)}"
+    return None
+
+
+def _is_azure(storage):
+    return bool(getattr(storage, "azure_container", None))
+
+
+class ReferenceIndex:
+    """Hashes of the referenced file names, per storage."""
+
+    def __init__(self):
+        self.storages = {}
+        self._keys = {}
+
+    def register(self, storage):
+        key = storage_key(storage)
+        if key is None:
+            logger.debug("Skipping unsupported storage %r", storage)
+            return None
+        self.storages.setdefault(key, storage)
+        self._keys.setdefault(key, set())
+        return key
+
+    def add(self, key, name):
+        if key is not None and name:
+            self._keys[key].add(_path_key(name))
+
+    def contains(self, key, name):
+        return _path_key(name) in self._keys.get(key, ())
+
+    def __len__(self):
+        return sum(len(keys) for keys in self._keys.values())
+
+
+def _derivative_references():
+    from crush_lu.models import CrushProfile
+    from crush_lu.services.photo_derivatives import manifest_names
+
+    storage = CrushProfile._meta.get_field("photo_1").storage
+    manifests = (
+        CrushProfile.objects.exclude(photo_derivatives={})
+        .values_list("photo_derivatives", flat=True)
+        .iterator(chunk_size=2000)
+    )
+    for manifest in manifests:
+        for name in manifest_names(manifest):
+            yield storage, name
+
+
+def _slideshow_references():
+    from crush_lu.models import JourneyReward
+
+    storage = JourneyReward._meta.get_field("photo").storage
+    slideshows = (
+        JourneyReward.objects.exclude(slideshow_photos=[])
+        .values_list("slideshow_photos", flat=True)
+        .iterator(chunk_size=2000)
+    )
+    for photos in slideshows:
+        for item in photos or []:
+            if isinstance(item, dict) and item.get("path"):
+                yield storage, item["path"]
+
+
+# File names kept in JSON columns rather than file fields
+EXTRA_REFERENCE_PROVIDERS = (_derivative_references, _slideshow_references)
+
+
+def build_reference_index():
+    """Hash every file name the database refers to, in one pass per model."""
+    index = ReferenceIndex()
+    for model in apps.get_models():
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        file_fields = [
+            f for f in model._meta.concrete_fields if isinstance(f, models.FileField)
+        ]
+        if not file_fields:
+            continue
+        keys = [index.register(f.storage) for f in file_fields]
+        rows = model._base_manager.values_list(
+            *[f.attname for f in file_fields]
+        ).iterator(chunk_size=2000)
+        for row in rows:
+            for key, name in zip(keys, row):
+                index.add(key, name)
+
+    for provider in EXTRA_REFERENCE_PROVIDERS:
+        for storage, name in provider():
+            index.add(index.register(storage), name)
+    return index
+
+
+def partition_prefixes(prefix):
+    """Split a prefix into disjoint prefixes that can be listed in parallel."""
+    # Per-user folders are named by numeric ID
+    if prefix.rstrip("/").rsplit("/", 1)[-1] == "users":
+        return [f"{prefix}{digit}" for digit in "0123456789"]
+    return [prefix]
+
+
+@dataclass
+class Blob:
+    name: str
+    size: int
+    last_modified: datetime
+
+
+def list_blobs(storage, prefix):
+    """Blobs whose name starts with ``prefix``, with names relative to the storage."""
+    if _is_azure(storage):
+        root = (storage.location or "").strip("/")
+        full_prefix = f"{root}/{prefix}" if root else prefix
+        for blob in storage.client.list_blobs(name_starts_with=full_prefix):
+            name = blob.name[len(root) + 1:] if root else blob.name
+            yield Blob(name, blob.size, blob.last_modified)
+        return
+
+    base = os.path.abspath(storage.location)
+    # Walk only the directory the prefix points into
+    start = os.path.join(base, os.path.dirname(prefix))
+    for directory, _dirs, files in os.walk(start):
+        for file_name in files:
+            path = os.path.join(directory, file_name)
+            name = os.path.relpath(path, base).replace(os.sep, "/")
+            if not name.startswith(prefix):
+                continue
+            stat = os.stat(path)
+            yield Blob(
+                name,
+                stat.st_size,
+                datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc),
+            )
+
+
+def delete_blobs(storage, names):
+    """Delete ``names`` from ``storage``; returns how many are gone."""
+    if _is_azure(storage):
+        return delete_blobs_batched(
+            storage.client, [storage._get_valid_path(name) for name in names]
+        )
+    deleted = 0
+    for name in names:
+        try:
+            storage.delete(name)
+            deleted += 1
+        except Exception as e:
+            logger.warning(f"Failed to delete {name}: {e}")
+    return deleted
+
+
+@dataclass
+class PartitionResult:
+    storage: str
+    prefix: str
+    scanned: int = 0
+    orphans: list = field(default_factory=list)
+    deleted: int = 0
+    resumed: bool = False
+
+    @property
+    def orphan_bytes(self):
+        return sum(blob.size for blob in self.orphans)
+
+    def summary(self):
+        return {
+            "scanned": self.scanned,
+            "orphans": len(self.orphans),
+            "orphan_bytes": self.orphan_bytes,
+            "deleted": self.deleted,
+        }
+
+
+class OrphanStorageScanner:
+    """
+    Find (and unless ``dry_run``, delete) blobs no database row refers to.
+
+    Args:
+        prefixes: Name prefixes to scan in every storage used by a file field
+        min_age: Blobs modified more recently than this are never orphans
+        dry_run: Report only
+        checkpoint_path: JSON file recording finished partitions; a run with
+            the same prefixes and mode resumes from it, and it is removed
+            once the scan completes
+        workers: Concurrent listings
+    """
+
+    def __init__(
+        self,
+        prefixes=DEFAULT_PREFIXES,
+        min_age=DEFAULT_MIN_AGE,
+        dry_run=True,
+        checkpoint_path=None,
+        workers=DEFAULT_WORKERS,
+    ):
+        self.prefixes = list(prefixes)
+        self.min_age = min_age
+        self.dry_run = dry_run
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable checkpoint %s", self.checkpoint_path)
+            return {}
+        if (
+            state.get("version") != CHECKPOINT_VERSION
+            or state.get("prefixes") != self.prefixes
+            or state.get("dry_run") != self.dry_run
+        ):
+            return {}
+        return state.get("done", {})
+
+    def _save_checkpoint(self, done):
+        if not self.checkpoint_path:
+            return
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "prefixes": self.prefixes,
+            "dry_run": self.dry_run,
+            "done": done,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def _is_orphan(self, key, blob, cutoff):
+        if self.index.contains(key, blob.name):
+            return False
+        if blob.last_modified > cutoff:
+            return False
+        parts = blob.name.split("/")
+        if (
+            len(parts) > 3
+            and parts[0] == "users"
+            and parts[1].isdigit()
+            and int(parts[1]) in self.user_ids
+            and parts[2] in PRESERVED_USER_SUBFOLDERS
+        ):
+            return False
+        return True
+
+    def _scan_partition(self, key, storage, prefix, cutoff):
+        # Runs in a worker thread: only storage I/O, no database access
+        result = PartitionResult(storage=key, prefix=prefix)
+        for blob in list_blobs(storage, prefix):
+            result.scanned += 1
+            if self._is_orphan(key, blob, cutoff):
+                result.orphans.append(blob)
+        if result.orphans and not self.dry_run:
+            result.deleted = delete_blobs(
+                storage, [blob.name for blob in result.orphans]
+            )
+        return result
+
+    def run(self, on_partition=None):
+        """
+        Scan every partition not finished by an earlier run.
+
+        Args:
+            on_partition: Called with each PartitionResult as it completes
+
+        Returns:
+            list[PartitionResult]: One per partition, including the ones
+                recorded in the checkpoint (``resumed=True``, no orphan list).
+                Partitions that raised are counted in ``self.failed`` and
+                keep the checkpoint for the next run.
+        """
+        self.index = build_reference_index()
+        self.user_ids = set(get_user_model().objects.values_list("id", flat=True))
+        cutoff = timezone.now() - self.min_age
+        done = self._load_checkpoint()
+        self.failed = 0
+
+        results = []
+        pending = []
+        for key, storage in self.index.storages.items():
+            for prefix in self.prefixes:
+                # A local walk is one directory scan whatever the partitioning
+                partitions = (
+                    partition_prefixes(prefix) if _is_azure(storage) else [prefix]
+                )
+                for partition in partitions:
+                    checkpoint_key = f"{key}|{partition}"
+                    if checkpoint_key in done:
+                        summary = done[checkpoint_key]
+                        results.append(
+                            PartitionResult(
+                                storage=key,
+                                prefix=partition,
+                                scanned=summary["scanned"],
+                                deleted=summary["deleted"],
+                                resumed=True,
+                            )
+                        )
+                        continue
+                    pending.append((key, storage, partition))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self._scan_partition, key, storage, partition, cutoff)
+                for key, storage, partition in pending
+            ]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Left out of the checkpoint: the next run retries it
+                    logger.error(f"Orphan scan partition failed: {e}")
+                    self.failed += 1
+                    continue
+                done[f"{result.storage}|{result.prefix}"] = result.summary()
+                self._save_checkpoint(done)
+                results.append(result)
+                if on_partition:
+                    on_partition(result)
+
+        if not self.failed:
+            self.clear_checkpoint()
+        return results
@@ -0,0 +1,218 @@
+"""
+Resized renditions ("derivatives") of profile photos.
+
+Every photo view used to stream the full-size original (up to 1200px) — a
+48px avatar in a coach list or a lobby roster tile cost the same blob egress
+as the profile page. After a photo changes, WebP (and AVIF where Pillow can
+encode it) copies are written at each of DERIVATIVE_WIDTHS next to the
+original:
+
+    users/{user_id}/photos/derivatives/{content hash}_{width}.{format}
+
+Names are content-hashed, so regenerating is idempotent and never needs a
+uniquifying suffix, and they sit under the user's folder, so GDPR deletion
+(``delete_user_storage``) removes them with the originals. What exists is
+recorded in ``CrushProfile.photo_derivatives``; ``photo_variant()`` picks the
+smallest rendition at least as wide as requested and falls back to the
+original when there is none (not generated yet, or the photo is smaller).
+"""
+
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+PHOTO_FIELDS = ("photo_1", "photo_2", "photo_3")
+
+# Thumbnail (avatars, 48-56px at up to 3x), grid tile, and card/wallet sizes
+DERIVATIVE_WIDTHS = (160, 320, 640)
+
+DERIVATIVE_QUALITY = 80
+
+# AVIF encoding is several times slower than WebP; speed 8 keeps it in the
+# tens of milliseconds for these sizes
+AVIF_SPEED = 8
+
+CONTENT_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+def derivative_formats():
+    """Formats written for each width: WebP always, AVIF when supported."""
+    return ["webp", "avif"] if features.check("avif") else ["webp"]
+
+
+def derivative_name(source_name, digest, width, fmt):
+    directory = os.path.dirname(source_name)
+    return f"{directory}/derivatives/{digest}_{width}.{fmt}"
+
+
+def _entry_names(entry):
+    return [
+        derivative_name(entry["source"], entry["hash"], width, fmt)
+        for width in entry["widths"]
+        for fmt in entry["formats"]
+    ]
+
+
+def manifest_names(manifest):
+    """Every rendition name a ``photo_derivatives`` manifest refers to."""
+    return [name for entry in (manifest or {}).values() for name in _entry_names(entry)]
+
+
+def _current_entry(profile, photo_field):
+    """The manifest entry for the photo the field holds now, else None."""
+    photo = getattr(profile, photo_field)
+    entry = (profile.photo_derivatives or {}).get(photo_field)
+    if not photo or not entry or entry.get("source") != photo.name:
+        return None
+    return entry
+
+
+def _render(image, width, fmt):
+    rendition = image.copy()
+    height = max(1, round(image.height * width / image.width))
+    rendition = rendition.resize((width, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    options = {"quality": DERIVATIVE_QUALITY}
+    if fmt == "avif":
+        options["speed"] = AVIF_SPEED
+    rendition.save(buffer, format=fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def _write(storage, name, data):
+    if storage.exists(name):
+        return  # Content-hashed name: the same bytes are already there
+    # Straight to _save(): CrushProfilePhotoStorage.get_available_name()
+    # prefixes every name with a fresh UUID, which would defeat the hash
+    storage._save(name, ContentFile(data))
+
+
+def build_derivatives(photo):
+    """Write the renditions of one stored photo; returns its manifest entry."""
+    photo.open("rb")
+    try:
+        data = photo.read()
+    finally:
+        photo.close()
+    digest = hashlib.sha256(data).hexdigest()[:20]
+
+    image = Image.open(io.BytesIO(data))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    # Never upscale: widths the original can't fill fall back to it
+    widths = [width for width in DERIVATIVE_WIDTHS if width < image.width]
+    formats = derivative_formats()
+    for width in widths:
+        for fmt in formats:
+            name = derivative_name(photo.name, digest, width, fmt)
+            _write(photo.storage, name, _render(image, width, fmt))
+    return {"source": photo.name, "hash": digest, "widths": widths, "formats": formats}
+
+
+def refresh_photo_derivatives(profile_id, force=False):
+    """
+    Bring one profile's renditions in line with its current photos.
+
+    Builds them for photos without an up-to-date manifest entry (all photos
+    with ``force``), and deletes the renditions of photos that were replaced
+    or removed.
+
+    Returns:
+        int: Number of photos whose renditions were built
+    """
+    from crush_lu.models import CrushProfile
+
+    profile = CrushProfile.objects.filter(pk=profile_id).first()
+    if profile is None:
+        return 0
+
+    built = {}
+    for field in PHOTO_FIELDS:
+        photo = getattr(profile, field)
+        if not photo or (not force and _current_entry(profile, field)):
+            continue
+        try:
+            built[field] = build_derivatives(photo)
+        except Exception:
+            logger.exception(
+                "Could not build derivatives for profile %s %s", profile_id, field
+            )
+
+    stale = []
+    with transaction.atomic():
+        # Re-read under lock: a concurrent refresh may have written the
+        # manifest, or the member may have replaced a photo meanwhile
+        profile = CrushProfile.objects.select_for_update().get(pk=profile_id)
+        manifest = dict(profile.photo_derivatives or {})
+        for field in PHOTO_FIELDS:
+            photo = getattr(profile, field)
+            entry = manifest.pop(field, None)
+            new_entry = built.get(field)
+            if new_entry and photo and photo.name == new_entry["source"]:
+                manifest[field] = new_entry
+            elif new_entry:
+                stale.append(new_entry)  # Built for a photo replaced meanwhile
+            if entry and photo and photo.name == entry.get("source"):
+                manifest.setdefault(field, entry)
+            if entry and manifest.get(field) != entry:
+                stale.append(entry)
+        if manifest != profile.photo_derivatives:
+            CrushProfile.objects.filter(pk=profile_id).update(
+                photo_derivatives=manifest
+            )
+
+    # Renditions still listed under another field (same photo uploaded
+    # twice) are shared and stay
+    keep = set(manifest_names(manifest))
+    storage = profile.photo_1.storage
+    for entry in stale:
+        for name in _entry_names(entry):
+            if name in keep:
+                continue
+            try:
+                storage.delete(name)
+            except Exception:
+                logger.warning("Could not delete stale derivative: %s", name)
+    return len(built)
+
+
+def photos_needing_derivatives(profile):
+    """Photo fields whose renditions are missing or belong to a replaced photo."""
+    fields = []
+    manifest = profile.photo_derivatives or {}
+    for field in PHOTO_FIELDS:
+        photo = getattr(profile, field)
+        entry = manifest.get(field)
+        if photo and not _current_entry(profile, field):
+            fields.append(field)
+        elif entry and not photo:
+            fields.append(field)
+    return fields
+
+
+def photo_variant(profile, photo_field, width=None, accept=""):
+    """
+    ``(storage name, content type)`` to serve for a photo at ``width`` pixels.
+
+    The smallest rendition at least ``width`` wide (AVIF when the client's
+    ``Accept`` header allows it); the original when no width is asked for,
+    nothing that wide was generated, or the renditions are not built yet.
+    """
+    photo = getattr(profile, photo_field)
+    entry = _current_entry(profile, photo_field) if width else None
+    fitting = [w for w in entry["widths"] if w >= width] if entry else []
+    if fitting:
+        fmt = "avif" if "avif" in entry["formats"] and "image/avif" in accept else "webp"
+        name = derivative_name(entry["source"], entry["hash"], min(fitting), fmt)
+        return name, CONTENT_TYPES[fmt]
+    return photo.name, mimetypes.guess_type(photo.name)[0] or "image/jpeg"
@@ -0,0 +1,277 @@
+"""
+Quiz Night leaderboard projection.
+
+The leaderboard is broadcast to every screen in the room after each scoring
+event. Rebuilding it from ``TableRoundScore`` / ``IndividualScore`` each time
+cost a query per table plus a profile lookup per top scorer, so the running
+totals are kept in the cache instead:
+
+    {"tables": {table_number: total},
+     "users": {user_id: total},
+     "people": {user_id: (display_name, has_photo)},
+     "generation": int}
+
+The scorers (the quiz consumer and ``api_quiz.score_table``) hand their
+deltas to ``apply_score_deltas`` under the quiz row lock, and the deltas are
+folded in once the scoring transaction commits. A rebuild takes the same row
+lock, so it reads either before a scoring transaction or after its commit,
+and the per-quiz generation tells the two apart: every scorer draws a new one
+under the lock, and a projection records the one current when it was read. A
+delta is only folded into a projection older than it; a projection built
+after the commit already counts it. Every other write path (undo, reset,
+table changes) invalidates through signals, which also bumps the generation
+so a rebuild racing it is not cached. A missing projection is rebuilt from
+the database in three queries; reading a cached one is one cache get,
+whatever the table count.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+# Quiz nights run for a few hours; the projection just needs to outlive one.
+LEADERBOARD_CACHE_TIMEOUT = 6 * 60 * 60
+LEADERBOARD_TOP_INDIVIDUALS = 10
+
+# The projection's read-modify-writes are serialized by a cache lock, held
+# for a cache round trip or two; a holder that died frees it after the timeout.
+PROJECTION_LOCK_TIMEOUT = 10
+PROJECTION_LOCK_WAIT_SECONDS = 2
+
+
+def _cache_key(quiz_id):
+    return f"crush_lu:quiz_leaderboard:{quiz_id}"
+
+
+def _generation_key(quiz_id):
+    return f"crush_lu:quiz_leaderboard:{quiz_id}:generation"
+
+
+def _generation(quiz_id, bump=False):
+    """The quiz's current generation, or a new one with ``bump``."""
+    key = _generation_key(quiz_id)
+    # Seeded from the clock so a generation lost to eviction restarts above
+    # every one handed out before it.
+    if cache.add(key, time.time_ns(), LEADERBOARD_CACHE_TIMEOUT):
+        # No cached projection can be matched against the new sequence
+        cache.delete(_cache_key(quiz_id))
+    if bump:
+        return cache.incr(key)
+    return cache.get(key)
+
+
+@contextmanager
+def _projection_lock(quiz_id):
+    """Serialize read-modify-writes of the projection.
+
+    Yields whether the lock was acquired; a caller that did not get it must
+    not write the projection.
+    """
+    key = f"{_cache_key(quiz_id)}:lock"
+    deadline = time.monotonic() + PROJECTION_LOCK_WAIT_SECONDS
+    acquired = cache.add(key, 1, PROJECTION_LOCK_TIMEOUT)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.01)
+        acquired = cache.add(key, 1, PROJECTION_LOCK_TIMEOUT)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+def _drop(quiz_id):
+    # Bumped first: a rebuild that read before this is then never cached
+    _generation(quiz_id, bump=True)
+    cache.delete(_cache_key(quiz_id))
+
+
+def invalidate_leaderboard(quiz_id):
+    """Drop the projection, now and again on commit; the next read rebuilds it.
+
+    A rebuild that read the database between the write and its commit is
+    discarded by the second bump.
+    """
+    _drop(quiz_id)
+    transaction.on_commit(lambda: _drop(quiz_id))
+
+
+def _people(user_ids):
+    """``{user_id: (display_name, has_photo)}`` in one query."""
+    from crush_lu.models import CrushProfile
+
+    people = {}
+    for profile in CrushProfile.objects.filter(user_id__in=user_ids).select_related(
+        "user"
+    ).only(
+        "user_id",
+        "show_full_name",
+        "photo_1",
+        "user__username",
+        "user__first_name",
+        "user__last_name",
+    ):
+        people[profile.user_id] = (profile.display_name, bool(profile.photo_1))
+    return people
+
+
+def rebuild_leaderboard(quiz_id):
+    """Recompute the projection from the database and cache it.
+
+    Table totals are one conditional aggregate over ``TableRoundScore``
+    (bonus rounds count double, as in ``QuizTable.get_total_score``); user
+    totals are one ``GROUP BY`` over ``IndividualScore``; display names are
+    one profile query. Read under the scorers' quiz row lock, so no scoring
+    transaction is half-way through while the totals are summed.
+    """
+    from crush_lu.models.quiz import IndividualScore, QuizEvent, QuizTable
+
+    with transaction.atomic():
+        QuizEvent.objects.select_for_update().filter(pk=quiz_id).first()
+        generation = _generation(quiz_id)
+
+        correct = Q(round_scores__is_correct=True, round_scores__quiz_id=quiz_id)
+        tables = dict(
+            QuizTable.objects.filter(quiz_id=quiz_id)
+            .annotate(
+                total=Coalesce(
+                    Sum(
+                        Case(
+                            When(
+                                correct
+                                & Q(round_scores__question__round__is_bonus=True),
+                                then=F("round_scores__question__points") * 2,
+                            ),
+                            When(correct, then=F("round_scores__question__points")),
+                            default=Value(0),
+                            output_field=IntegerField(),
+                        )
+                    ),
+                    0,
+                )
+            )
+            .values_list("table_number", "total")
+        )
+        users = dict(
+            IndividualScore.objects.filter(quiz_id=quiz_id)
+            .values("user_id")
+            .annotate(total=Sum("points_earned"))
+            .values_list("user_id", "total")
+        )
+        projection = {
+            "tables": tables,
+            "users": users,
+            "people": _people(list(users)),
+            "generation": generation,
+        }
+        # Still under the row lock, so no scorer commits before this lands;
+        # an invalidation since the read moved the generation on.
+        with _projection_lock(quiz_id) as locked:
+            if locked and _generation(quiz_id) == generation:
+                cache.set(_cache_key(quiz_id), projection, LEADERBOARD_CACHE_TIMEOUT)
+    return projection
+
+
+def apply_score_deltas(quiz_id, table_number=None, table_delta=0, user_deltas=None):
+    """Fold one scoring event into the cached projection once it commits.
+
+    ``user_deltas`` maps every user whose ``IndividualScore`` row was created
+    or changed to their points delta (0 for a new, pointless row — they still
+    join the standings). Call it inside the scoring transaction, holding the
+    quiz row lock: the generation drawn here orders the event against
+    rebuilds. A rolled-back transaction folds nothing.
+    """
+    generation = _generation(quiz_id, bump=True)
+    user_deltas = dict(user_deltas or {})
+    transaction.on_commit(
+        lambda: _fold(quiz_id, generation, table_number, table_delta, user_deltas)
+    )
+
+
+def _fold(quiz_id, generation, table_number, table_delta, user_deltas):
+    key = _cache_key(quiz_id)
+    with _projection_lock(quiz_id) as locked:
+        projection = cache.get(key) if locked else None
+        if projection is None:
+            # Nothing to fold into, or no safe way to: never skip the event,
+            # drop whatever is cached so the next read counts it.
+            _drop(quiz_id)
+            return
+        if projection["generation"] >= generation:
+            # Rebuilt after this event committed, so it is already counted
+            return
+
+        if table_number is not None:
+            tables = projection["tables"]
+            if table_number not in tables:
+                # A table the projection never saw — rebuild rather than guess.
+                _drop(quiz_id)
+                return
+            tables[table_number] += table_delta
+
+        users = projection["users"]
+        for user_id, delta in user_deltas.items():
+            users[user_id] = users.get(user_id, 0) + delta
+
+        unknown = [uid for uid in user_deltas if uid not in projection["people"]]
+        if unknown:
+            projection["people"].update(_people(unknown))
+
+        cache.set(key, projection, LEADERBOARD_CACHE_TIMEOUT)
+
+
+def individual_score_deltas(quiz_id, question_id, user_ids, points, overwrite):
+    """Per-user deltas for crediting ``points`` on one question.
+
+    Read BEFORE the ``IndividualScore`` writes. ``overwrite`` mirrors the
+    scorers' two modes: first scoring (``get_or_create`` — an existing row
+    keeps its points) and re-scoring (``update_or_create`` — every row is set
+    to ``points``).
+    """
+    from crush_lu.models.quiz import IndividualScore
+
+    previous = dict(
+        IndividualScore.objects.filter(
+            quiz_id=quiz_id, question_id=question_id, user_id__in=user_ids
+        ).values_list("user_id", "points_earned")
+    )
+    if overwrite:
+        return {uid: points - previous.get(uid, 0) for uid in user_ids}
+    return {uid: points for uid in user_ids if uid not in previous}
+
+
+def get_leaderboard(quiz_id):
+    """The broadcast payload: tables by total, then the top individuals."""
+    from crush_lu.views_quiz import _member_color, _member_initials
+
+    projection = cache.get(_cache_key(quiz_id))
+    if projection is None:
+        projection = rebuild_leaderboard(quiz_id)
+
+    tables = [
+        {"table_number": number, "total_score": total}
+        for number, total in sorted(projection["tables"].items())
+    ]
+    # Stable sort keeps table_number order among ties, as before.
+    tables.sort(key=lambda x: x["total_score"], reverse=True)
+
+    top = sorted(projection["users"].items(), key=lambda item: (-item[1], item[0]))
+    individuals = []
+    for user_id, total in top[:LEADERBOARD_TOP_INDIVIDUALS]:
+        # Display names only — the leaderboard is shown on the room screen.
+        name, has_photo = projection["people"].get(user_id, ("Anonymous", False))
+        individuals.append(
+            {
+                "display_name": name,
+                "total_score": total,
+                "initials": _member_initials(name),
+                "color": _member_color(name),
+                "photo_url": f"/api/quiz/photo/{user_id}/" if has_photo else None,
+            }
+        )
+
+    return {"tables": tables, "individuals": individuals}
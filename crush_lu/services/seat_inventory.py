@@ -0,0 +1,479 @@
+# crush_lu/services/seat_inventory.py
+"""
+Seat inventory for event registration launches.
+
+``event_register`` used to take ``select_for_update()`` on the event row for
+every attempt and recount the seat-holding registrations under it, so when a
+popular event opened every request queued on that one lock. With
+``EVENT_SEAT_INVENTORY`` on, the view claims a seat here first and only then
+writes the registration, without the event lock:
+
+- Per event, a counter of held seats (``total``) and one per gender pool
+  (``m``/``f``/``nb``). A claim checks them against the caps passed in —
+  ``max_participants`` for premium members, ``public_capacity`` for everyone
+  else, plus the pool cap when gender limits are active — and increments them
+  in one atomic step.
+- Every claim is also a short-lived reservation token (a "hold"). The view
+  confirms it once the registration row has committed, or releases it when
+  the write fails. A hold nobody settles — a worker that died mid-request —
+  expires after SEAT_HOLD_SECONDS and its seat is handed back.
+
+Where the counters live:
+- Redis (one Lua script per operation) when the default cache is
+  django-redis, so every worker shares one inventory.
+- Otherwise an in-process table (local dev, tests). It is only correct for a
+  single process; production always runs the Redis cache.
+
+Reconciliation: counters are seeded from the database on the first claim for
+an event. Seat changes made anywhere else (cancellations, waitlist promotion,
+payment expiry) reach them through the EventRegistration signals in
+signals.py, and the admin's bulk ``.update()`` actions call ``adjust_seats``
+themselves. Those adjustments deliberately err towards *over*-counting — a
+seat taken is counted at once, a seat freed only after commit — so drift can
+waitlist someone early but never oversell. What nothing tracks (a shell
+``.update()``, a registrant's gender change) is repaired by the
+``reconcile_seat_inventory`` command, which drops the counters so the next
+claim reseeds them. When the inventory is unavailable (Redis down, or a
+reseed races an in-flight hold) ``claim_seat`` returns None and the view falls
+back to the event-row lock.
+"""
+
+import logging
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+# A claim's reservation lifetime; long enough for the registration write
+SEAT_HOLD_SECONDS = 120
+
+# Counters of an event nobody registers for expire; the next claim reseeds them
+SEAT_INVENTORY_TTL = 6 * 60 * 60
+
+ADMITTED = "admitted"
+FULL = "full"
+POOL_FULL = "pool_full"
+
+# Backend claim results: -1 means the event has no counters yet
+_NOT_SEEDED = -1
+_OUTCOMES = {0: FULL, 1: ADMITTED, 2: POOL_FULL}
+
+POOLS = ("m", "f", "nb")
+
+
+@dataclass
+class SeatClaim:
+    """The outcome of ``claim_seat``; ``token`` is the hold to settle."""
+
+    event_id: int
+    outcome: str
+    pool: str = ""
+    token: str = ""
+
+    @property
+    def admitted(self):
+        return self.outcome == ADMITTED
+
+
+def inventory_enabled():
+    return getattr(settings, "EVENT_SEAT_INVENTORY", False)
+
+
+def _keys(event_id):
+    # The hash tag keeps an event's keys in one slot on a Redis cluster
+    base = f"crush_lu:seats:{{{event_id}}}"
+    return [f"{base}:counts", f"{base}:holds", f"{base}:hold_pools"]
+
+
+# KEYS: counts, holds, hold_pools
+# ARGV: now_ms, hold_expires_ms, token, total_cap, pool, pool_cap, ttl
+_CLAIM = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, token in ipairs(expired) do
+  local pool = redis.call('HGET', KEYS[3], token)
+  redis.call('HINCRBY', KEYS[1], 'total', -1)
+  if pool and pool ~= '' then redis.call('HINCRBY', KEYS[1], pool, -1) end
+  redis.call('HDEL', KEYS[3], token)
+end
+if #expired > 0 then redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1]) end
+if tonumber(redis.call('HGET', KEYS[1], 'total') or '0') >= tonumber(ARGV[4]) then
+  return 0
+end
+local pool = ARGV[5]
+if pool ~= '' and tonumber(ARGV[6]) >= 0 then
+  if tonumber(redis.call('HGET', KEYS[1], pool) or '0') >= tonumber(ARGV[6]) then
+    return 2
+  end
+end
+redis.call('HINCRBY', KEYS[1], 'total', 1)
+if pool ~= '' then redis.call('HINCRBY', KEYS[1], pool, 1) end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+redis.call('HSET', KEYS[3], ARGV[3], pool)
+for i = 1, 3 do redis.call('EXPIRE', KEYS[i], ARGV[7]) end
+return 1
+"""
+
+# KEYS: counts, holds, hold_pools
+# ARGV: token, pool, release (1 = hand the seat back, 0 = keep it)
+_SETTLE = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 then
+  redis.call('HDEL', KEYS[3], ARGV[1])
+  if ARGV[3] == '1' then
+    redis.call('HINCRBY', KEYS[1], 'total', -1)
+    if ARGV[2] ~= '' then redis.call('HINCRBY', KEYS[1], ARGV[2], -1) end
+  end
+  return 1
+end
+if ARGV[3] == '0' and redis.call('EXISTS', KEYS[1]) == 1 then
+  redis.call('HINCRBY', KEYS[1], 'total', 1)
+  if ARGV[2] ~= '' then redis.call('HINCRBY', KEYS[1], ARGV[2], 1) end
+end
+return 0
+"""
+
+# KEYS: counts
+# ARGV: delta, pool
+_ADJUST = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+redis.call('HINCRBY', KEYS[1], 'total', ARGV[1])
+if ARGV[2] ~= '' then redis.call('HINCRBY', KEYS[1], ARGV[2], ARGV[1]) end
+return 1
+"""
+
+# KEYS: counts, holds
+# ARGV: ttl, then field/value pairs
+_SEED = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 1 end
+if redis.call('ZCARD', KEYS[2]) > 0 then return 0 end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS: counts, holds, hold_pools
+# ARGV: now_ms
+_RESET = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, token in ipairs(expired) do redis.call('HDEL', KEYS[3], token) end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[2]) > 0 then return 0 end
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[3])
+return 1
+"""
+
+
+class _RedisInventory:
+    def __init__(self, client):
+        self.client = client
+        self._scripts = {}
+
+    def _run(self, source, keys, args):
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.client.register_script(source)
+        return script(keys=keys, args=args)
+
+    def claim(self, event_id, token, total_cap, pool, pool_cap, now_ms):
+        return int(
+            self._run(
+                _CLAIM,
+                _keys(event_id),
+                [
+                    now_ms,
+                    now_ms + SEAT_HOLD_SECONDS * 1000,
+                    token,
+                    total_cap,
+                    pool,
+                    pool_cap,
+                    SEAT_INVENTORY_TTL,
+                ],
+            )
+        )
+
+    def settle(self, event_id, token, pool, release):
+        self._run(_SETTLE, _keys(event_id), [token, pool, 1 if release else 0])
+
+    def adjust(self, event_id, pool, delta):
+        return bool(self._run(_ADJUST, _keys(event_id)[:1], [delta, pool]))
+
+    def seed(self, event_id, counts):
+        pairs = [item for field_value in counts.items() for item in field_value]
+        return bool(
+            self._run(_SEED, _keys(event_id)[:2], [SEAT_INVENTORY_TTL, *pairs])
+        )
+
+    def reset(self, event_id, now_ms):
+        return bool(self._run(_RESET, _keys(event_id), [now_ms]))
+
+    def counts(self, event_id):
+        raw = self.client.hgetall(_keys(event_id)[0])
+        if not raw:
+            return None
+        return {
+            (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in raw.items()
+        }
+
+
+class _LocalInventory:
+    """The same operations on an in-process table, for a single process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._holds = {}
+
+    def _reclaim_expired(self, event_id, now_ms):
+        holds = self._holds.setdefault(event_id, {})
+        counts = self._counts.get(event_id)
+        for token, (expires_ms, pool) in list(holds.items()):
+            if expires_ms <= now_ms:
+                del holds[token]
+                if counts is not None:
+                    counts["total"] -= 1
+                    if pool:
+                        counts[pool] -= 1
+        return holds
+
+    def claim(self, event_id, token, total_cap, pool, pool_cap, now_ms):
+        with self._lock:
+            counts = self._counts.get(event_id)
+            if counts is None:
+                return _NOT_SEEDED
+            holds = self._reclaim_expired(event_id, now_ms)
+            if counts["total"] >= total_cap:
+                return 0
+            if pool and pool_cap >= 0 and counts.get(pool, 0) >= pool_cap:
+                return 2
+            counts["total"] += 1
+            if pool:
+                counts[pool] = counts.get(pool, 0) + 1
+            holds[token] = (now_ms + SEAT_HOLD_SECONDS * 1000, pool)
+            return 1
+
+    def settle(self, event_id, token, pool, release):
+        with self._lock:
+            counts = self._counts.get(event_id)
+            held = self._holds.get(event_id, {}).pop(token, None)
+            if counts is None:
+                return
+            if held is not None and release:
+                delta = -1
+            elif held is None and not release:
+                # The hold expired and its seat was handed back, but the
+                # registration committed after all: count it again
+                delta = 1
+            else:
+                return
+            counts["total"] += delta
+            if pool:
+                counts[pool] = counts.get(pool, 0) + delta
+
+    def adjust(self, event_id, pool, delta):
+        with self._lock:
+            counts = self._counts.get(event_id)
+            if counts is None:
+                return False
+            counts["total"] += delta
+            if pool:
+                counts[pool] = counts.get(pool, 0) + delta
+            return True
+
+    def seed(self, event_id, counts):
+        with self._lock:
+            if event_id in self._counts:
+                return True
+            if self._holds.get(event_id):
+                return False
+            self._counts[event_id] = dict(counts)
+            return True
+
+    def reset(self, event_id, now_ms):
+        with self._lock:
+            holds = self._reclaim_expired(event_id, now_ms)
+            if holds:
+                return False
+            self._counts.pop(event_id, None)
+            self._holds.pop(event_id, None)
+            return True
+
+    def counts(self, event_id):
+        with self._lock:
+            counts = self._counts.get(event_id)
+            return dict(counts) if counts is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self._holds.clear()
+
+
+_local_inventory = _LocalInventory()
+_redis_inventory = None
+
+
+def _inventory():
+    """The Redis inventory when Redis backs the default cache, else the local one."""
+    global _redis_inventory
+
+    if "RedisCache" not in caches["default"].__class__.__name__:
+        return _local_inventory
+    if _redis_inventory is None:
+        from django_redis import get_redis_connection
+
+        _redis_inventory = _RedisInventory(get_redis_connection("default"))
+    return _redis_inventory
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _pool_for(gender):
+    from crush_lu.models import MeetupEvent
+
+    return MeetupEvent.GENDER_POOL_MAP.get(gender, "") if gender else ""
+
+
+def database_seat_counts(event_id):
+    """Seat-holding registrations of an event, in total and per gender pool."""
+    from crush_lu.models import EventRegistration, MeetupEvent
+    from crush_lu.models.events import SEAT_HOLDING_STATUSES
+
+    counts = {"total": 0, **{pool: 0 for pool in POOLS}}
+    rows = (
+        EventRegistration.objects.filter(
+            event_id=event_id, status__in=SEAT_HOLDING_STATUSES
+        )
+        .values("user__crushprofile__gender")
+        .annotate(n=Count("pk"))
+    )
+    for row in rows:
+        counts["total"] += row["n"]
+        pool = MeetupEvent.GENDER_POOL_MAP.get(row["user__crushprofile__gender"])
+        if pool:
+            counts[pool] += row["n"]
+    return counts
+
+
+def claim_seat(event, gender=None, is_premium=False):
+    """Claim a seat at ``event`` for a member of this gender and tier.
+
+    Returns a ``SeatClaim`` whose outcome is ADMITTED (a seat is held for the
+    caller, who must ``confirm_seat`` or ``release_seat`` it), FULL or
+    POOL_FULL; or None when the inventory can't decide and the caller should
+    take the event-row lock instead.
+    """
+    if not inventory_enabled():
+        return None
+
+    pool = _pool_for(gender)
+    total_cap = event.max_participants if is_premium else event.public_capacity
+    pool_cap = -1
+    if pool and event.gender_limits_active:
+        pool_cap = event.get_gender_pool_limit(gender)
+    token = secrets.token_urlsafe(12)
+
+    try:
+        inventory = _inventory()
+        result = inventory.claim(
+            event.pk, token, total_cap, pool, pool_cap, _now_ms()
+        )
+        if result == _NOT_SEEDED:
+            if not inventory.seed(event.pk, database_seat_counts(event.pk)):
+                return None
+            result = inventory.claim(
+                event.pk, token, total_cap, pool, pool_cap, _now_ms()
+            )
+            if result == _NOT_SEEDED:
+                return None
+    except Exception as e:  # noqa: BLE001 — the row lock still works without us
+        logger.warning("seat inventory unavailable for event %s: %s", event.pk, e)
+        return None
+
+    return SeatClaim(event_id=event.pk, outcome=_OUTCOMES[result], pool=pool, token=token)
+
+
+def _settle(claim, release):
+    if claim is None or not claim.admitted:
+        return
+    try:
+        _inventory().settle(claim.event_id, claim.token, claim.pool, release)
+    except Exception as e:  # noqa: BLE001 — the hold expires on its own
+        logger.warning(
+            "seat inventory settle failed for event %s: %s", claim.event_id, e
+        )
+
+
+def confirm_seat(claim):
+    """The claimed seat's registration has committed: drop the hold, keep the seat."""
+    _settle(claim, release=False)
+
+
+def release_seat(claim):
+    """The claimed seat was not taken after all: hand it back."""
+    _settle(claim, release=True)
+
+
+def adjust_seats(registrations, delta):
+    """Apply a seat change made outside ``claim_seat`` to the counters.
+
+    ``registrations`` are the ``(event_id, user_id)`` pairs that each took
+    (``delta=1``) or freed (``delta=-1``) a seat. Events without counters are
+    left alone. Returns how many pairs were applied; never raises.
+    """
+    registrations = list(registrations)
+    if not inventory_enabled() or not registrations:
+        return 0
+    from crush_lu.models import CrushProfile
+
+    genders = dict(
+        CrushProfile.objects.filter(
+            user_id__in={user_id for _event_id, user_id in registrations}
+        ).values_list("user_id", "gender")
+    )
+    applied = 0
+    try:
+        inventory = _inventory()
+        for event_id, user_id in registrations:
+            applied += inventory.adjust(
+                event_id, _pool_for(genders.get(user_id)), delta
+            )
+    except Exception as e:  # noqa: BLE001 — reconciliation repairs a missed delta
+        logger.warning("seat inventory adjust failed: %s", e)
+    return applied
+
+
+def reconcile_seat_inventory(event_ids):
+    """Drop the counters of these events so their next claim reseeds them.
+
+    An event with a live hold is left alone (reseeding would miss the
+    in-flight registration); it is reported as busy and the caller can retry.
+
+    Returns:
+        dict: ``reset`` and ``busy`` event counts
+    """
+    result = {"reset": 0, "busy": 0}
+    if not inventory_enabled():
+        return result
+    try:
+        inventory = _inventory()
+        for event_id in event_ids:
+            if inventory.reset(event_id, _now_ms()):
+                result["reset"] += 1
+            else:
+                result["busy"] += 1
+    except Exception as e:  # noqa: BLE001 — counters expire on their own
+        logger.warning("seat inventory reconcile failed: %s", e)
+    return result
+
+
+def inventory_seat_counts(event_id):
+    """The event's current counters, or None when it has none."""
+    return _inventory().counts(event_id)
@@ -6,18 +6,25 @@ matching aggregations for a single ISO week and returns a JSON-serializable dict
 ``upsert_snapshot(week_start)`` persists that dict on a
 :class:`~crush_lu.models.metrics.WeeklyMetricsSnapshot` (idempotent per week).
 
-The query patterns mirror those proven in the ``business_plan_metrics``
-management command — same date-window filters, ``Count``/``Avg``/``Exists``
-aggregations — but framed as *new-in-the-week* counts plus a few cumulative
-totals, which is what week-over-week tracking needs.
+The counts are framed as *new-in-the-week* numbers plus a few cumulative
+totals, which is what week-over-week tracking needs. Both are read
+from the incremental daily rollup in ``crush_lu.services.daily_metrics``, so
+recomputing a week — or backfilling a year of them with
+``backfill_snapshots`` — sums rollup rows instead of re-scanning the source
+tables. Nothing here writes the rollup; the ``send_weekly_kpis`` job brings it
+up to date before computing snapshots.
 """
 
 from __future__ import annotations
 
 from datetime import date, timedelta
 
-from django.contrib.auth.models import User
-from django.db.models import Avg, Count, ExpressionWrapper, F, FloatField, Q
+from crush_lu.services.daily_metrics import (
+    CUMULATIVE_METRICS,
+    FILL_EVENTS,
+    FILL_PCT_SUM,
+    metric_totals,
+)
 
 # ISO weeks run Monday (1) .. Sunday (7).
 _WEEK_LENGTH = timedelta(days=7)
@@ -44,55 +51,51 @@ def compute_weekly_snapshot(week_start: date) -> dict:
     """Compute the full KPI payload for the ISO week beginning ``week_start``.
 
     ``week_start`` must be a Monday. The window is the inclusive date range
-    ``[week_start, week_start + 6 days]`` (Mon..Sun), filtered with ``__date``
-    lookups so it stays timezone-correct under the project's current TZ.
+    ``[week_start, week_start + 6 days]`` (Mon..Sun) of local days.
+
+    The "new in the week" counts and the cumulative totals are sums over the
+    daily rollup (``crush_lu.services.daily_metrics``); engagement is queried
+    live.
     """
     # Imported here (not at module load) to avoid import-time coupling between
     # the services package and the large models package.
-    from crush_lu.models import CrushProfile, ProfileSubmission
-    from crush_lu.models.connections import EventConnection
-    from crush_lu.models.crush_connect import (
-        CrushConnectMembership,
-        CrushConnectWaitlist,
-    )
-    from crush_lu.models.events import SEAT_HOLDING_STATUSES, EventRegistration, MeetupEvent
+    from crush_lu.models import CrushProfile
+    from crush_lu.models.event_lobby import ConfirmedEncounter
     from crush_lu.models.profiles import (
         DailyUserActivity,
         PremiumMembership,
         UserActivity,
     )
-    from crush_lu.models.referrals import ReferralAttribution
 
     week_end = week_start + timedelta(days=6)  # Sunday, inclusive
 
-    def in_week(qs, field):
-        return qs.filter(
-            **{f"{field}__date__gte": week_start, f"{field}__date__lte": week_end}
-        )
+    week = {
+        metric: int(total) if metric != FILL_PCT_SUM else total
+        for metric, total in metric_totals(week_start, week_end).items()
+    }
+    # Cumulative position at the end of the week. Bounded at week_end (not
+    # "now") so a Monday-morning run reports the position *as of Sunday*, and
+    # backfilling an older week yields that week's number rather than today's.
+    to_date = {
+        metric: int(total)
+        for metric, total in metric_totals(
+            None, week_end, metrics=CUMULATIVE_METRICS
+        ).items()
+    }
 
+    # ── Acquisition funnel (new in the week) ─────────────────────────
     # auth.User is shared across all 9 platforms; only crush.lu logins get a
     # CrushProfile (create_crush_profile_on_login is host-gated and skips other
-    # domains), so scope every User-based count to Crush users — otherwise an
+    # domains), so the User-based rollup counts only Crush users — otherwise an
     # Entreprinder / Power-Up signup would inflate the crush.lu digest.
-    crush_users = User.objects.filter(crushprofile__isnull=False)
-
-    # ── Acquisition funnel (new in the week) ─────────────────────────
-    new_signups = in_week(crush_users, "date_joined").count()
-    new_profiles = in_week(CrushProfile.objects.all(), "created_at").count()
-    phone_verifications = in_week(
-        CrushProfile.objects.filter(phone_verified=True), "phone_verified_at"
-    ).count()
-    profiles_submitted = in_week(
-        ProfileSubmission.objects.all(), "submitted_at"
-    ).count()
-    profiles_verified = in_week(
-        CrushProfile.objects.filter(verification_status="verified"), "approved_at"
-    ).count()
+    new_signups = week.get("new_signups", 0)
+    profiles_submitted = week.get("profiles_submitted", 0)
+    profiles_verified = week.get("profiles_verified", 0)
 
     acquisition = {
         "new_signups": new_signups,
-        "new_profiles": new_profiles,
-        "phone_verifications": phone_verifications,
+        "new_profiles": week.get("new_profiles", 0),
+        "phone_verifications": week.get("phone_verifications", 0),
         "profiles_submitted": profiles_submitted,
         "profiles_verified": profiles_verified,
         # Rough week conversion (not a strict cohort — signups and verifications
@@ -100,19 +103,18 @@ def compute_weekly_snapshot(week_start: date) -> dict:
         "signup_to_verified_pct": _pct(profiles_verified, new_signups),
         "submitted_to_verified_pct": _pct(profiles_verified, profiles_submitted),
         # Cumulative position at the end of the week (Crush users only).
-        "cumulative_total_users": crush_users.filter(
-            date_joined__date__lte=week_end
-        ).count(),
+        "cumulative_total_users": to_date.get("new_signups", 0),
         # Count every verified member as of week_end. Legacy profiles verified
         # before approved_at was tracked have a NULL timestamp — include them so
         # the running total isn't silently undercounted (5 such rows in prod as
         # of 2026-06). Weekly "profiles_verified" still keys on approved_at, so
         # these undated legacy verifications aren't misattributed to any week.
-        "cumulative_verified_members": CrushProfile.objects.filter(
-            verification_status="verified"
-        )
-        .filter(Q(approved_at__date__lte=week_end) | Q(approved_at__isnull=True))
-        .count(),
+        "cumulative_verified_members": (
+            to_date.get("profiles_verified", 0)
+            + CrushProfile.objects.filter(
+                verification_status="verified", approved_at__isnull=True
+            ).count()
+        ),
     }
 
     # ── Engagement / retention ───────────────────────────────────────
@@ -122,7 +124,8 @@ def compute_weekly_snapshot(week_start: date) -> dict:
     # the snapshot job runs — a member's activity is never bumped out of the
     # week by a later visit the way the mutable UserActivity.last_seen was
     # (issue #523). first_seen still lives on UserActivity and drives the
-    # new-vs-returning split.
+    # new-vs-returning split. Distinct users don't add up across days, so this
+    # stays a live query over the week's DailyUserActivity rows.
     # activity_date is a DateField, so filter it directly (no __date transform,
     # which only applies to DateTimeFields like last_seen).
     daily_in_week = DailyUserActivity.objects.filter(
@@ -152,116 +155,50 @@ def compute_weekly_snapshot(week_start: date) -> dict:
     }
 
     # ── Revenue / premium ────────────────────────────────────────────
-    # Cumulative totals are bounded at week_end (not "now") so a Monday-morning
-    # run reports the position *as of Sunday*, not whatever has accrued by the
-    # time the job fires — and so backfilling an older week yields that week's
-    # number rather than today's. Their relevant timestamps: payment_date for
-    # premium (always set when status flips to active via confirm()), onboarded_at
-    # for Connect, joined_at for the waitlist.
+    # Relevant timestamps: payment_date for premium (always set when status
+    # flips to active via confirm()), onboarded_at for Connect, joined_at for
+    # the waitlist. Active premium depends on the membership's current status,
+    # which a daily count can't follow, so it is queried live.
     revenue = {
-        "new_premium": in_week(
-            PremiumMembership.objects.filter(payment_confirmed=True), "payment_date"
-        ).count(),
+        "new_premium": week.get("new_premium", 0),
         "total_active_premium": PremiumMembership.objects.filter(
             status="active", payment_date__date__lte=week_end
         ).count(),
-        "new_connect_optins": in_week(
-            CrushConnectMembership.objects.all(), "onboarded_at"
-        ).count(),
-        "total_connect_onboarded": CrushConnectMembership.objects.filter(
-            onboarded_at__date__lte=week_end
-        ).count(),
-        "waitlist_new": in_week(
-            CrushConnectWaitlist.objects.all(), "joined_at"
-        ).count(),
-        "waitlist_total": CrushConnectWaitlist.objects.filter(
-            joined_at__date__lte=week_end
-        ).count(),
-        "paid_event_registrations": in_week(
-            EventRegistration.objects.filter(payment_confirmed=True), "payment_date"
-        ).count(),
+        "new_connect_optins": week.get("new_connect_optins", 0),
+        "total_connect_onboarded": to_date.get("new_connect_optins", 0),
+        "waitlist_new": week.get("waitlist_new", 0),
+        "waitlist_total": to_date.get("waitlist_new", 0),
+        "paid_event_registrations": week.get("paid_event_registrations", 0),
     }
 
     # ── Matching & events ────────────────────────────────────────────
-    events_held_qs = in_week(
-        MeetupEvent.objects.filter(is_published=True, is_cancelled=False),
-        "date_time",
-    )
-    fill_data = (
-        events_held_qs.filter(max_participants__gt=0)
-        .annotate(
-            confirmed_count=Count(
-                "eventregistration",
-                filter=Q(eventregistration__status__in=SEAT_HOLDING_STATUSES),
-            )
-        )
-        .annotate(
-            fill_pct=ExpressionWrapper(
-                F("confirmed_count") * 100.0 / F("max_participants"),
-                output_field=FloatField(),
-            )
-        )
-    )
-    avg_fill = fill_data.aggregate(avg=Avg("fill_pct"))["avg"]
-
+    fill_events = week.get(FILL_EVENTS, 0)
     matching_events = {
-        "events_held": events_held_qs.count(),
-        "registrations": in_week(
-            EventRegistration.objects.all(), "registered_at"
-        ).count(),
-        "attended": in_week(
-            EventRegistration.objects.filter(status="attended"), "checked_in_at"
-        ).count(),
-        "no_show": EventRegistration.objects.filter(
-            status="no_show",
-            event__date_time__date__gte=week_start,
-            event__date_time__date__lte=week_end,
-        ).count(),
-        "avg_fill_rate_pct": round(avg_fill, 1) if avg_fill is not None else 0.0,
-        "connections_requested": in_week(
-            EventConnection.objects.all(), "requested_at"
-        ).count(),
-        "connections_shared": in_week(
-            EventConnection.objects.filter(shared_at__isnull=False), "shared_at"
-        ).count(),
-        "referrals_converted": in_week(
-            ReferralAttribution.objects.filter(status="converted"), "converted_at"
-        ).count(),
+        "events_held": week.get("events_held", 0),
+        "registrations": week.get("registrations", 0),
+        "attended": week.get("attended", 0),
+        "no_show": week.get("no_show", 0),
+        "avg_fill_rate_pct": (
+            round(week.get(FILL_PCT_SUM, 0.0) / fill_events, 1)
+            if fill_events
+            else 0.0
+        ),
+        "connections_requested": week.get("connections_requested", 0),
+        "connections_shared": week.get("connections_shared", 0),
+        "referrals_converted": week.get("referrals_converted", 0),
     }
 
     # ── Event Lobby funnel (unification decisions 2026-07-18) ────────
     # How the lobby feeds Crush Connect: participants per week, members who
     # completed onboarding DURING a live event (the lobby's direct conversion
-    # moment), then signals → mutual reveals → confirmed encounters.
-    from crush_lu.models.event_lobby import (
-        ConfirmedEncounter,
-        EventLobbyParticipation,
-        EventMeetSignal,
-    )
-
+    # moment), then signals → mutual reveals → confirmed encounters. Mutual
+    # reveals count each pair once (canonical direction, see daily_metrics).
     event_lobby = {
-        "lobby_participants": in_week(
-            EventLobbyParticipation.objects.all(), "joined_at"
-        ).count(),
-        "onboarded_at_event": in_week(
-            EventLobbyParticipation.objects.filter(
-                eligibility_source="onboarding_completed"
-            ),
-            "joined_at",
-        ).count(),
-        "meet_signals": in_week(EventMeetSignal.objects.all(), "created_at").count(),
-        # A reveal stamps BOTH directional rows of the pair; counting only the
-        # canonical direction (sender < recipient) reports each pair once.
-        "mutual_reveals": in_week(
-            EventMeetSignal.objects.filter(
-                mutual_revealed_at__isnull=False,
-                sender_id__lt=F("recipient_id"),
-            ),
-            "mutual_revealed_at",
-        ).count(),
-        "encounters_confirmed": in_week(
-            ConfirmedEncounter.objects.all(), "created_at"
-        ).count(),
+        "lobby_participants": week.get("lobby_participants", 0),
+        "onboarded_at_event": week.get("onboarded_at_event", 0),
+        "meet_signals": week.get("meet_signals", 0),
+        "mutual_reveals": week.get("mutual_reveals", 0),
+        "encounters_confirmed": week.get("encounters_confirmed", 0),
         "people_ive_met_total": ConfirmedEncounter.objects.filter(
             status="active", created_at__date__lte=week_end
         ).count(),
@@ -294,6 +231,22 @@ def upsert_snapshot(week_start: date):
     )
 
 
+def backfill_snapshots(first_week_start: date, last_week_start: date) -> int:
+    """Recompute and persist every week from ``first_week_start`` through
+    ``last_week_start`` (both Mondays, inclusive). Returns the number of weeks.
+
+    Each week sums rollup rows, so bring the rollup up to date first (as
+    ``send_weekly_kpis`` does).
+    """
+    week_start = first_week_start
+    weeks = 0
+    while week_start <= last_week_start:
+        upsert_snapshot(week_start)
+        week_start += _WEEK_LENGTH
+        weeks += 1
+    return weeks
+
+
 def compute_deltas(current: dict, previous: dict | None) -> dict:
     """Return a dict mirroring ``current`` with the numeric delta vs ``previous``.
 
@@ -14,11 +14,17 @@ from django.contrib.auth.signals import user_logged_in
 from django.core.files.base import ContentFile
 from django.db.models import Exists, OuterRef, Q
 from django.db import transaction
-from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils import timezone
 from allauth.account.signals import email_confirmation_sent, email_confirmed
-from allauth.socialaccount.models import SocialAccount
+from allauth.socialaccount.models import SocialAccount, SocialToken
 from allauth.socialaccount.signals import (
     pre_social_login,
     social_account_added,
@@ -39,6 +45,7 @@ from .models import (
     EmailPreference,
     EventRegistration,
     CrushCoach,
+    CrushConnectMembership,
     CrushSpark,
     ProfileSubmission,
     ReferralCode,
@@ -3105,17 +3112,23 @@ def remember_previous_user_name(sender, instance, update_fields=None, **kwargs):
 
     Only queries when a rename is actually possible: login writes
     ``update_fields=["last_login"]`` on every sign-in and must not pay for this.
+    A full save also snapshots ``last_login`` in the same read, for
+    refresh_connect_pool_on_login.
     """
     instance._previous_name = None
+    instance._previous_last_login = None
     if not instance.pk:
         return
     if update_fields is not None and not (set(update_fields) & _USER_NAME_FIELDS):
         return
-    instance._previous_name = (
+    previous = (
         User.objects.filter(pk=instance.pk)
-        .values_list("first_name", "last_name", "username")
+        .values_list("first_name", "last_name", "username", "last_login")
         .first()
     )
+    if previous is not None:
+        instance._previous_name = previous[:3]
+        instance._previous_last_login = previous[3]
 
 
 def _normalized_member_pass_values(values):
@@ -3135,8 +3148,14 @@ def _normalized_member_pass_values(values):
 
 
 @receiver(pre_save, sender=CrushProfile)
-def remember_previous_member_pass_fields(sender, instance, update_fields=None, **kwargs):
-    """Snapshot the persisted fields both wallet passes are rendered from.
+def remember_previous_profile_fields(sender, instance, update_fields=None, **kwargs):
+    """Snapshot the persisted fields the CrushProfile post_save receivers diff.
+
+    Four of them compare against the stored row: both wallet passes (below),
+    the materialized Connect pool, the demographic aggregates and the
+    navigation badges. They share
+    this one receiver so a save reads the row once, with ``.only()`` over the
+    fields of the watchers that need it.
 
     Mirrors remember_previous_user_name, and for the same reason: a bare
     ``profile.save()`` is not evidence of a change. The Microsoft sign-in path
@@ -3144,22 +3163,59 @@ def remember_previous_member_pass_fields(sender, instance, update_fields=None, *
     that as a change refreshed every historical ticket the user owns *and* made
     each of those logins wait on a Google Wallet round trip.
 
-    One indexed primary-key lookup, and only when a relevant field could have
-    moved at all: an onboarding step saving ``update_fields=["bio"]`` pays
-    nothing.
+    A watcher none of whose fields is in ``update_fields`` gets its "untouched"
+    marker instead of a snapshot, so an onboarding step saving
+    ``update_fields=["bio"]`` pays nothing.
     """
-    instance._previous_member_pass_fields = None
-    if not instance.pk:
+    from crush_lu.services.demographics import DEMOGRAPHIC_FIELDS
+
+    watchers = {
+        "_previous_member_pass_fields": (
+            WALLET_MEMBER_PASS_FIELDS,
+            None,
+            _normalized_member_pass_values,
+        ),
+        "_previous_connect_pool_fields": (
+            CONNECT_POOL_PROFILE_FIELDS,
+            _CONNECT_POOL_UNTOUCHED,
+            _connect_pool_profile_values,
+        ),
+        "_previous_demographic_fields": (
+            DEMOGRAPHIC_FIELDS,
+            _DEMOGRAPHICS_UNTOUCHED,
+            dict,
+        ),
+        "_previous_nav_fields": (_NAV_PROFILE_FIELDS, _NAV_UNTOUCHED, dict),
+    }
+    needed = []
+    for attr, (fields, untouched, _normalize) in watchers.items():
+        setattr(instance, attr, None)
+        if not instance.pk:
+            continue
+        if update_fields is not None and not set(update_fields) & set(fields):
+            setattr(instance, attr, untouched)
+            continue
+        needed.append(attr)
+    if not needed:
         return
-    if update_fields is not None and not (
-        set(update_fields) & WALLET_MEMBER_PASS_FIELDS
-    ):
+
+    fields = set().union(*(watchers[attr][0] for attr in needed))
+    previous = CrushProfile.objects.filter(pk=instance.pk).only(*fields).first()
+    if previous is None:
         return
-    instance._previous_member_pass_fields = _normalized_member_pass_values(
-        CrushProfile.objects.filter(pk=instance.pk)
-        .values(*WALLET_MEMBER_PASS_FIELDS)
-        .first()
-    )
+    for attr in needed:
+        watched, _untouched, normalize = watchers[attr]
+        # attname, so a foreign key reads as its id, as .values() would
+        setattr(
+            instance,
+            attr,
+            normalize(
+                {
+                    name: getattr(previous, CrushProfile._meta.get_field(name).attname)
+                    for name in watched
+                }
+            ),
+        )
 
 
 @receiver(post_save, sender=User)
@@ -4404,3 +4460,526 @@ def delete_quiz_question_media(sender, instance, **kwargs):
         field.storage.delete(name)
     except Exception:
         logger.exception("Failed to delete quiz media Blob: %s", name)
+
+
+# ---------------------------------------------------------------------------
+# Match score queue
+# ---------------------------------------------------------------------------
+# Inputs crush_lu.matching scores on. A save whose update_fields misses both
+# sets can't have changed a score and isn't queued; everything else is queued
+# and the drain's trait fingerprint discards saves that changed nothing.
+MATCH_MEMBERSHIP_FIELDS = {
+    "onboarded_at",
+    "excluded_by_coach",
+    "preferred_genders",
+    "preferred_age_min",
+    "preferred_age_max",
+    "astro_enabled",
+}
+MATCH_PROFILE_FIELDS = {
+    "gender",
+    "date_of_birth",
+    "event_languages",
+    "is_approved",
+    "verification_status",
+}
+
+
+@receiver(post_save, sender=CrushConnectMembership)
+def queue_match_scores_on_membership_save(sender, instance, update_fields=None, **kwargs):
+    """Queue the member for an incremental MatchScore recompute."""
+    from crush_lu.matching import mark_match_scores_dirty
+
+    if update_fields is not None and not set(update_fields) & MATCH_MEMBERSHIP_FIELDS:
+        return
+    if instance.onboarded_at is None:
+        return
+    mark_match_scores_dirty([instance.user_id])
+
+
+@receiver(m2m_changed, sender=CrushConnectMembership.qualities.through)
+@receiver(m2m_changed, sender=CrushConnectMembership.defects.through)
+@receiver(m2m_changed, sender=CrushConnectMembership.sought_qualities.through)
+def queue_match_scores_on_trait_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Queue members whose quality/defect/sought sets changed."""
+    from crush_lu.matching import mark_match_scores_dirty
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        mark_match_scores_dirty([instance.user_id])
+    elif pk_set:
+        # Trait-side edit (trait.connect_profiles_as_quality.add(...)).
+        mark_match_scores_dirty(
+            CrushConnectMembership.objects.filter(pk__in=pk_set).values_list(
+                "user_id", flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=CrushProfile)
+def queue_match_scores_on_profile_save(sender, instance, update_fields=None, **kwargs):
+    """Queue Connect members whose scoring identity fields may have changed.
+
+    Profiles of members who never joined Crush Connect have no scores, so the
+    queue only takes onboarded members.
+    """
+    from crush_lu.matching import mark_match_scores_dirty
+
+    if update_fields is not None and not set(update_fields) & MATCH_PROFILE_FIELDS:
+        return
+    if not CrushConnectMembership.objects.filter(
+        user_id=instance.user_id, onboarded_at__isnull=False
+    ).exists():
+        return
+    mark_match_scores_dirty([instance.user_id])
+
+
+# ---------------------------------------------------------------------------
+# Materialized Connect pool
+# ---------------------------------------------------------------------------
+# Keeps ConnectCandidate / ConnectPairExclusion (services.connect_pool) in step
+# with their sources. Queryset .update() calls bypass these receivers; the
+# nightly reconcile_connect_pool sweep repairs whatever they miss.
+CONNECT_POOL_PROFILE_FIELDS = (
+    "verification_status",
+    "photo_1",
+    "gender",
+    "date_of_birth",
+    "assigned_coach",
+)
+CONNECT_POOL_MEMBERSHIP_FIELDS = {
+    "onboarded_at",
+    "excluded_by_coach",
+    "photo_share_consent",
+    "preferred_genders",
+    "preferred_age_min",
+    "preferred_age_max",
+}
+# pre_save marker (remember_previous_profile_fields): update_fields proved no
+# catalogue field is being written.
+_CONNECT_POOL_UNTOUCHED = object()
+
+
+def _connect_pool_profile_values(values):
+    if values is None:
+        return None
+    values = dict(values)
+    photo = values.get("photo_1")
+    values["photo_1"] = getattr(photo, "name", photo) or ""
+    return values
+
+
+@receiver(post_save, sender=CrushProfile)
+def refresh_connect_pool_on_profile_save(sender, instance, created, **kwargs):
+    """Refresh the member's candidate row and, on reassignment, coach pairs."""
+    from crush_lu.services.connect_pool import (
+        refresh_coach_exclusions,
+        refresh_connect_candidates,
+    )
+
+    previous = getattr(instance, "_previous_connect_pool_fields", None)
+    if previous is _CONNECT_POOL_UNTOUCHED:
+        return
+    current = _connect_pool_profile_values(
+        {
+            "verification_status": instance.verification_status,
+            "photo_1": instance.photo_1,
+            "gender": instance.gender,
+            "date_of_birth": instance.date_of_birth,
+            "assigned_coach": instance.assigned_coach_id,
+        }
+    )
+    if previous is not None and previous == current:
+        return
+    refresh_connect_candidates([instance.user_id])
+    if previous is None or previous["assigned_coach"] != current["assigned_coach"]:
+        refresh_coach_exclusions(instance.user_id)
+
+
+@receiver(post_delete, sender=CrushProfile)
+def refresh_connect_pool_on_profile_delete(sender, instance, **kwargs):
+    from crush_lu.services.connect_pool import (
+        refresh_coach_exclusions,
+        refresh_connect_candidates,
+    )
+
+    refresh_connect_candidates([instance.user_id])
+    refresh_coach_exclusions(instance.user_id)
+
+
+@receiver(post_save, sender=CrushConnectMembership)
+def refresh_connect_pool_on_membership_save(sender, instance, update_fields=None, **kwargs):
+    from crush_lu.services.connect_pool import refresh_connect_candidates
+
+    if update_fields is not None and not set(update_fields) & CONNECT_POOL_MEMBERSHIP_FIELDS:
+        return
+    refresh_connect_candidates([instance.user_id])
+
+
+@receiver(post_save, sender=CrushCoach)
+@receiver(post_delete, sender=CrushCoach)
+def refresh_connect_pool_on_coach_change(sender, instance, **kwargs):
+    from crush_lu.services.connect_pool import refresh_coach_exclusions
+
+    refresh_coach_exclusions(instance.user_id)
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def refresh_connect_pool_on_social_account_change(sender, instance, **kwargs):
+    """LuxID links are part of the catalogue gate."""
+    from crush_lu.services.connect_pool import refresh_connect_candidates
+
+    refresh_connect_candidates([instance.user_id])
+
+
+@receiver(post_save, sender=SocialToken)
+@receiver(post_delete, sender=SocialToken)
+def refresh_connect_pool_on_social_token_change(sender, instance, **kwargs):
+    """A LuxID SocialApp token is what marks an openid_connect account LuxID."""
+    from crush_lu.services.connect_pool import refresh_connect_candidates
+
+    user_id = (
+        SocialAccount.objects.filter(pk=instance.account_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    if user_id:
+        refresh_connect_candidates([user_id])
+
+
+@receiver(post_save, sender=User)
+def refresh_connect_pool_on_login(sender, instance, update_fields=None, **kwargs):
+    from crush_lu.services.connect_pool import touch_candidate_last_login
+
+    if update_fields is not None:
+        if "last_login" not in update_fields:
+            return
+    elif getattr(instance, "_previous_last_login", None) == instance.last_login:
+        # A full save that left last_login alone (snapshot taken by
+        # remember_previous_user_name)
+        return
+    touch_candidate_last_login(instance.pk, instance.last_login)
+
+
+@receiver(post_save, sender="crush_lu.EventConnection")
+@receiver(post_delete, sender="crush_lu.EventConnection")
+def refresh_connect_pool_on_connection_change(sender, instance, **kwargs):
+    from crush_lu.services.connect_pool import refresh_pair_exclusions
+
+    refresh_pair_exclusions(instance.requester_id, instance.recipient_id)
+
+
+@receiver(post_save, sender="crush_lu.UserBlock")
+@receiver(post_delete, sender="crush_lu.UserBlock")
+def refresh_connect_pool_on_block_change(sender, instance, **kwargs):
+    from crush_lu.services.connect_pool import refresh_pair_exclusions
+
+    refresh_pair_exclusions(instance.blocker_id, instance.blocked_id)
+
+
+# ---------------------------------------------------------------------------
+# Quiz leaderboard projection
+# ---------------------------------------------------------------------------
+# The scorers fold their own writes into the cached projection
+# (services.quiz_leaderboard); any other change to what it summarizes — undo,
+# reset, table creation/dissolution — drops it so the next read rebuilds.
+
+
+@receiver(post_save, sender="crush_lu.QuizEvent")
+def invalidate_quiz_leaderboard_on_quiz_create(sender, instance, created, **kwargs):
+    """A new quiz must never inherit a projection cached under a reused id."""
+    from crush_lu.services.quiz_leaderboard import invalidate_leaderboard
+
+    if created:
+        invalidate_leaderboard(instance.pk)
+
+
+@receiver(post_save, sender="crush_lu.QuizTable")
+@receiver(post_delete, sender="crush_lu.QuizTable")
+@receiver(post_delete, sender="crush_lu.TableRoundScore")
+@receiver(post_delete, sender="crush_lu.IndividualScore")
+def invalidate_quiz_leaderboard(sender, instance, **kwargs):
+    from crush_lu.services.quiz_leaderboard import invalidate_leaderboard
+
+    invalidate_leaderboard(instance.quiz_id)
+
+
+# ---------------------------------------------------------------------------
+# Demographic aggregates
+# ---------------------------------------------------------------------------
+# The coach dashboard and the admin segments page read cached per-day
+# aggregates (services.demographics); a profile save that changes one of the
+# fields they group on drops the cache (the previous values come from
+# remember_previous_profile_fields).
+_DEMOGRAPHICS_UNTOUCHED = object()
+
+
+@receiver(post_save, sender=CrushProfile)
+def invalidate_demographics_on_profile_save(sender, instance, **kwargs):
+    from crush_lu.services.demographics import (
+        DEMOGRAPHIC_FIELDS,
+        invalidate_demographics,
+    )
+
+    previous = getattr(instance, "_previous_demographic_fields", None)
+    if previous is _DEMOGRAPHICS_UNTOUCHED:
+        return
+    if previous is not None and all(
+        previous[field] == getattr(instance, field) for field in DEMOGRAPHIC_FIELDS
+    ):
+        return
+    invalidate_demographics()
+
+
+@receiver(post_delete, sender=CrushProfile)
+def invalidate_demographics_on_profile_delete(sender, instance, **kwargs):
+    from crush_lu.services.demographics import invalidate_demographics
+
+    invalidate_demographics()
+
+
+# ---------------------------------------------------------------------------
+# Profile photo derivatives
+# ---------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=CrushProfile)
+def schedule_photo_derivatives(sender, instance, update_fields=None, **kwargs):
+    """Build resized renditions once a changed photo is committed."""
+    from crush_lu.services.photo_derivatives import (
+        PHOTO_FIELDS,
+        photos_needing_derivatives,
+    )
+
+    if update_fields is not None and not set(update_fields) & set(PHOTO_FIELDS):
+        return
+    if not photos_needing_derivatives(instance):
+        return
+
+    from .tasks import generate_photo_derivatives_task
+
+    profile_id = instance.pk
+    transaction.on_commit(
+        lambda: generate_photo_derivatives_task.enqueue(profile_id=profile_id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Navigation badges
+# ---------------------------------------------------------------------------
+# crush_user_context reads each member's header state from one cache entry
+# (services.nav_badges); every write that changes a count or flag in it drops
+# the entry of the members it concerns, and the next page rebuilds it.
+
+# CrushProfile / User fields the header shows
+_NAV_PROFILE_FIELDS = {"verification_status", "is_approved"}
+_NAV_USER_FIELDS = {"first_name", "last_name", "is_staff"}
+# pre_save marker (remember_previous_profile_fields): update_fields proved
+# neither header field is being written.
+_NAV_UNTOUCHED = object()
+
+
+@receiver(post_save, sender=CrushProfile)
+def invalidate_nav_badges_on_profile_save(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    previous = getattr(instance, "_previous_nav_fields", None)
+    if previous is _NAV_UNTOUCHED:
+        return
+    if previous is not None and all(
+        previous[field] == getattr(instance, field) for field in _NAV_PROFILE_FIELDS
+    ):
+        return
+    invalidate_nav_badges([instance.user_id])
+
+
+@receiver(post_delete, sender=CrushProfile)
+def invalidate_nav_badges_on_profile_delete(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    invalidate_nav_badges([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_nav_badges_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    """Names drive the legacy special-journey match, is_staff the Connect badge."""
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & _NAV_USER_FIELDS:
+        return
+    invalidate_nav_badges([instance.pk])
+
+
+@receiver(post_save, sender="account.EmailAddress")
+@receiver(post_delete, sender="account.EmailAddress")
+@receiver(post_save, sender="crush_lu.EventRegistration")
+@receiver(post_delete, sender="crush_lu.EventRegistration")
+@receiver(post_save, sender="crush_lu.JourneyProgress")
+@receiver(post_delete, sender="crush_lu.JourneyProgress")
+@receiver(post_save, sender="crush_lu.CrushCoach")
+@receiver(post_delete, sender="crush_lu.CrushCoach")
+@receiver(post_save, sender="crush_lu.CrushConnectMembership")
+@receiver(post_delete, sender="crush_lu.CrushConnectMembership")
+def invalidate_nav_badges_for_owner(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    invalidate_nav_badges([instance.user_id])
+
+
+@receiver(post_save, sender="crush_lu.EventConnection")
+@receiver(post_delete, sender="crush_lu.EventConnection")
+def invalidate_nav_badges_on_connection_change(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    invalidate_nav_badges([instance.requester_id, instance.recipient_id])
+
+
+@receiver(post_save, sender="crush_lu.CrushSpark")
+@receiver(post_delete, sender="crush_lu.CrushSpark")
+@receiver(post_save, sender="crush_lu.CuriositySpark")
+@receiver(post_delete, sender="crush_lu.CuriositySpark")
+def invalidate_nav_badges_on_spark_change(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    invalidate_nav_badges([instance.sender_id, instance.recipient_id])
+
+
+@receiver(post_save, sender="crush_lu.UserBlock")
+@receiver(post_delete, sender="crush_lu.UserBlock")
+def invalidate_nav_badges_on_block_change(sender, instance, **kwargs):
+    """Blocked counterparts drop out of both members' counts."""
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    invalidate_nav_badges([instance.blocker_id, instance.blocked_id])
+
+
+@receiver(post_save, sender="crush_lu.ProfileSubmission")
+@receiver(post_delete, sender="crush_lu.ProfileSubmission")
+def invalidate_nav_badges_on_submission_change(sender, instance, **kwargs):
+    """The member's review status, and the assigned coach's screening count."""
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    concerned = Q(crushprofile__pk=instance.profile_id)
+    if instance.coach_id:
+        concerned |= Q(crushcoach__pk=instance.coach_id)
+    invalidate_nav_badges(User.objects.filter(concerned).values("pk"))
+
+
+@receiver(post_save, sender="crush_lu.MeetupEvent")
+def invalidate_nav_badges_on_event_change(sender, instance, created, **kwargs):
+    """Publishing, cancelling or moving an event changes its registrants'
+    upcoming list."""
+    from crush_lu.models import EventRegistration
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    if created:
+        return
+    invalidate_nav_badges(
+        EventRegistration.objects.filter(event_id=instance.pk).values("user_id")
+    )
+
+
+@receiver(post_save, sender="crush_lu.SpecialUserExperience")
+@receiver(post_delete, sender="crush_lu.SpecialUserExperience")
+def invalidate_nav_badges_on_special_experience_change(sender, instance, **kwargs):
+    from crush_lu.services.nav_badges import invalidate_nav_badges
+
+    if instance.linked_user_id:
+        invalidate_nav_badges([instance.linked_user_id])
+        return
+    invalidate_nav_badges(
+        User.objects.filter(
+            first_name__iexact=instance.first_name,
+            last_name__iexact=instance.last_name,
+        ).values("pk")
+    )
+
+
+# =============================================================================
+# Seat inventory
+# =============================================================================
+# The seat counters behind event_register (services.seat_inventory) see the
+# seats event_register claims itself; every other way a registration takes or
+# frees a seat — cancellation, waitlist promotion, the admin, payment expiry —
+# reaches them here. Errs towards over-counting: a seat taken is counted at
+# once, a seat freed only once the write has committed.
+
+
+@receiver(post_save, sender="crush_lu.EventRegistration")
+def adjust_seat_inventory_on_registration_save(sender, instance, created, **kwargs):
+    from crush_lu.services.seat_inventory import adjust_seats, inventory_enabled
+
+    # _seat_claim: event_register already counted this seat when claiming it
+    if not inventory_enabled() or getattr(instance, "_seat_claim", None) is not None:
+        return
+    was_held = getattr(instance, "_previous_status", None) in SEAT_HOLDING_STATUSES
+    is_held = instance.status in SEAT_HOLDING_STATUSES
+    seat = [(instance.event_id, instance.user_id)]
+    if is_held and not was_held:
+        # An event whose counters are seeded before this commits would miss
+        # the row: count it then instead
+        if not adjust_seats(seat, 1):
+            transaction.on_commit(lambda: adjust_seats(seat, 1))
+    elif was_held and not is_held:
+        transaction.on_commit(lambda: adjust_seats(seat, -1))
+
+
+@receiver(post_delete, sender="crush_lu.EventRegistration")
+def adjust_seat_inventory_on_registration_delete(sender, instance, **kwargs):
+    from crush_lu.services.seat_inventory import adjust_seats, inventory_enabled
+
+    if inventory_enabled() and instance.status in SEAT_HOLDING_STATUSES:
+        seat = [(instance.event_id, instance.user_id)]
+        transaction.on_commit(lambda: adjust_seats(seat, -1))
+
+
+# =============================================================================
+# Event listing
+# =============================================================================
+# /events/ serves its shared part — the lists, registration counts and JSON-LD
+# — from services.event_listing; anything that shows there drops it.
+
+_LISTED_REGISTRATION_STATUSES = {*SEAT_HOLDING_STATUSES, "waitlist"}
+
+
+@receiver(post_save, sender="crush_lu.MeetupEvent")
+@receiver(post_delete, sender="crush_lu.MeetupEvent")
+@receiver(post_save, sender="crush_lu.EventPoll")
+@receiver(post_delete, sender="crush_lu.EventPoll")
+def invalidate_event_listing_on_change(sender, instance, **kwargs):
+    from crush_lu.services.event_listing import invalidate_event_listing
+
+    invalidate_event_listing()
+
+
+@receiver(m2m_changed, sender=MeetupEvent.coaches.through)
+def invalidate_event_listing_on_coaches_change(sender, action, **kwargs):
+    """The JSON-LD names each event's coaches as performers."""
+    from crush_lu.services.event_listing import invalidate_event_listing
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_event_listing()
+
+
+@receiver(post_save, sender="crush_lu.EventRegistration")
+def invalidate_event_listing_on_registration_save(sender, instance, **kwargs):
+    """Only a change to the confirmed or waitlist counts shows on the list."""
+    from crush_lu.services.event_listing import invalidate_event_listing
+
+    previous = getattr(instance, "_previous_status", None)
+    if previous == instance.status:
+        return
+    if {previous, instance.status} & _LISTED_REGISTRATION_STATUSES:
+        invalidate_event_listing()
+
+
+@receiver(post_delete, sender="crush_lu.EventRegistration")
+def invalidate_event_listing_on_registration_delete(sender, instance, **kwargs):
+    from crush_lu.services.event_listing import invalidate_event_listing
+
+    if instance.status in _LISTED_REGISTRATION_STATUSES:
+        invalidate_event_listing()
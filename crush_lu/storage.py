@@ -29,6 +29,9 @@ has no real folders, so there is no up-front initialization step.
 import hashlib
 import os
 import logging
+import threading
+import time
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta, timezone
 from django.conf import settings
 from django.core.cache import cache
@@ -47,6 +50,51 @@ except ImportError:
     logger.debug("Azure storage packages not available - using local filesystem")
 
 
+# Per-process memo in front of the shared cache: {cache key: (url, reuse until)}.
+# A member list renders dozens of photo URLs; answering them from memory
+# saves a cache round trip each, and the window alignment below makes the
+# entries identical across workers anyway.
+_SAS_URL_MEMO = OrderedDict()
+_SAS_URL_MEMO_LOCK = threading.Lock()
+SAS_URL_MEMO_MAX_ENTRIES = 4096
+_SAS_URL_STATS = Counter()
+
+
+def sas_url_cache_stats():
+    """SAS URL lookups in this process: ``local_hits``, ``shared_hits``, ``misses``."""
+    with _SAS_URL_MEMO_LOCK:
+        return {
+            "local_hits": _SAS_URL_STATS["local_hits"],
+            "shared_hits": _SAS_URL_STATS["shared_hits"],
+            "misses": _SAS_URL_STATS["misses"],
+        }
+
+
+def clear_sas_url_memo():
+    """Forget this process's memoized SAS URLs and reset the counters."""
+    with _SAS_URL_MEMO_LOCK:
+        _SAS_URL_MEMO.clear()
+        _SAS_URL_STATS.clear()
+
+
+def _memo_get(key, now):
+    with _SAS_URL_MEMO_LOCK:
+        entry = _SAS_URL_MEMO.get(key)
+        if entry is None or entry[1] <= now:
+            return None
+        _SAS_URL_MEMO.move_to_end(key)
+        _SAS_URL_STATS["local_hits"] += 1
+        return entry[0]
+
+
+def _memo_set(key, url, reuse_until):
+    with _SAS_URL_MEMO_LOCK:
+        _SAS_URL_MEMO[key] = (url, reuse_until)
+        _SAS_URL_MEMO.move_to_end(key)
+        while len(_SAS_URL_MEMO) > SAS_URL_MEMO_MAX_ENTRIES:
+            _SAS_URL_MEMO.popitem(last=False)
+
+
 def is_azurite_mode():
     """Check if we're running in Azurite (local emulator) mode."""
     return getattr(settings, 'AZURITE_MODE', False)
@@ -107,14 +155,27 @@ class PrivateAzureStorage(AzureStorage):
     # being handed out right before they expire.
     SAS_CACHE_SAFETY_MARGIN_SECS = 300
 
-    def _build_sas_url(self, name, expire):
+    # Tokens are issued per fixed window: every URL for a blob signed within
+    # one window carries the same expiry, so the same blob yields the same URL
+    # in every worker (HMAC signing is deterministic) and browsers/the CDN can
+    # cache the image under it. The window is a quarter of the requested
+    # lifetime — longer-lived URLs are reused for longer — and never shorter
+    # than SAS_EXPIRY_WINDOW_MIN_SECS.
+    SAS_EXPIRY_WINDOW_MIN_SECS = 300
+
+    def _expiry_window(self, expire):
+        return max(self.SAS_EXPIRY_WINDOW_MIN_SECS, expire // 4)
+
+    def _build_sas_url(self, name, expire, expiry=None):
+        if expiry is None:
+            expiry = datetime.now(timezone.utc) + timedelta(seconds=expire)
         sas_token = generate_blob_sas(
             account_name=self.account_name,
             account_key=self.account_key,
             container_name=self.azure_container,
             blob_name=name,
             permission=BlobSasPermissions(read=True),
-            expiry=datetime.now(timezone.utc) + timedelta(seconds=expire)
+            expiry=expiry,
         )
 
         if self._is_azurite:
@@ -136,6 +197,11 @@ class PrivateAzureStorage(AzureStorage):
         """
         Generate a time-limited SAS URL for accessing the blob.
 
+        URLs signed within the same window (a quarter of ``expire``, at least
+        SAS_EXPIRY_WINDOW_MIN_SECS) share their expiry (the window start plus
+        ``expire``), so they stay valid for between ``expire - window`` and
+        ``expire`` seconds.
+
         Args:
             name: Blob name (file path)
             expire: Optional expiration time in seconds (default: 1 hour)
@@ -146,6 +212,21 @@ class PrivateAzureStorage(AzureStorage):
         if not expire:
             expire = self.expiration_secs
 
+        window = self._expiry_window(expire)
+        # Reusing a URL until the end of its window leaves it
+        # ``expire - window`` seconds of validity. Below the safety margin
+        # (e.g. very short custom `expire`), skip alignment and caching
+        # entirely — the crypto cost of a fresh token is cheaper than
+        # serving a dead one.
+        if expire - window < self.SAS_CACHE_SAFETY_MARGIN_SECS:
+            with _SAS_URL_MEMO_LOCK:
+                _SAS_URL_STATS["misses"] += 1
+            return self._build_sas_url(name, expire)
+
+        now = int(time.time())
+        window_start = now - now % window
+        reuse_until = window_start + window
+
         # Cache the full URL (not just the token) because CDN/Azurite routing
         # is part of the output. SAS tokens for the same blob are identical
         # regardless of requester, so a single shared key is correct.
@@ -158,24 +239,28 @@ class PrivateAzureStorage(AzureStorage):
             (self.account_key or "").encode("utf-8")
         ).hexdigest()[:16]
         cache_key = (
-            f"sas_url:v2:{self.account_name}:{self.azure_container}:"
+            f"sas_url:v3:{self.account_name}:{self.azure_container}:"
             f"{name}:{expire}:{self._cdn_domain or ''}:"
             f"{'azurite' if self._is_azurite else 'az'}:"
-            f"{key_fingerprint}"
+            f"{key_fingerprint}:{window_start}"
         )
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-
-        url = self._build_sas_url(name, expire)
-        # TTL must never exceed the SAS lifetime itself, otherwise a cached
-        # URL could be handed out after the token has already expired.
-        # Below the safety margin (e.g. very short custom `expire`), skip
-        # caching entirely — the crypto cost of a fresh token is cheaper
-        # than serving a dead one.
-        ttl = expire - self.SAS_CACHE_SAFETY_MARGIN_SECS
-        if ttl >= 60:
-            cache.set(cache_key, url, ttl)
+        url = _memo_get(cache_key, now)
+        if url:
+            return url
+
+        url = cache.get(cache_key)
+        if url:
+            with _SAS_URL_MEMO_LOCK:
+                _SAS_URL_STATS["shared_hits"] += 1
+        else:
+            with _SAS_URL_MEMO_LOCK:
+                _SAS_URL_STATS["misses"] += 1
+            expiry = datetime.fromtimestamp(window_start + expire, timezone.utc)
+            url = self._build_sas_url(name, expire, expiry=expiry)
+            # The window is in the key, so the entry is only ever read
+            # within it; the TTL just reclaims the memory afterwards
+            cache.set(cache_key, url, reuse_until - now)
+        _memo_set(cache_key, url, reuse_until)
         return url
 
 
@@ -262,6 +347,40 @@ class CrushProfilePhotoStorage(PrivateAzureStorage):
         return os.path.join(dir_name, unique_filename)
 
 
+# Blob batch requests carry at most 256 sub-requests
+BLOB_BATCH_SIZE = 256
+
+
+def delete_blobs_batched(container_client, names):
+    """
+    Delete blobs with Blob Batch requests (256 per round trip).
+
+    Blobs that are already gone count as deleted; other failures are logged
+    and skipped.
+
+    Returns:
+        int: Number of blobs deleted
+    """
+    deleted = 0
+    for start in range(0, len(names), BLOB_BATCH_SIZE):
+        batch = names[start:start + BLOB_BATCH_SIZE]
+        try:
+            responses = container_client.delete_blobs(
+                *batch, raise_on_any_failure=False
+            )
+        except Exception as e:
+            logger.warning(f"Batch delete of {len(batch)} blob(s) failed: {e}")
+            continue
+        for name, response in zip(batch, responses):
+            if response.status_code in (202, 404):
+                deleted += 1
+            else:
+                logger.warning(
+                    f"Failed to delete blob {name}: HTTP {response.status_code}"
+                )
+    return deleted
+
+
 def delete_user_storage(user_id):
     """
     Delete all blobs in a user's storage folder from ALL containers.
@@ -323,21 +442,15 @@ def delete_user_storage(user_id):
                     container_client = blob_service.get_container_client(container_name)
 
                     # List all blobs with the user's prefix
-                    blobs = list(container_client.list_blobs(name_starts_with=prefix))
+                    names = [
+                        blob.name
+                        for blob in container_client.list_blobs(name_starts_with=prefix)
+                    ]
+                    deleted_count += delete_blobs_batched(container_client, names)
 
-                    for blob in blobs:
-                        try:
-                            container_client.delete_blob(blob.name)
-                            deleted_count += 1
-                            logger.debug(f"Deleted blob: {container_name}/{blob.name}")
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to delete blob {container_name}/{blob.name}: {e}"
-                            )
-
-                    if blobs:
+                    if names:
                         logger.debug(
-                            f"Deleted {len(blobs)} blob(s) from {container_name} "
+                            f"Deleted {len(names)} blob(s) from {container_name} "
                             f"for user {user_id}"
                         )
 
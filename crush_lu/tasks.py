@@ -320,6 +320,24 @@ def send_sla_fallback_email_task(submission_id, host, is_secure=True):
         )
 
 
+@task(priority=1)
+def generate_photo_derivatives_task(profile_id):
+    """Build the resized renditions of a profile's photos in the background.
+
+    Enqueued on commit by the CrushProfile post_save signal when a photo
+    changed. Until it has run, photo views serve the original, so a failure
+    here only costs bandwidth; it is logged and ``generate_photo_derivatives``
+    backfills anything missed.
+    """
+    from .services.photo_derivatives import refresh_photo_derivatives
+
+    try:
+        built = refresh_photo_derivatives(profile_id)
+        logger.info(f"[TASK] Built derivatives for {built} photo(s) of profile {profile_id}")
+    except Exception as e:
+        logger.error(f"[TASK] Photo derivatives failed for profile {profile_id}: {e}")
+
+
 @task(priority=0)
 def sync_event_to_echo_task(event_id):
     """Push one event's state to echo.lu in the background.
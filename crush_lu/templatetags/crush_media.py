@@ -3,23 +3,26 @@ Template tags for secure media access in Crush.lu
 """
 
 from django import template
-from django.urls import reverse
+
+from crush_lu.views_media import get_profile_photo_url
 
 register = template.Library()
 
 
 @register.simple_tag
-def profile_photo_url(profile, photo_field):
+def profile_photo_url(profile, photo_field, width=None):
     """
     Generate secure URL for profile photo
 
     Usage in template:
         {% load crush_media %}
         <img src="{% profile_photo_url profile 'photo_1' %}" alt="Profile photo">
+        <img src="{% profile_photo_url profile 'photo_1' 160 %}" class="w-12 h-12">
 
     Args:
         profile: CrushProfile instance
         photo_field: 'photo_1', 'photo_2', or 'photo_3'
+        width: Optional display width in pixels (resized rendition)
 
     Returns:
         Secure URL to the photo
@@ -27,10 +30,7 @@ def profile_photo_url(profile, photo_field):
     if not profile or not getattr(profile, photo_field, None):
         return ''
 
-    return reverse('crush_lu:serve_profile_photo', kwargs={
-        'user_id': profile.user.id,
-        'photo_field': photo_field
-    })
+    return get_profile_photo_url(profile, photo_field, width=width)
 
 
 @register.filter
@@ -69,7 +69,7 @@ def split_interests(value):
 
 @register.inclusion_tag('crush_lu/components/profile_photo.html')
 def profile_photo(profile, photo_field, css_class='', alt_text='Profile photo',
-                  fallback='initials'):
+                  fallback='initials', width=None):
     """
     Render a profile photo with consistent fallback.
 
@@ -85,6 +85,7 @@ def profile_photo(profile, photo_field, css_class='', alt_text='Profile photo',
         alt_text: Alt text for accessibility
         fallback: 'initials' (default — gradient + initial letter) or 'icon'
                   (neutral user-circle for non-personal placeholders)
+        width: Optional display width in pixels (resized rendition)
 
     Returns:
         Rendered component
@@ -92,10 +93,7 @@ def profile_photo(profile, photo_field, css_class='', alt_text='Profile photo',
     photo = getattr(profile, photo_field, None) if profile else None
 
     if photo:
-        photo_url = reverse('crush_lu:serve_profile_photo', kwargs={
-            'user_id': profile.user.id,
-            'photo_field': photo_field
-        })
+        photo_url = get_profile_photo_url(profile, photo_field, width=width)
     else:
         photo_url = None
 
@@ -1,4 +1,6 @@
-"""Tests for the profile-reminders and GDPR-retention admin API endpoints.
+"""Tests for the profile-reminders, GDPR-retention, match-score-queue,
+connect-pool-reconcile, daily-drop-pregenerate and activity-flush admin API
+endpoints.
 
 Covers Bearer auth, the method guard, and that a valid POST delegates to the
 right management command (mirrors the weekly-KPIs / rotate-questions wrapper
@@ -15,6 +17,10 @@ CRUSH_URLS = {"ROOT_URLCONF": "azureproject.urls_crush", "ADMIN_API_KEY": API_KE
 
 REMINDERS_URL = "/api/admin/profile-reminders/"
 GDPR_URL = "/api/admin/gdpr-retention/"
+MATCH_QUEUE_URL = "/api/admin/match-score-queue/"
+CONNECT_POOL_URL = "/api/admin/connect-pool-reconcile/"
+DAILY_DROP_URL = "/api/admin/daily-drop-pregenerate/"
+ACTIVITY_FLUSH_URL = "/api/admin/activity-flush/"
 
 
 @override_settings(**CRUSH_URLS)
@@ -99,3 +105,105 @@ class GdprRetentionEndpointTests(TestCase):
             )
         self.assertEqual(resp.status_code, 500)
         self.assertEqual(resp.json()["error"], "command_error")
+
+
+@override_settings(**CRUSH_URLS)
+class MatchScoreQueueEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client(HTTP_HOST="crush.lu")
+
+    def test_missing_bearer_unauthorized(self):
+        resp = self.client.post(MATCH_QUEUE_URL)
+        self.assertEqual(resp.status_code, 401)
+
+    def test_get_method_not_allowed(self):
+        resp = self.client.get(
+            MATCH_QUEUE_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+        )
+        self.assertEqual(resp.status_code, 405)
+
+    def test_valid_post_drains_queue(self):
+        with mock.patch(
+            "crush_lu.api_admin_metrics.call_command"
+        ) as mock_call:
+            resp = self.client.post(
+                MATCH_QUEUE_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+            )
+        self.assertEqual(resp.status_code, 202)
+        mock_call.assert_called_once()
+        self.assertEqual(mock_call.call_args[0][0], "drain_match_score_queue")
+
+
+@override_settings(**CRUSH_URLS)
+class ConnectPoolReconcileEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client(HTTP_HOST="crush.lu")
+
+    def test_missing_bearer_unauthorized(self):
+        resp = self.client.post(CONNECT_POOL_URL)
+        self.assertEqual(resp.status_code, 401)
+
+    def test_get_method_not_allowed(self):
+        resp = self.client.get(
+            CONNECT_POOL_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+        )
+        self.assertEqual(resp.status_code, 405)
+
+    def test_valid_post_reconciles_pool(self):
+        with mock.patch(
+            "crush_lu.api_admin_metrics.call_command"
+        ) as mock_call:
+            resp = self.client.post(
+                CONNECT_POOL_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+            )
+        self.assertEqual(resp.status_code, 202)
+        mock_call.assert_called_once()
+        self.assertEqual(mock_call.call_args[0][0], "reconcile_connect_pool")
+
+
+@override_settings(**CRUSH_URLS)
+class DailyDropPregenerateEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client(HTTP_HOST="crush.lu")
+
+    def test_missing_bearer_unauthorized(self):
+        resp = self.client.post(DAILY_DROP_URL)
+        self.assertEqual(resp.status_code, 401)
+
+    def test_get_method_not_allowed(self):
+        resp = self.client.get(
+            DAILY_DROP_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+        )
+        self.assertEqual(resp.status_code, 405)
+
+    def test_valid_post_pregenerates_drops(self):
+        with mock.patch(
+            "crush_lu.api_admin_metrics.call_command"
+        ) as mock_call:
+            resp = self.client.post(
+                DAILY_DROP_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+            )
+        self.assertEqual(resp.status_code, 202)
+        mock_call.assert_called_once()
+        self.assertEqual(mock_call.call_args[0][0], "pregenerate_daily_drops")
+
+
+@override_settings(**CRUSH_URLS)
+class ActivityFlushEndpointTests(TestCase):
+    def setUp(self):
+        self.client = Client(HTTP_HOST="crush.lu")
+
+    def test_missing_bearer_unauthorized(self):
+        resp = self.client.post(ACTIVITY_FLUSH_URL)
+        self.assertEqual(resp.status_code, 401)
+
+    def test_valid_post_flushes_buffer(self):
+        with mock.patch(
+            "crush_lu.api_admin_metrics.call_command"
+        ) as mock_call:
+            resp = self.client.post(
+                ACTIVITY_FLUSH_URL, HTTP_AUTHORIZATION=f"Bearer {API_KEY}",
+            )
+        self.assertEqual(resp.status_code, 202)
+        mock_call.assert_called_once()
+        self.assertEqual(mock_call.call_args[0][0], "flush_user_activity")
@@ -39,8 +39,7 @@ from crush_lu.services.campaigns import (
 
 User = get_user_model()
 
-# VAPID keys only exist in production settings; push sends need them present
-# (pywebpush itself is mocked module-wide in the root conftest).
+# VAPID keys only exist in production settings; push sends need them present.
 vapid_test_settings = override_settings(
     VAPID_PRIVATE_KEY='test-vapid-private-key',
     VAPID_PUBLIC_KEY='test-vapid-public-key',
@@ -48,6 +47,19 @@ vapid_test_settings = override_settings(
 )
 
 
+def _accept_every_push(deliveries, **kwargs):
+    """Stand-in for send_push_batch: every device accepts (the fan-out itself
+    is covered in test_push_notifications)."""
+    from crush_lu.push_notifications import PUSH_SENT
+
+    return {subscription.pk: PUSH_SENT for subscription, _ in deliveries}
+
+
+push_service_stand_in = patch(
+    'crush_lu.push_notifications.send_push_batch', new=_accept_every_push,
+)
+
+
 def make_user(email, **profile_kwargs):
     user = User.objects.create_user(
         username=email,
@@ -178,6 +190,7 @@ class ChannelEligibilityTests(TestCase):
 
 
 @vapid_test_settings
+@push_service_stand_in
 class ResumabilityTests(TestCase):
     def setUp(self):
         self.users = [
@@ -210,21 +223,23 @@ class ResumabilityTests(TestCase):
         adapter = CHANNEL_ADAPTERS['push']
         claims_seen = []
 
-        def record_claim(user, *args, **kwargs):
-            claims_seen.append(
-                CampaignRecipient.objects.filter(
-                    campaign=self.campaign, channel='push',
-                    user=user, status='pending',
-                ).exists()
-            )
-            return {'success': 1, 'failed': 0, 'total': 1}
+        def record_claim(deliveries, **kwargs):
+            deliveries = list(deliveries)
+            for subscription, _ in deliveries:
+                claims_seen.append(
+                    CampaignRecipient.objects.filter(
+                        campaign=self.campaign, channel='push',
+                        user_id=subscription.user_id, status='pending',
+                    ).exists()
+                )
+            return _accept_every_push(deliveries)
 
         with patch(
-            'crush_lu.push_notifications.send_push_notification',
+            'crush_lu.push_notifications.send_push_batch',
             side_effect=record_claim,
         ):
-            adapter.send_batch(self.campaign, limit=1)
-        self.assertEqual(claims_seen, [True])
+            adapter.send_batch(self.campaign, limit=2)
+        self.assertEqual(claims_seen, [True, True])
 
     def test_push_batch_respects_limit_and_resumes(self):
         adapter = CHANNEL_ADAPTERS['push']
@@ -309,7 +324,7 @@ class SendNewsletterBoundedRunTests(TestCase):
         real_send = 'crush_lu.newsletter_service._send_newsletter_to_user'
         calls = {'n': 0}
 
-        def flaky(newsletter, user, link_rewriter=None):
+        def flaky(newsletter, user, link_rewriter=None, renderer=None):
             calls['n'] += 1
             if calls['n'] == 1:
                 raise RuntimeError('bounce')
@@ -327,7 +342,7 @@ class SendNewsletterBoundedRunTests(TestCase):
         """The durable claim must exist when the Graph send happens."""
         claims_seen = []
 
-        def record_claim(newsletter, user, link_rewriter=None):
+        def record_claim(newsletter, user, link_rewriter=None, renderer=None):
             claims_seen.append(
                 NewsletterRecipient.objects.filter(
                     newsletter=newsletter, user=user, status='pending',
@@ -377,6 +392,7 @@ class SendNewsletterBoundedRunTests(TestCase):
 
 
 @vapid_test_settings
+@push_service_stand_in
 class DispatcherTests(TestCase):
     def setUp(self):
         self.users = [make_user(f'd{i}@example.com') for i in range(2)]
@@ -464,7 +480,7 @@ class DispatcherTests(TestCase):
         real_send = 'crush_lu.newsletter_service._send_newsletter_to_user'
         calls = {'n': 0}
 
-        def flaky(newsletter, user, link_rewriter=None):
+        def flaky(newsletter, user, link_rewriter=None, renderer=None):
             calls['n'] += 1
             if calls['n'] == 1:
                 raise RuntimeError('SMTP exploded')
@@ -519,7 +535,7 @@ class DispatcherTests(TestCase):
         )
         real_send = 'crush_lu.newsletter_service._send_newsletter_to_user'
 
-        def cancel_after_first(newsletter, user, link_rewriter=None):
+        def cancel_after_first(newsletter, user, link_rewriter=None, renderer=None):
             Campaign.objects.get(pk=campaign.pk).cancel()
 
         with patch(real_send, side_effect=cancel_after_first):
@@ -0,0 +1,254 @@
+"""
+Tests for the materialized Crush Connect pool (services.connect_pool).
+
+The live ``get_live_eligible_pool`` query is the reference: every scenario
+here asserts the materialized read returns exactly the same candidates, both
+as maintained by save signals and after a full ``reconcile_connect_pool``.
+
+Run with: pytest crush_lu/tests/test_connect_pool.py -v
+"""
+
+from datetime import date
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from crush_lu.models import (
+    ConnectCandidate,
+    ConnectPairExclusion,
+    CrushConnectMembership,
+    CrushProfile,
+    EventConnection,
+    UserBlock,
+)
+from crush_lu.services.connect_pool import (
+    check_pool_consistency,
+    get_materialized_pool,
+    preferred_genders_key,
+    reconcile_connect_pool,
+)
+from crush_lu.services.crush_connect import get_eligible_pool, get_live_eligible_pool
+from crush_lu.tests.test_crush_connect import _get_coach, _make_event, _make_user
+
+pytestmark = pytest.mark.urls("azureproject.urls_crush")
+
+User = get_user_model()
+
+
+def _pk(username):
+    return User.objects.get(username=username).pk
+
+
+def _pks(qs):
+    return list(qs.values_list("pk", flat=True))
+
+
+def _assert_pools_match(user):
+    live = _pks(get_live_eligible_pool(user))
+    assert _pks(get_materialized_pool(user)) == live
+    return live
+
+
+@pytest.fixture
+def mixed_pool():
+    """A requester plus candidates that each trip exactly one pool rule."""
+    today = date.today()
+    me = _make_user(username="me", preferred_genders=["F"])
+    ok = _make_user(username="ok", gender="F", preferred_genders=["M"])
+    _make_user(username="wrong_gender", gender="M", preferred_genders=["M"])
+    _make_user(username="wants_women", gender="F", preferred_genders=["F"])
+    _make_user(username="no_pref", gender="F", preferred_genders=[])
+    _make_user(username="no_luxid", gender="F", has_luxid=False)
+    _make_user(username="no_consent", gender="F", photo_share_consent=False)
+    _make_user(username="stale", gender="F", last_login_days_ago=45)
+    _make_user(username="excluded", gender="F", excluded_by_coach=True)
+    _make_user(username="not_onboarded", gender="F", onboarded=False)
+    _make_user(
+        username="too_young_for_her",
+        gender="F",
+        dob=today.replace(year=today.year - 22),
+        preferred_age_max=25,
+    )
+    return me, ok
+
+
+@pytest.mark.django_db
+def test_preferred_genders_key_is_sorted_and_deduplicated():
+    assert preferred_genders_key(["M", "F", "M"]) == "|F|M|"
+    assert preferred_genders_key([]) == ""
+    assert preferred_genders_key(None) == ""
+
+
+@pytest.mark.django_db
+def test_signal_maintained_pool_matches_live(mixed_pool):
+    me, ok = mixed_pool
+    pool = _assert_pools_match(me)
+    assert ok.pk in pool
+    assert _pk("no_pref") in pool
+    for name in (
+        "wrong_gender",
+        "wants_women",
+        "no_luxid",
+        "no_consent",
+        "stale",
+        "excluded",
+        "not_onboarded",
+    ):
+        assert _pk(name) not in pool
+
+
+@pytest.mark.django_db
+def test_unlisted_members_keep_a_row_with_reason_flags(mixed_pool):
+    row = ConnectCandidate.objects.get(user_id=_pk("no_luxid"))
+    assert row.is_listed is False
+    assert row.has_luxid is False
+    assert row.has_photo is True
+    assert not ConnectCandidate.objects.filter(user_id=_pk("not_onboarded")).exists()
+
+
+@pytest.mark.django_db
+def test_connection_exclusion_is_directional_for_secret_crush(mixed_pool):
+    me, ok = mixed_pool
+    event = _make_event(title="Shared")
+    # ok secretly declared a crush on me: she stays in my pool, I leave hers.
+    crush = EventConnection.objects.create(
+        requester=ok,
+        recipient=me,
+        event=event,
+        status="pending",
+        flow=EventConnection.FLOW_CRUSH,
+    )
+    assert ok.pk in _assert_pools_match(me)
+    assert me.pk not in _assert_pools_match(ok)
+
+    crush.status = "shared"
+    crush.save()
+    assert ok.pk not in _assert_pools_match(me)
+
+    crush.delete()
+    assert ok.pk in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_block_exclusion_is_symmetric_and_lifted_on_delete(mixed_pool):
+    me, ok = mixed_pool
+    block = UserBlock.objects.create(blocker=ok, blocked=me)
+    assert ok.pk not in _assert_pools_match(me)
+    assert me.pk not in _assert_pools_match(ok)
+
+    block.delete()
+    assert ok.pk in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_coach_pair_exclusion_follows_assignment(mixed_pool):
+    me, ok = mixed_pool
+    coach = _get_coach()
+    coach_member = _make_user(username="coach_member", gender="F", preferred_genders=["M"])
+    assert coach_member.pk in _assert_pools_match(me)
+
+    # Make coach_member the coach of me — they may no longer see each other.
+    coach.user = coach_member
+    coach.save()
+    profile = me.crushprofile
+    profile.assigned_coach = coach
+    profile.save()
+    me.refresh_from_db()
+    assert coach_member.pk not in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_profile_and_membership_edits_refresh_the_candidate(mixed_pool):
+    me, ok = mixed_pool
+    profile = ok.crushprofile
+    profile.photo_1 = ""
+    profile.save()
+    assert ok.pk not in _assert_pools_match(me)
+
+    profile.photo_1 = "users/1/photos/test.jpg"
+    profile.save(update_fields=["photo_1"])
+    membership = ok.crush_connect_membership
+    membership.preferred_genders = ["F"]
+    membership.save(update_fields=["preferred_genders"])
+    assert ok.pk not in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_login_refreshes_candidate_last_login(mixed_pool):
+    me, _ = mixed_pool
+    stale = User.objects.get(username="stale")
+    stale.last_login = timezone.now()
+    stale.save(update_fields=["last_login"])
+    assert stale.pk in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_full_user_save_touches_the_candidate_only_on_a_login_change(mixed_pool):
+    me, _ = mixed_pool
+    stale = User.objects.get(username="stale")
+
+    with CaptureQueriesContext(connection) as queries:
+        stale.save()
+    assert not any("connectcandidate" in q["sql"] for q in queries.captured_queries)
+
+    stale.last_login = timezone.now()
+    stale.save()
+    assert stale.pk in _assert_pools_match(me)
+
+
+@pytest.mark.django_db
+def test_point_lookup_and_dispatch(settings, mixed_pool):
+    me, ok = mixed_pool
+    assert _pks(get_materialized_pool(me, candidate_pk=ok.pk)) == [ok.pk]
+
+    settings.CONNECT_MATERIALIZED_POOL = True
+    assert _pks(get_eligible_pool(me)) == _pks(get_live_eligible_pool(me))
+
+
+@pytest.mark.django_db
+def test_materialized_pool_is_one_query(mixed_pool, django_assert_num_queries):
+    me, _ = mixed_pool
+    # Premium lookup happens in pool_requester; the pool itself is one SELECT.
+    _ = me.crushprofile.has_active_premium
+    with django_assert_num_queries(2):
+        list(get_materialized_pool(me))
+
+
+@pytest.mark.django_db
+def test_reconcile_repairs_writes_that_bypass_signals(mixed_pool):
+    me, ok = mixed_pool
+    # Bulk updates skip the save signals.
+    CrushConnectMembership.objects.filter(user=ok).update(excluded_by_coach=True)
+    CrushProfile.objects.filter(user__username="no_consent").update(gender="M")
+    EventConnection.objects.bulk_create(
+        [EventConnection(requester=me, recipient=ok, event=_make_event(), status="pending")]
+    )
+    ConnectPairExclusion.objects.create(
+        viewer=me, hidden_id=_pk("no_pref"), reason=ConnectPairExclusion.REASON_BLOCK
+    )
+    assert check_pool_consistency()
+
+    result = reconcile_connect_pool()
+    assert result["candidates_changed"] == 2
+    assert result["exclusions_added"] == 2  # both directions of the new connection
+    assert result["exclusions_removed"] == 1
+    assert check_pool_consistency() == []
+
+    # Nothing left to repair on a second run.
+    result = reconcile_connect_pool()
+    assert result["candidates_changed"] == 0
+    assert result["exclusions_added"] == result["exclusions_removed"] == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_command_check(mixed_pool):
+    me, _ = mixed_pool
+    call_command("reconcile_connect_pool", "--check")
+    call_command("reconcile_connect_pool", "--check", "--user-id", me.pk)
+
+    with pytest.raises(CommandError):
+        call_command("reconcile_connect_pool", "--check", "--user-id", 0)
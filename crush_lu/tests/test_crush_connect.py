@@ -6,6 +6,7 @@ Later milestones append to this module.
 """
 
 from datetime import date, timedelta
+from io import StringIO
 
 import pytest
 from allauth.socialaccount.models import SocialAccount
@@ -30,6 +31,7 @@ from crush_lu.services.crush_connect import (
     DAILY_DROP_SIZE,
     get_eligible_pool,
     get_or_create_daily_drop,
+    pregenerate_daily_drops,
 )
 
 
@@ -752,6 +754,125 @@ def test_drop_unique_constraint_per_day():
     assert ConnectDailyDrop.objects.filter(user=me, drop_date=today).count() == 1
 
 
+def _drop_recipient_map(drop_date):
+    return {
+        drop.user_id: sorted(drop.recipients.values_list("pk", flat=True))
+        for drop in ConnectDailyDrop.objects.filter(drop_date=drop_date)
+    }
+
+
+@pytest.mark.django_db
+def test_pregenerated_drops_match_lazy_drops():
+    from crush_lu.models import Interest, MatchScore, UserBlock
+
+    me = _make_user(username="me", preferred_genders=["F"])
+    targets = _seed_pool_for(me, n=8)
+    # Soft signals and a pair rule, so the shared snapshot is exercised.
+    interest = Interest.objects.create(slug="pregen-hiking", label="Hiking")
+    for user in (me, targets[0], targets[3]):
+        user.crush_connect_membership.interests.add(interest)
+    MatchScore.objects.create(
+        user_a=min(me, targets[1], key=lambda u: u.pk),
+        user_b=max(me, targets[1], key=lambda u: u.pk),
+        score_final=0.95,
+    )
+    UserBlock.objects.create(blocker=targets[2], blocked=me)
+    drop_date = date.today() + timedelta(days=1)
+
+    for user in [me, *targets]:
+        get_or_create_daily_drop(user, drop_date=drop_date)
+    lazy = _drop_recipient_map(drop_date)
+    ConnectDailyDrop.objects.filter(drop_date=drop_date).delete()
+
+    result = pregenerate_daily_drops(drop_date)
+
+    assert result["generated"] == len(targets) + 1
+    assert _drop_recipient_map(drop_date) == lazy
+    assert targets[2].pk not in lazy[me.pk]
+
+
+@pytest.mark.django_db
+def test_pregenerate_skips_existing_and_ineligible_members():
+    me = _make_user(username="me", preferred_genders=["F"])
+    _seed_pool_for(me, n=4)
+    free = _make_user(username="free", gender="F", preferred_genders=["M"], premium=False)
+    drop_date = date.today() + timedelta(days=1)
+    existing = ConnectDailyDrop.objects.create(user=me, drop_date=drop_date)
+
+    result = pregenerate_daily_drops(drop_date)
+
+    assert result["generated"] == 4
+    assert existing.recipients.count() == 0  # a pinned Drop is never re-rolled
+    assert not ConnectDailyDrop.objects.filter(user=free).exists()
+    assert pregenerate_daily_drops(drop_date)["generated"] == 0
+
+
+@pytest.mark.django_db
+def test_pregenerate_viewers_are_exactly_the_pool_requesters():
+    from crush_lu.services.crush_connect import _drop_viewers, pool_requester
+
+    me = _make_user(username="me", preferred_genders=["F"])
+    _seed_pool_for(me, n=3)
+    _make_user(username="excluded", gender="F", excluded_by_coach=True)
+    _make_user(username="free", gender="F", premium=False)
+    _make_user(username="unapproved", gender="F", is_approved=False)
+    _make_user(username="not_onboarded", gender="F", onboarded=False)
+    drop_date = date.today() + timedelta(days=1)
+
+    viewers = set(_drop_viewers(drop_date))
+
+    assert viewers == {user for user in User.objects.all() if pool_requester(user)}
+    assert User.objects.get(username="excluded") not in viewers
+
+
+@pytest.mark.django_db
+def test_pregenerate_leaves_members_with_an_open_coach_pick_alone():
+    from crush_lu.services.crush_connect import (
+        get_active_coach_pick,
+        propose_coach_pick,
+    )
+
+    me = _make_user(username="me", preferred_genders=["F"])
+    targets = _seed_pool_for(me, n=4)
+    propose_coach_pick(me.crushprofile.assigned_coach, me, targets[0])
+    drop_date = date.today() + timedelta(days=1)
+
+    result = pregenerate_daily_drops(drop_date)
+
+    assert result["coach_picks"] == 1
+    assert not ConnectDailyDrop.objects.filter(user=me, drop_date=drop_date).exists()
+    # The lazy path would not roll one either
+    assert get_active_coach_pick(me) is not None
+
+
+@pytest.mark.django_db
+def test_pregenerate_query_count_does_not_scale_with_viewers(
+    django_assert_max_num_queries,
+):
+    me = _make_user(username="me", preferred_genders=["F"])
+    _seed_pool_for(me, n=12)
+    # viewers + catalogue + interests + 3 exclusion sources + MatchScores +
+    # coach picks, then one write batch (2 reads, 2 inserts) wrapped in a
+    # savepoint.
+    with django_assert_max_num_queries(15):
+        result = pregenerate_daily_drops(date.today() + timedelta(days=1))
+    assert result["generated"] == 13
+
+
+@pytest.mark.django_db
+def test_pregenerate_daily_drops_command_defaults_to_next_drop():
+    from django.core.management import call_command
+
+    from crush_lu.services.crush_connect import next_drop_date
+
+    me = _make_user(username="me", preferred_genders=["F"])
+    _seed_pool_for(me, n=3)
+    call_command("pregenerate_daily_drops", stdout=StringIO())
+    assert ConnectDailyDrop.objects.filter(
+        user=me, drop_date=next_drop_date()
+    ).exists()
+
+
 # ---------------------------------------------------------------------------
 # M3 — Drop card preview (debug view + partial)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,122 @@
+"""
+Tests for the cached demographic aggregates behind the coach dashboard and the
+admin segments page.
+
+Run with: pytest crush_lu/tests/test_demographics.py -v
+"""
+
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from crush_lu.models import CrushProfile
+from crush_lu.services.demographics import profile_demographics
+
+User = get_user_model()
+
+
+def _years_ago(years):
+    return date(timezone.localdate().year - years, 1, 1)
+
+
+class ProfileDemographicsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = self._profile(
+            "alice", "F", 26, verification_status="verified",
+            preferred_language="fr", event_languages=["en", "fr"],
+        )
+        self._profile(
+            "bob", "M", 41, verification_status="verified",
+            preferred_language="de", event_languages=["de"],
+        )
+        self._profile("carol", "F", 63, preferred_language="en")
+        self._profile("dan", "M", None)
+        # Neither active nor verified: never aggregated
+        self._profile("eve", "F", 30, is_active=False)
+
+    def tearDown(self):
+        cache.clear()
+
+    def _profile(self, name, gender, age, **fields):
+        user = User.objects.create_user(
+            username=f"{name}@example.com", email=f"{name}@example.com", password="x"
+        )
+        return CrushProfile.objects.create(
+            user=user,
+            gender=gender,
+            date_of_birth=_years_ago(age) if age else None,
+            **fields,
+        )
+
+    def test_distributions_per_audience(self):
+        active = profile_demographics(active=True)
+        self.assertEqual(active["total"], 4)
+        self.assertEqual(active["with_birth_date"], 3)
+        self.assertEqual(active["gender"], {"F": 2, "M": 2})
+        self.assertEqual(active["age_gender"]["25-29"]["F"], 1)
+        self.assertEqual(active["age_gender"]["40-44"]["M"], 1)
+        self.assertEqual(active["age_gender"]["60+"]["F"], 1)
+
+        verified = profile_demographics(verified=True)
+        self.assertEqual(verified["total"], 2)
+        self.assertEqual(verified["preferred_language"], {"fr": 1, "de": 1})
+        self.assertEqual(verified["event_languages"], {"en": 1, "fr": 1, "de": 1})
+        self.assertEqual(verified["age_languages"]["25-29"], {"en": 1, "fr": 1})
+        self.assertEqual(verified["gender_languages"]["M"], {"de": 1})
+
+    def test_second_read_is_served_from_cache(self):
+        profile_demographics(active=True)
+        with CaptureQueriesContext(connection) as ctx:
+            profile_demographics(active=True, verified=True)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_verification_change_invalidates(self):
+        self.assertEqual(profile_demographics(verified=True)["total"], 2)
+        carol = CrushProfile.objects.get(user__username="carol@example.com")
+        carol.verification_status = "verified"
+        carol.save(update_fields=["verification_status"])
+        self.assertEqual(profile_demographics(verified=True)["total"], 3)
+
+    def test_unrelated_save_keeps_cache(self):
+        profile_demographics()
+        self.alice.location = "Esch"
+        self.alice.save(update_fields=["location"])
+        with CaptureQueriesContext(connection) as ctx:
+            profile_demographics()
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_profile_save_reads_the_previous_row_once(self):
+        """The wallet, Connect pool and demographics snapshots share one read."""
+        self.alice.bio = "Hi"
+        with CaptureQueriesContext(connection) as ctx:
+            self.alice.save()
+        # Narrow reads of the profile row; CrushProfile.save() itself loads
+        # the full row first
+        snapshots = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "crush_lu_crushprofile"')
+            and '"completion_status"' not in q["sql"]
+        ]
+        self.assertEqual(len(snapshots), 1)
+        for column in ("referral_points", "assigned_coach_id", "event_languages"):
+            self.assertIn(f'"{column}"', snapshots[0])
+        self.assertNotIn('"bio"', snapshots[0])
+
+    def test_admin_segment_stats(self):
+        from crush_lu.admin.user_segments import get_demographic_stats
+
+        stats = get_demographic_stats()
+        self.assertEqual(stats["total_active"], 4)
+        self.assertEqual(stats["total_approved"], 2)
+        self.assertEqual(
+            {item["gender"]: item["count"] for item in stats["gender_approved"]},
+            {"F": 1, "M": 1},
+        )
+        female = next(row for row in stats["gender_age_matrix"] if row["gender"] == "F")
+        self.assertEqual(female["total"], 1)
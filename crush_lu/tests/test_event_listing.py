@@ -0,0 +1,115 @@
+"""
+Tests for the cached shared part of the event list.
+
+Run with: pytest crush_lu/tests/test_event_listing.py -v
+"""
+
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from crush_lu.models import (
+    CrushProfile,
+    EventRegistration,
+    MeetupEvent,
+    UserDataConsent,
+)
+
+User = get_user_model()
+
+
+def _event(title, **kwargs):
+    return MeetupEvent.objects.create(
+        title=title,
+        description="x",
+        event_type="mixer",
+        date_time=timezone.now() + timedelta(days=10),
+        location="Bar Rouge",
+        address="12 Rue Secrète",
+        canton="Luxembourg",
+        max_participants=10,
+        registration_deadline=timezone.now() + timedelta(days=9),
+        is_published=True,
+        **kwargs,
+    )
+
+
+def _jsonld_names(response):
+    data = json.loads(response.context["event_list_jsonld"])
+    return [element["item"]["name"] for element in data["itemListElement"]]
+
+
+@override_settings(ROOT_URLCONF="azureproject.urls_crush")
+class EventListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("crush_lu:event_list")
+        self.event = _event("Open Mixer")
+
+    def test_warm_anonymous_list_needs_no_query(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_jsonld_names(response), ["Open Mixer"])
+
+    def test_editing_an_event_rebuilds_the_list(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = "Renamed Mixer"
+            self.event.save()
+
+        self.assertEqual(_jsonld_names(self.client.get(self.url)), ["Renamed Mixer"])
+
+    def test_a_registration_updates_the_counts(self):
+        self.client.get(self.url)
+        user = User.objects.create_user(username="reg@example.com", password="x")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EventRegistration.objects.create(
+                event=self.event, user=user, status="confirmed"
+            )
+
+        listed = self.client.get(self.url).context["upcoming_event_list"]
+        self.assertEqual(listed[0].confirmed_count_annotated, 1)
+
+    def test_private_events_stay_off_the_anonymous_list(self):
+        _event("Invite Only", is_private_invitation=True)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            [e.title for e in response.context["upcoming_event_list"]], ["Open Mixer"]
+        )
+        self.assertEqual(_jsonld_names(response), ["Open Mixer"])
+
+    def test_members_see_the_exact_address(self):
+        user = User.objects.create_user(username="member@example.com", password="x")
+        CrushProfile.objects.create(
+            user=user, date_of_birth=date(1993, 3, 15), gender="F"
+        )
+        UserDataConsent.objects.update_or_create(
+            user=user, defaults={"crushlu_consent_given": True}
+        )
+        self.client.get(self.url)  # warmed anonymously
+        self.client.force_login(user)
+
+        data = json.loads(self.client.get(self.url).context["event_list_jsonld"])
+
+        address = data["itemListElement"][0]["item"]["location"]["address"]
+        self.assertEqual(address["streetAddress"], "12 Rue Secrète")
+
+    def test_anonymous_visitors_see_the_canton_only(self):
+        data = json.loads(self.client.get(self.url).context["event_list_jsonld"])
+
+        address = data["itemListElement"][0]["item"]["location"]["address"]
+        self.assertNotIn("streetAddress", address)
+        self.assertEqual(address["addressLocality"], "Luxembourg")
@@ -542,11 +542,12 @@ class TestRoster:
             assert entry["is_mutual"] is False
             assert entry["already_met"] is False
             # The photo route is handle-addressed, never the durable user-id
-            # route used by serve_profile_photo.
+            # route used by serve_profile_photo, and asks for the tile-sized
+            # rendition.
             assert entry["photo_url"] == reverse(
                 "crush_lu:event_lobby_photo",
                 kwargs={"event_id": event.pk, "handle": entry["handle"]},
-            )
+            ) + f"?w={lobby.ROSTER_PHOTO_WIDTH}"
 
     def test_roster_newest_first(self):
         event = _make_event()
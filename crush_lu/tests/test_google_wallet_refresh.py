@@ -0,0 +1,185 @@
+"""
+Tests for the batched Google Wallet refresh: bulk prefetch, payload-hash
+skipping and the concurrent PATCH pipeline of update_all_google_wallet_passes.
+
+Run with: pytest crush_lu/tests/test_google_wallet_refresh.py -v
+"""
+
+import io
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from crush_lu.models import CrushProfile, EventRegistration, MeetupEvent
+
+User = get_user_model()
+
+PATCHED = {"success": True, "message": "Pass updated successfully"}
+
+
+@pytest.fixture
+def _google_identity(settings):
+    settings.WALLET_GOOGLE_CLASS_ID = "3388000000022222222.crush_member"
+
+
+def _holders(count):
+    profiles = []
+    for i in range(count):
+        user = User.objects.create_user(
+            username=f"refresh{i}@example.com",
+            email=f"refresh{i}@example.com",
+            password="x",
+        )
+        profile = CrushProfile.objects.create(
+            user=user,
+            date_of_birth=date(1995, 5, 15),
+            gender="M",
+            location="Luxembourg City",
+            is_approved=True,
+            is_active=True,
+        )
+        profile.google_wallet_object_id = f"google-refresh-{i}"
+        profile.save(update_fields=["google_wallet_object_id"])
+        profiles.append(profile)
+    return profiles
+
+
+@pytest.mark.django_db
+class TestPrefetchedPassData:
+    def test_matches_the_per_profile_build(self):
+        from crush_lu.wallet_pass import build_wallet_pass_data, prefetch_wallet_pass_data
+
+        profiles = _holders(2)
+        event = MeetupEvent.objects.create(
+            title="Wine Tasting",
+            description="x",
+            event_type="speed_dating",
+            date_time=timezone.now() + timedelta(days=3),
+            location="Luxembourg",
+            address="1 Rue",
+            max_participants=20,
+            registration_deadline=timezone.now() + timedelta(days=2),
+            is_published=True,
+        )
+        EventRegistration.objects.create(
+            event=event, user=profiles[0].user, status="confirmed"
+        )
+
+        prefetched = prefetch_wallet_pass_data(profiles)
+
+        for profile in profiles:
+            assert build_wallet_pass_data(
+                profile, prefetched=prefetched[profile.pk]
+            ) == build_wallet_pass_data(profile)
+        assert prefetched[profiles[0].pk]["next_registration"].event == event
+        assert prefetched[profiles[1].pk]["next_registration"] is None
+
+
+class TestPayloadHash:
+    def test_ignores_the_signature_of_the_photo_url(self):
+        from crush_lu.wallet.google_api import wallet_object_payload_hash
+
+        def payload(uri):
+            return {"id": "obj", "heroImage": {"sourceUri": {"uri": uri}}}
+
+        first = payload("https://x.blob.core.windows.net/p/a.webp?se=1&sig=aa")
+        second = payload("https://x.blob.core.windows.net/p/a.webp?se=2&sig=bb")
+        other = payload("https://x.blob.core.windows.net/p/b.webp?se=1&sig=aa")
+
+        assert wallet_object_payload_hash(first) == wallet_object_payload_hash(second)
+        assert wallet_object_payload_hash(first) != wallet_object_payload_hash(other)
+
+
+@pytest.mark.django_db
+class TestRefreshSweep:
+    def _sweep(self, **kwargs):
+        from crush_lu.wallet.google_api import update_all_google_wallet_passes
+
+        with mock.patch(
+            "crush_lu.wallet.google_api._get_access_token", return_value="tok"
+        ), mock.patch(
+            "crush_lu.wallet.google_api._patch_generic_object", return_value=PATCHED
+        ) as patch_object:
+            results = update_all_google_wallet_passes(**kwargs)
+        return results, patch_object
+
+    def test_unchanged_objects_are_not_patched_again(self, _google_identity):
+        profiles = _holders(3)
+
+        results, patch_object = self._sweep()
+        assert results == {"updated": 3, "failed": 0, "skipped": 0}
+        # The prepared payload is sent as built, not rebuilt per request
+        assert all(call.kwargs["payload"] for call in patch_object.call_args_list)
+        assert all(
+            CrushProfile.objects.filter(pk=p.pk)
+            .values_list("google_wallet_payload_hash", flat=True)
+            .get()
+            for p in profiles
+        )
+
+        results, patch_object = self._sweep()
+        assert results == {"updated": 0, "failed": 0, "skipped": 3}
+        assert patch_object.call_count == 0
+
+        CrushProfile.objects.filter(pk=profiles[1].pk).update(referral_points=250)
+        results, patch_object = self._sweep()
+        assert results == {"updated": 1, "failed": 0, "skipped": 2}
+        assert patch_object.call_args.args[0].pk == profiles[1].pk
+
+    def test_force_patches_unchanged_objects(self, _google_identity):
+        _holders(2)
+        self._sweep()
+
+        results, patch_object = self._sweep(force=True)
+
+        assert results == {"updated": 2, "failed": 0, "skipped": 0}
+        assert patch_object.call_count == 2
+
+    def test_failed_patch_keeps_the_old_hash(self, _google_identity):
+        from crush_lu.wallet.google_api import update_all_google_wallet_passes
+
+        profile = _holders(1)[0]
+        with mock.patch(
+            "crush_lu.wallet.google_api._get_access_token", return_value="tok"
+        ), mock.patch(
+            "crush_lu.wallet.google_api._patch_generic_object",
+            return_value={"success": False, "message": "API error: 503"},
+        ):
+            results = update_all_google_wallet_passes()
+
+        assert results == {"updated": 0, "failed": 1, "skipped": 0}
+        profile.refresh_from_db()
+        assert profile.google_wallet_payload_hash == ""
+
+    def test_a_new_object_is_patched_despite_a_stored_hash(self, _google_identity):
+        profile = _holders(1)[0]
+        self._sweep()
+
+        CrushProfile.objects.filter(pk=profile.pk).update(
+            google_wallet_object_id="google-refresh-readded"
+        )
+        results, _patch_object = self._sweep()
+
+        assert results["updated"] == 1
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+    def test_runs_against_the_stand_in(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_google_wallet_refresh",
+            "--objects",
+            "6",
+            "--latency-ms",
+            "0",
+            "--concurrency",
+            "3",
+            stdout=out,
+        )
+        assert "serial: 6/6 updated" in out.getvalue()
+        assert "concurrent: 6/6 updated" in out.getvalue()
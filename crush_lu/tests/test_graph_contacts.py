@@ -19,6 +19,8 @@ the contact is simply wrong or absent from caller ID:
    150 MB of writes per 5 minutes, and photos are the only large payload here.
 5. 429 backoff must be bounded, because these calls run on the web request
    thread via post_save.
+6. The nightly pass must not rewrite contacts that have not changed, and a
+   pass cut short by throttling must resume rather than start over.
 """
 
 from datetime import date
@@ -32,6 +34,8 @@ from crush_lu.services.graph_contacts import (
     CRUSH_CATEGORY,
     IMMUTABLE_ID_PREFER,
     GraphContactsService,
+    TokenBucket,
+    contact_payload_hash,
     normalize_e164,
 )
 
@@ -674,6 +678,249 @@ class TestRetryBudget:
         assert request.call_count == 1
 
 
+# ---------------------------------------------------------------------------
+# Bulk sync: $batch, pacing, hash skip, checkpoint
+# ---------------------------------------------------------------------------
+
+
+class FakeClock:
+    """Monotonic clock for TokenBucket that only moves when it sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_paces_requests_at_the_configured_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=20, clock=clock, sleep=clock.sleep)
+
+        bucket.acquire(20)  # the initial burst is free
+        bucket.acquire(20)
+
+        assert clock.now == pytest.approx(2.0)
+
+    def test_throttle_waits_out_retry_after_and_halves_the_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=20, clock=clock, sleep=clock.sleep)
+
+        bucket.throttled(7)
+        bucket.acquire(1)
+
+        assert clock.now >= 7
+        assert bucket.rate == 5
+
+    def test_clean_batches_win_the_rate_back(self):
+        bucket = TokenBucket(rate=10)
+        bucket.throttled(0)
+        bucket.throttled(0)
+
+        for _ in range(20):
+            bucket.recovered()
+
+        assert bucket.rate == 10
+
+
+@pytest.mark.django_db
+class TestBulkSync:
+    """The nightly pass used to PATCH every profile one by one with a fixed
+    sleep in between. It now sends $batch calls of up to 20, skips contacts
+    that would not change, and checkpoints so an interrupted pass resumes."""
+
+    @pytest.fixture
+    def profiles(self, django_user_model):
+        from crush_lu.models import CrushProfile
+
+        created = []
+        for n in range(3):
+            user = django_user_model.objects.create_user(
+                username=f"bulk{n}@crush.lu",
+                email=f"bulk{n}@crush.lu",
+                first_name=f"Bulk{n}",
+                last_name="Member",
+            )
+            created.append(
+                CrushProfile.objects.create(
+                    user=user,
+                    date_of_birth=date(1990, 1, 1),
+                    is_approved=True,
+                    phone_number=f"+35262100000{n}",
+                    phone_verified=True,
+                )
+            )
+        return created
+
+    @pytest.fixture
+    def bulk(self, service, monkeypatch):
+        """Sync enabled, a fake-clock bucket, and a scripted $batch endpoint.
+
+        Each queued handler maps the sub-request list of one $batch call to
+        {id: status}; created contacts get an ID derived from their index.
+        """
+        clock = FakeClock()
+        monkeypatch.setattr(graph_contacts, "is_sync_enabled", lambda request=None: True)
+        monkeypatch.setattr(
+            graph_contacts,
+            "TokenBucket",
+            lambda: TokenBucket(clock=clock, sleep=clock.sleep),
+        )
+        calls = []
+        script = []
+
+        def fake_request(method, url, **kwargs):
+            assert url.endswith("/$batch")
+            subrequests = kwargs["json"]["requests"]
+            calls.append(subrequests)
+            statuses = script.pop(0)(subrequests) if script else {}
+            responses = []
+            for sub in subrequests:
+                status = statuses.get(sub["id"], 201 if sub["method"] == "POST" else 200)
+                body = {"id": f"CID-{sub['body']['givenName']}"} if status == 201 else {}
+                headers = {"Retry-After": "3"} if status == 429 else {}
+                responses.append(
+                    {"id": sub["id"], "status": status, "headers": headers, "body": body}
+                )
+            return _response(200, {"responses": responses})
+
+        monkeypatch.setattr("requests.request", fake_request)
+        return SimpleNamespace(calls=calls, script=script, clock=clock)
+
+    def test_one_batch_creates_every_contact_and_records_hashes(
+        self, service, profiles, bulk
+    ):
+        from crush_lu.models import CrushProfile, OutlookContactSyncState
+
+        stats = service.sync_all_profiles()
+
+        assert len(bulk.calls) == 1
+        assert [sub["method"] for sub in bulk.calls[0]] == ["POST"] * 3
+        assert all(
+            sub["headers"]["Prefer"] == IMMUTABLE_ID_PREFER for sub in bulk.calls[0]
+        )
+        assert stats["synced"] == 3 and stats["complete"]
+        for profile in CrushProfile.objects.filter(pk__in=[p.pk for p in profiles]):
+            assert profile.outlook_contact_id.startswith("CID-")
+            assert profile.outlook_contact_hash == contact_payload_hash(
+                service._build_contact_payload(profile)
+            )
+        state = OutlookContactSyncState.get_state()
+        assert state.cursor_profile_id == 0
+        assert state.last_completed_at is not None
+
+    def test_unchanged_profiles_cost_no_request(self, service, profiles, bulk):
+        from crush_lu.models import CrushProfile
+
+        service.sync_all_profiles()
+        CrushProfile.objects.filter(pk=profiles[0].pk).update(location="Esch")
+        stats = service.sync_all_profiles()
+
+        assert len(bulk.calls) == 2
+        assert [sub["method"] for sub in bulk.calls[1]] == ["PATCH"]
+        assert stats["synced"] == 1
+        assert stats["unchanged"] == 2
+
+    def test_throttled_sub_requests_are_resent_after_retry_after(
+        self, service, profiles, bulk
+    ):
+        bulk.script.append(lambda subs: {subs[1]["id"]: 429})
+
+        stats = service.sync_all_profiles()
+
+        assert len(bulk.calls) == 2
+        assert len(bulk.calls[1]) == 1
+        assert bulk.calls[1][0]["body"] == bulk.calls[0][1]["body"]
+        assert sum(bulk.clock.slept) >= 3
+        assert stats["synced"] == 3 and stats["errors"] == 0
+
+    def test_update_conflict_falls_back_to_the_single_profile_path(
+        self, service, profiles, bulk, monkeypatch
+    ):
+        service.sync_all_profiles()
+        from crush_lu.models import CrushProfile
+
+        CrushProfile.objects.filter(pk=profiles[0].pk).update(location="Esch")
+        bulk.script.append(lambda subs: {subs[0]["id"]: 412})
+        sync_profile = mock.Mock(return_value="CID")
+        monkeypatch.setattr(service, "sync_profile", sync_profile)
+
+        stats = service.sync_all_profiles()
+
+        sync_profile.assert_called_once()
+        assert sync_profile.call_args[0][0].pk == profiles[0].pk
+        assert stats["synced"] == 1 and stats["errors"] == 0
+
+    def test_a_throttled_pass_resumes_from_its_checkpoint(
+        self, service, profiles, bulk, monkeypatch
+    ):
+        from crush_lu.models import OutlookContactSyncState
+
+        monkeypatch.setattr(graph_contacts, "GRAPH_BATCH_LIMIT", 2)
+        always_throttled = lambda subs: {sub["id"]: 429 for sub in subs}  # noqa: E731
+        bulk.script.extend(
+            [lambda subs: {}] + [always_throttled] * (graph_contacts.MAX_RETRIES + 1)
+        )
+
+        first = service.sync_all_profiles()
+
+        assert first["stopped"] == "throttled" and not first["complete"]
+        state = OutlookContactSyncState.get_state()
+        assert state.cursor_profile_id == profiles[1].pk
+        assert state.heartbeat_at is None  # lease released for the catch-up run
+
+        calls_before = len(bulk.calls)
+        second = service.sync_all_profiles(resume_only=True)
+
+        assert second["resumed_from"] == profiles[1].pk
+        assert second["complete"]
+        assert len(bulk.calls) == calls_before + 1
+        assert len(bulk.calls[-1]) == 1
+
+    def test_resume_only_is_a_no_op_without_an_unfinished_pass(
+        self, service, profiles, bulk
+    ):
+        stats = service.sync_all_profiles(resume_only=True)
+
+        assert stats["stopped"] == "idle"
+        assert bulk.calls == []
+
+    def test_a_live_pass_holds_the_lease(self, service, profiles, bulk):
+        from django.utils import timezone
+
+        from crush_lu.models import OutlookContactSyncState
+
+        state = OutlookContactSyncState.get_state()
+        state.pass_started_at = state.heartbeat_at = timezone.now()
+        state.save()
+
+        stats = service.sync_all_profiles()
+
+        assert stats["stopped"] == "locked"
+        assert bulk.calls == []
+
+    def test_single_profile_writes_record_the_hash_too(self, service, profiles):
+        """Otherwise every contact the post_save signal keeps fresh would be
+        rewritten again by the next nightly pass."""
+        from crush_lu.models import CrushProfile
+
+        profile = profiles[0]
+        with mock.patch(
+            "requests.request", return_value=_response(201, {"id": "NEW"})
+        ):
+            service.create_contact(profile, force=True)
+
+        assert CrushProfile.objects.get(pk=profile.pk).outlook_contact_hash == (
+            contact_payload_hash(service._build_contact_payload(profile))
+        )
+
+
 # ---------------------------------------------------------------------------
 # Request shaping
 # ---------------------------------------------------------------------------
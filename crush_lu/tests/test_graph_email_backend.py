@@ -0,0 +1,194 @@
+"""Tests for the Graph email transport: token caching and $batch sending."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.mail import EmailMessage
+
+from azureproject import graph_email_backend as backend_module
+from azureproject.email_utils import build_domain_email, send_domain_email_batch
+from azureproject.graph_email_backend import GraphEmailBackend, GraphThrottled
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches():
+    backend_module._msal_apps.clear()
+    backend_module._tokens.clear()
+    yield
+    backend_module._msal_apps.clear()
+    backend_module._tokens.clear()
+
+
+@pytest.fixture
+def msal_app():
+    app = MagicMock()
+    app.acquire_token_for_client.return_value = {
+        "access_token": "tok", "expires_in": 3600,
+    }
+    with patch.object(backend_module, "_get_msal_app", return_value=app):
+        yield app
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    with patch.object(backend_module, "get_graph_session", return_value=session):
+        yield session
+
+
+def _backend():
+    return GraphEmailBackend(tenant_id="t", client_id="c", client_secret="s")
+
+
+def _messages(count):
+    return [
+        EmailMessage("Hi", "body", "love@crush.lu", [f"u{i}@example.com"])
+        for i in range(count)
+    ]
+
+
+def _response(status, json=None, headers=None):
+    response = MagicMock(status_code=status, headers=headers or {}, text="")
+    response.json.return_value = json or {}
+    return response
+
+
+def _batch_response(statuses, retry_after=None):
+    return _response(200, {
+        "responses": [
+            {
+                "id": index,
+                "status": status,
+                "headers": {"Retry-After": str(retry_after)} if status == 429 else {},
+            }
+            for index, status in statuses.items()
+        ]
+    })
+
+
+def test_token_is_reused_across_backends(msal_app, session):
+    session.post.return_value = _response(202)
+
+    _backend().send_messages(_messages(1))
+    _backend().send_messages(_messages(1))
+
+    msal_app.acquire_token_for_client.assert_called_once()
+
+
+def test_rotated_secret_gets_a_new_msal_app():
+    with patch("msal.ConfidentialClientApplication") as app_class:
+        first = backend_module._get_msal_app("t", "c", "old-secret")
+        assert backend_module._get_msal_app("t", "c", "old-secret") is first
+        backend_module._get_msal_app("t", "c", "new-secret")
+
+    assert app_class.call_count == 2
+    assert [c.kwargs["client_credential"] for c in app_class.call_args_list] == [
+        "old-secret", "new-secret",
+    ]
+
+
+def test_token_refreshed_before_expiry(msal_app):
+    msal_app.acquire_token_for_client.return_value = {
+        "access_token": "tok", "expires_in": 60,  # inside the refresh margin
+    }
+
+    _backend().get_access_token()
+    _backend().get_access_token()
+
+    assert msal_app.acquire_token_for_client.call_count == 2
+
+
+def test_multiple_messages_go_through_one_batch_call(msal_app, session):
+    session.post.return_value = _batch_response({"0": 202, "1": 202, "2": 202})
+
+    sent = _backend().send_messages(_messages(3))
+
+    assert sent == 3
+    session.post.assert_called_once()
+    url = session.post.call_args[0][0]
+    assert url.endswith("/$batch")
+    body = session.post.call_args[1]["json"]
+    assert [r["url"] for r in body["requests"]] == ["/users/love@crush.lu/sendMail"] * 3
+
+
+def test_batches_are_capped_at_twenty_requests(msal_app, session):
+    session.post.side_effect = lambda url, **kwargs: _batch_response(
+        {r["id"]: 202 for r in kwargs["json"]["requests"]}
+    )
+
+    assert _backend().send_messages(_messages(25)) == 25
+    sizes = [len(c[1]["json"]["requests"]) for c in session.post.call_args_list]
+    assert sizes == [20, 5]
+
+
+def test_throttled_items_are_retried_alone(msal_app, session):
+    session.post.side_effect = [
+        _batch_response({"0": 202, "1": 429, "2": 202}, retry_after=2),
+        _batch_response({"1": 202}),
+    ]
+
+    with patch.object(backend_module.time, "sleep") as sleep:
+        errors = _backend().send_messages_detailed(_messages(3))
+
+    assert errors == [None, None, None]
+    sleep.assert_called_once_with(2)
+    retry = session.post.call_args_list[1][1]["json"]["requests"]
+    assert [r["id"] for r in retry] == ["1"]
+
+
+def test_per_item_failures_are_reported(msal_app, session):
+    session.post.return_value = _batch_response({"0": 202, "1": 400})
+
+    errors = _backend().send_messages_detailed(_messages(2))
+
+    assert errors[0] is None
+    assert "HTTP 400" in str(errors[1])
+    with pytest.raises(Exception, match="HTTP 400"):
+        _backend().send_messages(_messages(2))
+
+
+def test_throttling_beyond_budget_gives_up(msal_app, session):
+    session.post.return_value = _batch_response({"0": 429, "1": 202}, retry_after=10_000)
+
+    with patch.object(backend_module.time, "sleep") as sleep:
+        errors = _backend().send_messages_detailed(_messages(2))
+
+    sleep.assert_not_called()
+    assert isinstance(errors[0], GraphThrottled)
+    assert "429" in str(errors[0])
+    assert errors[1] is None
+
+
+def test_requests_missing_from_the_reply_count_as_failed(msal_app, session):
+    session.post.return_value = _batch_response({"0": 202, "2": 202})
+
+    errors = _backend().send_messages_detailed(_messages(3))
+
+    assert errors[0] is None and errors[2] is None
+    assert "no response" in str(errors[1])
+
+
+def test_sleeps_stay_inside_the_retry_budget(msal_app, session):
+    session.post.side_effect = [
+        _batch_response({"0": 429, "1": 429}, retry_after=15),
+        _batch_response({"0": 429, "1": 429}, retry_after=15),
+    ]
+
+    with patch.object(backend_module.time, "sleep") as sleep:
+        errors = _backend().send_messages_detailed(_messages(2))
+
+    # 15s fits the 20s budget once; the second wait would not
+    sleep.assert_called_once_with(15)
+    assert all(isinstance(error, GraphThrottled) for error in errors)
+
+
+def test_batch_helper_falls_back_to_per_message_sends(mailoutbox):
+    messages = [
+        build_domain_email("Hi", "body", [f"u{i}@example.com"], "love@crush.lu")
+        for i in range(3)
+    ]
+
+    errors = send_domain_email_batch(messages, domain="crush.lu")
+
+    assert errors == [None, None, None]
+    assert len(mailoutbox) == 3
@@ -1,10 +1,13 @@
 """Tests for the Crush.lu matching system (models, algorithm, views)."""
 
-from datetime import date
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
 
 from django.contrib.auth.models import User
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
 from crush_lu.matching import (
     get_western_zodiac,
@@ -22,14 +25,19 @@ from crush_lu.matching import (
     get_score_label,
     get_score_display,
     update_match_scores_for_user,
+    drain_match_score_queue,
+    mark_aged_members_dirty,
     get_matches_for_user,
+    load_match_vectors,
+    recalculate_all_match_scores,
+    score_match_vectors,
     WEIGHT_QUALITIES,
     WEIGHT_ZODIAC_WEST,
     WEIGHT_ZODIAC_CN,
     WEIGHT_LANGUAGE,
     WEIGHT_AGE_FIT,
 )
-from crush_lu.models import CrushCoach, CrushProfile, MatchScore, Trait
+from crush_lu.models import CrushCoach, CrushProfile, MatchMemberState, MatchScore, Trait
 from crush_lu.models.profiles import UserDataConsent
 
 
@@ -838,6 +846,276 @@ class MatchScorePersistenceTests(TestCase):
         )
 
 
+class BatchScoringTests(TestCase):
+    """The vector scorer must reproduce the per-pair scorer exactly."""
+
+    def setUp(self):
+        all_q = list(Trait.objects.filter(trait_type="quality").order_by("sort_order"))
+        all_d = list(Trait.objects.filter(trait_type="defect").order_by("sort_order"))
+        specs = [
+            # gender, preferred, dob, langs, age range, astro, q slice, sought slice
+            ("M", ["F"], date(1990, 4, 5), ["en", "fr"], (18, 99), True, (0, 5), (5, 10)),
+            ("F", ["M"], date(1992, 6, 10), ["fr"], (28, 40), True, (5, 10), (0, 5)),
+            ("F", ["M", "F"], date(1985, 12, 25), ["de"], (18, 99), False, (2, 7), (3, 8)),
+            ("M", [], date(1999, 2, 1), ["en"], (20, 30), True, (1, 6), (0, 5)),
+            ("M", ["F"], None, [], (18, 99), True, (4, 9), (6, 11)),
+        ]
+        self.users = []
+        for i, (gender, prefs, dob, langs, (lo, hi), astro, qs, ss) in enumerate(specs):
+            user = User.objects.create_user(f"batch_{i}", password="test")
+            profile = CrushProfile.objects.create(
+                user=user,
+                location="canton-luxembourg",
+                gender=gender,
+                date_of_birth=dob,
+                event_languages=langs,
+                is_approved=True,
+                is_active=True,
+            )
+            _onboard_with_traits(
+                profile,
+                qualities=all_q[qs[0]:qs[1]],
+                defects=all_d[:5],
+                sought=all_q[ss[0]:ss[1]],
+                preferred_genders=prefs,
+                preferred_age_min=lo,
+                preferred_age_max=hi,
+                astro_enabled=astro,
+            )
+            self.users.append(user)
+
+    def _legacy_data(self, user):
+        from types import SimpleNamespace
+
+        profile = CrushProfile.objects.get(user=user)
+        membership = user.crush_connect_membership
+        return SimpleNamespace(
+            qualities=membership.qualities,
+            defects=membership.defects,
+            sought_qualities=membership.sought_qualities,
+            astro_enabled=membership.astro_enabled,
+            preferred_genders=membership.preferred_genders,
+            preferred_age_min=membership.preferred_age_min,
+            preferred_age_max=membership.preferred_age_max,
+            gender=profile.gender,
+            date_of_birth=profile.date_of_birth,
+            age=profile.age,
+            event_languages=profile.event_languages,
+        )
+
+    def test_vector_scores_match_pairwise_scorer(self):
+        pool = load_match_vectors()
+        self.assertEqual(len(pool), len(self.users))
+        for i, user_a in enumerate(self.users):
+            for user_b in self.users[i + 1:]:
+                data_a = self._legacy_data(user_a)
+                data_b = self._legacy_data(user_b)
+                expected = (
+                    compute_match_score(data_a, data_b)
+                    if passes_hard_filters(data_a, data_b)
+                    else None
+                )
+                self.assertEqual(
+                    score_match_vectors(pool[user_a.pk], pool[user_b.pk]),
+                    expected,
+                    f"pair {user_a.username}/{user_b.username}",
+                )
+
+    def test_load_excludes_coach_excluded_and_unapproved(self):
+        self.users[0].crush_connect_membership.excluded_by_coach = True
+        self.users[0].crush_connect_membership.save()
+        CrushProfile.objects.filter(user=self.users[1]).update(is_approved=False)
+        pool = load_match_vectors()
+        self.assertNotIn(self.users[0].pk, pool)
+        self.assertNotIn(self.users[1].pk, pool)
+
+    def test_full_recompute_matches_per_user_updates(self):
+        for user in self.users:
+            update_match_scores_for_user(user)
+        per_user = {
+            (ms.user_a_id, ms.user_b_id): ms.score_final
+            for ms in MatchScore.objects.all()
+        }
+        MatchScore.objects.all().delete()
+
+        recalculate_all_match_scores()
+        batch = {
+            (ms.user_a_id, ms.user_b_id): ms.score_final
+            for ms in MatchScore.objects.all()
+        }
+        self.assertTrue(batch)
+        self.assertEqual(batch, per_user)
+
+    def test_full_recompute_updates_and_purges(self):
+        recalculate_all_match_scores()
+        pair = MatchScore.objects.first()
+        pair.score_final = 0.01
+        pair.save()
+        outsider = User.objects.create_user("batch_outsider", password="test")
+        MatchScore.objects.create(user_a=self.users[0], user_b=outsider, score_final=0.9)
+
+        recalculate_all_match_scores()
+
+        pair.refresh_from_db()
+        self.assertNotEqual(pair.score_final, 0.01)
+        self.assertFalse(MatchScore.objects.filter(user_b=outsider).exists())
+
+    def test_per_user_query_count_is_constant(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        user = User.objects.select_related(
+            "crushprofile", "crush_connect_membership"
+        ).get(pk=self.users[0].pk)
+        with CaptureQueriesContext(connection) as small:
+            update_match_scores_for_user(user)
+
+        for i in range(5):
+            extra = User.objects.create_user(f"batch_extra_{i}", password="test")
+            profile = CrushProfile.objects.create(
+                user=extra,
+                location="canton-luxembourg",
+                gender="F",
+                date_of_birth=date(1991, 3, 3),
+                event_languages=["en"],
+                is_approved=True,
+                is_active=True,
+            )
+            _onboard_with_traits(
+                profile,
+                qualities=list(Trait.objects.filter(trait_type="quality")[:5]),
+                defects=list(Trait.objects.filter(trait_type="defect")[:5]),
+                sought=list(Trait.objects.filter(trait_type="quality")[5:10]),
+                preferred_genders=["M"],
+            )
+        with CaptureQueriesContext(connection) as large:
+            update_match_scores_for_user(user)
+
+        self.assertEqual(len(small), len(large))
+
+
+class MatchScoreQueueTests(TestCase):
+    """Dirty-member queue: save paths enqueue, the drain rescores only changes."""
+
+    def setUp(self):
+        all_q = list(Trait.objects.filter(trait_type="quality").order_by("sort_order"))
+        all_d = list(Trait.objects.filter(trait_type="defect").order_by("sort_order"))
+        self.all_q = all_q
+        self.users = []
+        for i, (qs, ss) in enumerate([((0, 5), (5, 10)), ((5, 10), (0, 5))]):
+            user = User.objects.create_user(f"queue_{i}", password="test")
+            profile = CrushProfile.objects.create(
+                user=user,
+                location="canton-luxembourg",
+                date_of_birth=date(1990 + i, 4, 5),
+                event_languages=["en"],
+                is_approved=True,
+                is_active=True,
+            )
+            _onboard_with_traits(
+                profile,
+                qualities=all_q[qs[0]:qs[1]],
+                defects=all_d[:5],
+                sought=all_q[ss[0]:ss[1]],
+            )
+            self.users.append(user)
+
+    def _queued(self):
+        return set(
+            MatchMemberState.objects.filter(dirty_since__isnull=False).values_list(
+                "user_id", flat=True
+            )
+        )
+
+    def test_onboarding_and_trait_saves_enqueue(self):
+        self.assertEqual(self._queued(), {u.pk for u in self.users})
+
+    def test_drain_scores_queued_members_and_empties_queue(self):
+        result = drain_match_score_queue()
+        self.assertEqual(result["rescored"], 2)
+        self.assertEqual(MatchScore.objects.count(), 1)
+        self.assertEqual(self._queued(), set())
+
+    def test_noop_profile_save_is_skipped(self):
+        drain_match_score_queue()
+        MatchScore.objects.update(score_final=0.01)
+
+        # Re-saving the profile without changing a scoring input queues the
+        # member, but the fingerprint is unchanged so nothing is rewritten.
+        CrushProfile.objects.get(user=self.users[0]).save()
+        self.assertEqual(self._queued(), {self.users[0].pk})
+        result = drain_match_score_queue()
+
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(result["rescored"], 0)
+        self.assertEqual(MatchScore.objects.get().score_final, 0.01)
+        self.assertEqual(self._queued(), set())
+
+    def test_unrelated_update_fields_do_not_enqueue(self):
+        drain_match_score_queue()
+        profile = CrushProfile.objects.get(user=self.users[0])
+        profile.bio = "New bio"
+        profile.save(update_fields=["bio"])
+        self.assertEqual(self._queued(), set())
+
+    def test_trait_change_rescores(self):
+        drain_match_score_queue()
+        before = MatchScore.objects.get().score_qualities
+
+        self.users[0].crush_connect_membership.qualities.set(self.all_q[10:15])
+        self.assertEqual(self._queued(), {self.users[0].pk})
+        result = drain_match_score_queue()
+
+        self.assertEqual(result["rescored"], 1)
+        self.assertNotEqual(MatchScore.objects.get().score_qualities, before)
+
+    def test_coach_exclusion_drops_rows(self):
+        drain_match_score_queue()
+        membership = self.users[1].crush_connect_membership
+        membership.excluded_by_coach = True
+        membership.save(update_fields=["excluded_by_coach"])
+
+        drain_match_score_queue()
+
+        self.assertEqual(MatchScore.objects.count(), 0)
+
+    def test_birthday_requeues_and_rescores(self):
+        # Scored a year ago: the rows and fingerprints carry last year's ages
+        a_year_ago = timezone.now() - timedelta(days=366)
+        with mock.patch("django.utils.timezone.now", return_value=a_year_ago):
+            drain_match_score_queue()
+        MatchScore.objects.update(score_final=0.01)
+
+        result = drain_match_score_queue()
+
+        self.assertEqual(result["rescored"], 2)
+        self.assertNotEqual(MatchScore.objects.get().score_final, 0.01)
+
+    def test_members_scored_since_their_birthday_stay_dequeued(self):
+        drain_match_score_queue()
+
+        self.assertEqual(mark_aged_members_dirty(), 0)
+        self.assertEqual(self._queued(), set())
+
+    def test_only_members_past_a_birthday_are_queued(self):
+        drain_match_score_queue()
+        # Both born on 5 April; the first scored the day before this year's
+        MatchMemberState.objects.filter(user=self.users[0]).update(
+            scored_at=datetime(2025, 4, 4, 23, 30, tzinfo=dt_timezone.utc)
+        )
+        MatchMemberState.objects.filter(user=self.users[1]).update(
+            scored_at=datetime(2025, 4, 5, 0, 30, tzinfo=dt_timezone.utc)
+        )
+
+        self.assertEqual(mark_aged_members_dirty(today=date(2025, 4, 5)), 1)
+        self.assertEqual(self._queued(), {self.users[0].pk})
+
+    def test_drain_restricted_to_user_ids(self):
+        result = drain_match_score_queue(user_ids=[self.users[0].pk])
+        self.assertEqual(result["processed"], 1)
+        self.assertEqual(self._queued(), {self.users[1].pk})
+
+
 # =============================================================================
 # View Tests
 # =============================================================================
@@ -175,3 +175,113 @@ def test_daily_pwa_visit_not_re_queried_after_flagged(user):
     with patch("crush_lu.models.DailyUserActivity.objects") as mock_daily:
         _run(_make_request(user, pwa=True))
     mock_daily.get_or_create.assert_not_called()
+
+
+# --- Write-behind mode -------------------------------------------------------
+
+
+@pytest.fixture
+def write_behind(settings):
+    from crush_lu.services import activity_buffer
+
+    settings.USER_ACTIVITY_WRITE_BEHIND = True
+    activity_buffer._local_events.clear()
+    # Keep the in-process buffer from flushing itself on a background thread
+    with patch.object(activity_buffer, "LOCAL_FLUSH_EVENTS", 10_000), patch.object(
+        activity_buffer, "LOCAL_FLUSH_SECONDS", 10_000
+    ):
+        yield activity_buffer
+    activity_buffer._local_events.clear()
+
+
+def test_write_behind_request_path_does_not_touch_db(user, write_behind):
+    with patch("crush_lu.models.UserActivity.objects") as mock_activity, patch(
+        "crush_lu.models.DailyUserActivity.objects"
+    ) as mock_daily:
+        _run(_make_request(user))
+
+    mock_activity.get_or_create.assert_not_called()
+    mock_daily.get_or_create.assert_not_called()
+    assert len(write_behind._local_events) == 1
+
+
+def test_flush_coalesces_events_per_user(user, write_behind):
+    # Midday, so every event lands on the same local day
+    now = timezone.localtime().replace(hour=12, minute=0)
+    for seconds in (0, 60, 400):  # two visits: the 60s hit is inside the throttle
+        write_behind.record_activity(user.pk, now + timedelta(seconds=seconds))
+    write_behind.record_activity(user.pk, now + timedelta(seconds=450), pwa=True)
+
+    result = write_behind.flush_activity_buffer()
+
+    assert result["events"] == 4
+    activity = UserActivity.objects.get(user=user)
+    assert activity.total_visits == 2
+    assert activity.last_seen == now + timedelta(seconds=450)
+    assert activity.is_pwa_user is True
+    row = DailyUserActivity.objects.get(user=user)
+    assert row.was_pwa is True
+    assert len(write_behind._local_events) == 0
+
+
+def test_flush_continues_from_stored_last_seen(user, write_behind):
+    past = timezone.localtime().replace(hour=12, minute=0)
+    UserActivity.objects.create(user=user, last_seen=past, total_visits=5)
+    DailyUserActivity.objects.create(
+        user=user, activity_date=timezone.localdate(past), was_pwa=True
+    )
+
+    write_behind.record_activity(user.pk, past + timedelta(seconds=50))
+    write_behind.record_activity(user.pk, past + timedelta(seconds=400))
+    write_behind.flush_activity_buffer()
+
+    activity = UserActivity.objects.get(user=user)
+    assert activity.total_visits == 6
+    # A browser-only flush never clears the day's PWA flag
+    assert DailyUserActivity.objects.get(user=user).was_pwa is True
+
+
+def test_flush_drains_the_backlog_in_batches(user, write_behind):
+    now = timezone.localtime().replace(hour=12, minute=0)
+    for seconds in range(0, 2500, 500):
+        write_behind.record_activity(user.pk, now + timedelta(seconds=seconds))
+
+    result = write_behind.flush_activity_buffer(limit=2)
+
+    assert (result["events"], result["batches"]) == (5, 3)
+    assert UserActivity.objects.get(user=user).total_visits == 5
+    assert len(write_behind._local_events) == 0
+
+
+def test_flush_stops_when_the_time_budget_is_spent(user, write_behind):
+    for _ in range(5):
+        write_behind.record_activity(user.pk)
+
+    result = write_behind.flush_activity_buffer(limit=2, time_budget=0)
+
+    assert (result["events"], result["batches"]) == (2, 1)
+    assert len(write_behind._local_events) == 3
+
+
+def test_failed_batch_goes_back_to_the_buffer(user, write_behind):
+    write_behind.record_activity(user.pk)
+    write_behind.record_activity(user.pk, pwa=True)
+    queued = list(write_behind._local_events)
+
+    with patch.object(
+        write_behind, "_apply_events", side_effect=RuntimeError("db down")
+    ), pytest.raises(RuntimeError):
+        write_behind.flush_activity_buffer()
+
+    assert list(write_behind._local_events) == queued
+    assert not UserActivity.objects.filter(user=user).exists()
+    # The lock is released, so the next tick applies them
+    assert write_behind.flush_activity_buffer()["events"] == 2
+
+
+def test_flush_skips_while_another_flush_holds_the_lock(user, write_behind):
+    write_behind.record_activity(user.pk)
+    cache.add(write_behind.FLUSH_LOCK_KEY, 1)
+
+    assert write_behind.flush_activity_buffer()["skipped"] is True
+    assert len(write_behind._local_events) == 1
@@ -0,0 +1,200 @@
+"""
+Tests for the per-member navigation cache behind crush_user_context.
+
+Run with: pytest crush_lu/tests/test_nav_badges.py -v
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from crush_lu.context_processors import crush_user_context
+from crush_lu.models import (
+    CrushProfile,
+    EventConnection,
+    EventRegistration,
+    MeetupEvent,
+    UserDataConsent,
+)
+from crush_lu.services.nav_badges import (
+    NAV_BADGES_CACHE_TIMEOUT,
+    _cache_key,
+    build_nav_badges,
+)
+
+User = get_user_model()
+
+# Queries for a signed-in member's page render once the navigation cache is
+# warm: session and user, then the coach, Connect membership and profile
+# lookups made outside the navbar. The navbar itself adds none (it used to add
+# a dozen); raise this only for a deliberate new per-request query.
+ABOUT_PAGE_QUERY_BUDGET = 5
+
+
+class NavBadgeCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(
+            username="member@example.com",
+            email="member@example.com",
+            password="pass123",
+            first_name="Mem",
+        )
+        self.profile = CrushProfile.objects.create(
+            user=self.user,
+            date_of_birth=date(1993, 3, 15),
+            gender="F",
+            location="Luxembourg City",
+            verification_status="pending",
+            is_active=True,
+        )
+        self.other = User.objects.create_user(
+            username="other@example.com", email="other@example.com", password="x"
+        )
+        self.event = MeetupEvent.objects.create(
+            title="Speed Dating",
+            description="x",
+            event_type="speed_dating",
+            date_time=timezone.now() + timedelta(days=3),
+            location="Luxembourg",
+            address="1 Rue",
+            max_participants=20,
+            registration_deadline=timezone.now() + timedelta(days=2),
+            is_published=True,
+        )
+        EventRegistration.objects.create(
+            event=self.event, user=self.user, status="confirmed"
+        )
+
+    def _context(self):
+        request = self.factory.get("/en/")
+        request.user = self.user
+        return crush_user_context(request)
+
+    def test_warm_context_costs_no_queries(self):
+        self._context()
+
+        with self.assertNumQueries(0):
+            context = self._context()
+
+        self.assertEqual(context["upcoming_events_count"], 1)
+        self.assertTrue(context["nav_has_profile"])
+
+    def test_cached_state_matches_a_fresh_build(self):
+        self._context()
+        self.assertEqual(
+            {k: v for k, v in self._context().items() if k.endswith("_count")},
+            {
+                "connection_count": 0,
+                "pending_requests_count": 0,
+                "actionable_sparks_count": 0,
+                "connect_pending_sparks_count": 0,
+                "upcoming_events_count": 1,
+            },
+        )
+        state = build_nav_badges(self.user)
+        self.assertEqual(state["upcoming_registration_ids"], [
+            EventRegistration.objects.get(user=self.user).pk
+        ])
+
+    def test_lazy_upcoming_events_load_on_access(self):
+        context = self._context()
+        self.assertEqual(
+            [registration.event for registration in context["upcoming_events"]],
+            [self.event],
+        )
+
+    def test_new_connection_request_updates_the_badge(self):
+        self.assertEqual(self._context()["pending_requests_count"], 0)
+
+        EventConnection.objects.create(
+            requester=self.other, recipient=self.user, event=self.event
+        )
+
+        self.assertEqual(self._context()["pending_requests_count"], 1)
+
+    def test_profile_verification_updates_the_progress_step(self):
+        self.assertEqual(self._context()["profile_completion_step"], 2)
+
+        self.profile.verification_status = "verified"
+        self.profile.is_approved = True
+        self.profile.save(update_fields=["verification_status", "is_approved"])
+
+        context = self._context()
+        self.assertEqual(context["profile_completion_step"], 3)
+        self.assertTrue(context["profile_is_approved"])
+
+    def test_state_cached_before_the_commit_is_dropped_on_commit(self):
+        stale = build_nav_badges(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.verification_status = "verified"
+            self.profile.is_approved = True
+            self.profile.save()
+            # Another page's render, not yet seeing the write, caches it again
+            cache.set(_cache_key(self.user), stale, NAV_BADGES_CACHE_TIMEOUT)
+
+        self.assertTrue(self._context()["profile_is_approved"])
+
+    def test_profile_save_leaving_the_header_fields_keeps_the_entry(self):
+        self._context()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.location = "Esch-sur-Alzette"
+            self.profile.save()
+
+        self.assertEqual(callbacks, [])
+        with self.assertNumQueries(0):
+            self._context()
+
+    def test_cancelled_event_leaves_the_upcoming_list(self):
+        self.assertEqual(self._context()["upcoming_events_count"], 1)
+
+        self.event.is_cancelled = True
+        self.event.save()
+
+        self.assertEqual(self._context()["upcoming_events_count"], 0)
+
+    def test_entry_expires_when_a_listed_event_ends(self):
+        self._context()
+        MeetupEvent.objects.filter(pk=self.event.pk).update(
+            date_time=timezone.now() - timedelta(days=1)
+        )
+        # A silent write: the stored entry still lists the event...
+        with self.assertNumQueries(0):
+            self._context()
+
+        # ...until the time it recorded for the event's end has passed
+        later = self.event.date_time + timedelta(days=1)
+        with mock.patch(
+            "crush_lu.services.nav_badges.timezone.now", return_value=later
+        ):
+            self.assertEqual(self._context()["upcoming_events_count"], 0)
+
+    @override_settings(ROOT_URLCONF="azureproject.urls_crush")
+    def test_page_render_query_budget(self):
+        UserDataConsent.objects.update_or_create(
+            user=self.user, defaults={"crushlu_consent_given": True}
+        )
+        client = Client()
+        client.force_login(self.user)
+        url = reverse("crush_lu:about")
+        self.assertEqual(client.get(url).status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            len(queries),
+            ABOUT_PAGE_QUERY_BUDGET,
+            "\n".join(query["sql"] for query in queries.captured_queries),
+        )
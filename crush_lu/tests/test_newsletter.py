@@ -259,6 +259,167 @@ class NewsletterSendTests(TestCase):
         self.assertEqual(call_kwargs['from_email'], 'love@crush.lu')
         self.assertEqual(call_kwargs['domain'], 'crush.lu')
 
+    def _add_users(self, count):
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f'extra{i}@example.com',
+                email=f'extra{i}@example.com',
+                password='testpass123',
+            )
+            CrushProfile.objects.create(
+                user=user, date_of_birth='1995-01-01',
+                gender='F', location='Luxembourg',
+            )
+
+    @patch('crush_lu.newsletter_service.BATCH_PAUSE_SECONDS', 0)
+    @patch('crush_lu.newsletter_service.send_domain_email', return_value=1)
+    def test_query_count_independent_of_recipient_count(self, mock_send):
+        """Users, preferences and recipient rows are handled per chunk."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def measured_send(subject):
+            newsletter = Newsletter.objects.create(
+                subject=subject, body_html='<p>Hi</p>', audience='all_users',
+            )
+            with CaptureQueriesContext(connection) as queries:
+                send_newsletter(newsletter)
+            return len(queries)
+
+        send_newsletter(self.newsletter)  # warm per-process caches
+        # Missing preference rows are created in bulk, not per user
+        EmailPreference.objects.filter(user=self.user1).delete()
+        small = measured_send('Small')
+
+        self._add_users(8)
+        EmailPreference.objects.filter(
+            user__username__startswith='extra',
+        ).delete()
+        large = measured_send('Large')
+
+        self.assertEqual(large, small)
+        self.assertEqual(mock_send.call_count, 2 + 2 + 10)
+        self.assertEqual(EmailPreference.objects.count(), 10)
+
+    @patch('crush_lu.newsletter_service.BATCH_PAUSE_SECONDS', 0)
+    def test_batched_transport_sends_chunk_at_once(self):
+        """A $batch-capable connection gets the chunk in one call."""
+        class BatchConnection:
+            def send_messages_detailed(self, messages):
+                return []
+
+        def batch_send(email_messages, **kwargs):
+            sent_batches.append([email.to for email in email_messages])
+            return [None, Exception('mailbox full')]
+
+        sent_batches = []
+        with patch(
+            'crush_lu.newsletter_service.get_domain_email_connection',
+            return_value=BatchConnection(),
+        ), patch(
+            'crush_lu.newsletter_service.send_domain_email_batch',
+            side_effect=batch_send,
+        ):
+            results = send_newsletter(self.newsletter)
+
+        self.assertEqual(len(sent_batches), 1)
+        self.assertEqual(
+            sorted(sent_batches[0]),
+            [['user1@example.com'], ['user2@example.com']],
+        )
+        self.assertEqual(results['sent'], 1)
+        self.assertEqual(results['failed'], 1)
+        failed = NewsletterRecipient.objects.get(status='failed')
+        self.assertEqual(failed.error_message, 'mailbox full')
+
+    @patch('crush_lu.newsletter_service.BATCH_PAUSE_SECONDS', 0)
+    def test_throttled_recipients_wait_for_the_next_run(self):
+        """Messages Graph never accepted are neither sent nor failed."""
+        from azureproject.graph_email_backend import GraphThrottled
+
+        class BatchConnection:
+            def send_messages_detailed(self, messages):
+                return []
+
+        def batch_send(email_messages, **kwargs):
+            return [None, GraphThrottled('HTTP 429 - throttled')]
+
+        with patch(
+            'crush_lu.newsletter_service.get_domain_email_connection',
+            return_value=BatchConnection(),
+        ), patch(
+            'crush_lu.newsletter_service.send_domain_email_batch',
+            side_effect=batch_send,
+        ):
+            results = send_newsletter(self.newsletter)
+
+        self.assertFalse(results['complete'])
+        self.assertEqual((results['sent'], results['failed']), (1, 0))
+        self.assertEqual(results['remaining'], 1)
+        self.assertEqual(
+            list(NewsletterRecipient.objects.values_list('status', flat=True)),
+            ['sent'],
+        )
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.status, 'sending')
+
+    @patch('crush_lu.newsletter_service.BATCH_PAUSE_SECONDS', 0)
+    def test_throttled_recipient_keeps_its_earlier_failure(self):
+        """A throttled retry restores the row it claimed instead of deleting it."""
+        from azureproject.graph_email_backend import GraphThrottled
+
+        NewsletterRecipient.objects.create(
+            newsletter=self.newsletter, user=self.user2, email=self.user2.email,
+            status='failed', error_message='bounced',
+        )
+
+        class BatchConnection:
+            def send_messages_detailed(self, messages):
+                return []
+
+        def batch_send(email_messages, **kwargs):
+            return [
+                GraphThrottled('HTTP 429 - throttled')
+                if email.to == [self.user2.email] else None
+                for email in email_messages
+            ]
+
+        with patch(
+            'crush_lu.newsletter_service.get_domain_email_connection',
+            return_value=BatchConnection(),
+        ), patch(
+            'crush_lu.newsletter_service.send_domain_email_batch',
+            side_effect=batch_send,
+        ):
+            results = send_newsletter(self.newsletter)
+
+        self.assertFalse(results['complete'])
+        row = NewsletterRecipient.objects.get(user=self.user2)
+        self.assertEqual((row.status, row.error_message), ('failed', 'bounced'))
+
+    @patch('crush_lu.newsletter_service.BATCH_PAUSE_SECONDS', 0)
+    @patch('crush_lu.newsletter_service.send_domain_email', return_value=1)
+    def test_abort_releases_unsent_claims(self, mock_send):
+        """Claims of users the aborted run never reached are undone."""
+        for user in (self.user1, self.user2):
+            NewsletterRecipient.objects.create(
+                newsletter=self.newsletter, user=user, email=user.email,
+                status='failed', error_message='bounced',
+            )
+        checks = iter([False, True])
+
+        results = send_newsletter(
+            self.newsletter, should_abort=lambda: next(checks),
+        )
+
+        self.assertTrue(results['aborted'])
+        self.assertEqual(results['sent'], 1)
+        statuses = sorted(
+            NewsletterRecipient.objects.values_list('status', 'error_message')
+        )
+        # The unreached user is back to its earlier failure, not 'pending'
+        self.assertEqual(statuses, [('failed', 'bounced'), ('sent', '')])
+
 
 class NewsletterEmailRenderTests(TestCase):
     """Test that the newsletter email template renders correctly."""
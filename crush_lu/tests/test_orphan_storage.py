@@ -0,0 +1,163 @@
+"""
+Tests for the orphaned blob scanner behind cleanup_orphan_storage, run
+against the local filesystem storage.
+
+Run with: pytest crush_lu/tests/test_orphan_storage.py -v
+"""
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from crush_lu.models import CrushProfile
+from crush_lu.services.orphan_storage import (
+    OrphanStorageScanner,
+    partition_prefixes,
+    storage_key,
+)
+from crush_lu.storage import delete_blobs_batched
+
+User = get_user_model()
+
+TWO_DAYS_AGO = time.time() - 2 * 24 * 3600
+
+
+class OrphanStorageScannerTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(
+            username="orphan@example.com", email="orphan@example.com", password="x"
+        )
+        self.profile = CrushProfile.objects.create(user=self.user)
+        self.profile.photo_1.save("photo.jpg", ContentFile(b"photo"))
+        self.storage = self.profile.photo_1.storage
+        folder = f"users/{self.user.id}"
+        CrushProfile.objects.filter(pk=self.profile.pk).update(
+            photo_derivatives={
+                "photo_1": {
+                    "source": self.profile.photo_1.name,
+                    "hash": "abc",
+                    "widths": [160],
+                    "formats": ["webp"],
+                }
+            }
+        )
+
+        self.referenced = [
+            self.profile.photo_1.name,
+            f"{folder}/photos/derivatives/abc_160.webp",
+            f"{folder}/social_cache/google.jpg",
+            "branding/logo.png",  # Outside the scanned prefix
+        ]
+        self.orphans = [
+            f"{folder}/photos/replaced.jpg",
+            "users/999999/photos/deleted_user.jpg",
+        ]
+        for name in self.referenced[1:] + self.orphans:
+            self._write(name)
+        for name in self.referenced + self.orphans:
+            path = self.storage.path(name)
+            os.utime(path, (TWO_DAYS_AGO, TWO_DAYS_AGO))
+        # Too recent to judge: its row may not be committed yet
+        self.fresh = f"{folder}/photos/uploading.jpg"
+        self._write(self.fresh)
+
+    def _write(self, name):
+        path = self.storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"x")
+
+    def _exists(self, name):
+        return os.path.exists(self.storage.path(name))
+
+    def test_dry_run_reports_orphans_only(self):
+        results = OrphanStorageScanner(dry_run=True).run()
+        found = sorted(blob.name for result in results for blob in result.orphans)
+        self.assertEqual(found, sorted(self.orphans))
+        for name in self.orphans:
+            self.assertTrue(self._exists(name))
+
+    def test_run_deletes_orphans(self):
+        results = OrphanStorageScanner(dry_run=False).run()
+        self.assertEqual(sum(result.deleted for result in results), 2)
+        for name in self.orphans:
+            self.assertFalse(self._exists(name))
+        for name in self.referenced + [self.fresh]:
+            self.assertTrue(self._exists(name), name)
+
+    def test_resumes_from_checkpoint(self):
+        checkpoint = os.path.join(self.media_root, "checkpoint.json")
+        key = storage_key(self.storage)
+        with open(checkpoint, "w") as f:
+            json.dump(
+                {
+                    "version": 1,
+                    "prefixes": ["users/"],
+                    "dry_run": False,
+                    "done": {
+                        f"{key}|users/": {
+                            "scanned": 7, "orphans": 0, "orphan_bytes": 0, "deleted": 0,
+                        }
+                    },
+                },
+                f,
+            )
+
+        results = OrphanStorageScanner(dry_run=False, checkpoint_path=checkpoint).run()
+        self.assertTrue(all(result.resumed for result in results))
+        for name in self.orphans:
+            self.assertTrue(self._exists(name))
+        # Finished: the next run starts over
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_command_writes_report(self):
+        report = os.path.join(self.media_root, "orphans.csv")
+        out = io.StringIO()
+        call_command(
+            "cleanup_orphan_storage",
+            "--dry-run",
+            "--report",
+            report,
+            "--checkpoint",
+            os.path.join(self.media_root, "checkpoint.json"),
+            stdout=out,
+        )
+        self.assertIn("Would delete 2 orphaned blob(s)", out.getvalue())
+        with open(report) as f:
+            self.assertEqual(len(f.read().splitlines()), 3)
+
+
+class AzureHelpersTests(TestCase):
+    def test_user_prefix_is_partitioned_by_leading_digit(self):
+        partitions = partition_prefixes("users/")
+        self.assertEqual(partitions[0], "users/0")
+        self.assertEqual(len(partitions), 10)
+        self.assertEqual(partition_prefixes("branding/"), ["branding/"])
+
+    def test_batch_delete_counts_missing_blobs_as_deleted(self):
+        client = MagicMock()
+        client.delete_blobs.side_effect = lambda *names, **kwargs: [
+            SimpleNamespace(status_code=404 if name == "gone" else 202)
+            for name in names
+        ]
+        names = [f"users/1/{index}.jpg" for index in range(300)] + ["gone"]
+
+        self.assertEqual(delete_blobs_batched(client, names), 301)
+        # 256 sub-requests per batch
+        self.assertEqual(client.delete_blobs.call_count, 2)
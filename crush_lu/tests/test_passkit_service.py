@@ -4694,3 +4694,140 @@ class TestEnsureCheckinOrigin:
         assert _ensure_checkin_origin(registration, request) == "https://crush.lu"
         registration.refresh_from_db()
         assert registration.apple_wallet_checkin_origin == "https://crush.lu"
+
+
+# ---------------------------------------------------------------------------
+# Signed-package cache and conditional GET
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def _clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class TestPkpassCache:
+    """Signing is the expensive part of a pass fetch and Wallet re-fetches on
+    every push, so an unchanged pass must be served without signing again.
+    _sign_manifest is the only piece that needs Apple certs, so it is patched."""
+
+    def _payload(self, **overrides):
+        return {"formatVersion": 1, "serialNumber": "member-serial", **overrides}
+
+    def test_unchanged_payload_is_signed_once(self, _clear_cache):
+        from crush_lu.wallet import apple_pass
+
+        with mock.patch.object(
+            apple_pass, "_sign_manifest", return_value=b"sig"
+        ) as sign:
+            first = apple_pass._package_pkpass(self._payload())
+            second = apple_pass._package_pkpass(self._payload())
+
+        assert sign.call_count == 1
+        assert first.pkpass_bytes == second.pkpass_bytes
+        assert first.etag == second.etag
+        assert first.last_updated == second.last_updated
+
+    def test_changed_payload_gets_a_new_package(self, _clear_cache):
+        from crush_lu.wallet import apple_pass
+
+        with mock.patch.object(
+            apple_pass, "_sign_manifest", return_value=b"sig"
+        ) as sign:
+            first = apple_pass._package_pkpass(self._payload(description="a"))
+            second = apple_pass._package_pkpass(self._payload(description="b"))
+
+        assert sign.call_count == 2
+        assert first.etag != second.etag
+
+    def test_rebuild_after_eviction_is_byte_identical(self, _clear_cache):
+        from django.core.cache import cache
+
+        from crush_lu.wallet import apple_pass
+
+        # The fallback ETag in get_latest_pass hashes the bytes, which only
+        # works if an identical pass always zips to identical bytes.
+        with mock.patch.object(apple_pass, "_sign_manifest", return_value=b"sig"):
+            first = apple_pass._package_pkpass(self._payload())
+            cache.clear()
+            second = apple_pass._package_pkpass(self._payload())
+
+        assert first.pkpass_bytes == second.pkpass_bytes
+
+    def test_reverted_pass_is_not_reported_as_unmodified(self, _clear_cache):
+        from datetime import UTC, datetime
+
+        from crush_lu.wallet import apple_pass
+
+        clock = iter([1000, 2000, 3000])
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.fromtimestamp(next(clock), tz=UTC)
+
+        # A -> B -> A again: the third package comes from the cache, but a
+        # device holding B must still see it as newer than B.
+        with mock.patch.object(apple_pass, "_sign_manifest", return_value=b"sig"):
+            with mock.patch.object(apple_pass, "datetime", FakeDatetime):
+                apple_pass._package_pkpass(self._payload(description="a"))
+                b = apple_pass._package_pkpass(self._payload(description="b"))
+                a_again = apple_pass._package_pkpass(self._payload(description="a"))
+
+        assert a_again.last_updated > b.last_updated
+
+
+def _fixed_pass_provider(pass_type_identifier, serial_number, **kwargs):
+    from datetime import UTC, datetime
+
+    from crush_lu.wallet.passkit_service import PasskitPass
+
+    return PasskitPass(
+        b"pkpass-bytes",
+        last_updated=datetime(2026, 1, 1, tzinfo=UTC),
+        etag="abc123",
+    )
+
+
+@pytest.mark.django_db
+class TestGetLatestPassConditional:
+    @pytest.fixture(autouse=True)
+    def _provider(self, settings):
+        settings.PASSKIT_AUTH_TOKEN = "tok"
+        settings.PASSKIT_PASS_JSON_PROVIDER = None
+        settings.PASSKIT_PASS_PROVIDER = (
+            "crush_lu.tests.test_passkit_service._fixed_pass_provider"
+        )
+
+    def _get(self, **headers):
+        from crush_lu.wallet.passkit_service import get_latest_pass
+
+        request = RequestFactory().get(
+            "/", HTTP_AUTHORIZATION="ApplePass tok", **headers
+        )
+        return get_latest_pass(request, "pass.lu.crush", "any-serial")
+
+    def test_full_response_carries_validators(self):
+        response = self._get()
+
+        assert response.status_code == 200
+        assert response["ETag"] == '"abc123"'
+        assert "Last-Modified" in response
+
+    def test_matching_etag_is_304(self):
+        response = self._get(HTTP_IF_NONE_MATCH='"abc123"')
+
+        assert response.status_code == 304
+        assert response["ETag"] == '"abc123"'
+
+    def test_stale_etag_wins_over_a_fresh_if_modified_since(self):
+        response = self._get(
+            HTTP_IF_NONE_MATCH='"old"',
+            HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT",
+        )
+
+        assert response.status_code == 200
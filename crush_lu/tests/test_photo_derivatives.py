@@ -0,0 +1,143 @@
+"""
+Tests for the resized profile photo renditions: generation on save, width and
+format selection, stale rendition cleanup, and serving via ``?w=``.
+
+Run with: pytest crush_lu/tests/test_photo_derivatives.py -v
+"""
+
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+
+from crush_lu.models import CrushProfile
+from crush_lu.services.photo_derivatives import (
+    derivative_formats,
+    photo_variant,
+    photos_needing_derivatives,
+    refresh_photo_derivatives,
+)
+from crush_lu.views_media import serve_profile_photo
+
+User = get_user_model()
+
+
+def _jpeg(width, height, color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, format="JPEG")
+    return ContentFile(buffer.getvalue(), name="photo.jpg")
+
+
+@override_settings(AZURE_ACCOUNT_NAME="")
+class PhotoDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(
+            username="photo@example.com", email="photo@example.com", password="x"
+        )
+        self.profile = CrushProfile.objects.create(user=self.user)
+
+    def _upload(self, field, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            getattr(self.profile, field).save("photo.jpg", content)
+        self.profile.refresh_from_db()
+
+    def test_save_builds_renditions_after_commit(self):
+        self._upload("photo_1", _jpeg(800, 600))
+
+        entry = self.profile.photo_derivatives["photo_1"]
+        self.assertEqual(entry["source"], self.profile.photo_1.name)
+        self.assertEqual(entry["widths"], [160, 320, 640])
+        self.assertEqual(entry["formats"], derivative_formats())
+        self.assertEqual(photos_needing_derivatives(self.profile), [])
+
+        name, content_type = photo_variant(self.profile, "photo_1", width=160)
+        self.assertEqual(content_type, "image/webp")
+        self.assertTrue(name.startswith(f"users/{self.user.id}/photos/derivatives/"))
+        with self.profile.photo_1.storage.open(name) as rendition:
+            self.assertEqual(Image.open(rendition).size, (160, 120))
+
+    def test_variant_selection(self):
+        self._upload("photo_1", _jpeg(500, 500))
+        entry = self.profile.photo_derivatives["photo_1"]
+        # Never upscaled: the 640 rendition would be larger than the original
+        self.assertEqual(entry["widths"], [160, 320])
+
+        name, _ = photo_variant(self.profile, "photo_1", width=200)
+        self.assertTrue(name.endswith("_320.webp"))
+        name, content_type = photo_variant(self.profile, "photo_1", width=400)
+        self.assertEqual(name, self.profile.photo_1.name)
+        self.assertEqual(content_type, "image/jpeg")
+        name, _ = photo_variant(self.profile, "photo_1")
+        self.assertEqual(name, self.profile.photo_1.name)
+
+        if "avif" in entry["formats"]:
+            name, content_type = photo_variant(
+                self.profile, "photo_1", width=160, accept="image/avif,image/webp"
+            )
+            self.assertTrue(name.endswith("_160.avif"))
+            self.assertEqual(content_type, "image/avif")
+
+    def test_replaced_photo_renditions_are_deleted(self):
+        self._upload("photo_1", _jpeg(800, 600, "red"))
+        storage = self.profile.photo_1.storage
+        old_name, _ = photo_variant(self.profile, "photo_1", width=160)
+        self.assertTrue(storage.exists(old_name))
+
+        self._upload("photo_1", _jpeg(800, 600, "blue"))
+        new_name, _ = photo_variant(self.profile, "photo_1", width=160)
+        self.assertNotEqual(new_name, old_name)
+        self.assertTrue(storage.exists(new_name))
+        self.assertFalse(storage.exists(old_name))
+
+    def test_unbuilt_photo_falls_back_to_original(self):
+        self.profile.photo_1.save("photo.jpg", _jpeg(800, 600), save=False)
+        CrushProfile.objects.filter(pk=self.profile.pk).update(
+            photo_1=self.profile.photo_1.name
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(photos_needing_derivatives(self.profile), ["photo_1"])
+        name, _ = photo_variant(self.profile, "photo_1", width=160)
+        self.assertEqual(name, self.profile.photo_1.name)
+
+        call_command("generate_photo_derivatives", stdout=io.StringIO())
+        self.profile.refresh_from_db()
+        self.assertEqual(photos_needing_derivatives(self.profile), [])
+        self.assertEqual(refresh_photo_derivatives(self.profile.pk), 0)
+
+    def test_serve_profile_photo_with_width(self):
+        self._upload("photo_1", _jpeg(800, 600))
+        request = RequestFactory().get(
+            f"/crush/media/profile/{self.user.id}/photo_1/?w=160",
+            HTTP_ACCEPT="image/webp,*/*",
+        )
+        request.user = self.user
+        response = serve_profile_photo(
+            request, user_id=self.user.id, photo_field="photo_1"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(response["Vary"], "Accept")
+        self.assertEqual(Image.open(io.BytesIO(response.content)).width, 160)
+
+    def test_wallet_pass_keeps_the_original_upload(self):
+        from crush_lu.wallet_pass import get_profile_photo_url
+
+        self._upload("photo_1", _jpeg(800, 600))
+        self.profile.show_photo_on_wallet = True
+        self.assertTrue(self.profile.photo_derivatives["photo_1"]["widths"])
+
+        # Google Wallet's heroImage takes JPEG/PNG only, never a WebP rendition
+        self.assertEqual(
+            get_profile_photo_url(self.profile), self.profile.photo_1.url
+        )
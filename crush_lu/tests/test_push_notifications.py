@@ -4,8 +4,11 @@ Comprehensive tests for the Crush.lu Push Notification Utilities
 Tests for push_notifications.py which handles:
 - Language detection and context management for multi-language notifications
 - Web Push API notification delivery
+- Batched campaign fan-out (send_push_batch)
 - Notification-specific functions (event reminders, connections, messages, etc.)
 """
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import date, timedelta
@@ -1041,6 +1044,155 @@ class TestSubscriptionFailureTracking:
         assert push_subscription.failure_count == 0
 
 
+# =============================================================================
+# TESTS FOR send_push_batch() (campaign fan-out)
+# =============================================================================
+
+def _b64(raw):
+    import base64
+    return base64.urlsafe_b64encode(raw).strip(b'=').decode()
+
+
+def _browser_keys():
+    """A real receiver key pair + auth secret, as a browser would create."""
+    import os
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    private = ec.generate_private_key(ec.SECP256R1())
+    p256dh = _b64(private.public_key().public_bytes(
+        serialization.Encoding.X962,
+        serialization.PublicFormat.UncompressedPoint,
+    ))
+    auth = os.urandom(16)
+    return private, p256dh, auth
+
+
+class TestSendPushBatch:
+    """The batched sender encrypts for real and talks to a mock transport."""
+
+    @pytest.fixture
+    def real_vapid(self, settings):
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        settings.VAPID_PRIVATE_KEY = _b64(key.private_numbers().private_value.to_bytes(32, 'big'))
+        settings.VAPID_PUBLIC_KEY = 'test_vapid_public_key'
+        settings.VAPID_ADMIN_EMAIL = 'admin@crush.lu'
+
+    @pytest.fixture
+    def devices(self, user_with_profile):
+        """Five devices across two push services; status code per endpoint."""
+        created = {}
+        for i, (origin, status) in enumerate([
+            ('https://fcm.example.com', 201),
+            ('https://fcm.example.com', 201),
+            ('https://fcm.example.com', 410),
+            ('https://moz.example.com', 500),
+            ('https://moz.example.com', 500),
+        ]):
+            private, p256dh, auth = _browser_keys()
+            sub = PushSubscription.objects.create(
+                user=user_with_profile,
+                endpoint=f'{origin}/send/{i}',
+                p256dh_key=p256dh,
+                auth_key=_b64(auth),
+                failure_count=4 if i == 4 else 1,
+            )
+            created[sub.endpoint] = (sub, status, private, auth)
+        return created
+
+    def _transport(self, devices, seen):
+        import httpx
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(devices[str(request.url)][1])
+
+        return lambda concurrency, timeout: httpx.Client(transport=httpx.MockTransport(handler))
+
+    def test_fans_out_and_records_health_in_bulk(
+        self, real_vapid, devices, django_assert_max_num_queries
+    ):
+        import http_ece
+        from crush_lu import push_notifications
+        from crush_lu.push_notifications import (
+            PUSH_FAILED, PUSH_GONE, PUSH_SENT, build_push_payload, send_push_batch,
+        )
+
+        seen = []
+        payload = build_push_payload('Hello', 'World', url='/en/events/')
+        with patch.object(push_notifications, '_push_client', self._transport(devices, seen)):
+            # sent + gone + failed increment + failed delete (+ cascade lookup)
+            with django_assert_max_num_queries(6):
+                outcomes = send_push_batch(
+                    [(sub, payload) for sub, *_ in devices.values()]
+                )
+
+        by_endpoint = {sub.endpoint: outcomes[sub.pk] for sub, *_ in devices.values()}
+        assert list(by_endpoint.values()) == [
+            PUSH_SENT, PUSH_SENT, PUSH_GONE, PUSH_FAILED, PUSH_FAILED,
+        ]
+
+        # One VAPID token per push service, shared by its devices
+        tokens = {}
+        for request in seen:
+            tokens.setdefault(request.url.host, set()).add(request.headers['authorization'])
+            assert request.headers['content-encoding'] == 'aes128gcm'
+        assert {host: len(t) for host, t in tokens.items()} == {
+            'fcm.example.com': 1, 'moz.example.com': 1,
+        }
+
+        # The receiving browser can decrypt what was sent
+        request = seen[0]
+        _, _, private, auth = devices[str(request.url)]
+        decrypted = http_ece.decrypt(
+            request.content, private_key=private, auth_secret=auth, version='aes128gcm',
+        )
+        assert json.loads(decrypted) == payload
+
+        remaining = {sub.endpoint: sub for sub in PushSubscription.objects.all()}
+        sent = remaining['https://fcm.example.com/send/0']
+        assert sent.failure_count == 0 and sent.last_used_at is not None
+        assert 'https://fcm.example.com/send/2' not in remaining  # 410 Gone
+        assert remaining['https://moz.example.com/send/3'].failure_count == 2
+        assert 'https://moz.example.com/send/4' not in remaining  # 5th strike
+
+    def test_unusable_keys_count_as_failures(self, real_vapid, push_subscription):
+        from crush_lu.push_notifications import (
+            PUSH_FAILED, build_push_payload, send_push_batch,
+        )
+
+        outcomes = send_push_batch([(push_subscription, build_push_payload('T', 'B'))])
+
+        assert outcomes == {push_subscription.pk: PUSH_FAILED}
+        push_subscription.refresh_from_db()
+        assert push_subscription.failure_count == 1
+
+    def test_network_errors_leave_device_health_alone(self, real_vapid, devices):
+        import httpx
+        from crush_lu import push_notifications
+        from crush_lu.push_notifications import PUSH_ERROR, build_push_payload, send_push_batch
+
+        def refuse(request):
+            raise httpx.ConnectError('connection refused', request=request)
+
+        sub = next(iter(devices.values()))[0]
+        client = lambda concurrency, timeout: httpx.Client(transport=httpx.MockTransport(refuse))
+        with patch.object(push_notifications, '_push_client', client):
+            outcomes = send_push_batch([(sub, build_push_payload('T', 'B'))])
+
+        assert outcomes == {sub.pk: PUSH_ERROR}
+        sub.refresh_from_db()
+        assert sub.failure_count == 1
+
+    def test_returns_nothing_without_vapid(self, settings, push_subscription):
+        from crush_lu.push_notifications import build_push_payload, send_push_batch
+
+        settings.VAPID_PRIVATE_KEY = ''
+        assert send_push_batch([(push_subscription, build_push_payload('T', 'B'))]) == {}
+
+
 # =============================================================================
 # TESTS FOR thread-safety in concurrent scenarios
 # =============================================================================
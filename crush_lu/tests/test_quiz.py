@@ -4640,3 +4640,195 @@ class TestSeatChangeReauthorization:
         sent = consumer.send_json.await_args.args[0]
         assert sent == {"type": "quiz.table_update", "data": {"table_number": 1}}
         assert "affected_user_id" not in sent["data"]
+
+
+# ============================================================================
+# LEADERBOARD PROJECTION
+# ============================================================================
+
+
+@pytest.mark.django_db
+class TestLeaderboardProjection:
+    """The cached leaderboard is folded forward by the scorers and must always
+    equal a rebuild from the score tables."""
+
+    @pytest.fixture(autouse=True)
+    def _keep_test_connection_open(self, monkeypatch):
+        """Same pytest-django atomic-wrapper guard as TestScoringSeatRace."""
+        monkeypatch.setattr("channels.db.close_old_connections", lambda *a, **kw: None)
+
+    def _setup(self, quiz):
+        from unittest.mock import AsyncMock
+        from crush_lu.consumers import QuizConsumer
+
+        round1 = QuizRound.objects.create(
+            quiz=quiz, title="R1", sort_order=0, time_per_question=30
+        )
+        bonus = QuizRound.objects.create(
+            quiz=quiz, title="Bonus", sort_order=1, time_per_question=30, is_bonus=True
+        )
+        q1 = QuizQuestion.objects.create(
+            round=round1, text="Q1?", question_type="open_ended", points=10, sort_order=0
+        )
+        q2 = QuizQuestion.objects.create(
+            round=bonus, text="Q2?", question_type="open_ended", points=5, sort_order=0
+        )
+        quiz.num_tables = 3
+        quiz.save(update_fields=["num_tables"])
+        tables = [t for _, t in sorted(quiz.ensure_tables().items())]
+        quiz.current_round = round1
+        quiz.save(update_fields=["current_round"])
+        for index, table in enumerate(tables):
+            for seat in range(2):
+                user = User.objects.create_user(
+                    username=f"lb{index}{seat}@test.com",
+                    first_name=f"Player{index}{seat}",
+                    password="x",
+                )
+                _create_profile(user, "M")
+                QuizTableMembership.objects.create(table=table, user=user)
+        consumer = QuizConsumer()
+        consumer.quiz_id = quiz.id
+        consumer.channel_layer = AsyncMock()
+        return consumer, tables, q1, q2
+
+    def _rebuilt(self, quiz):
+        from crush_lu.services.quiz_leaderboard import (
+            get_leaderboard,
+            invalidate_leaderboard,
+        )
+
+        invalidate_leaderboard(quiz.pk)
+        return get_leaderboard(quiz.pk)
+
+    def test_incremental_updates_match_a_rebuild(
+        self, quiz_event, django_capture_on_commit_callbacks
+    ):
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+
+        consumer, tables, q1, q2 = self._setup(quiz_event)
+        build_leaderboard(quiz_event.pk)  # warm the projection
+
+        score = async_to_sync(consumer.score_table_for_question)
+        with django_capture_on_commit_callbacks(execute=True):
+            score(tables[0].id, q1.id, True)
+            score(tables[1].id, q1.id, False)
+            score(tables[1].id, q1.id, True)  # re-score before reveal
+            score(tables[0].id, q1.id, False)  # and back down
+            score(tables[2].id, q2.id, True)  # bonus counts double
+
+        incremental = build_leaderboard(quiz_event.pk)
+        assert incremental == self._rebuilt(quiz_event)
+        totals = {t["table_number"]: t["total_score"] for t in incremental["tables"]}
+        assert totals == {
+            t.table_number: t.get_total_score() for t in tables
+        } == {tables[0].table_number: 0, tables[1].table_number: 10, tables[2].table_number: 10}
+        assert [t["table_number"] for t in incremental["tables"]][:2] == [
+            tables[1].table_number,
+            tables[2].table_number,
+        ]
+        assert len(incremental["individuals"]) == 6
+
+    def test_cached_leaderboard_reads_no_rows(
+        self, quiz_event, django_assert_num_queries
+    ):
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+
+        consumer, tables, q1, _q2 = self._setup(quiz_event)
+        async_to_sync(consumer.score_table_for_question)(tables[0].id, q1.id, True)
+        build_leaderboard(quiz_event.pk)
+
+        with django_assert_num_queries(0):
+            board = build_leaderboard(quiz_event.pk)
+        assert board["tables"][0]["total_score"] == 10
+
+    def test_deleted_scores_invalidate_the_projection(self, quiz_event):
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+
+        consumer, tables, q1, _q2 = self._setup(quiz_event)
+        async_to_sync(consumer.score_table_for_question)(tables[0].id, q1.id, True)
+        build_leaderboard(quiz_event.pk)
+
+        # An undone check-in removes the member's rows outside the scorers.
+        victim = tables[0].memberships.first().user
+        IndividualScore.objects.filter(quiz=quiz_event, user=victim).delete()
+
+        board = build_leaderboard(quiz_event.pk)
+        assert len(board["individuals"]) == 1
+        assert board == self._rebuilt(quiz_event)
+
+    def test_legacy_answer_scoring_updates_the_projection(
+        self, quiz_event, django_capture_on_commit_callbacks
+    ):
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+
+        consumer, tables, q1, _q2 = self._setup(quiz_event)
+        q1.choices = [{"text": "Yes", "is_correct": True}]
+        q1.save(update_fields=["choices"])
+        player = tables[0].memberships.first().user
+        build_leaderboard(quiz_event.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            async_to_sync(consumer.score_answer)(player.id, q1.id, "Yes")
+
+        board = build_leaderboard(quiz_event.pk)
+        assert board["individuals"][0]["total_score"] == 10
+        assert board == self._rebuilt(quiz_event)
+
+    def test_a_rebuild_racing_an_uncommitted_score_is_not_cached(
+        self, quiz_event, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """A reader that summed the totals before a score landed must not
+        cache them over it, even with no projection for the score to fold into."""
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+        from crush_lu.services import quiz_leaderboard
+
+        consumer, tables, q1, _q2 = self._setup(quiz_event)
+        score = async_to_sync(consumer.score_table_for_question)
+        people = quiz_leaderboard._people
+        scored = []
+
+        def score_mid_rebuild(user_ids):
+            # The totals are read; the scorer gets in before they are cached.
+            if not scored:
+                scored.append(score(tables[0].id, q1.id, True))
+            return people(user_ids)
+
+        monkeypatch.setattr(quiz_leaderboard, "_people", score_mid_rebuild)
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            stale = build_leaderboard(quiz_event.pk)
+        assert scored and stale["tables"][0]["total_score"] == 0
+        for callback in callbacks:
+            callback()  # the scoring transaction commits
+
+        board = build_leaderboard(quiz_event.pk)
+        assert board["tables"][0] == {
+            "table_number": tables[0].table_number,
+            "total_score": 10,
+        }
+        assert board == self._rebuilt(quiz_event)
+
+    def test_a_rebuild_between_commit_and_fold_counts_the_score_once(
+        self, quiz_event, django_capture_on_commit_callbacks
+    ):
+        from asgiref.sync import async_to_sync
+        from crush_lu.consumers import build_leaderboard
+
+        consumer, tables, q1, _q2 = self._setup(quiz_event)
+        build_leaderboard(quiz_event.pk)
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            async_to_sync(consumer.score_table_for_question)(tables[0].id, q1.id, True)
+        # Committed, not folded yet: a reader drops and rebuilds meanwhile
+        assert self._rebuilt(quiz_event)["tables"][0]["total_score"] == 10
+        for callback in callbacks:
+            callback()
+
+        board = build_leaderboard(quiz_event.pk)
+        assert board["tables"][0]["total_score"] == 10
+        assert board == self._rebuilt(quiz_event)
@@ -0,0 +1,234 @@
+"""
+Tests for the seat inventory behind event_register.
+
+Run with: pytest crush_lu/tests/test_seat_inventory.py -v
+"""
+
+import io
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from crush_lu.models import (
+    CrushProfile,
+    EventRegistration,
+    MeetupEvent,
+    UserDataConsent,
+)
+from crush_lu.services import seat_inventory
+
+User = get_user_model()
+
+
+def _member(name, gender="F"):
+    user = User.objects.create_user(
+        username=f"{name}@example.com", email=f"{name}@example.com", password="x"
+    )
+    CrushProfile.objects.create(
+        user=user,
+        date_of_birth=date(1993, 3, 15),
+        gender=gender,
+        location="Luxembourg City",
+        verification_status="verified",
+        is_approved=True,
+    )
+    UserDataConsent.objects.update_or_create(
+        user=user, defaults={"crushlu_consent_given": True}
+    )
+    return user
+
+
+@override_settings(EVENT_SEAT_INVENTORY=True)
+class SeatInventoryTestCase(TestCase):
+    def setUp(self):
+        seat_inventory._local_inventory.clear()
+        self.event = MeetupEvent.objects.create(
+            title="Launch Night",
+            description="x",
+            event_type="speed_dating",
+            date_time=timezone.now() + timedelta(days=10),
+            location="Luxembourg",
+            address="1 Rue",
+            max_participants=10,
+            registration_deadline=timezone.now() + timedelta(days=9),
+            profile_requirement="profile_exists",
+            is_published=True,
+        )
+
+    def tearDown(self):
+        seat_inventory._local_inventory.clear()
+
+    def _claim_concurrently(self, requests):
+        """Fire ``claim_seat`` for each (gender, is_premium) at once."""
+        barrier = threading.Barrier(len(requests))
+        outcomes = Counter()
+        lock = threading.Lock()
+
+        def claim(gender, is_premium):
+            barrier.wait(timeout=10)
+            result = seat_inventory.claim_seat(
+                self.event, gender=gender, is_premium=is_premium
+            )
+            with lock:
+                outcomes[(gender, result.outcome)] += 1
+
+        threads = [threading.Thread(target=claim, args=args) for args in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        return outcomes
+
+
+class ClaimTests(SeatInventoryTestCase):
+    def test_hundreds_of_concurrent_claims_never_oversell(self):
+        # Seeded from the database by the first claim, before the rush
+        seat_inventory.release_seat(seat_inventory.claim_seat(self.event))
+
+        outcomes = self._claim_concurrently([("F", False)] * 300)
+
+        self.assertEqual(outcomes[("F", seat_inventory.ADMITTED)], 10)
+        self.assertEqual(outcomes[("F", seat_inventory.FULL)], 290)
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk)["total"], 10
+        )
+
+    def test_gender_pools_fill_independently(self):
+        self.event.max_participants_m = 4
+        self.event.max_participants_f = 4
+        self.event.max_participants_nb = 2
+        self.event.save()
+        seat_inventory.release_seat(seat_inventory.claim_seat(self.event))
+
+        outcomes = self._claim_concurrently(
+            [("M", False)] * 50 + [("F", False)] * 50 + [("NB", False)] * 50
+        )
+
+        self.assertEqual(outcomes[("M", seat_inventory.ADMITTED)], 4)
+        self.assertEqual(outcomes[("F", seat_inventory.ADMITTED)], 4)
+        self.assertEqual(outcomes[("NB", seat_inventory.ADMITTED)], 2)
+
+    def test_reserved_seats_stay_with_premium_members(self):
+        self.event.reserved_premium_seats = 3
+        self.event.save()
+        seat_inventory.release_seat(seat_inventory.claim_seat(self.event))
+
+        outcomes = self._claim_concurrently(
+            [("F", False)] * 40 + [("M", True)] * 40
+        )
+
+        self.assertLessEqual(outcomes[("F", seat_inventory.ADMITTED)], 7)
+        self.assertGreaterEqual(outcomes[("M", seat_inventory.ADMITTED)], 3)
+        self.assertEqual(
+            outcomes[("F", seat_inventory.ADMITTED)]
+            + outcomes[("M", seat_inventory.ADMITTED)],
+            10,
+        )
+
+    def test_first_claim_seeds_from_seat_holding_registrations(self):
+        for i, status in enumerate(["confirmed", "pending", "waitlist", "cancelled"]):
+            EventRegistration.objects.create(
+                event=self.event, user=_member(f"seed{i}", gender="M"), status=status
+            )
+
+        seat_inventory.claim_seat(self.event, gender="F")
+
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk),
+            {"total": 3, "m": 2, "f": 1, "nb": 0},
+        )
+
+    def test_released_and_expired_holds_hand_the_seat_back(self):
+        self.event.max_participants = 1
+        self.event.save()
+
+        claim = seat_inventory.claim_seat(self.event)
+        self.assertTrue(claim.admitted)
+        self.assertFalse(seat_inventory.claim_seat(self.event).admitted)
+
+        seat_inventory.release_seat(claim)
+        abandoned = seat_inventory.claim_seat(self.event)
+        self.assertTrue(abandoned.admitted)
+
+        # Never settled: reclaimed once the hold has expired
+        later = seat_inventory._now_ms() + seat_inventory.SEAT_HOLD_SECONDS * 1000
+        with mock.patch.object(seat_inventory, "_now_ms", return_value=later):
+            self.assertTrue(seat_inventory.claim_seat(self.event).admitted)
+
+    def test_disabled_inventory_leaves_the_decision_to_the_row_lock(self):
+        with override_settings(EVENT_SEAT_INVENTORY=False):
+            self.assertIsNone(seat_inventory.claim_seat(self.event))
+
+
+@override_settings(ROOT_URLCONF="azureproject.urls_crush")
+class RegisterViewTests(SeatInventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()  # event_register's per-user rate limit
+
+    def _register(self, user):
+        client = Client()
+        client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(
+                reverse("crush_lu:event_register", args=[self.event.pk]),
+                {"age_confirmation": "on"},
+            )
+        return EventRegistration.objects.get(event=self.event, user=user)
+
+    def test_admitted_then_waitlisted_once_the_counters_are_full(self):
+        self.event.max_participants = 1
+        self.event.save()
+
+        self.assertEqual(self._register(_member("first")).status, "confirmed")
+        self.assertEqual(self._register(_member("second")).status, "waitlist")
+        # Confirmed holds are dropped; only the seat itself is counted
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk)["total"], 1
+        )
+        self.assertFalse(seat_inventory._local_inventory._holds[self.event.pk])
+
+    def test_a_failed_write_hands_the_seat_back(self):
+        with mock.patch(
+            "crush_lu.views_events._write_event_registration",
+            side_effect=RuntimeError("database went away"),
+        ):
+            client = Client(raise_request_exception=False)
+            client.force_login(_member("unlucky"))
+            client.post(
+                reverse("crush_lu:event_register", args=[self.event.pk]),
+                {"age_confirmation": "on"},
+            )
+
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk)["total"], 0
+        )
+
+    def test_seats_freed_elsewhere_reach_the_counters(self):
+        registration = self._register(_member("leaver"))
+        registration.status = "cancelled"
+        with self.captureOnCommitCallbacks(execute=True):
+            registration.save()
+
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk)["total"], 0
+        )
+
+    def test_reconcile_command_reseeds_from_the_database(self):
+        self._register(_member("counted"))
+        EventRegistration.objects.filter(event=self.event).update(status="cancelled")
+
+        call_command("reconcile_seat_inventory", stdout=io.StringIO())
+        seat_inventory.release_seat(seat_inventory.claim_seat(self.event))
+
+        self.assertEqual(
+            seat_inventory.inventory_seat_counts(self.event.pk)["total"], 0
+        )
@@ -4,14 +4,20 @@ from unittest.mock import patch
 import pytest
 from django.core.cache import cache
 
-from crush_lu.storage import PrivateAzureStorage
+from crush_lu.storage import (
+    PrivateAzureStorage,
+    clear_sas_url_memo,
+    sas_url_cache_stats,
+)
 
 
 @pytest.fixture(autouse=True)
 def _clear_cache():
     cache.clear()
+    clear_sas_url_memo()
     yield
     cache.clear()
+    clear_sas_url_memo()
 
 
 def _make_storage():
@@ -96,3 +102,58 @@ def test_cache_invalidates_on_signing_key_rotation(mock_gen):
     storage.url("users/1/photos/a.jpg")
 
     assert mock_gen.call_count == 2
+
+
+@patch("crush_lu.storage.time.time", return_value=1_000_123)
+@patch("crush_lu.storage.generate_blob_sas", return_value="sv=fake&sig=abc")
+def test_expiry_is_aligned_to_window(mock_gen, _mock_time):
+    """Workers signing the same blob within one window must produce the
+    same token, so the expiry is the window start plus the lifetime."""
+    storage = _make_storage()
+
+    storage.url("users/1/photos/a.jpg", expire=1800)
+
+    window_start = 1_000_123 - 1_000_123 % storage._expiry_window(1800)
+    expiry = mock_gen.call_args.kwargs["expiry"]
+    assert expiry.timestamp() == window_start + 1800
+
+
+@patch("crush_lu.storage.generate_blob_sas", return_value="sv=fake&sig=abc")
+def test_new_window_signs_a_new_url(mock_gen):
+    storage = _make_storage()
+    window = storage._expiry_window(storage.expiration_secs)
+
+    with patch("crush_lu.storage.time.time", return_value=10 * window):
+        storage.url("users/1/photos/a.jpg")
+    with patch("crush_lu.storage.time.time", return_value=11 * window - 1):
+        storage.url("users/1/photos/a.jpg")
+    assert mock_gen.call_count == 1
+
+    with patch("crush_lu.storage.time.time", return_value=11 * window):
+        storage.url("users/1/photos/a.jpg")
+    assert mock_gen.call_count == 2
+
+
+def test_window_scales_with_the_lifetime():
+    storage = _make_storage()
+
+    assert storage._expiry_window(3600) == 900
+    assert storage._expiry_window(24 * 3600) == 6 * 3600
+    # Short lifetimes keep the floor
+    assert storage._expiry_window(600) == storage.SAS_EXPIRY_WINDOW_MIN_SECS
+
+
+@patch("crush_lu.storage.generate_blob_sas", return_value="sv=fake&sig=abc")
+def test_hit_and_miss_counters(mock_gen):
+    storage = _make_storage()
+
+    storage.url("users/1/photos/a.jpg")
+    storage.url("users/1/photos/a.jpg")
+    assert sas_url_cache_stats() == {"local_hits": 1, "shared_hits": 0, "misses": 1}
+
+    # A fresh worker: nothing memoized locally, the shared cache answers
+    clear_sas_url_memo()
+    storage.url("users/1/photos/a.jpg")
+    storage.url("users/1/photos/a.jpg")
+    assert sas_url_cache_stats() == {"local_hits": 1, "shared_hits": 1, "misses": 0}
+    assert mock_gen.call_count == 1
@@ -0,0 +1,103 @@
+"""
+Tests for the user segments dashboard: the cached segment count table and the
+streamed CSV export.
+
+Run with: pytest crush_lu/tests/test_user_segments.py -v
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from crush_lu.admin.user_segments import (
+    compute_segment_counts,
+    find_segment,
+    get_segment_definitions,
+)
+from crush_lu.models import CrushProfile
+
+User = get_user_model()
+
+
+@override_settings(ROOT_URLCONF="azureproject.urls_crush")
+class UserSegmentsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.get_or_create(
+            id=1, defaults={"domain": "testserver", "name": "Test Server"}
+        )
+        cls.superuser = User.objects.create_superuser(
+            username="segments_admin", email="segments@test.lu", password="x"
+        )
+        for index, gender in enumerate(["F", "F", "M"]):
+            user = User.objects.create_user(
+                username=f"member{index}@example.com",
+                email=f"member{index}@example.com",
+                password="x",
+            )
+            CrushProfile.objects.create(
+                user=user, gender=gender, verification_status="verified"
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_counts_match_querysets(self):
+        definitions = get_segment_definitions(with_counts=False)
+        counts = compute_segment_counts(definitions)
+        for category in definitions.values():
+            for segment in category["segments"]:
+                self.assertEqual(
+                    counts[segment["key"]],
+                    segment["queryset"].count(),
+                    segment["key"],
+                )
+        self.assertEqual(counts["gender_female"], 2)
+        self.assertEqual(counts["gender_male"], 1)
+
+    def test_counts_are_served_from_cache(self):
+        get_segment_definitions()
+        with CaptureQueriesContext(connection) as ctx:
+            definitions = get_segment_definitions()
+        # Only the live-event lookup that builds a segment queryset
+        self.assertLessEqual(len(ctx.captured_queries), 1)
+        _title, segment = find_segment("gender_female")
+        self.assertNotIn("count", segment)
+        female = next(
+            segment
+            for segment in definitions["demographics_gender"]["segments"]
+            if segment["key"] == "gender_female"
+        )
+        self.assertEqual(female["count"], 2)
+
+    def test_dashboard_shows_count_age_and_refreshes(self):
+        self.client.force_login(self.superuser)
+        response = self.client.get("/crush-admin/user-segments/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Refresh counts")
+        first = response.context["counts_computed_at"]
+
+        response = self.client.get("/crush-admin/user-segments/")
+        self.assertEqual(response.context["counts_computed_at"], first)
+
+        response = self.client.get("/crush-admin/user-segments/?refresh=1")
+        self.assertGreater(response.context["counts_computed_at"], first)
+
+    async def test_csv_export_streams_rows(self):
+        # Served over ASGI in production: the export is an async stream
+        await self.async_client.aforce_login(self.superuser)
+        response = await self.async_client.get(
+            "/crush-admin/user-segments/gender_female/?export=csv"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "Email")
+        self.assertEqual(len(lines), 3)
@@ -4,7 +4,7 @@ Tests for the weekly KPI snapshot service, command, and email.
 Run with: pytest crush_lu/tests/test_weekly_kpis.py -v
 """
 
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
 
 from django.contrib.auth import get_user_model
 from django.core import mail
@@ -357,6 +357,224 @@ class LastCompletedWeekTests(TestCase):
         self.assertEqual(last_completed_week_start(date(2026, 6, 17)), WEEK_START)
 
 
+class DailyMetricsRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="rollup@example.com",
+            email="rollup@example.com",
+            password="x",
+            date_joined=_aware(date(2026, 6, 10)),
+        )
+        self.profile = CrushProfile.objects.create(
+            user=self.user, gender="F", location="Luxembourg"
+        )
+        CrushProfile.objects.filter(pk=self.profile.pk).update(
+            created_at=_aware(date(2026, 6, 10))
+        )
+
+    def test_rollup_processes_new_days_and_the_trailing_window(self):
+        from crush_lu.models import DailyMetric
+        from crush_lu.services.daily_metrics import (
+            RESTATE_DAYS,
+            metric_names,
+            rollup_daily_metrics,
+        )
+
+        self.assertEqual(rollup_daily_metrics(through=date(2026, 6, 14)), 5)
+        # A re-run only rewrites the window, which starts at the first data day
+        self.assertEqual(rollup_daily_metrics(through=date(2026, 6, 14)), RESTATE_DAYS)
+        self.assertEqual(
+            rollup_daily_metrics(through=date(2026, 6, 14) + timedelta(days=50)),
+            50,
+        )
+        self.assertEqual(
+            DailyMetric.objects.get(day=date(2026, 6, 10), metric="new_profiles").value,
+            1,
+        )
+        # Every metric, status-dependent ones included, has a row for each day
+        self.assertEqual(
+            DailyMetric.objects.filter(day=date(2026, 6, 10)).count(),
+            len(metric_names()),
+        )
+        self.assertEqual(
+            DailyMetric.objects.get(day=date(2026, 6, 10), metric="new_signups").value,
+            1,
+        )
+
+    def test_snapshot_reads_rolled_up_days(self):
+        from crush_lu.services.daily_metrics import rollup_daily_metrics
+
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        # Written after the day was rolled up: the next run picks it up.
+        late = User.objects.create_user(
+            username="late-row@example.com",
+            email="late-row@example.com",
+            password="x",
+            date_joined=_aware(date(2026, 6, 11)),
+        )
+        late_profile = CrushProfile.objects.create(
+            user=late, gender="M", location="Luxembourg"
+        )
+        CrushProfile.objects.filter(pk=late_profile.pk).update(
+            created_at=_aware(date(2026, 6, 11))
+        )
+
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual((m["new_profiles"], m["new_signups"]), (1, 1))
+        self.assertEqual(m["cumulative_total_users"], 1)
+
+        rollup_daily_metrics(through=date(2026, 6, 21))
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual((m["new_profiles"], m["new_signups"]), (2, 2))
+        self.assertEqual(m["cumulative_total_users"], 2)
+
+    def test_metric_totals_does_not_write(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from crush_lu.models import DailyMetric
+        from crush_lu.services.daily_metrics import metric_totals
+
+        with CaptureQueriesContext(connection) as queries:
+            totals = metric_totals(WEEK_START, date(2026, 6, 14))
+            cumulative = metric_totals(None, date(2026, 6, 14), metrics=["new_signups"])
+
+        # Nothing rolled up yet: computed from source, and nothing written
+        self.assertEqual(totals["new_profiles"], 1)
+        self.assertEqual(cumulative["new_signups"], 1)
+        self.assertFalse(DailyMetric.objects.exists())
+        self.assertFalse(
+            any(
+                query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_deleted_profile_is_restated_within_the_window(self):
+        from crush_lu.services.daily_metrics import rollup_daily_metrics
+
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        self.profile.delete()
+
+        # Rows are only read: the deletion shows once the rollup runs again
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(m["new_signups"], 1)
+
+        rollup_daily_metrics(through=date(2026, 6, 21))
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(m["new_signups"], 0)
+        self.assertEqual(m["cumulative_total_users"], 0)
+
+    def test_revoked_verification_is_restated_within_the_window(self):
+        from crush_lu.services.daily_metrics import rollup_daily_metrics
+
+        CrushProfile.objects.filter(pk=self.profile.pk).update(
+            verification_status="verified", approved_at=_aware(date(2026, 6, 12))
+        )
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(
+            (m["profiles_verified"], m["cumulative_verified_members"]), (1, 1)
+        )
+
+        CrushProfile.objects.filter(pk=self.profile.pk).update(
+            verification_status="rejected"
+        )
+        rollup_daily_metrics(through=date(2026, 6, 21))
+
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(
+            (m["profiles_verified"], m["cumulative_verified_members"]), (0, 0)
+        )
+
+    def test_days_past_the_window_need_since_to_restate(self):
+        from crush_lu.services.daily_metrics import RESTATE_DAYS, rollup_daily_metrics
+
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        self.profile.delete()
+
+        rollup_daily_metrics(
+            through=date(2026, 6, 14) + timedelta(days=RESTATE_DAYS + 7)
+        )
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(m["new_signups"], 1)
+
+        rollup_daily_metrics(since=WEEK_START)
+        m = compute_weekly_snapshot(WEEK_START)["acquisition"]
+        self.assertEqual(m["new_signups"], 0)
+
+    def test_attendance_and_cancellation_after_the_rollup(self):
+        from crush_lu.models import EventRegistration, MeetupEvent
+        from crush_lu.services.daily_metrics import metric_totals, rollup_daily_metrics
+
+        event = MeetupEvent.objects.create(
+            title="June Mixer",
+            description="event",
+            date_time=_aware(date(2026, 6, 11), hour=19),
+            registration_deadline=_aware(date(2026, 6, 10)),
+            location="Luxembourg",
+            address="1 Test St",
+            max_participants=20,
+            is_published=True,
+        )
+        registration = EventRegistration.objects.create(
+            user=self.user, event=event, status="confirmed"
+        )
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        week_end = date(2026, 6, 14)
+        totals = metric_totals(WEEK_START, week_end)
+        self.assertEqual((totals["events_held"], totals["no_show"]), (1, 0))
+        self.assertEqual(totals["fill_pct_sum"], 5.0)
+
+        # Marked a no-show once the day was rolled up, then the event is
+        # cancelled after the fact; the next run restates both
+        registration.status = "no_show"
+        registration.save(update_fields=["status"])
+        rollup_daily_metrics(through=date(2026, 6, 21))
+        self.assertEqual(metric_totals(WEEK_START, week_end)["no_show"], 1)
+
+        MeetupEvent.objects.filter(pk=event.pk).update(is_cancelled=True)
+        rollup_daily_metrics(through=date(2026, 6, 21))
+        totals = metric_totals(WEEK_START, week_end)
+        self.assertEqual((totals["events_held"], totals["fill_events"]), (0, 0))
+
+    def test_backfill_sums_rollup_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from crush_lu.services.daily_metrics import rollup_daily_metrics
+        from crush_lu.services.weekly_kpis import backfill_snapshots
+
+        rollup_daily_metrics(through=date(2026, 6, 14))
+        with CaptureQueriesContext(connection) as queries:
+            backfill_snapshots(date(2026, 5, 18), date(2026, 6, 8))
+
+        # Already rolled up: counts and cumulative totals come from
+        # DailyMetric, not the source tables.
+        for table in ('"crush_lu_profilesubmission"', '"crush_lu_meetupevent"'):
+            self.assertFalse(
+                any(table in query["sql"] for query in queries.captured_queries)
+            )
+        weeks = dict(
+            WeeklyMetricsSnapshot.objects.values_list("week_start", "metrics")
+        )
+        self.assertEqual(weeks[date(2026, 6, 1)]["acquisition"]["new_signups"], 0)
+        self.assertEqual(weeks[WEEK_START]["acquisition"]["new_signups"], 1)
+        self.assertEqual(
+            weeks[date(2026, 6, 1)]["acquisition"]["cumulative_total_users"], 0
+        )
+
+    def test_command_rolls_up_before_the_snapshot(self):
+        from crush_lu.services.daily_metrics import last_rolled_up_day
+
+        call_command(
+            "send_weekly_kpis", "--week-start", WEEK_START.isoformat(), "--no-email"
+        )
+        self.assertEqual(last_rolled_up_day(), date(2026, 6, 14))
+        snapshot = WeeklyMetricsSnapshot.objects.get(week_start=WEEK_START)
+        self.assertEqual(snapshot.metrics["acquisition"]["new_profiles"], 1)
+
+
 class EventRegistrationAdminPaymentDateTests(TestCase):
     """Guard the admin path that feeds the 'paid event registrations' KPI.
 
@@ -1282,9 +1282,11 @@ def _edit_section_event_identity(request, profile):
         )
         if form.is_valid():
             updated_profile = form.save()
-            from .matching import update_match_scores_for_user
+            from .matching import drain_match_score_queue
 
-            transaction.on_commit(lambda: update_match_scores_for_user(request.user))
+            transaction.on_commit(
+                lambda: drain_match_score_queue(user_ids=[request.user.pk])
+            )
             if request.htmx:
                 context = _render_event_identity_section(request, updated_profile)
                 return render(
@@ -1328,9 +1330,11 @@ def _edit_section_contact(request, profile):
         form = CrushProfileContactForm(request.POST, instance=profile)
         if form.is_valid():
             updated_profile = form.save()
-            from .matching import update_match_scores_for_user
+            from .matching import drain_match_score_queue
 
-            transaction.on_commit(lambda: update_match_scores_for_user(request.user))
+            transaction.on_commit(
+                lambda: drain_match_score_queue(user_ids=[request.user.pk])
+            )
             if request.htmx:
                 context = _render_contact_section(request, updated_profile)
                 return render(request, "crush_lu/partials/edit_contact.html", context)
@@ -1730,9 +1734,11 @@ def api_profile_settings_autosave(request):
             form.require_event_languages = True
         if form.is_valid():
             updated_profile = form.save()
-            from .matching import update_match_scores_for_user
+            from .matching import drain_match_score_queue
 
-            transaction.on_commit(lambda: update_match_scores_for_user(request.user))
+            transaction.on_commit(
+                lambda: drain_match_score_queue(user_ids=[request.user.pk])
+            )
             return JsonResponse(
                 {
                     "success": True,
@@ -1120,9 +1120,12 @@ def _get_profile_data(registration):
         "interests": ", ".join(profile.checkin_interest_labels()),
     }
     if profile.photo_1:
-        data["photo_url"] = reverse(
-            "crush_lu:serve_profile_photo",
-            kwargs={"user_id": registration.user_id, "photo_field": "photo_1"},
+        data["photo_url"] = (
+            reverse(
+                "crush_lu:serve_profile_photo",
+                kwargs={"user_id": registration.user_id, "photo_field": "photo_1"},
+            )
+            + "?w=320"
         )
 
     # Include coach info for unverified profiles
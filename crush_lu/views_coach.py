@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import timedelta
 
 from django.shortcuts import render, redirect, get_object_or_404
@@ -63,6 +64,7 @@ from .notification_service import (
     notify_profile_rejected,
 )
 from .referrals import check_and_apply_profile_approved_reward
+from .services.demographics import AGE_BANDS, profile_demographics
 from .services.profile_verification import (
     claim_profile_verification,
     transition_unverified_profile,
@@ -73,8 +75,6 @@ from .services.profile_verification import (
 @coach_required
 def coach_dashboard(request):
     """Coach dashboard - analytics and statistics hub"""
-    from datetime import date
-
     coach = request.coach
     now = timezone.now()
 
@@ -104,16 +104,16 @@ def coach_dashboard(request):
     ).count()
 
     # --- Row 2: Demographics ---
+    # Cached grouped aggregates (services.demographics), so this section costs
+    # one cache read rather than a pass over every verified profile.
+    demographics = profile_demographics(verified=True)
+    gender_totals = demographics["gender"]
+
     # Gender breakdown
-    gender_data = approved_profiles.values("gender").annotate(count=Count("id"))
-    gender_counts = {"F": 0, "M": 0, "other": 0}
-    for item in gender_data:
-        if item["gender"] == "F":
-            gender_counts["F"] = item["count"]
-        elif item["gender"] == "M":
-            gender_counts["M"] = item["count"]
-        else:
-            gender_counts["other"] += item["count"]
+    gender_counts = {"F": gender_totals["F"], "M": gender_totals["M"]}
+    gender_counts["other"] = (
+        demographics["total"] - gender_counts["F"] - gender_counts["M"]
+    )
     gender_total = sum(gender_counts.values()) or 1
 
     gender_bars = []
@@ -127,47 +127,19 @@ def coach_dashboard(request):
         gender_bars.append({"label": label, "count": count, "pct": pct, "color": color})
 
     # Age distribution (with gender breakdown)
-    today = date.today()
-    dob_gender_list = list(
-        approved_profiles.exclude(date_of_birth__isnull=True).values_list(
-            "date_of_birth", "gender"
+    age_buckets = []
+    for label, _min_age, _max_age in AGE_BANDS:
+        band_genders = demographics["age_gender"][label]
+        count = sum(band_genders.values())
+        age_buckets.append(
+            {
+                "label": label,
+                "count": count,
+                "count_f": band_genders["F"],
+                "count_m": band_genders["M"],
+                "count_other": count - band_genders["F"] - band_genders["M"],
+            }
         )
-    )
-    # 5-year age bands with only 60+ grouped together (see issue #190).
-    age_buckets = [
-        {
-            "label": label,
-            "min": lo,
-            "max": hi,
-            "count": 0,
-            "count_f": 0,
-            "count_m": 0,
-            "count_other": 0,
-        }
-        for label, lo, hi in [
-            ("18-24", 18, 24),
-            ("25-29", 25, 29),
-            ("30-34", 30, 34),
-            ("35-39", 35, 39),
-            ("40-44", 40, 44),
-            ("45-49", 45, 49),
-            ("50-54", 50, 54),
-            ("55-59", 55, 59),
-            ("60+", 60, 999),
-        ]
-    ]
-    for dob, gender in dob_gender_list:
-        age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-        for bucket in age_buckets:
-            if bucket["min"] <= age <= bucket["max"]:
-                bucket["count"] += 1
-                if gender == "F":
-                    bucket["count_f"] += 1
-                elif gender == "M":
-                    bucket["count_m"] += 1
-                else:
-                    bucket["count_other"] += 1
-                break
     max_age_count = max((b["count"] for b in age_buckets), default=1) or 1
     for bucket in age_buckets:
         bucket["pct"] = round(bucket["count"] * 100 / max_age_count)
@@ -181,13 +153,7 @@ def coach_dashboard(request):
     # Event language distribution (approved profiles)
     lang_label_map = dict(CrushProfile.EVENT_LANGUAGE_CHOICES)
     lang_flags = {"en": "🇬🇧", "de": "🇩🇪", "fr": "🇫🇷", "lu": "🇱🇺"}
-    lang_counts = {}
-    for langs in approved_profiles.exclude(event_languages=[]).values_list(
-        "event_languages", flat=True
-    ):
-        if isinstance(langs, list):
-            for code in langs:
-                lang_counts[code] = lang_counts.get(code, 0) + 1
+    lang_counts = demographics["event_languages"]
     lang_total = sum(lang_counts.values()) or 1
     language_stats = sorted(
         [
@@ -209,55 +175,37 @@ def coach_dashboard(request):
         f"{lang_flags.get(code, '')} {label}"
         for code, label in CrushProfile.EVENT_LANGUAGE_CHOICES
     ]
+    other_gender_langs = sum(
+        (
+            langs
+            for gender, langs in demographics["gender_languages"].items()
+            if gender not in ("F", "M")
+        ),
+        Counter(),
+    )
     gender_lang_matrix = []
-    for gender_code, gender_label, _color in [
-        ("F", _("Women"), "bg-pink-500"),
-        ("M", _("Men"), "bg-blue-500"),
-        ("other", _("Other"), "bg-purple-500"),
+    for gender_label, gender_lang_counts in [
+        (_("Women"), demographics["gender_languages"]["F"]),
+        (_("Men"), demographics["gender_languages"]["M"]),
+        (_("Other"), other_gender_langs),
     ]:
-        row = {"label": gender_label, "cells": [], "total": 0}
-        if gender_code == "other":
-            qs = approved_profiles.exclude(gender__in=["F", "M"]).exclude(
-                event_languages=[]
-            )
-        else:
-            qs = approved_profiles.filter(gender=gender_code).exclude(
-                event_languages=[]
-            )
-        gender_lang_counts = {}
-        for langs in qs.values_list("event_languages", flat=True):
-            if isinstance(langs, list):
-                for code in langs:
-                    gender_lang_counts[code] = gender_lang_counts.get(code, 0) + 1
-        for code in lang_codes:
-            count = gender_lang_counts.get(code, 0)
-            row["cells"].append(count)
-            row["total"] += count
-        gender_lang_matrix.append(row)
+        cells = [gender_lang_counts[code] for code in lang_codes]
+        gender_lang_matrix.append(
+            {"label": gender_label, "cells": cells, "total": sum(cells)}
+        )
     gender_lang_col_totals = [
         sum(row["cells"][i] for row in gender_lang_matrix)
         for i in range(len(lang_codes))
     ]
 
     # Age x Event Language matrix
-    age_lang_matrix = [
-        {"label": bucket["label"], "cells": [0] * len(lang_codes), "total": 0}
-        for bucket in age_buckets
-    ]
-    for dob, _gender, langs in (
-        approved_profiles.exclude(date_of_birth__isnull=True)
-        .exclude(event_languages=[])
-        .values_list("date_of_birth", "gender", "event_languages")
-    ):
-        age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-        if isinstance(langs, list):
-            for idx, bucket in enumerate(age_buckets):
-                if bucket["min"] <= age <= bucket["max"]:
-                    for code in langs:
-                        if code in lang_codes:
-                            age_lang_matrix[idx]["cells"][lang_codes.index(code)] += 1
-                            age_lang_matrix[idx]["total"] += 1
-                    break
+    age_lang_matrix = []
+    for bucket in age_buckets:
+        band_langs = demographics["age_languages"][bucket["label"]]
+        cells = [band_langs[code] for code in lang_codes]
+        age_lang_matrix.append(
+            {"label": bucket["label"], "cells": cells, "total": sum(cells)}
+        )
     age_lang_col_totals = [
         sum(row["cells"][i] for row in age_lang_matrix) for i in range(len(lang_codes))
     ]
@@ -2567,10 +2515,12 @@ def coach_event_checkin(request, event_id):
         try:
             profile = reg.user.crushprofile
             reg.photo_url = (
+                # 40px avatars in the door list: the thumbnail rendition
                 _reverse(
                     "crush_lu:serve_profile_photo",
                     kwargs={"user_id": reg.user_id, "photo_field": "photo_1"},
                 )
+                + "?w=160"
                 if profile.photo_1
                 else None
             )
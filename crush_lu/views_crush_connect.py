@@ -351,11 +351,14 @@ def _emit_onboarding_complete(request, done_url):
 def _recompute_member_match_scores(user):
     """Refresh the member's trait-based MatchScores after their Connect traits
     change. Best-effort — scoring is a soft signal for the Drop (missing pairs
-    are neutral), so a failure must never block onboarding or an edit save."""
+    are neutral), so a failure must never block onboarding or an edit save.
+
+    The save signals already queued the member; draining just their entry
+    rescores only if the trait fingerprint actually moved."""
     try:
-        from crush_lu.matching import update_match_scores_for_user
+        from crush_lu.matching import drain_match_score_queue
 
-        update_match_scores_for_user(user)
+        drain_match_score_queue(user_ids=[user.pk])
     except Exception:  # pragma: no cover - never block the user flow
         import logging
 
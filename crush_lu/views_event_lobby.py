@@ -57,6 +57,8 @@ from .services.event_lobby import (
     submit_encounter_removal_request,
     viewer_participation,
 )
+from .services.photo_derivatives import photo_variant
+from .views_media import requested_photo_width
 
 logger = logging.getLogger(__name__)
 
@@ -583,18 +585,24 @@ def lobby_photo(request, event_id, handle):
     # whole lifetime after a block/exclusion/removal or an attendance
     # correction, defeating immediate revocation (§13). Mirrors
     # ``event_lobby_person_photo``; works for both local and blob storage.
+    # The roster asks for a tile-sized rendition (?w=); the original until
+    # the renditions exist.
+    name, content_type = photo_variant(
+        target.user.crushprofile,
+        "photo_1",
+        width=requested_photo_width(request),
+        accept=request.headers.get("Accept", ""),
+    )
     try:
-        photo.open("rb")
-        content = photo.read()
+        with photo.storage.open(name, "rb") as image:
+            content = image.read()
     except Exception:
         logger.exception("Error serving lobby photo for event %s", event.pk)
         raise Http404("Photo not found") from None
-    finally:
-        photo.close()
 
-    content_type = mimetypes.guess_type(photo.name)[0] or "application/octet-stream"
     response = HttpResponse(content, content_type=content_type)
     response["Content-Disposition"] = "inline"
+    response["Vary"] = "Accept"
     # §13: private browser micro-cache only — every new request re-authorizes,
     # and no shareable URL ever leaves the server.
     response["Cache-Control"] = "private, max-age=300"
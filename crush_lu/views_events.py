@@ -18,9 +18,9 @@ from .models import (
     EventInvitation,
     EventFeedback,
 )
-from .models.event_polls import EventPoll
 from .forms import EventRegistrationForm, EventFeedbackForm
 from .decorators import crush_login_required, ratelimit
+from .services import event_listing, seat_inventory
 from .email_helpers import (
     send_event_payment_pending_notification,
     send_event_registration_confirmation,
@@ -174,201 +174,50 @@ def _filter_private_events(events, user):
 
 def event_list(request):
     """List of upcoming and past events"""
-    now = timezone.now()
-
-    # Fetch published, non-cancelled events and split into upcoming/past
-    # in Python using the model's end_time property. This avoids
-    # timedelta * F() which is not supported on SQLite. The cutoff is the
-    # enforced max event duration, so an in-progress event is never dropped
-    # regardless of its length (see MeetupEvent.live_lookback_cutoff).
-    generous_cutoff = MeetupEvent.live_lookback_cutoff(now)
-    upcoming_events = list(
-        MeetupEvent.objects.with_registration_counts()
-        .filter(is_published=True, is_cancelled=False, date_time__gte=generous_cutoff)
-        .prefetch_related("coaches__user")
-        .order_by("date_time")
-    )
-    upcoming_events = [e for e in upcoming_events if e.end_time >= now]
-
-    boundary_past = [
-        event
-        for event in MeetupEvent.objects.with_registration_counts()
-        .filter(
-            is_published=True,
-            is_cancelled=False,
-            date_time__gte=generous_cutoff,
-            date_time__lt=now,
-        )
-        .order_by("-date_time")
-        if event.end_time < now
-    ]
-    older_past = list(
-        MeetupEvent.objects.with_registration_counts()
-        .filter(
-            is_published=True,
-            is_cancelled=False,
-            date_time__lt=generous_cutoff,
-        )
-        .order_by("-date_time")[:10]
-    )
-    past_events = (boundary_past + older_past)[:10]
+    # The lists, counts and JSON-LD are shared by everyone and cached (see
+    # services/event_listing.py); an anonymous view is served from that alone
+    listing = event_listing.event_listing()
+    active_polls = [p for p in listing["polls"] if p.is_active]
+
+    if not request.user.is_authenticated:
+        context = {
+            "upcoming_event_list": [
+                e for e in listing["upcoming"] if not e.is_private_invitation
+            ],
+            "past_events_with_attendance": [
+                (event, False)
+                for event in listing["past"]
+                if not event.is_private_invitation
+            ],
+            "event_list_jsonld": listing["public_jsonld"],
+            "active_polls": active_polls,
+        }
+        return render(request, "crush_lu/event_list.html", context)
 
-    visible_upcoming = _filter_private_events(upcoming_events, request.user)
-    visible_past = _filter_private_events(past_events, request.user)
+    visible_upcoming = _filter_private_events(listing["upcoming"], request.user)
+    visible_past = _filter_private_events(listing["past"], request.user)
 
     # Build attendance lookup for past events (only 'attended' status)
-    attended_ids = set()
-    if request.user.is_authenticated:
-        attended_ids = set(
-            EventRegistration.objects.filter(
-                event__in=visible_past,
-                user=request.user,
-                status="attended",
-            ).values_list("event_id", flat=True)
-        )
+    attended_ids = set(
+        EventRegistration.objects.filter(
+            event__in=visible_past,
+            user=request.user,
+            status="attended",
+        ).values_list("event_id", flat=True)
+    )
 
     past_events_with_attendance = [
         (event, event.id in attended_ids) for event in visible_past
     ]
 
-    # Build ItemList JSON-LD in Python to avoid template rendering issues
-    # (escapejs produces \x27 for apostrophes, which is invalid JSON)
-    has_profile = False
-    if request.user.is_authenticated:
-        has_profile = CrushProfile.objects.filter(user=request.user).exists()
-
-    item_list_elements = []
-    for position, event in enumerate(visible_upcoming, start=1):
-        if not event.id:
-            continue
-        event_url = reverse("crush_lu:event_detail", args=[event.id])
-        description = event.description or ""
-        words = description.split()
-        if len(words) > 50:
-            description = " ".join(words[:50]) + " \u2026"
-
-        if request.user.is_authenticated and has_profile:
-            location_data = {
-                "@type": "Place",
-                "name": event.location or "",
-                "address": {
-                    "@type": "PostalAddress",
-                    "streetAddress": event.address or "",
-                    "addressLocality": event.location or "",
-                    "addressCountry": "LU",
-                },
-            }
-        else:
-            canton = event.canton or "Luxembourg"
-            location_data = {
-                "@type": "Place",
-                "name": canton,
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressLocality": canton,
-                    "addressCountry": "LU",
-                },
-            }
-
-        if event.is_full:
-            availability = "https://schema.org/SoldOut"
-        elif event.is_registration_open:
-            availability = "https://schema.org/InStock"
-        else:
-            availability = "https://schema.org/OutOfStock"
-
-        # Event image URL (fallback to social preview)
-        if event.image:
-            image_url = event.image.url
-        else:
-            image_url = "https://crush.lu/static/crush_lu/crush_social_preview.jpg"
-
-        # Performer list from assigned coaches
-        performers = [
-            {"@type": "Person", "name": coach.user.first_name}
-            for coach in event.coaches.all()
-        ]
-
-        # Description fallback for events with empty descriptions
-        if not description:
-            description = "Dating event in Luxembourg organized by Crush.lu"
-
-        # Map event languages for inLanguage
-        lang_map = {"en": "en", "de": "de", "fr": "fr"}
-        event_languages = [
-            lang_map[lang] for lang in (event.languages or []) if lang in lang_map
-        ]
-
-        event_item = {
-            "@type": "SocialEvent",
-            "name": event.title or "",
-            "description": description,
-            "startDate": event.date_time.isoformat(),
-            "endDate": event.end_time.isoformat(),
-            "image": image_url,
-            "eventStatus": (
-                "https://schema.org/EventCancelled"
-                if event.is_cancelled
-                else "https://schema.org/EventScheduled"
-            ),
-            "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode",
-            "location": location_data,
-            "organizer": {
-                "@type": "Organization",
-                "name": "Crush.lu",
-                "url": "https://crush.lu",
-            },
-            "offers": {
-                "@type": "Offer",
-                "url": f"https://crush.lu{event_url}",
-                "price": format(event.registration_fee, ".2f"),
-                "priceCurrency": "EUR",
-                "availability": availability,
-                "validFrom": event.created_at.isoformat(),
-            },
-            "url": f"https://crush.lu{event_url}",
-            "audience": {
-                "@type": "PeopleAudience",
-                "suggestedMinAge": event.min_age,
-                "suggestedMaxAge": event.max_age,
-            },
-        }
-        if event_languages:
-            event_item["inLanguage"] = (
-                event_languages if len(event_languages) > 1 else event_languages[0]
-            )
-
-        if performers:
-            event_item["performer"] = performers
-
-        item_list_elements.append(
-            {
-                "@type": "ListItem",
-                "position": position,
-                "item": event_item,
-            }
-        )
-
-    event_list_jsonld = json.dumps(
-        {
-            "@context": "https://schema.org",
-            "@type": "ItemList",
-            "name": str(_("Upcoming Dating Events in Luxembourg")),
-            "description": str(
-                _(
-                    "Speed dating, social mixers, and singles meetups organized by Crush.lu"
-                )
-            ),
-            "itemListElement": item_list_elements,
-        },
-        ensure_ascii=False,
+    # Members with a profile see the exact address in the JSON-LD
+    has_profile = CrushProfile.objects.filter(user=request.user).exists()
+    event_list_jsonld = event_listing.listing_jsonld(
+        listing,
+        visible_ids={event.id for event in visible_upcoming},
+        exact_address=has_profile,
     )
 
-    # Active polls for the feedback banner
-    active_polls = [
-        p for p in EventPoll.objects.filter(is_published=True) if p.is_active
-    ]
-
     context = {
         "upcoming_event_list": visible_upcoming,
         "past_events_with_attendance": past_events_with_attendance,
@@ -1058,139 +907,30 @@ def event_register(request, event_id):
             requires_gender_selection=requires_gender_selection,
         )
         if form.is_valid():
-            # Use select_for_update + atomic to prevent race condition where
-            # concurrent registrations could exceed max_participants
-            with transaction.atomic():
-                # Lock the event row to get accurate capacity count
-                locked_event = MeetupEvent.objects.select_for_update().get(id=event_id)
-
-                # Re-check registration deadline under lock to prevent race condition
-                if not locked_event.is_registration_accepting:
-                    # Detail page shows the "closed" banner; skip the redundant flash.
-                    return redirect("crush_lu:event_detail", event_id=event_id)
-
-                # Defense-in-depth: re-verify age under lock against the freshly
-                # locked event, in case event.min_age / max_age or the user's
-                # DOB changed concurrently. Derive the restriction flag from
-                # the *locked* event — the pre-lock flag may be stale if an
-                # admin tightened the age bounds after the initial read.
-                locked_has_age_restriction = (
-                    locked_event.min_age > 18 or locked_event.max_age < 99
-                )
-                if locked_has_age_restriction:
-                    locked_profile = CrushProfile.objects.filter(
-                        user=request.user
-                    ).first()
-                    if (
-                        locked_profile is None
-                        or locked_profile.age is None
-                        or not (
-                            locked_event.min_age
-                            <= locked_profile.age
-                            <= locked_event.max_age
-                        )
-                    ):
-                        messages.error(
-                            request,
-                            _("This event is restricted to ages " "%(min)d–%(max)d.")
-                            % {
-                                "min": locked_event.min_age,
-                                "max": locked_event.max_age,
-                            },
-                        )
-                        return redirect("crush_lu:event_detail", event_id=event_id)
-
-                # If the user submitted a gender, persist it to their profile
-                submitted_gender = form.cleaned_data.get("gender")
-                if requires_gender_selection and submitted_gender:
-                    if profile is None:
-                        profile = CrushProfile.objects.create(
-                            user=request.user, gender=submitted_gender
-                        )
-                    else:
-                        profile.gender = submitted_gender
-                        profile.save(update_fields=["gender"])
-
-                cancelled_registration = EventRegistration.objects.filter(
-                    event=locked_event, user=request.user, status="cancelled"
-                ).first()
-
-                if cancelled_registration:
-                    registration = cancelled_registration
-                    # A re-registration is treated as brand new (its
-                    # registered_at is reset below), so drop any stale hunt-team
-                    # membership tied to this row. Otherwise reconfirming it
-                    # would silently reactivate the old CacheTeamMember: the
-                    # active-only member_count() freed the slot on cancellation,
-                    # a replacement may have taken it, and the team would then
-                    # exceed team_size_max. The user re-joins a team afresh.
-                    registration.cache_memberships.all().delete()
-                    registration.dietary_restrictions = form.cleaned_data.get(
-                        "dietary_restrictions", ""
-                    )
-                    registration.bringing_guest = form.cleaned_data.get(
-                        "bringing_guest", False
+            # With EVENT_SEAT_INVENTORY on, the seat is claimed from the
+            # per-event counters first, so the write below needs no event-row
+            # lock. None means the inventory is off or could not decide, and
+            # the locked recount below stays the source of truth.
+            claim = seat_inventory.claim_seat(
+                event,
+                gender=form.cleaned_data.get("gender")
+                if requires_gender_selection
+                else getattr(profile, "gender", None),
+                is_premium=bool(profile and profile.assigned_coach_id),
+            )
+            # Whatever keeps the registration from being written -- an early
+            # redirect or an exception -- hands a claimed seat back.
+            try:
+                with transaction.atomic():
+                    registration = _write_event_registration(
+                        request, event_id, form, profile, requires_gender_selection, claim
                     )
-                    registration.guest_name = form.cleaned_data.get("guest_name", "")
-                    # Policy: a user who cancelled and re-registers is treated
-                    # like a new registration — their original `registered_at`
-                    # is discarded and they go to the back of the waitlist (if
-                    # the event is full). This prevents queue-jumping via
-                    # cancel-then-re-register while the event is at capacity.
-                    registration.registered_at = timezone.now()
-                else:
-                    registration = form.save(commit=False)
-                    registration.event = locked_event
-                    registration.user = request.user
-
-                # Determine confirmed vs waitlist using both total and gender caps.
-                # Premium (coach-assigned) members can claim reserved seats, so
-                # their fullness is measured against the full capacity.
-                user_gender = getattr(profile, "gender", None)
-                is_premium = bool(profile and profile.assigned_coach_id)
-                total_full = locked_event.is_full_for(is_premium=is_premium)
-                gender_pool_full = (
-                    locked_event.gender_limits_active
-                    and user_gender
-                    and locked_event.is_gender_pool_full(user_gender)
-                )
-
-                if total_full or gender_pool_full:
-                    registration.status = "waitlist"
-                    if gender_pool_full and not total_full:
-                        messages.info(
-                            request,
-                            _(
-                                "All spots for your gender group are taken. "
-                                "You have been added to the waitlist."
-                            ),
-                        )
-                    else:
-                        messages.info(
-                            request,
-                            _("Event is full. You have been added to the waitlist."),
-                        )
-                else:
-                    # A paid event's seat is held, not confirmed, until the money
-                    # arrives -- the SumUp return handler flips it to "confirmed".
-                    # "pending" still counts toward capacity and still yields a
-                    # door ticket (see SEAT_HOLDING_STATUSES); it only changes
-                    # what the status *claims*. Free events are unaffected.
-                    registration.status = _admitted_status(locked_event, registration)
-                    if registration.status == "pending":
-                        messages.success(
-                            request,
-                            _(
-                                "Your spot is reserved! Please complete payment "
-                                "to confirm your registration."
-                            ),
-                        )
-                    else:
-                        messages.success(
-                            request, _("Successfully registered for the event!")
-                        )
-
-                registration.save()
+            except Exception:
+                seat_inventory.release_seat(claim)
+                raise
+            if not isinstance(registration, EventRegistration):
+                seat_inventory.release_seat(claim)
+                return registration
 
             try:
                 if registration.status == "confirmed":
@@ -1253,6 +993,164 @@ def event_register(request, event_id):
     return render(request, "crush_lu/event_register.html", context)
 
 
+def _write_event_registration(
+    request, event_id, form, profile, requires_gender_selection, claim
+):
+    """Save the member's registration inside event_register's transaction.
+
+    Returns the saved EventRegistration, or the redirect to send instead.
+    Without a seat ``claim`` the event row is locked and the seats recounted
+    under it, so concurrent registrations cannot exceed max_participants. With
+    one, the inventory has already admitted or waitlisted the member
+    atomically and the row is read without the lock.
+    """
+    if claim is None:
+        # Lock the event row to get accurate capacity count
+        locked_event = MeetupEvent.objects.select_for_update().get(id=event_id)
+    else:
+        locked_event = MeetupEvent.objects.get(id=event_id)
+
+    # Re-check registration deadline under lock to prevent race condition
+    if not locked_event.is_registration_accepting:
+        # Detail page shows the "closed" banner; skip the redundant flash.
+        return redirect("crush_lu:event_detail", event_id=event_id)
+
+    # Defense-in-depth: re-verify age under lock against the freshly
+    # locked event, in case event.min_age / max_age or the user's
+    # DOB changed concurrently. Derive the restriction flag from
+    # the *locked* event — the pre-lock flag may be stale if an
+    # admin tightened the age bounds after the initial read.
+    locked_has_age_restriction = (
+        locked_event.min_age > 18 or locked_event.max_age < 99
+    )
+    if locked_has_age_restriction:
+        locked_profile = CrushProfile.objects.filter(
+            user=request.user
+        ).first()
+        if (
+            locked_profile is None
+            or locked_profile.age is None
+            or not (
+                locked_event.min_age
+                <= locked_profile.age
+                <= locked_event.max_age
+            )
+        ):
+            messages.error(
+                request,
+                _("This event is restricted to ages " "%(min)d–%(max)d.")
+                % {
+                    "min": locked_event.min_age,
+                    "max": locked_event.max_age,
+                },
+            )
+            return redirect("crush_lu:event_detail", event_id=event_id)
+
+    # If the user submitted a gender, persist it to their profile
+    submitted_gender = form.cleaned_data.get("gender")
+    if requires_gender_selection and submitted_gender:
+        if profile is None:
+            profile = CrushProfile.objects.create(
+                user=request.user, gender=submitted_gender
+            )
+        else:
+            profile.gender = submitted_gender
+            profile.save(update_fields=["gender"])
+
+    cancelled_registration = EventRegistration.objects.filter(
+        event=locked_event, user=request.user, status="cancelled"
+    ).first()
+
+    if cancelled_registration:
+        registration = cancelled_registration
+        # A re-registration is treated as brand new (its
+        # registered_at is reset below), so drop any stale hunt-team
+        # membership tied to this row. Otherwise reconfirming it
+        # would silently reactivate the old CacheTeamMember: the
+        # active-only member_count() freed the slot on cancellation,
+        # a replacement may have taken it, and the team would then
+        # exceed team_size_max. The user re-joins a team afresh.
+        registration.cache_memberships.all().delete()
+        registration.dietary_restrictions = form.cleaned_data.get(
+            "dietary_restrictions", ""
+        )
+        registration.bringing_guest = form.cleaned_data.get(
+            "bringing_guest", False
+        )
+        registration.guest_name = form.cleaned_data.get("guest_name", "")
+        # Policy: a user who cancelled and re-registers is treated
+        # like a new registration — their original `registered_at`
+        # is discarded and they go to the back of the waitlist (if
+        # the event is full). This prevents queue-jumping via
+        # cancel-then-re-register while the event is at capacity.
+        registration.registered_at = timezone.now()
+    else:
+        registration = form.save(commit=False)
+        registration.event = locked_event
+        registration.user = request.user
+
+    # Determine confirmed vs waitlist using both total and gender caps.
+    # Premium (coach-assigned) members can claim reserved seats, so
+    # their fullness is measured against the full capacity.
+    if claim is not None:
+        # Already decided by the inventory against the same caps
+        total_full = claim.outcome == seat_inventory.FULL
+        gender_pool_full = claim.outcome == seat_inventory.POOL_FULL
+    else:
+        user_gender = getattr(profile, "gender", None)
+        is_premium = bool(profile and profile.assigned_coach_id)
+        total_full = locked_event.is_full_for(is_premium=is_premium)
+        gender_pool_full = (
+            locked_event.gender_limits_active
+            and user_gender
+            and locked_event.is_gender_pool_full(user_gender)
+        )
+
+    if total_full or gender_pool_full:
+        registration.status = "waitlist"
+        if gender_pool_full and not total_full:
+            messages.info(
+                request,
+                _(
+                    "All spots for your gender group are taken. "
+                    "You have been added to the waitlist."
+                ),
+            )
+        else:
+            messages.info(
+                request,
+                _("Event is full. You have been added to the waitlist."),
+            )
+    else:
+        # A paid event's seat is held, not confirmed, until the money
+        # arrives -- the SumUp return handler flips it to "confirmed".
+        # "pending" still counts toward capacity and still yields a
+        # door ticket (see SEAT_HOLDING_STATUSES); it only changes
+        # what the status *claims*. Free events are unaffected.
+        registration.status = _admitted_status(locked_event, registration)
+        if registration.status == "pending":
+            messages.success(
+                request,
+                _(
+                    "Your spot is reserved! Please complete payment "
+                    "to confirm your registration."
+                ),
+            )
+        else:
+            messages.success(
+                request, _("Successfully registered for the event!")
+            )
+
+    # Tells the seat-inventory signal this row's seat is already counted
+    registration._seat_claim = claim
+    registration.save()
+
+    if claim is not None:
+        # Drop the hold once the row has committed; the seat stays counted
+        transaction.on_commit(lambda: seat_inventory.confirm_seat(claim))
+    return registration
+
+
 @crush_login_required
 def event_cancel(request, event_id):
     """Cancel event registration"""
@@ -14,6 +14,7 @@ import logging
 
 from .models import CrushProfile, CrushCoach
 from .oauth_statekit import get_client_ip
+from .services.photo_derivatives import photo_variant
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +84,28 @@ def _increment_rate_limit_counter(key, period_seconds):
         return None
 
 
+def requested_photo_width(request):
+    """The ``?w=`` display width a photo URL asks for, or None for the original."""
+    try:
+        width = int(request.GET.get("w", ""))
+    except ValueError:
+        return None
+    return width if width > 0 else None
+
+
+def photo_url_for_width(url, width=None):
+    """Append the ``?w=`` display width to a photo view URL."""
+    return f"{url}?w={width}" if width else url
+
+
 @login_required
 def serve_profile_photo(request, user_id, photo_field):
     """
     Serve profile photos with authentication and privacy checks
 
-    URL: /crush/media/profile/{user_id}/{photo_field}/
-    Where photo_field is: photo_1, photo_2, or photo_3
+    URL: /crush/media/profile/{user_id}/{photo_field}/[?w=<pixels>]
+    Where photo_field is: photo_1, photo_2, or photo_3, and ``w`` asks for the
+    smallest stored rendition at least that wide (the original otherwise)
 
     Rate limits: 200/min for regular users, 300/min for coaches.
 
@@ -154,6 +170,14 @@ def serve_profile_photo(request, user_id, photo_field):
     if not photo:
         raise Http404("Photo not found")
 
+    # A resized rendition when the page asked for one (?w=<pixels>)
+    name, content_type = photo_variant(
+        profile,
+        photo_field,
+        width=requested_photo_width(request),
+        accept=request.headers.get("Accept", ""),
+    )
+
     # AZURE BLOB STORAGE: Generate SAS URL and redirect
     if hasattr(settings, "AZURE_ACCOUNT_NAME") and settings.AZURE_ACCOUNT_NAME:
         from .storage import CrushProfilePhotoStorage
@@ -161,30 +185,27 @@ def serve_profile_photo(request, user_id, photo_field):
         storage = CrushProfilePhotoStorage()
 
         # Redirect to Azure with time-limited SAS token
-        secure_url = storage.url(photo.name, expire=1800)  # 30 min expiry
+        secure_url = storage.url(name, expire=1800)  # 30 min expiry
         from django.shortcuts import redirect
 
-        return redirect(secure_url)
+        response = redirect(secure_url)
+        # The target depends on Accept (AVIF or WebP rendition)
+        response["Vary"] = "Accept"
+        return response
 
     # LOCAL FILESYSTEM: Serve directly
     else:
-        photo_path = photo.path
+        photo_path = photo.storage.path(name)
 
         # Check if file exists
         if not os.path.exists(photo_path):
             raise Http404("Photo file not found")
 
-        # Serve original photo
         try:
             with open(photo_path, "rb") as f:
-                content_type = "image/jpeg"
-                if photo_path.lower().endswith(".png"):
-                    content_type = "image/png"
-                elif photo_path.lower().endswith(".webp"):
-                    content_type = "image/webp"
-
                 response = HttpResponse(f.read(), content_type=content_type)
                 response["Content-Disposition"] = "inline"
+                response["Vary"] = "Accept"
                 return response
         except Exception as e:
             logger.error(f"Error serving photo {photo_path}: {e}")
@@ -235,7 +256,7 @@ def serve_coach_photo(request, coach_id):
         raise Http404("Error loading photo")
 
 
-def get_profile_photo_url(profile, photo_field, request=None):
+def get_profile_photo_url(profile, photo_field, request=None, width=None):
     """
     Helper function to generate the correct photo URL
 
@@ -245,6 +266,8 @@ def get_profile_photo_url(profile, photo_field, request=None):
         profile: CrushProfile instance
         photo_field: Which photo ('photo_1', 'photo_2', 'photo_3')
         request: Optional request object (for building absolute URLs)
+        width: Optional display width in pixels; grids and avatars pass
+            this to get a resized rendition instead of the original
 
     Returns:
         URL string to the photo (through the secure view)
@@ -255,9 +278,12 @@ def get_profile_photo_url(profile, photo_field, request=None):
         return None
 
     # Generate URL through the secure view
-    url = reverse(
-        "crush_lu:serve_profile_photo",
-        kwargs={"user_id": profile.user.id, "photo_field": photo_field},
+    url = photo_url_for_width(
+        reverse(
+            "crush_lu:serve_profile_photo",
+            kwargs={"user_id": profile.user.id, "photo_field": photo_field},
+        ),
+        width,
     )
 
     # Build absolute URL if request provided
@@ -18,11 +18,15 @@ from crush_lu.models.quiz import (
     QuizTable,
     QuizTableMembership,
 )
+from crush_lu.services.photo_derivatives import photo_variant
 from crush_lu.throttling import QuizPinRateThrottle, ratelimit_view
 
 
 logger = logging.getLogger(__name__)
 
+# Leaderboard/table avatars are at most 40px on the projector
+QUIZ_PHOTO_WIDTH = 160
+
 
 def _photo_url(profile):
     """Return public quiz photo URL if photo_1 exists, else None."""
@@ -513,29 +517,34 @@ def quiz_display_photo(request, user_id):
     if not photo:
         raise Http404("No photo")
 
+    # Only ever shown as a small avatar: the thumbnail rendition once built
+    name, content_type = photo_variant(
+        profile,
+        "photo_1",
+        width=QUIZ_PHOTO_WIDTH,
+        accept=request.headers.get("Accept", ""),
+    )
+
     # Azure Blob Storage: redirect with SAS token
     if hasattr(settings, "AZURE_ACCOUNT_NAME") and settings.AZURE_ACCOUNT_NAME:
         from crush_lu.storage import CrushProfilePhotoStorage
         from django.shortcuts import redirect
 
         storage = CrushProfilePhotoStorage()
-        secure_url = storage.url(photo.name, expire=1800)
+        secure_url = storage.url(name, expire=1800)
         response = redirect(secure_url)
         response["Cache-Control"] = "private, max-age=1800"
+        response["Vary"] = "Accept"
         return response
 
     # Local filesystem
-    photo_path = photo.path
+    photo_path = photo.storage.path(name)
     if not os.path.exists(photo_path):
         raise Http404("Photo file not found")
 
     with open(photo_path, "rb") as f:
-        content_type = "image/jpeg"
-        if photo_path.lower().endswith(".png"):
-            content_type = "image/png"
-        elif photo_path.lower().endswith(".webp"):
-            content_type = "image/webp"
         response = HttpResponse(f.read(), content_type=content_type)
         response["Content-Disposition"] = "inline"
         response["Cache-Control"] = "private, max-age=1800"
+        response["Vary"] = "Accept"
         return response
@@ -1,21 +1,23 @@
 import base64
+import functools
 import hashlib
 import json
 import os
 import secrets
 from datetime import datetime, timezone
 from io import BytesIO
-from zipfile import ZIP_DEFLATED, ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
 
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.serialization import pkcs7
 from cryptography.x509 import load_pem_x509_certificate
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from django.utils import translation
 
 from ..wallet_pass import build_wallet_pass_data
-from .passkit_service import resolve_web_service_url
+from .passkit_service import PasskitPass, resolve_web_service_url
 
 # Placeholder 1x1 transparent PNG for icon (fallback if static assets missing)
 ICON_PNG_BASE64 = (
@@ -48,6 +50,35 @@ def _load_brand_assets():
     return files
 
 
+@functools.lru_cache(maxsize=1)
+def _brand_asset_manifest():
+    """Brand assets (with the fallback icon) and their SHA-256s, read once.
+
+    The files ship with the code, so they cannot change under a running
+    process; hashing them on every pass fetch was pure waste.
+
+    Returns:
+        tuple: ({pkpass_filename: bytes}, {pkpass_filename: sha256 hex})
+    """
+    files = _load_brand_assets()
+    if "icon.png" not in files:
+        files["icon.png"] = base64.b64decode(ICON_PNG_BASE64)
+    digests = {
+        name: hashlib.sha256(content).hexdigest() for name, content in files.items()
+    }
+    return files, digests
+
+
+# Signed packages are cached under the digest of their manifest. The manifest
+# already hashes pass.json and every asset, so an identical manifest means an
+# identical package — a changed pass can never be served from a stale entry.
+PKPASS_CACHE_PREFIX = "crush_lu:pkpass:"
+PKPASS_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # seconds
+
+# Fixed ZIP member timestamp, so the same inputs always produce the same bytes.
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
 def _require_setting(name):
     value = getattr(settings, name, None)
     if not value:
@@ -315,28 +346,38 @@ def _build_pass_payload(
     return payload
 
 
-def _build_pkpass(pass_payload, files=None):
+def _signing_identity():
+    """Which signing certificate is configured, for the package cache key.
+
+    Keyed on the setting values rather than the certificate itself so a cache
+    hit does not read the key material. Rotating the production certificate
+    changes WALLET_APPLE_CERT_BASE64 and so retires every cached package.
     """
-    Build a .pkpass ZIP file from a pass payload and optional extra files.
+    source = getattr(settings, "WALLET_APPLE_CERT_BASE64", "") or getattr(
+        settings, "WALLET_APPLE_CERT_PATH", ""
+    )
+    return hashlib.sha256(str(source).encode("utf-8")).hexdigest()[:16]
+
+
+def _package_pkpass(pass_payload, files=None):
+    """
+    Build (or fetch from cache) a signed .pkpass for a pass payload.
+
+    Signing and zipping only happen on a cache miss. Devices re-fetch the pass
+    after every APNs push, and most of those fetches return a pass that has
+    not changed since the last one.
 
     Args:
         pass_payload: dict -- the pass.json content
-        files: dict of {filename: bytes} -- extra files to include (icon.png, etc.)
+        files: dict of {filename: bytes} -- extra files to include; these
+            override brand assets of the same name
 
     Returns:
-        bytes: The .pkpass file contents
+        PasskitPass: the package bytes, when this pass's content last
+            changed (Last-Modified) and its content digest (ETag)
     """
-    if files is None:
-        files = {}
-
-    # Load branded icons and logos, then layer caller-provided files on top
-    brand_assets = _load_brand_assets()
-    brand_assets.update(files)
-    files = brand_assets
-
-    # Add fallback 1x1 icon if no branded assets found
-    if "icon.png" not in files:
-        files["icon.png"] = base64.b64decode(ICON_PNG_BASE64)
+    brand_files, brand_digests = _brand_asset_manifest()
+    files = {**brand_files, **(files or {})}
 
     # Serialize pass.json
     pass_json_bytes = json.dumps(
@@ -347,25 +388,90 @@ def _build_pkpass(pass_payload, files=None):
     manifest = {}
     manifest["pass.json"] = hashlib.sha256(pass_json_bytes).hexdigest()
     for filename, content in files.items():
-        manifest[filename] = hashlib.sha256(content).hexdigest()
+        if content is brand_files.get(filename):
+            manifest[filename] = brand_digests[filename]
+        else:
+            manifest[filename] = hashlib.sha256(content).hexdigest()
 
     manifest_bytes = json.dumps(
         manifest, ensure_ascii=False, separators=(",", ":")
     ).encode("utf-8")
 
-    # Sign manifest
-    signature_bytes = _sign_manifest(manifest_bytes)
+    digest = hashlib.sha256(
+        manifest_bytes + _signing_identity().encode("ascii")
+    ).hexdigest()
+    cache_key = f"{PKPASS_CACHE_PREFIX}{digest}"
+    pkpass_bytes = cache.get(cache_key)
+    if pkpass_bytes is None:
+        # Sign manifest
+        signature_bytes = _sign_manifest(manifest_bytes)
+
+        # Build ZIP
+        buffer = BytesIO()
+        with ZipFile(buffer, "w", ZIP_DEFLATED) as zf:
+            members = [
+                ("pass.json", pass_json_bytes),
+                ("manifest.json", manifest_bytes),
+                ("signature", signature_bytes),
+                *files.items(),
+            ]
+            for filename, content in members:
+                info = ZipInfo(filename, date_time=_ZIP_EPOCH)
+                info.compress_type = ZIP_DEFLATED
+                zf.writestr(info, content)
+
+        pkpass_bytes = buffer.getvalue()
+        cache.set(cache_key, pkpass_bytes, _pkpass_cache_timeout())
+
+    return PasskitPass(
+        pkpass_bytes,
+        last_updated=_content_changed_at(pass_payload.get("serialNumber"), digest),
+        etag=digest,
+    )
+
 
-    # Build ZIP
-    buffer = BytesIO()
-    with ZipFile(buffer, "w", ZIP_DEFLATED) as zf:
-        zf.writestr("pass.json", pass_json_bytes)
-        zf.writestr("manifest.json", manifest_bytes)
-        zf.writestr("signature", signature_bytes)
-        for filename, content in files.items():
-            zf.writestr(filename, content)
+def _pkpass_cache_timeout():
+    return getattr(settings, "WALLET_APPLE_PKPASS_CACHE_TIMEOUT", PKPASS_CACHE_TIMEOUT)
 
-    return buffer.getvalue()
+
+def _content_changed_at(serial_number, digest):
+    """When this serial's package last changed content, for Last-Modified.
+
+    Tracked per serial rather than per package: a pass that flips back to an
+    earlier state (registered, cancelled, registered again) reuses an old
+    cached package, and that package's original build time would be older
+    than the If-Modified-Since of a device holding the intermediate version —
+    Wallet would be told "304" and keep the wrong pass. A lost record
+    re-stamps to now, which only costs one full download.
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    if not serial_number:
+        return datetime.fromtimestamp(now, tz=timezone.utc)
+
+    key = f"{PKPASS_CACHE_PREFIX}serial:{serial_number}"
+    record = cache.get(key)
+    if record and record[0] == digest:
+        changed_at = record[1]
+    else:
+        # Whole seconds: Last-Modified has one-second resolution, and a
+        # fractional timestamp would never satisfy If-Modified-Since.
+        changed_at = now
+        cache.set(key, (digest, changed_at), _pkpass_cache_timeout())
+    return datetime.fromtimestamp(changed_at, tz=timezone.utc)
+
+
+def _build_pkpass(pass_payload, files=None):
+    """
+    Build a .pkpass ZIP file from a pass payload and optional extra files.
+
+    Args:
+        pass_payload: dict -- the pass.json content
+        files: dict of {filename: bytes} -- extra files to include (icon.png, etc.)
+
+    Returns:
+        bytes: The .pkpass file contents
+    """
+    return _package_pkpass(pass_payload, files).pkpass_bytes
 
 
 def build_apple_pass(profile, request=None, web_service_url=None):
@@ -382,6 +488,16 @@ def build_apple_pass(profile, request=None, web_service_url=None):
     Returns:
         bytes: The .pkpass file contents
     """
+    return build_apple_pass_package(
+        profile, request=request, web_service_url=web_service_url
+    ).pkpass_bytes
+
+
+def build_apple_pass_package(profile, request=None, web_service_url=None):
+    """
+    Like build_apple_pass, but returns a PasskitPass carrying the ETag and
+    Last-Modified of the package, for the PassKit web service.
+    """
     serial_number, auth_token = _ensure_pass_identifiers(profile)
     pass_payload = _build_pass_payload(
         profile,
@@ -390,7 +506,7 @@ def build_apple_pass(profile, request=None, web_service_url=None):
         request=request,
         web_service_url=web_service_url,
     )
-    return _build_pkpass(pass_payload)
+    return _package_pkpass(pass_payload)
 
 
 def provide_pass_for_serial(
@@ -442,7 +558,7 @@ def provide_pass_for_serial(
     # See the evt- branch: forward web_service_url so the rebuilt member pass
     # does not silently drop webServiceURL.
     with translation.override(getattr(profile, "preferred_language", "") or None):
-        return build_apple_pass(profile, web_service_url=web_service_url)
+        return build_apple_pass_package(profile, web_service_url=web_service_url)
 
 
 def _ticket_language(registration):
@@ -5,10 +5,13 @@ This module provides functions to update Google Wallet passes when user data cha
 (points, tier, event registrations, etc.) and to send push notifications via
 the messages array on pass objects.
 """
+import hashlib
 import json
 import logging
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 from django.conf import settings
@@ -18,7 +21,7 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 
 from .google_wallet import _load_private_key, _base64url_encode
-from ..wallet_pass import build_wallet_pass_data
+from ..wallet_pass import build_wallet_pass_data, prefetch_wallet_pass_data
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,15 @@ GOOGLE_WALLET_HTTP_TIMEOUT = 30.0
 # refresh never reaches it — its whole budget is seconds.
 GOOGLE_WALLET_TOKEN_REUSE_SECONDS = 45 * 60
 
+# PATCHes in flight at once during update_all_google_wallet_passes. Over HTTP/2
+# they share one multiplexed connection; Google's per-issuer write quota is far
+# above what this many streams can reach.
+GOOGLE_WALLET_PATCH_CONCURRENCY = 8
+
+# Profiles whose payloads are prefetched and built at a time by a sweep, so the
+# memory held for an estate-wide refresh stays bounded.
+GOOGLE_WALLET_REFRESH_CHUNK_SIZE = 500
+
 
 def _timeout_kwargs(timeout):
     """Build the per-request timeout kwarg, omitting it when unset.
@@ -142,12 +154,52 @@ def _get_access_token(client=None, timeout=None):
             owned_client.close()
 
 
-def _build_generic_object_payload(profile, object_id, class_id):
+def _wallet_client(concurrency=1):
+    """One client for a batch: HTTP/2 where Google negotiates it, so the
+    concurrent PATCHes of a sweep multiplex over a single connection, with the
+    pool sized for HTTP/1.1 peers that cannot."""
+    return httpx.Client(
+        http2=True,
+        timeout=GOOGLE_WALLET_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+    )
+
+
+def wallet_object_payload_hash(payload):
+    """
+    Stable fingerprint of a generic object payload.
+
+    Stored on the profile after every successful PATCH, so a refresh can tell
+    "nothing changed" without asking Google. The hero image's query string is
+    left out: a profile photo is served through a SAS URL whose signature
+    rotates with every expiry window, and Google copies the image when the
+    object is written, so a re-signed URL alone is not a change worth a PATCH.
+    """
+    hero_uri = payload.get("heroImage", {}).get("sourceUri", {}).get("uri")
+    if hero_uri and "?" in hero_uri:
+        payload = {
+            **payload,
+            "heroImage": {
+                **payload["heroImage"],
+                "sourceUri": {"uri": hero_uri.split("?", 1)[0]},
+            },
+        }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _build_generic_object_payload(profile, object_id, class_id, prefetched=None):
     """
     Build the generic object payload for updating a pass.
     Mirrors the Buffalo Grill-inspired structure in google_wallet.py.
+
+    ``prefetched`` is this profile's entry of prefetch_wallet_pass_data(),
+    which batch refreshes pass so building N payloads does not cost N sets of
+    queries.
     """
-    pass_data = build_wallet_pass_data(profile)
+    pass_data = build_wallet_pass_data(profile, prefetched=prefetched)
 
     # Map tier to emoji and promotional message
     tier = pass_data["membership_tier"] or "basic"
@@ -293,27 +345,40 @@ def _build_generic_object_payload(profile, object_id, class_id):
     return generic_object
 
 
-def _patch_generic_object(profile, class_id, access_token, client, timeout=None):
-    """PATCH one member object with a caller-supplied token and HTTP client.
-
-    Split out of update_google_wallet_pass so a batch can mint ONE token and
-    reuse ONE connection across its whole fan-out. The single-profile entry
-    point below still owns both when called on its own, so its behaviour and
-    return shape are unchanged.
-    """
+def _build_holder_payload(profile, class_id, prefetched=None):
     # Render in the HOLDER's language, not the caller's. The next-event title
     # is modeltranslated, and every path that reaches here in bulk runs from
     # the admin — which is forced to English — so without this override a
     # French or German holder's card is rewritten in English by an edit they
     # had nothing to do with. Mirrors the Apple member-pass rebuild in
     # apple_pass.provide_pass_for_serial; None leaves the active language.
+    extra = {} if prefetched is None else {"prefetched": prefetched}
     with translation.override(getattr(profile, "preferred_language", "") or None):
-        object_payload = _build_generic_object_payload(
+        return _build_generic_object_payload(
             profile,
             profile.google_wallet_object_id,
             class_id,
+            **extra,
         )
 
+
+def _patch_generic_object(
+    profile, class_id, access_token, client, timeout=None, payload=None
+):
+    """PATCH one member object with a caller-supplied token and HTTP client.
+
+    Split out of update_google_wallet_pass so a batch can mint ONE token and
+    reuse ONE connection across its whole fan-out. The single-profile entry
+    point below still owns both when called on its own, so its behaviour and
+    return shape are unchanged. A batch that built the payload up front (see
+    _prepare_refresh) hands it over as ``payload``.
+
+    A successful result also carries the ``payload_hash`` that was written.
+    """
+    object_payload = payload
+    if object_payload is None:
+        object_payload = _build_holder_payload(profile, class_id)
+
     # URL encode the object ID (it contains dots)
     encoded_object_id = profile.google_wallet_object_id.replace(".", "%2E")
     url = f"{GOOGLE_WALLET_API_BASE}/genericObject/{encoded_object_id}"
@@ -334,7 +399,11 @@ def _patch_generic_object(profile, class_id, access_token, client, timeout=None)
             profile.user_id,
             profile.google_wallet_object_id,
         )
-        return {"success": True, "message": "Pass updated successfully"}
+        return {
+            "success": True,
+            "message": "Pass updated successfully",
+            "payload_hash": wallet_object_payload_hash(object_payload),
+        }
 
     if response.status_code == 404:
         # Pass doesn't exist in Google's system (user may have deleted it)
@@ -373,12 +442,159 @@ def update_google_wallet_pass(profile):
     try:
         with httpx.Client(timeout=GOOGLE_WALLET_HTTP_TIMEOUT) as client:
             access_token = _get_access_token(client=client)
-            return _patch_generic_object(profile, class_id, access_token, client)
+            result = _patch_generic_object(profile, class_id, access_token, client)
 
     except Exception as e:
         logger.exception("Error updating Google Wallet pass for user %s: %s", profile.user_id, e)
         return {"success": False, "message": str(e)}
 
+    if result["success"] and result.get("payload_hash") and profile.pk:
+        from ..models import CrushProfile
+
+        # Conditional on the object id, so a pass the holder replaced in the
+        # meantime does not inherit this object's fingerprint
+        CrushProfile.objects.filter(
+            pk=profile.pk, google_wallet_object_id=profile.google_wallet_object_id
+        ).update(google_wallet_payload_hash=result["payload_hash"])
+    return result
+
+
+def _prepare_refresh(profiles, class_id, force=False):
+    """Build the payloads of a batch up front, dropping the unchanged ones.
+
+    Everything the payloads need is prefetched for the whole batch (see
+    prefetch_wallet_pass_data), so this costs a handful of queries however
+    many profiles it covers; building inside the PATCH loop cost two or more
+    per pass. A payload whose hash matches the one recorded at the holder's
+    last successful PATCH would rewrite an identical object and is skipped
+    unless ``force``.
+
+    Returns ``(jobs, unchanged, failed)``: a list of ``(profile, payload,
+    payload_hash)`` still to send, and how many profiles were skipped or could
+    not be built.
+    """
+    prefetched = prefetch_wallet_pass_data(profiles)
+    jobs = []
+    unchanged = 0
+    failed = 0
+    for profile in profiles:
+        try:
+            payload = _build_holder_payload(
+                profile, class_id, prefetched=prefetched[profile.pk]
+            )
+        except Exception:
+            # One broken profile must not strand the rest of the batch
+            logger.exception(
+                "Failed building Google Wallet object %s",
+                profile.google_wallet_object_id,
+            )
+            failed += 1
+            continue
+        payload_hash = wallet_object_payload_hash(payload)
+        if not force and payload_hash == profile.google_wallet_payload_hash:
+            unchanged += 1
+            continue
+        jobs.append((profile, payload, payload_hash))
+    return jobs, unchanged, failed
+
+
+def _remember_payload_hashes(written):
+    """Record the payload hash of every object PATCHed by a batch.
+
+    Written in bulk once the batch is done rather than per PATCH, and from the
+    calling thread: the sweep's workers only talk to Google. A holder who
+    re-added their pass in between gets a new object id, which is part of the
+    payload, so a fingerprint recorded against the old object never matches
+    the new one.
+    """
+    from ..models import CrushProfile
+
+    profiles = []
+    for profile, payload_hash in written:
+        profile.google_wallet_payload_hash = payload_hash
+        profiles.append(profile)
+    if profiles:
+        CrushProfile.objects.bulk_update(
+            profiles, ["google_wallet_payload_hash"], batch_size=500
+        )
+
+
+class _SharedAccessToken:
+    """One OAuth token for the workers of a sweep, re-minted when it ages.
+
+    Minting is serialized, so N workers starting at once make one exchange
+    rather than N. Once an exchange fails nothing else can be PATCHed, so the
+    error is kept and every later caller fails fast with it instead of
+    hammering the token endpoint once per remaining pass.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self._token = None
+        self._minted_at = 0.0
+        self._error = None
+
+    def get(self):
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            # Re-minted rather than held for the whole sweep: a token is good
+            # for an hour, and an uncapped sweep over a large estate can
+            # outlive one.
+            if (
+                self._token is None
+                or time.monotonic() - self._minted_at
+                >= GOOGLE_WALLET_TOKEN_REUSE_SECONDS
+            ):
+                try:
+                    self._token = _get_access_token(client=self._client)
+                except Exception as e:
+                    logger.exception("Batch Google Wallet update could not finish")
+                    self._error = e
+                    raise
+                self._minted_at = time.monotonic()
+            return self._token
+
+
+def _patch_concurrently(jobs, class_id, client, get_token, concurrency):
+    """PATCH prepared ``(profile, payload, payload_hash)`` jobs, ``concurrency``
+    at a time, over one shared client.
+
+    Returns ``(outcome, profile, payload_hash)`` per job, in job order, where
+    outcome is "updated", "not_found" or "failed". Every failure is isolated
+    to its own job.
+    """
+
+    def _send(job):
+        profile, payload, payload_hash = job
+        try:
+            access_token = get_token()
+        except Exception:
+            # Already logged, once, by whoever failed to mint it
+            return "failed", profile, payload_hash
+        try:
+            result = _patch_generic_object(
+                profile, class_id, access_token, client, payload=payload
+            )
+        except Exception:
+            # One unreachable object must not strand the rest.
+            logger.exception(
+                "Failed updating Google Wallet object %s",
+                profile.google_wallet_object_id,
+            )
+            return "failed", profile, payload_hash
+        if result["success"]:
+            return "updated", profile, payload_hash
+        if "not found" in result["message"].lower():
+            return "not_found", profile, payload_hash
+        return "failed", profile, payload_hash
+
+    if concurrency <= 1:
+        return [_send(job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(_send, jobs))
+
 
 def refresh_google_wallet_objects(profiles, context=""):
     """Bulk-refresh Google Wallet member objects under ONE shared budget.
@@ -461,26 +677,35 @@ def refresh_google_wallet_objects(profiles, context=""):
         profiles = list(
             CrushProfile.objects.filter(pk__in=profile_ids)
             .exclude(google_wallet_object_id="")
+            .select_related("user")
             .order_by("pk")
         )
         if not profiles:
             return
 
         deadline = time.monotonic() + update_budget
+        # Payloads are built before the first request, from one prefetch, and
+        # the ones Google already holds are dropped here, so neither the cap
+        # nor the budget is spent rewriting identical objects.
+        jobs, unchanged, failed = _prepare_refresh(profiles, class_id)
         updated = 0
-        failed = 0
         # 404 means the holder deleted the pass — classified apart from a real
         # failure, matching update_all_google_wallet_passes.
         not_found = 0
         attempted = 0
+        written = []
 
         # A non-positive budget means there is no room to start anything; fall
         # straight through to the stale accounting rather than handing httpx a
         # zero timeout.
         token_timeout = _remaining_timeout(deadline)
-        if token_timeout > 0:
+        if jobs and token_timeout > 0:
             try:
-                with httpx.Client(timeout=GOOGLE_WALLET_HTTP_TIMEOUT) as client:
+                # Sequential, unlike the sweep: this runs inside an admin
+                # request, and the budget is enforced by refusing to START
+                # work past the deadline, which concurrent requests already in
+                # flight would not honour.
+                with _wallet_client() as client:
                     # One exchange for the batch, and inside the budget as
                     # well: a stalled OAuth endpoint left at the 30s default
                     # would burn the whole allowance before a single pass had
@@ -489,7 +714,7 @@ def refresh_google_wallet_objects(profiles, context=""):
                         client=client, timeout=token_timeout
                     )
 
-                    for profile in profiles[:update_limit]:
+                    for profile, payload, payload_hash in jobs[:update_limit]:
                         remaining = _remaining_timeout(deadline)
                         if remaining <= 0:
                             break
@@ -501,6 +726,7 @@ def refresh_google_wallet_objects(profiles, context=""):
                                 access_token,
                                 client,
                                 timeout=remaining,
+                                payload=payload,
                             )
                         except Exception:
                             # One unreachable object must not strand the rest.
@@ -512,6 +738,7 @@ def refresh_google_wallet_objects(profiles, context=""):
                             continue
                         if result["success"]:
                             updated += 1
+                            written.append((profile, payload_hash))
                         elif "not found" in result["message"].lower():
                             not_found += 1
                         else:
@@ -527,21 +754,24 @@ def refresh_google_wallet_objects(profiles, context=""):
                     context or "bulk refresh",
                 )
 
+        _remember_payload_hashes(written)
+
         logger.info(
             "%s: updated %s of %s Google Wallet pass(es) "
-            "(%s failed, %s already deleted by their holder)",
+            "(%s unchanged, %s failed, %s already deleted by their holder)",
             context or "bulk refresh",
             updated,
             len(profiles),
+            unchanged,
             failed,
             not_found,
         )
 
-        skipped = len(profiles) - attempted
+        skipped = len(jobs) - attempted
         if skipped > 0:
             # Never silent, and never merely "delayed": unlike an Apple pass
             # past the push cap, these do not heal on a later poll.
-            stale = [p.google_wallet_object_id for p in profiles[attempted:]]
+            stale = [profile.google_wallet_object_id for profile, _, _ in jobs[attempted:]]
             logger.warning(
                 "%s: %s Google Wallet pass(es) left STALE (limit=%s, "
                 "budget=%ss) — Google has no client poll to heal them, so they "
@@ -558,31 +788,42 @@ def refresh_google_wallet_objects(profiles, context=""):
     return len(profile_ids)
 
 
-def update_all_google_wallet_passes():
+def update_all_google_wallet_passes(
+    force=False, concurrency=GOOGLE_WALLET_PATCH_CONCURRENCY
+):
     """
     Update all existing Google Wallet passes.
     Useful for batch updates after design changes.
 
-    Shares ONE token exchange and ONE keep-alive connection across the sweep,
-    like refresh_google_wallet_objects — the per-profile entry point minted a
-    fresh token and opened a fresh connection for every pass, so a sweep cost
-    two round trips and a TLS handshake each.
+    Shares ONE token exchange and ONE HTTP/2 client across the sweep. Profiles
+    are taken in chunks: each chunk's payloads are built from one bulk
+    prefetch (see _prepare_refresh), objects whose payload hash matches the
+    last successful PATCH are skipped, and the rest are PATCHed
+    ``concurrency`` at a time as multiplexed streams on the shared connection.
 
-    It does NOT inherit that helper's count limit or wall-clock budget. Those
-    exist because the bulk refresh runs inline in an admin request, and a slow
-    Google API would otherwise hold a human waiting. This is a maintenance
-    sweep with no request attached: stopping early would just leave passes
-    stale with nothing to finish them, so it runs to the end.
+    It does NOT inherit refresh_google_wallet_objects' count limit or
+    wall-clock budget. Those exist because the bulk refresh runs inline in an
+    admin request, and a slow Google API would otherwise hold a human waiting.
+    This is a maintenance sweep with no request attached: stopping early would
+    just leave passes stale with nothing to finish them, so it runs to the end.
+
+    Args:
+        force: PATCH every object, even those whose payload is unchanged —
+            for when the object was edited outside this code
+        concurrency: PATCH requests in flight at once
 
     Returns:
-        dict: {"updated": int, "failed": int, "skipped": int}
+        dict: {"updated": int, "failed": int, "skipped": int}, where skipped
+            counts objects left alone because nothing changed as well as those
+            the holder has already deleted
     """
     from ..models import CrushProfile
 
     profiles = list(
-        CrushProfile.objects.exclude(google_wallet_object_id__isnull=True).exclude(
-            google_wallet_object_id=""
-        )
+        CrushProfile.objects.exclude(google_wallet_object_id__isnull=True)
+        .exclude(google_wallet_object_id="")
+        .select_related("user")
+        .order_by("pk")
     )
 
     results = {"updated": 0, "failed": 0, "skipped": 0}
@@ -602,58 +843,46 @@ def update_all_google_wallet_passes():
         results["failed"] = len(profiles)
         return results
 
-    attempted = 0
+    unchanged = 0
+    processed = 0
     try:
-        with httpx.Client(timeout=GOOGLE_WALLET_HTTP_TIMEOUT) as client:
-            access_token = None
-            token_minted_at = 0.0
-
-            for profile in profiles:
-                # Re-minted rather than held for the whole sweep: a token is
-                # good for an hour, and an uncapped sweep over a large estate
-                # can outlive one. Minting per profile is what this change
-                # removed, so the expiry it used to hide has to be handled
-                # here instead.
-                if (
-                    access_token is None
-                    or time.monotonic() - token_minted_at
-                    >= GOOGLE_WALLET_TOKEN_REUSE_SECONDS
-                ):
-                    access_token = _get_access_token(client=client)
-                    token_minted_at = time.monotonic()
+        with _wallet_client(concurrency) as client:
+            access_token = _SharedAccessToken(client)
+            for start in range(0, len(profiles), GOOGLE_WALLET_REFRESH_CHUNK_SIZE):
+                chunk = profiles[start:start + GOOGLE_WALLET_REFRESH_CHUNK_SIZE]
+                jobs, chunk_unchanged, build_failed = _prepare_refresh(
+                    chunk, class_id, force=force
+                )
+                unchanged += chunk_unchanged
+                results["skipped"] += chunk_unchanged
+                results["failed"] += build_failed
 
-                attempted += 1
-                try:
-                    result = _patch_generic_object(
-                        profile, class_id, access_token, client
-                    )
-                except Exception:
-                    # One unreachable object must not strand the rest.
-                    logger.exception(
-                        "Failed updating Google Wallet object %s",
-                        profile.google_wallet_object_id,
-                    )
-                    results["failed"] += 1
-                    continue
-
-                if result["success"]:
-                    results["updated"] += 1
-                elif "not found" in result["message"].lower():
-                    results["skipped"] += 1
-                else:
-                    results["failed"] += 1
+                written = []
+                for outcome, profile, payload_hash in _patch_concurrently(
+                    jobs, class_id, client, access_token.get, concurrency
+                ):
+                    if outcome == "updated":
+                        results["updated"] += 1
+                        written.append((profile, payload_hash))
+                    elif outcome == "not_found":
+                        results["skipped"] += 1
+                    else:
+                        results["failed"] += 1
+                _remember_payload_hashes(written)
+                processed += len(chunk)
     except Exception:
-        # Nothing can be PATCHed without a token, so a failed exchange takes
-        # the rest of the sweep with it. Counted as failures rather than
-        # quietly dropped, so the caller's totals still add up to the estate.
+        # Counted as failures rather than quietly dropped, so the caller's
+        # totals still add up to the estate.
         logger.exception("Batch Google Wallet update could not finish")
-        results["failed"] += len(profiles) - attempted
+        results["failed"] += len(profiles) - processed
 
     logger.info(
-        "Batch Google Wallet update complete: %d updated, %d failed, %d skipped",
+        "Batch Google Wallet update complete: %d updated, %d failed, "
+        "%d skipped (%d unchanged)",
         results["updated"],
         results["failed"],
         results["skipped"],
+        unchanged,
     )
 
     return results
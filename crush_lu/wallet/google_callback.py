@@ -206,7 +206,13 @@ def _handle_pass_deleted(class_id, object_id, nonce):
             if profile:
                 # Clear the object ID since the user deleted the pass
                 profile.google_wallet_object_id = ""
-                profile.save(update_fields=["google_wallet_object_id"])
+                profile.google_wallet_payload_hash = ""
+                profile.save(
+                    update_fields=[
+                        "google_wallet_object_id",
+                        "google_wallet_payload_hash",
+                    ]
+                )
                 logger.info(
                     "Cleared google_wallet_object_id for user %s",
                     user_id
@@ -42,7 +42,11 @@ def _ensure_object_id(profile):
     object_suffix = secrets.token_hex(8)
     object_id = f"{issuer_id}.crush-{profile.user_id}-{object_suffix}"
     profile.google_wallet_object_id = object_id
-    profile.save(update_fields=["google_wallet_object_id"])
+    # A new object has never been PATCHed
+    profile.google_wallet_payload_hash = ""
+    profile.save(
+        update_fields=["google_wallet_object_id", "google_wallet_payload_hash"]
+    )
     return object_id
 
 
@@ -1,3 +1,4 @@
+import hashlib
 import secrets
 import importlib
 import json
@@ -23,6 +24,7 @@ logger = logging.getLogger(__name__)
 class PasskitPass:
     pkpass_bytes: bytes
     last_updated: datetime | None = None
+    etag: str | None = None
 
 
 def _load_callable(path):
@@ -425,9 +427,11 @@ def get_latest_pass(request, pass_type_identifier, serial_number):
             authentication_token=authentication_token,
         )
 
+    etag = None
     if isinstance(pass_result, PasskitPass):
         pkpass = pass_result.pkpass_bytes
         last_updated = pass_result.last_updated
+        etag = pass_result.etag
     elif isinstance(pass_result, tuple):
         pkpass, last_updated = pass_result
     else:
@@ -437,7 +441,22 @@ def get_latest_pass(request, pass_type_identifier, serial_number):
     if pkpass is None:
         return HttpResponse(status=404)
 
-    if last_updated and request.headers.get("If-Modified-Since"):
+    # Wallet re-fetches after every APNs push, usually for a pass that has not
+    # changed. Packages are built deterministically, so hashing the bytes is a
+    # valid validator for providers that do not supply their own.
+    if not etag:
+        etag = hashlib.sha256(pkpass).hexdigest()
+    etag = f'"{etag}"'
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        if etag in candidates or f"W/{etag}" in candidates or "*" in candidates:
+            response = HttpResponse(status=304)
+            response["ETag"] = etag
+            return response
+    elif last_updated and request.headers.get("If-Modified-Since"):
         try:
             if_modified_since = parse_http_date(request.headers["If-Modified-Since"])
             if if_modified_since and last_updated.timestamp() <= if_modified_since:
@@ -446,6 +465,7 @@ def get_latest_pass(request, pass_type_identifier, serial_number):
             pass
 
     response = HttpResponse(pkpass, content_type="application/vnd.apple.pkpass")
+    response["ETag"] = etag
     if last_updated:
         response["Last-Modified"] = http_date(last_updated.timestamp())
     return response
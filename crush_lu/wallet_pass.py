@@ -116,7 +116,11 @@ def get_next_event_for_pass(profile):
 
     if not registration:
         return None
+    return _format_next_event(registration)
 
+
+def _format_next_event(registration):
+    """The card's next-event block for one registration (see get_next_event_for_pass)."""
     event = registration.event
     result = {
         "title": event.title,
@@ -132,6 +136,35 @@ def get_next_event_for_pass(profile):
     return result
 
 
+def prefetch_wallet_pass_data(profiles, now=None):
+    """What build_wallet_pass_data looks up per profile, for a whole batch.
+
+    ``{profile.pk: {"referral_code": ReferralCode, "next_registration":
+    EventRegistration or None}}`` from two queries, where building each pass
+    on its own costs two per profile (plus one insert for every profile that
+    has no active referral code yet, either way). Hand each entry to
+    build_wallet_pass_data as ``prefetched``; event titles are still rendered
+    there, so they come out in whichever language is active at that point.
+    """
+    profiles = list(profiles)
+    codes = {}
+    for code in ReferralCode.objects.filter(
+        referrer__in=profiles, is_active=True
+    ).order_by("referrer_id", "-created_at"):
+        codes.setdefault(code.referrer_id, code)
+    registrations = get_next_event_registrations(
+        [profile.user_id for profile in profiles], now=now
+    )
+    return {
+        profile.pk: {
+            "referral_code": codes.get(profile.pk)
+            or ReferralCode.get_or_create_for_profile(profile),
+            "next_registration": registrations.get(profile.user_id),
+        }
+        for profile in profiles
+    }
+
+
 def get_membership_tier_display(profile):
     """
     Returns a display-friendly membership tier string.
@@ -165,6 +198,8 @@ def get_profile_photo_url(profile, request=None):
         return None
 
     try:
+        # The original upload, not a WebP/AVIF rendition: Google Wallet's
+        # heroImage only accepts JPEG or PNG
         photo_url = profile.photo_1.url
         if request:
             return request.build_absolute_uri(photo_url)
@@ -173,7 +208,7 @@ def get_profile_photo_url(profile, request=None):
         return None
 
 
-def build_wallet_pass_data(profile, request=None, base_url=None):
+def build_wallet_pass_data(profile, request=None, base_url=None, prefetched=None):
     """
     Build complete wallet pass data for a user profile.
 
@@ -181,12 +216,23 @@ def build_wallet_pass_data(profile, request=None, base_url=None):
         profile: CrushProfile instance
         request: Optional HttpRequest for building absolute URLs
         base_url: Optional base URL override
+        prefetched: Optional entry of prefetch_wallet_pass_data() for this
+            profile, so a batch does not query per pass
 
     Returns:
         Dictionary with all pass data
     """
-    referral_url = build_wallet_pass_barcode_value(profile, request=request, base_url=base_url)
-    next_event = get_next_event_for_pass(profile)
+    if prefetched is None:
+        referral_url = build_wallet_pass_barcode_value(
+            profile, request=request, base_url=base_url
+        )
+        next_event = get_next_event_for_pass(profile)
+    else:
+        referral_url = build_referral_url(
+            prefetched["referral_code"].code, base_url=base_url, language_neutral=True
+        )
+        registration = prefetched["next_registration"]
+        next_event = _format_next_event(registration) if registration else None
     tier_display = get_membership_tier_display(profile)
     photo_url = get_profile_photo_url(profile, request=request)
 
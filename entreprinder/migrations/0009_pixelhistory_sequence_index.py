@@ -0,0 +1,19 @@
+# Generated by Django 6.0.7 on 2026-10-17 01:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entreprinder', '0008_repair_site_names'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pixelhistory',
+            index=models.Index(fields=['canvas', 'id'], name='vibe_pixhist_canvas_seq_idx'),
+        ),
+    ]
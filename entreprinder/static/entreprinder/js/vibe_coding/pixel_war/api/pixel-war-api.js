@@ -81,13 +81,72 @@ export class PixelWarAPI {
         return this.request(`${PixelWarConfig.api.endpoints.canvasState}${canvasId}/`);
     }
 
-    async getPixelHistory(canvasId, limit = 20) {
+    /**
+     * Load the binary canvas snapshot, decoded by decodeCanvasSnapshot.
+     */
+    async getCanvasSnapshot(canvasId) {
+        let response;
+        try {
+            response = await fetch(
+                `${this.baseUrl}${PixelWarConfig.api.endpoints.canvasSnapshot}${canvasId}/`,
+            );
+        } catch (error) {
+            throw new APIError("Network error", 0, null);
+        }
+        if (!response.ok) {
+            throw new APIError("Request failed", response.status, null);
+        }
+        return decodeCanvasSnapshot(await response.arrayBuffer());
+    }
+
+    async getCanvasDelta(canvasId, since) {
+        return this.request(
+            `${PixelWarConfig.api.endpoints.canvasDelta}${canvasId}/?since=${since}`,
+        );
+    }
+
+    async getPixelHistory(canvasId, limit = 20, cell = null) {
+        const at = cell ? `&x=${cell.x}&y=${cell.y}` : "";
         return this.request(
-            `${PixelWarConfig.api.endpoints.pixelHistory}?canvas_id=${canvasId}&limit=${limit}`,
+            `${PixelWarConfig.api.endpoints.pixelHistory}?canvas_id=${canvasId}&limit=${limit}${at}`,
         );
     }
 }
 
+/**
+ * Decode a binary canvas snapshot (HTTP or the live socket's first message):
+ * a 4-byte big-endian header length, a JSON header, then one big-endian
+ * palette index per pixel (0 = empty). Returns { sequence, pixels } with
+ * pixels keyed "x,y" like getCanvasState's, minus placed_by: the tooltip
+ * looks the author up per hovered pixel (getPixelHistory with a cell).
+ */
+export function decodeCanvasSnapshot(buffer) {
+    const view = new DataView(buffer);
+    const headerLength = view.getUint32(0);
+    const header = JSON.parse(
+        new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)),
+    );
+    const size = header.bytes_per_pixel;
+    const offset = 4 + headerLength;
+
+    const pixels = {};
+    for (let cell = 0; cell < header.width * header.height; cell++) {
+        const at = offset + cell * size;
+        const index =
+            size === 1
+                ? view.getUint8(at)
+                : size === 2
+                  ? view.getUint16(at)
+                  : view.getUint32(at);
+        if (index) {
+            const x = cell % header.width;
+            const y = Math.floor(cell / header.width);
+            pixels[`${x},${y}`] = { color: header.palette[index] };
+        }
+    }
+    return { sequence: header.sequence, pixels };
+}
+
 export class APIError extends Error {
     constructor(message, status, data) {
         super(message);
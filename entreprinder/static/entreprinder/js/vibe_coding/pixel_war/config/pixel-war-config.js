@@ -20,10 +20,14 @@ export const PixelWarConfig = {
     },
     api: {
         updateInterval: 2000,
+        liveSocket: "/ws/pixel-war/",
+        liveReconnectMs: 5000,
         retryAttempts: 3,
         endpoints: {
             placePixel: "/vibe-coding/api/place-pixel/",
             canvasState: "/vibe-coding/api/canvas-state/",
+            canvasSnapshot: "/vibe-coding/api/canvas-snapshot/",
+            canvasDelta: "/vibe-coding/api/canvas-delta/",
             pixelHistory: "/vibe-coding/api/pixel-history/",
         },
     },
@@ -7,7 +7,11 @@
  */
 
 import { PixelWarConfig } from "../config/pixel-war-config.js";
-import { PixelWarAPI, APIError } from "../api/pixel-war-api.js";
+import {
+    PixelWarAPI,
+    APIError,
+    decodeCanvasSnapshot,
+} from "../api/pixel-war-api.js";
 import { CanvasRenderer } from "../rendering/canvas-renderer.js";
 import InputHandler from "../input/input-handler.js";
 import GestureHandler from "../input/gesture-handler.js";
@@ -104,6 +108,11 @@ export class PixelWar {
         // Animation
         this.animationFrame = null;
         this.updateInterval = null;
+        // Canvas sequence the board is synced to (see loadCanvasState)
+        this.sequence = undefined;
+        // Live placements; polling only runs while this is not open
+        this.liveSocket = null;
+        this.liveReconnect = null;
         this.lastFrameTime = 0;
 
         // Force correct grid dimensions for backwards compatibility
@@ -141,6 +150,10 @@ export class PixelWar {
             this.initializeZoom();
 
             this.isRunning = true;
+
+            // Live updates, with polling as the fallback
+            this.connectLiveUpdates();
+
             this.notifications.show("Canvas ready!", "success");
         } catch (error) {
             console.error("Failed to initialize PixelWar:", error);
@@ -1285,7 +1298,11 @@ export class PixelWar {
 
         let tooltipText = `X: ${x}, Y: ${y}`;
         if (existingPixel) {
-            tooltipText += ` (${existingPixel.placed_by || "Unknown"})`;
+            if (existingPixel.placed_by === undefined) {
+                // From the snapshot, which has no authors: ask for this one
+                this.lookupPixelAuthor(x, y, existingPixel);
+            }
+            tooltipText += ` (${existingPixel.placed_by || "…"})`;
         }
 
         tooltip.textContent = tooltipText;
@@ -1300,6 +1317,28 @@ export class PixelWar {
         tooltip.style.top = `${screenY - 25}px`;
     }
 
+    async lookupPixelAuthor(x, y, pixel) {
+        if (pixel.authorLookup) return;
+        pixel.authorLookup = true;
+        try {
+            const response = await this.api.getPixelHistory(this.config.id, 1, {
+                x,
+                y,
+            });
+            pixel.placed_by = response.history?.[0]?.placed_by || "Unknown";
+        } catch (error) {
+            pixel.placed_by = "Unknown";
+        }
+        // Still hovering the same pixel: show the author now
+        if (
+            this.hoveredPixel.x === x &&
+            this.hoveredPixel.y === y &&
+            this.renderer.pixels[`${x},${y}`] === pixel
+        ) {
+            this.updateTooltip(x, y);
+        }
+    }
+
     hideTooltip() {
         const tooltip = document.getElementById("pixelTooltip");
         if (tooltip) {
@@ -1372,12 +1411,33 @@ export class PixelWar {
 
     async loadCanvasState() {
         try {
-            const response = await this.api.getCanvasState(this.config.id);
-
-            if (response.success) {
-                this.renderer.setPixels(response.pixels);
-                this.render();
+            // Whole board once, then only the pixels placed since
+            if (this.sequence !== undefined) {
+                const delta = await this.api.getCanvasDelta(
+                    this.config.id,
+                    this.sequence,
+                );
+                if (delta.success && !delta.reset) {
+                    for (const pixel of delta.pixels) {
+                        this.renderer.updatePixel(
+                            pixel.x,
+                            pixel.y,
+                            pixel.color,
+                            pixel.placed_by,
+                        );
+                    }
+                    this.sequence = delta.sequence;
+                    if (delta.pixels.length) {
+                        this.render();
+                    }
+                    return;
+                }
             }
+
+            const snapshot = await this.api.getCanvasSnapshot(this.config.id);
+            this.renderer.setPixels(snapshot.pixels);
+            this.sequence = snapshot.sequence;
+            this.render();
         } catch (error) {
             console.error("Failed to load canvas state:", error);
             this.notifications.show("Failed to load canvas", "error");
@@ -1518,12 +1578,65 @@ export class PixelWar {
 
         // Update canvas state less frequently
         this.updateInterval = setInterval(async () => {
-            await this.loadCanvasState();
+            if (!this.isLive()) {
+                await this.loadCanvasState();
+            }
             await this.loadRecentActivity();
             this.rateLimiter.checkReset();
         }, PixelWarConfig.api.updateInterval);
     }
 
+    isLive() {
+        return this.liveSocket?.readyState === WebSocket.OPEN;
+    }
+
+    connectLiveUpdates() {
+        if (!("WebSocket" in window) || !this.isRunning) {
+            return;
+        }
+        const scheme = window.location.protocol === "https:" ? "wss" : "ws";
+        const socket = new WebSocket(
+            `${scheme}://${window.location.host}${PixelWarConfig.api.liveSocket}${this.config.id}/`,
+        );
+        socket.binaryType = "arraybuffer";
+
+        socket.onmessage = (message) => {
+            if (message.data instanceof ArrayBuffer) {
+                // Snapshot on connect: replaces whatever polling had
+                const snapshot = decodeCanvasSnapshot(message.data);
+                this.renderer.setPixels(snapshot.pixels);
+                this.sequence = snapshot.sequence;
+                this.render();
+                return;
+            }
+            const frame = JSON.parse(message.data);
+            if (frame.type === "pixels") {
+                for (const pixel of frame.pixels) {
+                    this.renderer.updatePixel(
+                        pixel.x,
+                        pixel.y,
+                        pixel.color,
+                        pixel.placed_by,
+                    );
+                }
+                this.render();
+            }
+        };
+
+        socket.onclose = () => {
+            this.liveSocket = null;
+            // Polling resumes from the last snapshot's sequence meanwhile
+            if (this.isRunning) {
+                this.liveReconnect = setTimeout(
+                    () => this.connectLiveUpdates(),
+                    PixelWarConfig.api.liveReconnectMs,
+                );
+            }
+        };
+
+        this.liveSocket = socket;
+    }
+
     setupTouchModeToggle() {
         // Comprehensive mobile/touch device detection
         const forceShow = localStorage.getItem("forceMobileMode") === "true";
@@ -1917,7 +2030,12 @@ export class PixelWar {
             clearInterval(this.uiUpdateInterval);
         }
 
-        this.inputHandler.destroy();
         this.isRunning = false;
+        clearTimeout(this.liveReconnect);
+        if (this.liveSocket) {
+            this.liveSocket.close();
+        }
+
+        this.inputHandler.destroy();
     }
 }
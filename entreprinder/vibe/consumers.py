@@ -0,0 +1,81 @@
+"""
+Pixel War live canvas WebSocket consumer.
+
+A read-only relay: placements still go through ``place_pixel`` over HTTP
+(rate limits, cooldowns), which broadcasts each accepted pixel to the
+canvas group. Each connection then:
+
+- receives the binary canvas snapshot (see snapshot.py) on connect;
+- receives placements as JSON frames, coalesced into FRAME_SECONDS windows
+  so a burst of placements is one message rather than one per pixel.
+
+When WebSockets/Redis are unavailable the client falls back to polling
+``get_canvas_delta``, so broadcasts are never the only source of truth.
+"""
+
+import asyncio
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+# How long placements are held to go out together
+FRAME_SECONDS = 0.1
+
+
+def canvas_group(canvas_id):
+    return f"pixel_war_{canvas_id}"
+
+
+class PixelWarConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
+        self.canvas_id = int(self.scope["url_route"]["kwargs"]["canvas_id"])
+        self.pending = []
+        self.flush_task = None
+
+        # Join before taking the snapshot: a placement racing the connect is
+        # then sent twice (harmless) rather than lost
+        self.group = canvas_group(self.canvas_id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+
+        snapshot = await self._snapshot()
+        if snapshot is None:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+            self.group = None
+            await self.close()
+            return
+        await self.accept()
+        await self.send(bytes_data=snapshot)
+
+    async def disconnect(self, close_code):
+        if getattr(self, "flush_task", None):
+            self.flush_task.cancel()
+        if getattr(self, "group", None):
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Read-only: placements go through place_pixel, which carries the
+        # cooldowns and per-minute limits.
+        pass
+
+    @database_sync_to_async
+    def _snapshot(self):
+        from .models import PixelCanvas
+        from .snapshot import canvas_snapshot, encode_snapshot
+
+        canvas = PixelCanvas.objects.filter(pk=self.canvas_id, is_active=True).first()
+        if canvas is None:
+            return None
+        return encode_snapshot(canvas_snapshot(canvas))
+
+    # ---- server→client relay ----
+
+    async def pixel_placed(self, event):
+        self.pending.append(event["pixel"])
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(FRAME_SECONDS)
+        pixels, self.pending = self.pending, []
+        self.flush_task = None
+        await self.send_json({"type": "pixels", "pixels": pixels})
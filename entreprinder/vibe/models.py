@@ -60,6 +60,10 @@ class PixelHistory(models.Model):
     class Meta:
         db_table = 'vibe_coding_pixelhistory'
         ordering = ['-placed_at']
+        indexes = [
+            # The id is the canvas sequence number for snapshots and deltas
+            models.Index(fields=['canvas', 'id'], name='vibe_pixhist_canvas_seq_idx'),
+        ]
 
     def __str__(self):
         return f"History ({self.x}, {self.y}) - {self.color} at {self.placed_at}"
@@ -0,0 +1,7 @@
+from django.urls import re_path
+
+from entreprinder.vibe.consumers import PixelWarConsumer
+
+websocket_urlpatterns = [
+    re_path(r"ws/pixel-war/(?P<canvas_id>\d+)/$", PixelWarConsumer.as_asgi()),
+]
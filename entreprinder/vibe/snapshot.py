@@ -0,0 +1,279 @@
+"""
+Compact Pixel War canvas snapshots and deltas.
+
+get_canvas_state serializes every Pixel row (and its placer) per poll. The
+snapshot is the whole board as one palette-indexed buffer instead, cached
+per canvas and brought up to date from PixelHistory, whose primary key
+doubles as the canvas sequence number:
+
+    {"width": int, "height": int, "palette": [None, "#FF0000", ...],
+     "bytes_per_pixel": 1 | 2 | 4, "pixels": bytearray,
+     "sequence": int, "applied": int, "etag": str}
+
+``pixels`` is row-major (``(y * width + x) * bytes_per_pixel``), each cell
+a big-endian palette index; index 0 is a pixel never placed. The palette
+grows as colors are seen, widening the cells past 255 colors.
+
+History ids are handed out before their row commits, so one can become
+visible after a higher one. ``sequence`` therefore only advances over rows
+older than SETTLE_SECONDS; rows after it are replayed on every catch-up,
+which is harmless since replaying a suffix of history in id order ends on
+the same board. ``applied`` is the highest id folded in. Deltas use the
+same watermark, so a client may receive a row twice but never miss one.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Pixel, PixelHistory
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached dict changes shape
+SNAPSHOT_VERSION = 1
+
+# Safety net for writes that bypass PixelHistory (admin edits, deletes)
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+
+# How long a history row may take to commit after its id is assigned
+SETTLE_SECONDS = 5
+
+# Catching up on more rows than this is slower than rebuilding
+MAX_CATCH_UP = 5000
+
+# A client further behind than this reloads the snapshot instead
+MAX_DELTA = 2000
+
+
+def _cache_key(canvas_id):
+    return f"vibe:canvas_snapshot:v{SNAPSHOT_VERSION}:{canvas_id}"
+
+
+def _latest_sequence(canvas):
+    return (
+        PixelHistory.objects.filter(canvas=canvas)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+        or 0
+    )
+
+
+def _settled_sequence(canvas, cutoff):
+    return (
+        PixelHistory.objects.filter(canvas=canvas, placed_at__lte=cutoff)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+        or 0
+    )
+
+
+def _bytes_per_pixel(palette_size):
+    if palette_size <= 1 << 8:
+        return 1
+    if palette_size <= 1 << 16:
+        return 2
+    return 4
+
+
+class _Board:
+    """Writes into a snapshot dict, widening its cells when the palette outgrows them."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.indexes = {color: i for i, color in enumerate(snapshot["palette"]) if i}
+
+    def paint(self, x, y, color):
+        snapshot = self.snapshot
+        width = snapshot["width"]
+        if not (0 <= x < width and 0 <= y < snapshot["height"]):
+            return
+        index = self.indexes.get(color)
+        if index is None:
+            index = len(snapshot["palette"])
+            snapshot["palette"].append(color)
+            self.indexes[color] = index
+            if _bytes_per_pixel(len(snapshot["palette"])) > snapshot["bytes_per_pixel"]:
+                self._widen()
+        size = snapshot["bytes_per_pixel"]
+        offset = (y * width + x) * size
+        snapshot["pixels"][offset:offset + size] = index.to_bytes(size, "big")
+
+    def _widen(self):
+        snapshot = self.snapshot
+        old = snapshot["bytes_per_pixel"]
+        new = _bytes_per_pixel(len(snapshot["palette"]))
+        cells = snapshot["pixels"]
+        widened = bytearray(len(cells) // old * new)
+        for cell in range(len(cells) // old):
+            index = int.from_bytes(cells[cell * old:(cell + 1) * old], "big")
+            widened[cell * new:(cell + 1) * new] = index.to_bytes(new, "big")
+        snapshot["pixels"] = widened
+        snapshot["bytes_per_pixel"] = new
+
+
+def build_snapshot(canvas):
+    """Encode the board from the Pixel table."""
+    # Taken before the pixels are read: every row after it is replayed on top
+    sequence = _settled_sequence(
+        canvas, timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    )
+    snapshot = {
+        "width": canvas.width,
+        "height": canvas.height,
+        "palette": [None],
+        "bytes_per_pixel": 1,
+        "pixels": bytearray(canvas.width * canvas.height),
+        "sequence": sequence,
+        "applied": sequence,
+        "etag": "",
+    }
+    board = _Board(snapshot)
+    for x, y, color in Pixel.objects.filter(canvas=canvas).values_list(
+        "x", "y", "color"
+    ).order_by():
+        board.paint(x, y, color)
+    # Only the last SETTLE_SECONDS of history, so no limit
+    _replay(snapshot, _history_after(canvas, sequence))
+    return snapshot
+
+
+def catch_up(snapshot, canvas):
+    """Fold history newer than the snapshot's sequence into it.
+
+    Returns False when there was nothing to fold in.
+    """
+    rows = _history_after(canvas, snapshot["sequence"])[:MAX_CATCH_UP]
+    if len(rows) == MAX_CATCH_UP:
+        snapshot.update(build_snapshot(canvas))
+        return True
+    return _replay(snapshot, rows)
+
+
+def _history_after(canvas, sequence):
+    return (
+        PixelHistory.objects.filter(canvas=canvas, id__gt=sequence)
+        .order_by("id")
+        .values_list("id", "x", "y", "color", "placed_at")
+    )
+
+
+def _replay(snapshot, rows):
+    rows = list(rows)
+    if rows:
+        cutoff = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+        board = _Board(snapshot)
+        settled = True
+        for row_id, x, y, color, placed_at in rows:
+            board.paint(x, y, color)
+            settled = settled and placed_at <= cutoff
+            if settled:
+                snapshot["sequence"] = row_id
+        snapshot["applied"] = max(snapshot["applied"], rows[-1][0])
+    _seal(snapshot)
+    return bool(rows)
+
+
+def _seal(snapshot):
+    snapshot["etag"] = '"{}"'.format(
+        hashlib.md5(
+            bytes(snapshot["pixels"]) + json.dumps(snapshot["palette"]).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+    )
+
+
+def canvas_snapshot(canvas):
+    """The current snapshot for ``canvas``, from cache when still current."""
+    key = _cache_key(canvas.id)
+    snapshot = cache.get(key)
+    if (
+        snapshot is None
+        or snapshot["width"] != canvas.width
+        or snapshot["height"] != canvas.height
+    ):
+        snapshot = build_snapshot(canvas)
+        cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+        return snapshot
+
+    latest = _latest_sequence(canvas)
+    if latest < snapshot["applied"]:
+        # History was pruned or reset under the snapshot
+        snapshot = build_snapshot(canvas)
+        cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    elif latest > snapshot["applied"] or snapshot["sequence"] < snapshot["applied"]:
+        catch_up(snapshot, canvas)
+        cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def record_placement(canvas):
+    """Fold a just-placed pixel into the cached snapshot, if there is one.
+
+    Never raises: the placement has already been saved, and the next read
+    catches up regardless.
+    """
+    key = _cache_key(canvas.id)
+    try:
+        snapshot = cache.get(key)
+        if snapshot is None or snapshot["width"] != canvas.width:
+            return
+        if catch_up(snapshot, canvas):
+            cache.set(key, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception("Could not update the snapshot of canvas %s", canvas.id)
+
+
+def encode_snapshot(snapshot):
+    """The wire format: a 4-byte big-endian header length, a JSON header, the cells."""
+    header = json.dumps(
+        {
+            "width": snapshot["width"],
+            "height": snapshot["height"],
+            "sequence": snapshot["sequence"],
+            "bytes_per_pixel": snapshot["bytes_per_pixel"],
+            "palette": snapshot["palette"],
+        }
+    ).encode()
+    return len(header).to_bytes(4, "big") + header + bytes(snapshot["pixels"])
+
+
+def canvas_delta(canvas, since):
+    """History rows after ``since`` and the sequence to ask from next.
+
+    Returns None when the client should reload the snapshot: it is too far
+    behind, or its sequence is ahead of a history that was reset.
+    """
+    rows = list(
+        PixelHistory.objects.filter(canvas=canvas, id__gt=since)
+        .select_related("placed_by")
+        .order_by("id")[:MAX_DELTA + 1]
+    )
+    if len(rows) > MAX_DELTA:
+        return None
+    if not rows:
+        if since > _latest_sequence(canvas):
+            return None
+        return since, []
+
+    cutoff = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    sequence = since
+    for row in rows:
+        if row.placed_at > cutoff:
+            break
+        sequence = row.id
+    return sequence, [
+        {
+            "x": row.x,
+            "y": row.y,
+            "color": row.color,
+            "placed_by": row.placed_by.username if row.placed_by else "Anonymous",
+        }
+        for row in rows
+    ]
@@ -0,0 +1,120 @@
+"""Tests for the Pixel War live canvas consumer and its broadcasts."""
+
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from entreprinder.vibe.consumers import FRAME_SECONDS, PixelWarConsumer
+from entreprinder.vibe.models import Pixel, PixelCanvas
+
+
+class PixelWarConsumerTests(TestCase):
+    """Live Pixel War broadcasts: snapshot on connect, batched frames."""
+
+    def setUp(self):
+        cache.clear()
+        self.canvas = PixelCanvas.objects.create(
+            width=10, height=10, anonymous_pixels_per_minute=100
+        )
+        # database_sync_to_async closes connections around each hop, which
+        # would close the test transaction's connection
+        patcher = mock.patch('channels.db.close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _consumer(self):
+        consumer = PixelWarConsumer()
+        consumer.scope = {'url_route': {'kwargs': {'canvas_id': str(self.canvas.id)}}}
+        consumer.channel_name = 'test-channel-name'
+        consumer.channel_layer = mock.AsyncMock()
+        consumer.accept = mock.AsyncMock()
+        consumer.close = mock.AsyncMock()
+        consumer.send = mock.AsyncMock()
+        consumer.send_json = mock.AsyncMock()
+        return consumer
+
+    def test_connect_joins_the_canvas_and_sends_the_snapshot(self):
+        Pixel.objects.create(canvas=self.canvas, x=2, y=3, color='#FF0000')
+        consumer = self._consumer()
+
+        async_to_sync(consumer.connect)()
+
+        consumer.channel_layer.group_add.assert_awaited_once_with(
+            f'pixel_war_{self.canvas.id}', 'test-channel-name'
+        )
+        consumer.accept.assert_awaited_once()
+        body = consumer.send.await_args.kwargs['bytes_data']
+        length = int.from_bytes(body[:4], 'big')
+        header = json.loads(body[4:4 + length])
+        self.assertEqual(header['palette'][body[4 + length + 3 * 10 + 2]], '#FF0000')
+
+    def test_inactive_canvas_is_refused(self):
+        self.canvas.is_active = False
+        self.canvas.save()
+        consumer = self._consumer()
+
+        async_to_sync(consumer.connect)()
+
+        consumer.close.assert_awaited_once()
+        consumer.accept.assert_not_awaited()
+        consumer.channel_layer.group_discard.assert_awaited_once()
+
+    def _placed(self, consumer, x):
+        return consumer.pixel_placed(
+            {'type': 'pixel.placed', 'pixel': {'x': x, 'y': 0, 'color': '#000000'}}
+        )
+
+    def test_a_burst_of_placements_goes_out_as_one_frame(self):
+        consumer = self._consumer()
+        consumer.pending, consumer.flush_task = [], None
+
+        async def burst():
+            # Spread over most of one window, not all in the same tick
+            for x in range(4):
+                await self._placed(consumer, x)
+                await asyncio.sleep(FRAME_SECONDS / 5)
+            await asyncio.sleep(FRAME_SECONDS)
+
+        async_to_sync(burst)()
+
+        consumer.send_json.assert_awaited_once()
+        frame = consumer.send_json.await_args.args[0]
+        self.assertEqual(frame['type'], 'pixels')
+        self.assertEqual([p['x'] for p in frame['pixels']], [0, 1, 2, 3])
+        self.assertEqual(consumer.pending, [])
+
+    def test_a_placement_after_the_frame_starts_the_next_one(self):
+        consumer = self._consumer()
+        consumer.pending, consumer.flush_task = [], None
+
+        async def two_bursts():
+            await self._placed(consumer, 0)
+            await self._placed(consumer, 1)
+            await asyncio.sleep(FRAME_SECONDS * 2)
+            await self._placed(consumer, 2)
+            await asyncio.sleep(FRAME_SECONDS * 2)
+
+        async_to_sync(two_bursts)()
+
+        frames = [call.args[0]['pixels'] for call in consumer.send_json.await_args_list]
+        self.assertEqual([[p['x'] for p in pixels] for pixels in frames], [[0, 1], [2]])
+
+    def test_place_pixel_broadcasts_to_the_canvas_group(self):
+        channel_layer = mock.Mock(group_send=mock.AsyncMock())
+        with mock.patch('entreprinder.vibe.views.get_channel_layer', return_value=channel_layer):
+            Client(HTTP_HOST='entreprinder.lu').post(
+                '/vibe-coding/api/place-pixel/',
+                data=json.dumps({'x': 4, 'y': 5, 'color': '#00FF00', 'canvas_id': self.canvas.id}),
+                content_type='application/json',
+            )
+
+        group, message = channel_layer.group_send.await_args.args
+        self.assertEqual(group, f'pixel_war_{self.canvas.id}')
+        self.assertEqual(message['type'], 'pixel.placed')
+        self.assertEqual(
+            message['pixel'], {'x': 4, 'y': 5, 'color': '#00FF00', 'placed_by': 'Anonymous'}
+        )
@@ -0,0 +1,112 @@
+"""Tests for the Pixel War canvas snapshot and delta endpoints."""
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from entreprinder.vibe.models import Pixel, PixelCanvas
+
+
+class PixelCanvasSnapshotTests(TestCase):
+    """Binary snapshot and delta sync for the Pixel War canvas."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(HTTP_HOST='entreprinder.lu')
+        self.canvas = PixelCanvas.objects.create(
+            width=10, height=10, anonymous_pixels_per_minute=100
+        )
+
+    def _place(self, x, y, color):
+        response = self.client.post(
+            '/vibe-coding/api/place-pixel/',
+            data=json.dumps({'x': x, 'y': y, 'color': color, 'canvas_id': self.canvas.id}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _snapshot(self, **headers):
+        return self.client.get(f'/vibe-coding/api/canvas-snapshot/{self.canvas.id}/', **headers)
+
+    def _decode(self, body):
+        length = int.from_bytes(body[:4], 'big')
+        header = json.loads(body[4:4 + length])
+        size = header['bytes_per_pixel']
+        cells = body[4 + length:]
+        pixels = {}
+        for cell in range(header['width'] * header['height']):
+            index = int.from_bytes(cells[cell * size:(cell + 1) * size], 'big')
+            if index:
+                pixels[(cell % header['width'], cell // header['width'])] = header['palette'][index]
+        return header, pixels
+
+    def test_snapshot_carries_every_placed_pixel(self):
+        self._place(1, 2, '#FF0000')
+        self._snapshot()  # cached before the next placement
+        self._place(3, 4, '#0000FF')
+        self._place(1, 2, '#00FF00')
+
+        response = self._snapshot()
+
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        header, pixels = self._decode(response.content)
+        self.assertEqual(pixels, {(1, 2): '#00FF00', (3, 4): '#0000FF'})
+        self.assertEqual(len(response.content), 4 + int.from_bytes(response.content[:4], 'big') + 100)
+
+    def test_unchanged_snapshot_is_not_resent(self):
+        self._place(0, 0, '#FF0000')
+        etag = self._snapshot()['ETag']
+
+        self.assertEqual(self._snapshot(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self._place(0, 1, '#FF0000')
+        self.assertEqual(self._snapshot(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_delta_returns_only_later_pixels(self):
+        from entreprinder.vibe import snapshot
+        self._place(0, 0, '#FF0000')
+        with mock.patch.object(snapshot, 'SETTLE_SECONDS', 0):
+            header, _pixels = self._decode(self._snapshot().content)
+        self._place(5, 5, '#0000FF')
+
+        response = self.client.get(
+            f'/vibe-coding/api/canvas-delta/{self.canvas.id}/', {'since': header['sequence']}
+        )
+
+        data = response.json()
+        self.assertEqual([(p['x'], p['y'], p['color']) for p in data['pixels']], [(5, 5, '#0000FF')])
+        # Too recent to be sure nothing commits before it: asked for again next time
+        self.assertEqual(data['sequence'], header['sequence'])
+
+    def test_delta_ahead_of_history_asks_for_a_reload(self):
+        response = self.client.get(f'/vibe-coding/api/canvas-delta/{self.canvas.id}/', {'since': 999})
+
+        self.assertTrue(response.json()['reset'])
+
+    def test_history_of_one_cell_names_its_author(self):
+        # The snapshot has no authors; the hover tooltip asks for the cell's
+        self._place(1, 2, '#FF0000')
+        self._place(3, 4, '#0000FF')
+
+        response = self.client.get(
+            '/vibe-coding/api/pixel-history/',
+            {'canvas_id': self.canvas.id, 'limit': 1, 'x': 1, 'y': 2},
+        )
+
+        history = response.json()['history']
+        self.assertEqual([(h['x'], h['y'], h['placed_by']) for h in history], [(1, 2, 'Anonymous')])
+
+    def test_cells_widen_past_255_colors(self):
+        from entreprinder.vibe.snapshot import build_snapshot
+        canvas = PixelCanvas.objects.create(width=20, height=20)
+        Pixel.objects.bulk_create(
+            Pixel(canvas=canvas, x=i % 20, y=i // 20, color=f'#{i:06X}') for i in range(300)
+        )
+
+        snapshot = build_snapshot(canvas)
+
+        self.assertEqual(snapshot['bytes_per_pixel'], 2)
+        cell = (299 // 20 * 20 + 299 % 20) * 2
+        index = int.from_bytes(snapshot['pixels'][cell:cell + 2], 'big')
+        self.assertEqual(snapshot['palette'][index], '#00012B')
@@ -22,6 +22,10 @@ urlpatterns = [
     path('road-trip-music-game/', views.road_trip_music_game, name='road_trip_music_game'),
     path('api/canvas-state/', views.get_canvas_state, name='canvas_state'),
     path('api/canvas-state/<int:canvas_id>/', views.get_canvas_state, name='canvas_state_by_id'),
+    path('api/canvas-snapshot/', views.get_canvas_snapshot, name='canvas_snapshot'),
+    path('api/canvas-snapshot/<int:canvas_id>/', views.get_canvas_snapshot, name='canvas_snapshot_by_id'),
+    path('api/canvas-delta/', views.get_canvas_delta, name='canvas_delta'),
+    path('api/canvas-delta/<int:canvas_id>/', views.get_canvas_delta, name='canvas_delta_by_id'),
     path('api/place-pixel/', views.place_pixel, name='place_pixel'),
     path('api/pixel-history/', views.get_pixel_history, name='pixel_history'),
 ]
@@ -5,12 +5,16 @@ Vibe Coding Views - Pixel War and Games
 
 from django.shortcuts import render, get_object_or_404
 from django.utils.translation import gettext as _
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.utils import timezone
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 import json
 import logging
 
+from . import snapshot as canvas_snapshots
+from .consumers import canvas_group
 from .models import PixelCanvas, Pixel, PixelHistory, UserPixelCooldown, UserPixelStats
 
 logger = logging.getLogger(__name__)
@@ -218,7 +222,7 @@ def get_canvas_state(request, canvas_id=None):
     if not canvas:
         return JsonResponse({'error': 'No canvas found'}, status=404)
 
-    pixels = canvas.pixels.all()
+    pixels = canvas.pixels.select_related('placed_by')
     pixel_data = {}
 
     for pixel in pixels:
@@ -246,6 +250,74 @@ def get_canvas_state(request, canvas_id=None):
     })
 
 
+def get_canvas_snapshot(request, canvas_id=None):
+    """The whole canvas as a palette-indexed binary snapshot.
+
+    See entreprinder/vibe/snapshot.py for the format. Clients load this
+    once and then poll get_canvas_delta from its sequence.
+    """
+    if canvas_id:
+        canvas = get_object_or_404(PixelCanvas, id=canvas_id)
+    else:
+        canvas = PixelCanvas.objects.first()
+
+    if not canvas:
+        return JsonResponse({'error': 'No canvas found'}, status=404)
+
+    snapshot = canvas_snapshots.canvas_snapshot(canvas)
+    headers = {'ETag': snapshot['etag'], 'Cache-Control': 'no-cache'}
+    if request.headers.get('If-None-Match') == snapshot['etag']:
+        return HttpResponse(status=304, headers=headers)
+
+    return HttpResponse(
+        canvas_snapshots.encode_snapshot(snapshot),
+        content_type='application/octet-stream',
+        headers=headers,
+    )
+
+
+def get_canvas_delta(request, canvas_id=None):
+    """Pixels placed since a snapshot or delta ``sequence``"""
+    if canvas_id:
+        canvas = get_object_or_404(PixelCanvas, id=canvas_id)
+    else:
+        canvas = PixelCanvas.objects.first()
+
+    if not canvas:
+        return JsonResponse({'error': 'No canvas found'}, status=404)
+
+    try:
+        since = int(request.GET['since'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+
+    delta = canvas_snapshots.canvas_delta(canvas, since)
+    if delta is None:
+        # Too far behind, or history was reset: reload the snapshot
+        return JsonResponse({'success': True, 'reset': True})
+
+    sequence, pixels = delta
+    return JsonResponse({
+        'success': True,
+        'reset': False,
+        'sequence': sequence,
+        'pixels': pixels,
+    })
+
+
+def _broadcast_pixel(canvas_id, pixel):
+    """Push an accepted placement to the canvas's live clients (PixelWarConsumer)."""
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            canvas_group(canvas_id), {'type': 'pixel.placed', 'pixel': pixel}
+        )
+    except Exception:
+        logger.exception("Failed to broadcast pixel for canvas %s", canvas_id)
+
+
 def place_pixel(request):
     """Place a pixel on the canvas with tiered cooldown system"""
     if request.method != 'POST':
@@ -364,6 +436,13 @@ def place_pixel(request):
             color=color,
             placed_by=request.user if request.user.is_authenticated else None
         )
+        canvas_snapshots.record_placement(canvas)
+        _broadcast_pixel(canvas.id, {
+            'x': pixel.x,
+            'y': pixel.y,
+            'color': pixel.color,
+            'placed_by': pixel.placed_by.username if pixel.placed_by else 'Anonymous',
+        })
 
         return JsonResponse({
             'success': True,
@@ -389,15 +468,19 @@ def place_pixel(request):
 
 
 def get_pixel_history(request):
-    """Get the history of pixel placements"""
+    """Get the history of pixel placements, optionally of a single x/y cell"""
     canvas_id = request.GET.get('canvas_id')
     limit = int(request.GET.get('limit', 50))
 
     if canvas_id:
         canvas = get_object_or_404(PixelCanvas, id=canvas_id)
-        history = PixelHistory.objects.filter(canvas=canvas)[:limit]
+        history = PixelHistory.objects.filter(canvas=canvas)
     else:
-        history = PixelHistory.objects.all()[:limit]
+        history = PixelHistory.objects.all()
+    if 'x' in request.GET and 'y' in request.GET:
+        # The snapshot carries colours only: the tooltip asks who placed a cell
+        history = history.filter(x=int(request.GET['x']), y=int(request.GET['y']))
+    history = history.select_related('placed_by')[:limit]
 
     history_data = [{
         'x': h.x,
@@ -5,13 +5,24 @@ Usage:
     python manage.py import_cost_data --subscription PartnerLed-power_up  # Filter by subscription
     python manage.py import_cost_data --force             # Re-import all (ignore processed status)
     python manage.py import_cost_data --limit 5           # Process only first 5 exports
+    python manage.py import_cost_data --workers 4 --parse-workers 2
+                                                          # 4 parts at once, parsing in 2 processes
+
+Parts of one export run (part_0_0001.csv.gz, part_1_0001.csv.gz, ... under the
+same export GUID) are independent files and are imported concurrently. Old
+exports a new GUID supersedes are retired serially first, so concurrent parts
+never race on the same supersede.
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
 from power_up.finops.models import CostExport, CostRecord
 from power_up.finops.utils.blob_reader import AzureCostBlobReader
-from power_up.finops.utils.focus_parser import FOCUSParser
+from power_up.finops.utils.cost_loader import load_cost_records
+from power_up.finops.utils.focus_parser import FOCUSRowParser
 import logging
+import threading
 import traceback
 
 # A failed export is swallowed so the remaining ones still import, which means
@@ -20,6 +31,19 @@ import traceback
 # tally so it survives into App Insights.
 logger = logging.getLogger(__name__)
 
+# Batches handed to the parse pool ahead of the one being loaded
+PARSE_AHEAD_BATCHES = 8
+
+
+def _init_parse_worker():
+    """Parse workers import CostRecord for the row hash, so need Django set up"""
+    import django
+    django.setup()
+
+
+def _parse_batch(parser, rows):
+    return parser.parse_batch(rows)
+
 
 class Command(BaseCommand):
     help = 'Import Azure cost data from Blob Storage msexports container'
@@ -35,6 +59,8 @@ class Command(BaseCommand):
     failed_exports = 0
     failed_records = 0
 
+    _output_lock = threading.Lock()
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--subscription',
@@ -62,6 +88,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip automatic aggregation refresh after import',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of export files to import concurrently (default: 4)',
+        )
+        parser.add_argument(
+            '--parse-workers',
+            type=int,
+            default=0,
+            help='Processes to parse CSV rows in; 0 parses inline (default: 0)',
+        )
 
     def handle(self, *args, **options):
         subscription_filter = options.get('subscription')
@@ -69,12 +107,15 @@ class Command(BaseCommand):
         limit = options.get('limit')
         batch_size = options.get('batch_size', 1000)
         skip_aggregation = options.get('skip_aggregation', False)
+        workers = max(1, options.get('workers') or 1)
+        parse_workers = max(0, options.get('parse_workers') or 0)
 
         self.stdout.write(self.style.SUCCESS('Starting Azure Cost Data Import'))
         self.stdout.write(f'Subscription filter: {subscription_filter or "All"}')
         self.stdout.write(f'Force re-import: {force_reimport}')
         self.stdout.write(f'Batch size: {batch_size}')
         self.stdout.write(f'Skip aggregation: {skip_aggregation}')
+        self.stdout.write(f'Workers: {workers} (parse processes: {parse_workers})')
 
         try:
             # Initialize Azure Blob reader
@@ -139,28 +180,83 @@ class Command(BaseCommand):
                 exports = exports[:limit]
                 self.stdout.write(f'Processing first {limit} export(s)')
 
-            # Process each export
+            # Retire superseded exports first, one export at a time: parts of
+            # the same new GUID would otherwise race to delete the same rows
             total_records_imported = 0
             total_duplicates_skipped = 0
             total_records_failed = 0
             failed_exports = 0
-            for idx, export_meta in enumerate(exports, 1):
-                self.stdout.write(f'\n[{idx}/{len(exports)}] Processing: {export_meta["blob_path"]}')
-
+            runnable = []
+            for export_meta in exports:
                 try:
-                    result = self.process_export(blob_reader, export_meta, batch_size, force_reimport)
-                    total_records_imported += result['records_imported']
-                    total_duplicates_skipped += result['duplicates_skipped']
-                    total_records_failed += result.get('records_failed', 0)
-                    self.stdout.write(self.style.SUCCESS(
-                        f'  [OK] Imported {result["records_imported"]} records '
-                        f'({result["duplicates_skipped"]} duplicates skipped)'
-                    ))
+                    is_update = self._supersede_previous(
+                        blob_reader, export_meta, force_reimport
+                    )
+                    runnable.append((export_meta, is_update))
                 except Exception as e:
                     failed_exports += 1
-                    self.stdout.write(self.style.ERROR(f'  [ERROR] Failed: {str(e)}'))
+                    self.stdout.write(self.style.ERROR(
+                        f'  [ERROR] Failed: {export_meta["blob_path"]}: {str(e)}'
+                    ))
                     self.stderr.write(traceback.format_exc())
+
+            parse_pool = (
+                ProcessPoolExecutor(max_workers=parse_workers, initializer=_init_parse_worker)
+                if parse_workers else None
+            )
+
+            def run(idx, export_meta, is_update):
+                self._write(f'\n[{idx}/{len(runnable)}] Processing: {export_meta["blob_path"]}')
+                return self._import_records(
+                    blob_reader, export_meta, batch_size, is_update, parse_pool
+                )
+
+            def run_in_worker(idx, export_meta, is_update):
+                try:
+                    return run(idx, export_meta, is_update)
+                finally:
+                    # Worker threads get their own DB connection
+                    connection.close()
+
+            try:
+                if workers > 1 and len(runnable) > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        futures = [
+                            (export_meta, pool.submit(run_in_worker, idx, export_meta, is_update))
+                            for idx, (export_meta, is_update) in enumerate(runnable, 1)
+                        ]
+                        outcomes = []
+                        for export_meta, future in futures:
+                            try:
+                                outcomes.append((export_meta, future.result(), None))
+                            except Exception as e:
+                                outcomes.append((export_meta, None, e))
+                else:
+                    outcomes = []
+                    for idx, (export_meta, is_update) in enumerate(runnable, 1):
+                        try:
+                            outcomes.append((export_meta, run(idx, export_meta, is_update), None))
+                        except Exception as e:
+                            outcomes.append((export_meta, None, e))
+            finally:
+                if parse_pool is not None:
+                    parse_pool.shutdown()
+
+            for export_meta, result, error in outcomes:
+                if error is not None:
+                    failed_exports += 1
+                    self.stdout.write(self.style.ERROR(
+                        f'  [ERROR] Failed: {export_meta["blob_path"]}: {str(error)}'
+                    ))
+                    self.stderr.write(''.join(traceback.format_exception(error)))
                     continue
+                total_records_imported += result['records_imported']
+                total_duplicates_skipped += result['duplicates_skipped']
+                total_records_failed += result.get('records_failed', 0)
+                self.stdout.write(self.style.SUCCESS(
+                    f'  [OK] {export_meta["blob_path"]}: imported {result["records_imported"]} records '
+                    f'({result["duplicates_skipped"]} duplicates skipped)'
+                ))
 
             self.failed_exports = failed_exports
             self.failed_records = total_records_failed
@@ -207,6 +303,16 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f'Import failed: {str(e)}')
 
+    def _write(self, message, stream=None, ending=None):
+        """Write a progress line; parts import concurrently, so serialize output"""
+        stream = stream or self.stdout
+        with self._output_lock:
+            if ending is None:
+                stream.write(message)
+            else:
+                stream.write(message, ending=ending)
+                stream.flush()
+
     def process_export(self, blob_reader, export_meta, batch_size, force_reimport=False):
         """
         Process a single cost export file with duplicate detection and update handling
@@ -221,9 +327,20 @@ class Command(BaseCommand):
             dict: {
                 'records_imported': int,
                 'duplicates_skipped': int,
+                'records_failed': int,
                 'is_update': bool
             }
         """
+        is_update = self._supersede_previous(blob_reader, export_meta, force_reimport)
+        return self._import_records(blob_reader, export_meta, batch_size, is_update)
+
+    def _supersede_previous(self, blob_reader, export_meta, force_reimport=False):
+        """
+        Retire completed exports of the same period that a new export run replaces.
+
+        Returns:
+            bool: True if this export supersedes an earlier one
+        """
         blob_path = export_meta['blob_path']
         subscription_name = export_meta['subscription_name']
         date_range = export_meta['date_range']
@@ -270,11 +387,42 @@ class Command(BaseCommand):
                     old_export.save()
                     self.stdout.write(f'  -> Removed {old_record_count} old records from superseded export')
 
+        return is_update
+
+    def _parsed_batches(self, blob_reader, blob_path, batch_size, parse_pool=None):
+        """
+        Yield (records, errors) per CSV batch, in file order.
+
+        With a process pool, a few batches are parsed ahead while the caller
+        loads the current one; the in-flight window is bounded so a large
+        export never sits decompressed in memory.
+        """
+        parser = None
+        pending = deque()
+
+        for header, rows in blob_reader.stream_csv_rows(blob_path, batch_size=batch_size):
+            if parser is None:
+                parser = FOCUSRowParser(header)
+            if parse_pool is None:
+                yield parser.parse_batch(rows)
+                continue
+            pending.append(parse_pool.submit(_parse_batch, parser, rows))
+            if len(pending) >= PARSE_AHEAD_BATCHES:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def _import_records(self, blob_reader, export_meta, batch_size, is_update, parse_pool=None):
+        """Stream, parse and load one export file; see process_export"""
+        blob_path = export_meta['blob_path']
+        start_date, end_date = blob_reader.parse_date_range(export_meta['date_range'])
+
         # Create or get CostExport record
         cost_export, created = CostExport.objects.get_or_create(
             blob_path=blob_path,
             defaults={
-                'subscription_name': subscription_name,
+                'subscription_name': export_meta['subscription_name'],
                 'billing_period_start': start_date,
                 'billing_period_end': end_date,
                 'file_size_bytes': export_meta['size'],
@@ -312,97 +460,69 @@ class Command(BaseCommand):
             records_imported = 0
             duplicates_skipped = 0
             records_failed = 0
-            parser = FOCUSParser()
-
-            # Get existing hashes for this export to avoid re-checking database constantly
-            # (only relevant if force_reimport, otherwise hashes should be unique across exports)
-            existing_hashes = set()
-            if not is_update and not force_reimport:
-                # Pre-load existing hashes for duplicate detection (memory efficient for large imports)
-                # We check in batches to avoid loading millions of hashes
-                pass  # Will check per-batch below
-
-            for batch in blob_reader.stream_csv_records(blob_path, batch_size=batch_size):
-                # Parse batch
-                parsed_records = []
-                batch_hashes = []
-
-                for row in batch:
-                    try:
-                        parsed = parser.parse_cost_record(row, calculate_hash=True)
-
-                        # Extract subscription ID from first valid record
-                        if not subscription_id_found and parsed.get('sub_account_id'):
-                            subscription_id_found = parsed['sub_account_id']
-
-                        # Validate
-                        is_valid, error_msg = parser.validate_record(parsed)
-                        if not is_valid:
-                            records_failed += 1
-                            self.stderr.write(f'  Warning: Skipping invalid record - {error_msg}')
-                            continue
-
-                        parsed_records.append(parsed)
-                        batch_hashes.append(parsed['record_hash'])
-                    except Exception as e:
-                        records_failed += 1
-                        self.stderr.write(f'  Warning: Failed to parse record - {str(e)}')
-                        continue
 
-                # Check for existing hashes in database (batch query)
-                if batch_hashes:
-                    existing_in_db = set(
-                        CostRecord.objects.filter(
-                            record_hash__in=batch_hashes
-                        ).values_list('record_hash', flat=True)
+            for parsed_records, errors in self._parsed_batches(
+                blob_reader, blob_path, batch_size, parse_pool
+            ):
+                records_failed += len(errors)
+                for error_msg in errors:
+                    self._write(f'  Warning: {error_msg}', stream=self.stderr)
+
+                if not subscription_id_found:
+                    subscription_id_found = next(
+                        (r['sub_account_id'] for r in parsed_records if r.get('sub_account_id')),
+                        None,
                     )
 
-                    # Filter out duplicates
-                    unique_records = []
-                    for record in parsed_records:
-                        if record['record_hash'] in existing_in_db:
-                            duplicates_skipped += 1
-                        else:
-                            unique_records.append(record)
-
-                    # Batch insert unique records only
-                    if unique_records:
-                        cost_records = [
-                            CostRecord(cost_export=cost_export, **record)
-                            for record in unique_records
-                        ]
+                if not parsed_records:
+                    continue
 
-                        with transaction.atomic():
+                # Check for existing hashes in database (batch query)
+                existing_in_db = set(
+                    CostRecord.objects.filter(
+                        record_hash__in=[record['record_hash'] for record in parsed_records]
+                    ).values_list('record_hash', flat=True)
+                )
+
+                # Filter out duplicates
+                unique_records = []
+                for record in parsed_records:
+                    if record['record_hash'] in existing_in_db:
+                        duplicates_skipped += 1
+                    else:
+                        unique_records.append(record)
+
+                # Batch insert unique records only
+                if unique_records:
+                    try:
+                        inserted = load_cost_records(cost_export, unique_records, batch_size=batch_size)
+                        records_imported += inserted
+                        # A concurrent part may have inserted the same row
+                        # between the pre-check and the load
+                        duplicates_skipped += len(unique_records) - inserted
+                    except Exception:
+                        # If the bulk load fails, try individual inserts (slower but more resilient)
+                        self._write('  Warning: Bulk insert failed, trying individual inserts...')
+                        for record in unique_records:
                             try:
-                                CostRecord.objects.bulk_create(
-                                    cost_records,
-                                    batch_size=batch_size,
-                                    ignore_conflicts=True  # Skip duplicates at DB level
-                                )
-                                records_imported += len(cost_records)
+                                with transaction.atomic():
+                                    CostRecord.objects.create(cost_export=cost_export, **record)
+                                records_imported += 1
                             except Exception:
-                                # If bulk_create fails, try individual inserts (slower but more resilient)
-                                self.stdout.write('  Warning: Bulk insert failed, trying individual inserts...')
-                                for record_obj in cost_records:
-                                    try:
-                                        record_obj.save()
-                                        records_imported += 1
-                                    except Exception:
-                                        duplicates_skipped += 1
-
-                    # Progress indicator
-                    if records_imported % (batch_size * 10) == 0:
-                        self.stdout.write(
-                            f'  ... {records_imported} records imported ({duplicates_skipped} duplicates)',
-                            ending=''
-                        )
-                        self.stdout.flush()
+                                duplicates_skipped += 1
+
+                # Progress indicator
+                if records_imported % (batch_size * 10) == 0:
+                    self._write(
+                        f'  ... {records_imported} records imported ({duplicates_skipped} duplicates)',
+                        ending=''
+                    )
 
             # Save subscription ID if found
             if subscription_id_found:
                 cost_export.subscription_id = subscription_id_found
                 cost_export.save()
-                self.stdout.write(f'  -> Extracted subscription ID: {subscription_id_found}')
+                self._write(f'  -> Extracted subscription ID: {subscription_id_found}')
 
             # Mark as completed
             cost_export.mark_completed(records_imported)
@@ -411,7 +531,7 @@ class Command(BaseCommand):
             if records_imported == 0 and not cost_export.subscription_id:
                 cost_export.needs_subscription_id = True
                 cost_export.save()
-                self.stdout.write(self.style.WARNING(
+                self._write(self.style.WARNING(
                     '  ⚠ No records imported. Please add subscription ID via the import dashboard.'
                 ))
 
@@ -129,11 +129,18 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'  ✓ Daily aggregations: {result["daily_aggregations"]}'))
             self.stdout.write(self.style.SUCCESS(f'  ✓ Monthly aggregations: {result["monthly_aggregations"]}'))
             self.stdout.write(self.style.SUCCESS(f'  ✓ Period: {result["period"]}'))
+            timings = ' '.join(
+                f'{phase}={elapsed:.2f}s'
+                for phase, elapsed in result.get('timings', {}).items()
+            )
+            if timings:
+                self.stdout.write(f'  Timings: {timings}')
             logger.info(
-                '[finops_sync] aggregations daily=%s monthly=%s period=%s',
+                '[finops_sync] aggregations daily=%s monthly=%s period=%s %s',
                 result['daily_aggregations'],
                 result['monthly_aggregations'],
                 result['period'],
+                timings,
             )
 
         def _anomalies():
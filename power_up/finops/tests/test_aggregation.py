@@ -0,0 +1,154 @@
+"""
+Tests for the single-pass cost aggregation engine.
+
+The engine replaced a per-day, per-dimension loop, so the assertions pin the
+numbers that loop produced (totals, charge-category split, top-N lists) and
+that the query count no longer grows with the length of the range.
+"""
+
+import pytest
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from power_up.finops.models import CostAggregation, CostExport, CostRecord
+from power_up.finops.utils.aggregation import AggregationEngine, CostAggregator
+
+DAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def export(db):
+    return CostExport.objects.create(
+        blob_path='exports/test/part_0_0001.csv.gz',
+        subscription_name='Prod',
+        billing_period_start=date(2026, 3, 1),
+        billing_period_end=date(2026, 3, 31),
+    )
+
+
+def make_record(export, day, cost, service='Storage', subscription='Prod',
+                resource_group='rg-web', resource='stweb', category='Usage'):
+    start = timezone.make_aware(datetime.combine(day, time(12)))
+    return CostRecord.objects.create(
+        cost_export=export,
+        billed_cost=Decimal(cost),
+        billing_currency='EUR',
+        billing_period_start=day.replace(day=1),
+        billing_period_end=day,
+        charge_period_start=start,
+        charge_period_end=start + timedelta(hours=1),
+        billing_account_id='acct',
+        sub_account_id=f'sub-{subscription}',
+        sub_account_name=subscription,
+        resource_id=f'/rg/{resource}',
+        resource_name=resource,
+        resource_group_name=resource_group,
+        service_name=service,
+        charge_category=category,
+    )
+
+
+def get_agg(aggregation_type, dimension_type, value, period_start):
+    return CostAggregation.objects.get(
+        aggregation_type=aggregation_type,
+        dimension_type=dimension_type,
+        dimension_value=value,
+        period_start=period_start,
+        currency='EUR',
+    )
+
+
+@pytest.mark.django_db
+class TestAggregationEngine:
+    def test_daily_totals_per_dimension(self, export):
+        make_record(export, DAY, '10.00', service='Storage')
+        make_record(export, DAY, '5.00', service='Compute', resource='vm1')
+        make_record(export, DAY, '2.00', service='Compute', resource='vm1', category='Tax')
+        make_record(export, DAY, '3.00', subscription='Dev', resource_group=None)
+
+        created = AggregationEngine('daily', DAY, DAY).run()
+
+        overall = get_agg('daily', 'overall', 'Total', DAY)
+        assert overall.total_cost == Decimal('20.00')
+        assert overall.record_count == 4
+        assert overall.usage_cost == Decimal('18.00')
+        assert overall.tax_cost == Decimal('2.00')
+        assert overall.purchase_cost == Decimal('0.00')
+
+        assert get_agg('daily', 'subscription', 'Prod', DAY).total_cost == Decimal('17.00')
+        assert get_agg('daily', 'service', 'Compute', DAY).total_cost == Decimal('7.00')
+        assert get_agg('daily', 'resource_group', 'rg-web', DAY).total_cost == Decimal('17.00')
+        # Records without a resource group get no resource_group row
+        assert not CostAggregation.objects.filter(
+            dimension_type='resource_group', dimension_value=''
+        ).exists()
+
+        # overall + 2 subscriptions + 2 services + 1 resource group
+        assert created == 6
+
+    def test_top_lists_are_ranked_and_capped(self, export):
+        for i in range(7):
+            make_record(export, DAY, f'{i + 1}.00', service=f'svc{i}', resource=f'res{i}')
+        make_record(export, DAY, '100.00', service='svc0', resource=None)
+
+        AggregationEngine('daily', DAY, DAY).run()
+
+        overall = get_agg('daily', 'overall', 'Total', DAY)
+        assert [s['name'] for s in overall.top_services] == ['svc0', 'svc6', 'svc5', 'svc4', 'svc3']
+        assert overall.top_services[0]['cost'] == 101.0
+        # The unnamed resource ranks first but is dropped, as before
+        assert [r['name'] for r in overall.top_resources] == ['res6', 'res5', 'res4', 'res3']
+
+        service = get_agg('daily', 'service', 'svc0', DAY)
+        assert service.top_services == []
+
+    def test_rerun_updates_in_place(self, export):
+        record = make_record(export, DAY, '10.00')
+        assert AggregationEngine('daily', DAY, DAY).run() == 4
+
+        record.billed_cost = Decimal('12.50')
+        record.save()
+        assert AggregationEngine('daily', DAY, DAY).run() == 0
+
+        assert get_agg('daily', 'overall', 'Total', DAY).total_cost == Decimal('12.50')
+        assert CostAggregation.objects.filter(dimension_type='overall').count() == 1
+
+    def test_monthly_covers_whole_month(self, export):
+        make_record(export, date(2026, 3, 1), '1.00')
+        make_record(export, date(2026, 3, 31), '2.00')
+        make_record(export, date(2026, 4, 1), '4.00')
+
+        AggregationEngine('monthly', date(2026, 3, 15), date(2026, 3, 20)).run()
+
+        march = get_agg('monthly', 'overall', 'Total', date(2026, 3, 1))
+        assert march.total_cost == Decimal('3.00')
+        assert march.period_end == date(2026, 3, 31)
+        assert not CostAggregation.objects.filter(period_start=date(2026, 4, 1)).exists()
+        # Monthly rows never had a resource-group breakdown
+        assert not CostAggregation.objects.filter(
+            aggregation_type='monthly', dimension_type='resource_group'
+        ).exists()
+
+    def test_query_count_does_not_grow_with_range(self, export):
+        for offset in range(3):
+            make_record(export, DAY + timedelta(days=offset), '1.00')
+
+        with CaptureQueriesContext(connection) as short:
+            AggregationEngine('daily', DAY, DAY).run()
+        with CaptureQueriesContext(connection) as long:
+            AggregationEngine('daily', DAY - timedelta(days=30), DAY + timedelta(days=30)).run()
+
+        assert len(long) == len(short)
+
+
+@pytest.mark.django_db
+def test_refresh_all_reports_timings(export):
+    make_record(export, timezone.now().date(), '1.00')
+
+    result = CostAggregator.refresh_all(days_back=5)
+
+    assert result['daily_aggregations'] == 4
+    assert result['monthly_aggregations'] == 3
+    assert {'daily_totals', 'daily_top_n', 'daily_upsert', 'monthly_upsert'} <= set(result['timings'])
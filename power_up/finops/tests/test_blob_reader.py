@@ -60,3 +60,16 @@ def test_stream_csv_records_end_to_end(reader):
     assert len(flattened) == 5
     assert flattened[0] == {"cost": "0", "currency": "EUR"}
     assert flattened[-1] == {"cost": "4", "currency": "EUR"}
+
+
+def test_stream_csv_rows_yields_header_with_list_batches(reader):
+    rows = [(str(i), "EUR") for i in range(5)]
+    blob_client = MagicMock()
+    blob_client.download_blob.return_value = _make_gzip_bytes(rows)
+    reader.blob_service_client.get_blob_client.return_value = blob_client
+
+    batches = list(reader.stream_csv_rows("path.csv.gz", batch_size=2))
+
+    assert [len(batch) for _, batch in batches] == [2, 2, 1]
+    assert all(header == ["cost", "currency"] for header, _ in batches)
+    assert batches[0][1][0] == ["0", "EUR"]
@@ -0,0 +1,251 @@
+"""
+Tests for the streaming FOCUS import path.
+
+FOCUSRowParser must produce exactly what FOCUSParser.parse_cost_record does
+(record_hash included), or re-imports through the new path would stop
+deduplicating against rows the old one wrote.
+"""
+
+import csv
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+
+from power_up.finops.management.commands.import_cost_data import Command
+from power_up.finops.models import CostExport, CostRecord
+from power_up.finops.utils.cost_loader import load_cost_records
+from power_up.finops.utils.focus_parser import FOCUSParser, FOCUSRowParser
+
+HEADER = [
+    'BilledCost', 'BillingCurrency', 'EffectiveCost', 'BillingPeriodStart',
+    'BillingPeriodEnd', 'ChargePeriodStart', 'ChargePeriodEnd', 'SubAccountId',
+    'SubAccountName', 'ResourceId', 'ResourceName', 'x_ResourceGroupName',
+    'ServiceName', 'ChargeCategory', 'ConsumedQuantity', 'Tags', 'x_CostCenter',
+]
+
+
+def make_row(i, cost='1.50', tags='{"env": "prod"}'):
+    return [
+        cost, 'EUR', cost, '2026-03-01T00:00:00Z', '2026-03-31T00:00:00Z',
+        f'2026-03-{i % 28 + 1:02d}T00:00:00Z', f'2026-03-{i % 28 + 1:02d}T01:00:00Z',
+        'sub-1', 'Prod', f'/rg/res{i}', f'res{i}', 'rg-web', 'Storage', 'Usage',
+        '2', tags, '',
+    ]
+
+
+class TestFOCUSRowParser:
+    @pytest.mark.parametrize('row', [
+        make_row(1),
+        make_row(2, cost='', tags=''),
+        make_row(3, cost='not-a-number', tags='not json'),
+        make_row(4)[:10],  # short row
+    ])
+    def test_matches_parse_cost_record(self, row):
+        expected = FOCUSParser.parse_cost_record(
+            dict(zip(HEADER, row + [None] * (len(HEADER) - len(row))))
+        )
+
+        assert FOCUSRowParser(HEADER).parse(row) == expected
+
+    def test_missing_columns_use_defaults(self):
+        header = ['BilledCost', 'ChargePeriodStart']
+        row = ['3', '2026-03-02T00:00:00Z']
+
+        parsed = FOCUSRowParser(header).parse(row)
+
+        assert parsed == FOCUSParser.parse_cost_record(dict(zip(header, row)))
+        assert parsed['billing_currency'] == 'EUR'
+        assert parsed['provider_name'] == 'Microsoft'
+
+    def test_parse_batch_reports_rejections(self):
+        bad = make_row(5)
+        bad[5] = ''  # no charge period start
+
+        records, errors = FOCUSRowParser(HEADER).parse_batch([make_row(1), bad])
+
+        assert len(records) == 1
+        assert errors == ['Skipping invalid record - Missing required field: charge_period_start']
+
+
+class FakeBlobReader:
+    date_range = '20260301-20260331'
+
+    def __init__(self, rows, fail_after=None, exports=()):
+        self.rows = rows
+        self.fail_after = fail_after
+        self.exports = list(exports)
+
+    def list_cost_exports(self, subscription_filter=None):
+        return self.exports
+
+    def parse_date_range(self, date_range):
+        from power_up.finops.utils.blob_reader import AzureCostBlobReader
+        return AzureCostBlobReader.parse_date_range(MagicMock(), date_range)
+
+    def stream_csv_rows(self, blob_path, batch_size=1000):
+        for start in range(0, len(self.rows), batch_size):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise OSError('connection reset')
+            yield HEADER, self.rows[start:start + batch_size]
+
+
+def export_meta(guid='7946d592-03d8-4ce0-bfca-af3abfa49d71', part=0):
+    return {
+        'blob_path': f'subscriptions/s/export/20260301-20260331/{guid}/part_{part}_0001.csv.gz',
+        'subscription_name': 'Prod',
+        'date_range': FakeBlobReader.date_range,
+        'size': 100,
+        'last_modified': None,
+        'etag': None,
+    }
+
+
+def make_command():
+    return Command(stdout=io.StringIO(), stderr=io.StringIO())
+
+
+@pytest.mark.django_db
+class TestProcessExport:
+    def test_imports_and_skips_duplicates(self):
+        rows = [make_row(i) for i in range(5)]
+        command = make_command()
+
+        first = command.process_export(FakeBlobReader(rows), export_meta(), batch_size=2)
+        second = command.process_export(
+            FakeBlobReader(rows + [make_row(9)]), export_meta(part=1), batch_size=2
+        )
+
+        assert first['records_imported'] == 5
+        assert second == {
+            'records_imported': 1,
+            'duplicates_skipped': 5,
+            'records_failed': 0,
+            'is_update': False,
+        }
+        export = CostExport.objects.get(blob_path=export_meta()['blob_path'])
+        assert export.import_status == 'completed'
+        assert export.subscription_id == 'sub-1'
+        assert CostRecord.objects.count() == 6
+
+    def test_new_guid_supersedes_previous_run(self):
+        command = make_command()
+        command.process_export(FakeBlobReader([make_row(1)]), export_meta(), batch_size=10)
+
+        result = command.process_export(
+            FakeBlobReader([make_row(2)]),
+            export_meta(guid='00000000-03d8-4ce0-bfca-af3abfa49d71'),
+            batch_size=10,
+        )
+
+        assert result['is_update'] is True
+        old = CostExport.objects.get(blob_path=export_meta()['blob_path'])
+        assert old.import_status == 'superseded'
+        assert list(CostRecord.objects.values_list('resource_name', flat=True)) == ['res2']
+
+    def test_mid_stream_failure_rolls_back_this_run(self):
+        rows = [make_row(i) for i in range(4)]
+        command = make_command()
+
+        with pytest.raises(OSError):
+            command.process_export(
+                FakeBlobReader(rows, fail_after=2), export_meta(), batch_size=2
+            )
+
+        assert CostRecord.objects.count() == 0
+        assert CostExport.objects.get().import_status == 'failed'
+
+    def test_rejected_rows_are_counted(self):
+        bad = make_row(7)
+        bad[5] = ''
+        stderr = io.StringIO()
+        command = Command(stdout=io.StringIO(), stderr=stderr)
+
+        result = command.process_export(
+            FakeBlobReader([make_row(1), bad]), export_meta(), batch_size=10
+        )
+
+        assert result['records_failed'] == 1
+        assert 'Skipping invalid record' in stderr.getvalue()
+
+
+def run_import(blob_reader, *args):
+    command = make_command()
+    with patch(
+        'power_up.finops.management.commands.import_cost_data.AzureCostBlobReader',
+        return_value=blob_reader,
+    ):
+        call_command(command, '--skip-aggregation', *args)
+    return command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImportCommand:
+    def test_parts_import_concurrently(self):
+        # Each part gets the same rows: the second to load skips them all
+        reader = FakeBlobReader(
+            [make_row(i) for i in range(6)],
+            exports=[export_meta(part=0), export_meta(part=1), export_meta(part=2)],
+        )
+
+        command = run_import(reader, '--workers', '3', '--batch-size', '2')
+
+        assert command.failed_exports == 0
+        assert CostRecord.objects.count() == 6
+        assert set(CostExport.objects.values_list('import_status', flat=True)) == {'completed'}
+
+    def test_rows_parse_in_a_process_pool(self):
+        reader = FakeBlobReader(
+            [make_row(i) for i in range(5)], exports=[export_meta()]
+        )
+
+        run_import(reader, '--parse-workers', '2', '--batch-size', '2')
+
+        assert sorted(CostRecord.objects.values_list('resource_name', flat=True)) == [
+            f'res{i}' for i in range(5)
+        ]
+
+    def test_a_single_export_keeps_the_main_connection(self):
+        reader = FakeBlobReader([make_row(1)], exports=[export_meta()])
+
+        with patch.object(connection, 'close') as close:
+            run_import(reader, '--workers', '4')
+
+        close.assert_not_called()
+        assert CostRecord.objects.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='COPY is PostgreSQL-only')
+def test_copy_load_runs_batch_after_batch_in_one_transaction():
+    cost_export = CostExport.objects.create(
+        blob_path=export_meta()['blob_path'],
+        subscription_name='Prod',
+        billing_period_start='2026-03-01',
+        billing_period_end='2026-03-31',
+    )
+    parser = FOCUSRowParser(HEADER)
+    records, _errors = parser.parse_batch([make_row(i) for i in range(4)])
+
+    with transaction.atomic():
+        first = load_cost_records(cost_export, records[:2])
+        second = load_cost_records(cost_export, records[1:])
+
+    assert (first, second) == (2, 2)
+    assert CostRecord.objects.count() == 4
+
+
+def test_csv_round_trip_matches_dict_reader():
+    """stream_csv_rows + FOCUSRowParser agrees with DictReader + parse_cost_record"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    writer.writerow(make_row(1, tags='{"a": "b, c"}'))
+    text = buffer.getvalue()
+
+    header, *rows = list(csv.reader(io.StringIO(text)))
+    dict_row = next(csv.DictReader(io.StringIO(text)))
+
+    assert FOCUSRowParser(header).parse(rows[0]) == FOCUSParser.parse_cost_record(dict_row)
@@ -1,13 +1,286 @@
 """
 Cost aggregation logic for pre-computing dashboard queries
+
+AggregationEngine computes every dimension for a whole date range with a
+handful of grouped queries and writes the CostAggregation rows with a single
+bulk upsert. The previous implementation walked the range day by day and ran
+five queries plus an update_or_create per (day, dimension value) — several
+thousand round trips for the 60-day refresh that runs inside the sync webhook.
 """
-from django.db import transaction
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
-from datetime import datetime, timedelta
+import time
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+
+from django.db import connections, transaction
+from django.db.models import Count, DateField, F, Q, Sum, Window
+from django.db.models.functions import RowNumber, TruncDate, TruncMonth
+from django.utils import timezone
+
 from power_up.finops.models import CostRecord, CostAggregation
 
+TOP_N = 5
+
+# (dimension_type, CostRecord field); None is the 'overall' rollup
+DAILY_DIMENSIONS = [
+    ('overall', None),
+    ('subscription', 'sub_account_name'),
+    ('service', 'service_name'),
+    ('resource_group', 'resource_group_name'),
+]
+MONTHLY_DIMENSIONS = DAILY_DIMENSIONS[:3]
+
+OVERALL_VALUE = 'Total'
+
+UPSERT_BATCH_SIZE = 1000
+
+
+class AggregationEngine:
+    """
+    Compute CostAggregation rows for one aggregation type over a date range.
+
+    Query plan, regardless of the range length:
+    - totals: one GROUPING SETS query on PostgreSQL, one grouped query per
+      dimension elsewhere (SQLite has no GROUPING SETS)
+    - top services / top resources: one ROW_NUMBER() window query per
+      dimension and ranked field
+    - one query for the keys that already exist, then a bulk upsert
+    """
+
+    def __init__(self, aggregation_type, start_date, end_date, currency='EUR', dimensions=None):
+        if aggregation_type not in ('daily', 'monthly'):
+            raise ValueError(f'Unsupported aggregation type: {aggregation_type}')
+
+        self.aggregation_type = aggregation_type
+        self.currency = currency
+        if aggregation_type == 'monthly':
+            # Monthly rows always cover whole calendar months
+            start_date = start_date.replace(day=1)
+            end_date = end_date.replace(day=monthrange(end_date.year, end_date.month)[1])
+        self.start_date = start_date
+        self.end_date = end_date
+        if dimensions is None:
+            dimensions = DAILY_DIMENSIONS if aggregation_type == 'daily' else MONTHLY_DIMENSIONS
+        self.dimensions = dimensions
+        self.timings = {}
+
+    def _records(self):
+        """Cost records in range, annotated with the period they roll up into"""
+        if self.aggregation_type == 'daily':
+            period = TruncDate('charge_period_start')
+        else:
+            period = TruncMonth('charge_period_start', output_field=DateField())
+
+        return CostRecord.objects.filter(
+            charge_period_start__date__gte=self.start_date,
+            charge_period_start__date__lte=self.end_date,
+            billing_currency=self.currency,
+        ).annotate(period=period)
+
+    @staticmethod
+    def _period_start(value):
+        # TruncMonth/TruncDate come back as date on PostgreSQL but may be a
+        # datetime or ISO string on SQLite
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return date.fromisoformat(value[:10])
+        return value
+
+    def _period_end(self, period_start):
+        if self.aggregation_type == 'daily':
+            return period_start
+        return period_start.replace(day=monthrange(period_start.year, period_start.month)[1])
+
+    @staticmethod
+    def _totals_from(row):
+        return {
+            'total_cost': row['total_cost'] or Decimal('0.00'),
+            'record_count': row['record_count'] or 0,
+            'usage_cost': row['usage_cost'] or Decimal('0.00'),
+            'purchase_cost': row['purchase_cost'] or Decimal('0.00'),
+            'tax_cost': row['tax_cost'] or Decimal('0.00'),
+        }
+
+    def _totals(self):
+        """{(period_start, dimension_type, dimension_value): totals}"""
+        if connections[CostRecord.objects.db].vendor == 'postgresql':
+            return self._totals_grouping_sets()
+        return self._totals_grouped()
+
+    def _totals_grouped(self):
+        totals = {}
+        records = self._records()
+        for dimension_type, field in self.dimensions:
+            group_by = ['period'] + ([field] if field else [])
+            rows = records.values(*group_by).annotate(
+                total_cost=Sum('billed_cost'),
+                record_count=Count('id'),
+                usage_cost=Sum('billed_cost', filter=Q(charge_category='Usage')),
+                purchase_cost=Sum('billed_cost', filter=Q(charge_category='Purchase')),
+                tax_cost=Sum('billed_cost', filter=Q(charge_category='Tax')),
+            ).order_by()
+            for row in rows:
+                value = row[field] if field else OVERALL_VALUE
+                if not value:
+                    continue
+                key = (self._period_start(row['period']), dimension_type, value)
+                totals[key] = self._totals_from(row)
+        return totals
+
+    def _totals_grouping_sets(self):
+        """
+        All dimensions in one scan. The inner query is built by the ORM so
+        the period bucketing uses exactly the same time-zone conversion as the
+        __date filters; only the GROUPING SETS wrapper is hand-written.
+        """
+        fields = [field for _, field in self.dimensions if field]
+        inner = self._records().values('period', 'billed_cost', 'charge_category', *fields)
+        connection = connections[inner.db]
+        inner_sql, params = inner.query.get_compiler(connection=connection).as_sql()
+
+        qn = connection.ops.quote_name
+        grouping_sets = ', '.join(
+            f'({qn("period")}, {qn(field)})' if field else f'({qn("period")})'
+            for _, field in self.dimensions
+        )
+        field_columns = ''.join(f', r.{qn(field)}, GROUPING(r.{qn(field)})' for field in fields)
+        sql = (
+            f'SELECT r.{qn("period")}{field_columns}, '
+            f'SUM(r.{qn("billed_cost")}), COUNT(*), '
+            f"SUM(r.{qn('billed_cost')}) FILTER (WHERE r.{qn('charge_category')} = 'Usage'), "
+            f"SUM(r.{qn('billed_cost')}) FILTER (WHERE r.{qn('charge_category')} = 'Purchase'), "
+            f"SUM(r.{qn('billed_cost')}) FILTER (WHERE r.{qn('charge_category')} = 'Tax') "
+            f'FROM ({inner_sql}) r '
+            f'GROUP BY GROUPING SETS ({grouping_sets})'
+        )
+
+        by_field = {field: dimension_type for dimension_type, field in self.dimensions}
+        totals = {}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for row in cursor.fetchall():
+                period = row[0]
+                dimension_type, value = by_field[None], OVERALL_VALUE
+                for index, field in enumerate(fields):
+                    # GROUPING() is 0 for the column this set groups by
+                    if row[2 + 2 * index] == 0:
+                        dimension_type, value = by_field[field], row[1 + 2 * index]
+                if not value:
+                    continue
+                aggregates = row[1 + 2 * len(fields):]
+                totals[(self._period_start(period), dimension_type, value)] = self._totals_from({
+                    'total_cost': aggregates[0],
+                    'record_count': aggregates[1],
+                    'usage_cost': aggregates[2],
+                    'purchase_cost': aggregates[3],
+                    'tax_cost': aggregates[4],
+                })
+        return totals
+
+    def _top(self, field, ranked_field):
+        """
+        Top-N of ranked_field by cost within every (period, field) group,
+        from one window-function query.
+
+        Returns:
+            dict: {(period_start, dimension_value): [{'name', 'cost'}, ...]}
+        """
+        group_by = ['period'] + ([field] if field else [])
+        rows = (
+            self._records()
+            .values(*group_by, ranked_field)
+            .annotate(cost=Sum('billed_cost'))
+            .annotate(rank=Window(
+                RowNumber(),
+                partition_by=[F(name) for name in group_by],
+                order_by=[F('cost').desc(), F(ranked_field).asc()],
+            ))
+            .filter(rank__lte=TOP_N)
+            .order_by(*group_by, 'rank')
+        )
+
+        top = defaultdict(list)
+        for row in rows:
+            value = row[field] if field else OVERALL_VALUE
+            top[(self._period_start(row['period']), value)].append(
+                {'name': row[ranked_field], 'cost': float(row['cost'])}
+            )
+        return top
+
+    def run(self):
+        """
+        Compute and upsert all aggregations for the range.
+
+        Returns:
+            int: Number of aggregation records created (updates not counted)
+        """
+        started = time.monotonic()
+        totals = self._totals()
+        self.timings['totals'] = time.monotonic() - started
+
+        started = time.monotonic()
+        top_services = {}
+        top_resources = {}
+        for dimension_type, field in self.dimensions:
+            if dimension_type != 'service':
+                top_services[dimension_type] = self._top(field, 'service_name')
+            top_resources[dimension_type] = self._top(field, 'resource_name')
+        self.timings['top_n'] = time.monotonic() - started
+
+        started = time.monotonic()
+        existing = set(
+            CostAggregation.objects.filter(
+                aggregation_type=self.aggregation_type,
+                currency=self.currency,
+                period_start__gte=self.start_date,
+                period_start__lte=self.end_date,
+            ).values_list('period_start', 'dimension_type', 'dimension_value')
+        )
+
+        aggregations = []
+        for key, values in totals.items():
+            period_start, dimension_type, value = key
+            services = top_services.get(dimension_type, {}).get((period_start, value), [])
+            resources = [
+                item for item in top_resources[dimension_type].get((period_start, value), [])
+                if item['name']
+            ]
+            aggregations.append(CostAggregation(
+                aggregation_type=self.aggregation_type,
+                dimension_type=dimension_type,
+                dimension_value=value,
+                period_start=period_start,
+                period_end=self._period_end(period_start),
+                currency=self.currency,
+                top_services=services,
+                top_resources=resources,
+                **values,
+            ))
+
+        with transaction.atomic():
+            CostAggregation.objects.bulk_create(
+                aggregations,
+                batch_size=UPSERT_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=[
+                    'aggregation_type', 'dimension_type', 'dimension_value',
+                    'period_start', 'currency',
+                ],
+                update_fields=[
+                    'period_end', 'total_cost', 'record_count', 'usage_cost',
+                    'purchase_cost', 'tax_cost', 'top_services', 'top_resources',
+                    'updated_at',
+                ],
+            )
+        self.timings['upsert'] = time.monotonic() - started
+
+        return sum(
+            1 for agg in aggregations
+            if (agg.period_start, agg.dimension_type, agg.dimension_value) not in existing
+        )
+
 
 class CostAggregator:
     """Generate pre-computed cost aggregations for faster dashboard queries"""
@@ -30,133 +303,7 @@ class CostAggregator:
         if not start_date:
             start_date = end_date - timedelta(days=30)
 
-        records_created = 0
-
-        # Wrap day-by-day aggregation in a transaction for data integrity
-        with transaction.atomic():
-            # Iterate through each day
-            current_date = start_date
-            while current_date <= end_date:
-                # Overall daily aggregation
-                records_created += CostAggregator._aggregate_for_day(
-                    current_date, 'overall', 'Total', currency
-                )
-
-                # By subscription
-                subscriptions = CostRecord.objects.filter(
-                    charge_period_start__date=current_date,
-                    billing_currency=currency
-                ).values_list('sub_account_name', flat=True).distinct()
-
-                for subscription in subscriptions:
-                    if subscription:
-                        records_created += CostAggregator._aggregate_for_day(
-                            current_date, 'subscription', subscription, currency
-                        )
-
-                # By service
-                services = CostRecord.objects.filter(
-                    charge_period_start__date=current_date,
-                    billing_currency=currency
-                ).values_list('service_name', flat=True).distinct()
-
-                for service in services:
-                    if service:
-                        records_created += CostAggregator._aggregate_for_day(
-                            current_date, 'service', service, currency
-                        )
-
-                # By resource group
-                resource_groups = CostRecord.objects.filter(
-                    charge_period_start__date=current_date,
-                    billing_currency=currency
-                ).values_list('resource_group_name', flat=True).distinct()
-
-                for rg in resource_groups:
-                    if rg:
-                        records_created += CostAggregator._aggregate_for_day(
-                            current_date, 'resource_group', rg, currency
-                        )
-
-                current_date += timedelta(days=1)
-
-        return records_created
-
-    @staticmethod
-    def _aggregate_for_day(date, dimension_type, dimension_value, currency):
-        """Generate aggregation for a single day and dimension"""
-        # Build query filters
-        filters = {
-            'charge_period_start__date': date,
-            'billing_currency': currency,
-        }
-
-        if dimension_type == 'subscription':
-            filters['sub_account_name'] = dimension_value
-        elif dimension_type == 'service':
-            filters['service_name'] = dimension_value
-        elif dimension_type == 'resource_group':
-            filters['resource_group_name'] = dimension_value
-        elif dimension_type == 'region':
-            filters['region_name'] = dimension_value
-
-        # Query cost data
-        queryset = CostRecord.objects.filter(**filters)
-
-        if not queryset.exists():
-            return 0
-
-        # Aggregate totals
-        aggregates = queryset.aggregate(
-            total_cost=Sum('billed_cost'),
-            record_count=Count('id'),
-            usage_cost=Sum('billed_cost', filter=Q(charge_category='Usage')),
-            purchase_cost=Sum('billed_cost', filter=Q(charge_category='Purchase')),
-            tax_cost=Sum('billed_cost', filter=Q(charge_category='Tax')),
-        )
-
-        # Get top services (for non-service dimensions)
-        top_services = []
-        if dimension_type != 'service':
-            top_services_qs = queryset.values('service_name').annotate(
-                cost=Sum('billed_cost')
-            ).order_by('-cost')[:5]
-
-            top_services = [
-                {'name': item['service_name'], 'cost': float(item['cost'])}
-                for item in top_services_qs
-            ]
-
-        # Get top resources
-        top_resources_qs = queryset.values('resource_name').annotate(
-            cost=Sum('billed_cost')
-        ).order_by('-cost')[:5]
-
-        top_resources = [
-            {'name': item['resource_name'], 'cost': float(item['cost'])}
-            for item in top_resources_qs if item['resource_name']
-        ]
-
-        # Create or update aggregation
-        aggregation, created = CostAggregation.objects.update_or_create(
-            aggregation_type='daily',
-            dimension_type=dimension_type,
-            dimension_value=dimension_value,
-            period_start=date,
-            currency=currency,
-            defaults={
-                'period_end': date,
-                'total_cost': aggregates['total_cost'] or Decimal('0.00'),
-                'record_count': aggregates['record_count'] or 0,
-                'usage_cost': aggregates['usage_cost'] or Decimal('0.00'),
-                'purchase_cost': aggregates['purchase_cost'] or Decimal('0.00'),
-                'tax_cost': aggregates['tax_cost'] or Decimal('0.00'),
-                'top_services': top_services,
-                'top_resources': top_resources,
-            }
-        )
-
-        return 1 if created else 0
+        return AggregationEngine('daily', start_date, end_date, currency).run()
 
     @staticmethod
     def aggregate_monthly(year, month, currency='EUR'):
@@ -171,159 +318,40 @@ class CostAggregator:
         Returns:
             int: Number of aggregation records created
         """
-        # Calculate month start and end
-        from calendar import monthrange
-        start_date = datetime(year, month, 1).date()
-        last_day = monthrange(year, month)[1]
-        end_date = datetime(year, month, last_day).date()
-
-        records_created = 0
-
-        # Wrap monthly aggregation in a transaction for data integrity
-        with transaction.atomic():
-            # Overall monthly aggregation
-            records_created += CostAggregator._aggregate_for_period(
-                start_date, end_date, 'monthly', 'overall', 'Total', currency
-            )
-
-            # By subscription
-            subscriptions = CostRecord.objects.filter(
-                charge_period_start__date__gte=start_date,
-                charge_period_start__date__lte=end_date,
-                billing_currency=currency
-            ).values_list('sub_account_name', flat=True).distinct()
-
-            for subscription in subscriptions:
-                if subscription:
-                    records_created += CostAggregator._aggregate_for_period(
-                        start_date, end_date, 'monthly', 'subscription', subscription, currency
-                    )
-
-            # By service
-            services = CostRecord.objects.filter(
-                charge_period_start__date__gte=start_date,
-                charge_period_start__date__lte=end_date,
-                billing_currency=currency
-            ).values_list('service_name', flat=True).distinct()
-
-            for service in services:
-                if service:
-                    records_created += CostAggregator._aggregate_for_period(
-                        start_date, end_date, 'monthly', 'service', service, currency
-                    )
-
-        return records_created
-
-    @staticmethod
-    def _aggregate_for_period(start_date, end_date, agg_type, dimension_type, dimension_value, currency):
-        """Generate aggregation for a date range"""
-        # Build query filters
-        filters = {
-            'charge_period_start__date__gte': start_date,
-            'charge_period_start__date__lte': end_date,
-            'billing_currency': currency,
-        }
-
-        if dimension_type == 'subscription':
-            filters['sub_account_name'] = dimension_value
-        elif dimension_type == 'service':
-            filters['service_name'] = dimension_value
-        elif dimension_type == 'resource_group':
-            filters['resource_group_name'] = dimension_value
-
-        # Query cost data
-        queryset = CostRecord.objects.filter(**filters)
-
-        if not queryset.exists():
-            return 0
-
-        # Aggregate totals
-        aggregates = queryset.aggregate(
-            total_cost=Sum('billed_cost'),
-            record_count=Count('id'),
-            usage_cost=Sum('billed_cost', filter=Q(charge_category='Usage')),
-            purchase_cost=Sum('billed_cost', filter=Q(charge_category='Purchase')),
-            tax_cost=Sum('billed_cost', filter=Q(charge_category='Tax')),
-        )
-
-        # Get top services
-        top_services = []
-        if dimension_type != 'service':
-            top_services_qs = queryset.values('service_name').annotate(
-                cost=Sum('billed_cost')
-            ).order_by('-cost')[:5]
-
-            top_services = [
-                {'name': item['service_name'], 'cost': float(item['cost'])}
-                for item in top_services_qs
-            ]
-
-        # Get top resources
-        top_resources_qs = queryset.values('resource_name').annotate(
-            cost=Sum('billed_cost')
-        ).order_by('-cost')[:5]
-
-        top_resources = [
-            {'name': item['resource_name'], 'cost': float(item['cost'])}
-            for item in top_resources_qs if item['resource_name']
-        ]
-
-        # Create or update aggregation
-        aggregation, created = CostAggregation.objects.update_or_create(
-            aggregation_type=agg_type,
-            dimension_type=dimension_type,
-            dimension_value=dimension_value,
-            period_start=start_date,
-            currency=currency,
-            defaults={
-                'period_end': end_date,
-                'total_cost': aggregates['total_cost'] or Decimal('0.00'),
-                'record_count': aggregates['record_count'] or 0,
-                'usage_cost': aggregates['usage_cost'] or Decimal('0.00'),
-                'purchase_cost': aggregates['purchase_cost'] or Decimal('0.00'),
-                'tax_cost': aggregates['tax_cost'] or Decimal('0.00'),
-                'top_services': top_services,
-                'top_resources': top_resources,
-            }
-        )
-
-        return 1 if created else 0
+        month_start = date(year, month, 1)
+        return AggregationEngine('monthly', month_start, month_start, currency).run()
 
     @staticmethod
     def refresh_all(days_back=30, currency='EUR'):
         """
         Refresh all aggregations for the past N days
 
+        Every month touched by the range is aggregated in full, in the same
+        pass as the others.
+
         Args:
             days_back: Number of days to aggregate (default: 30)
             currency: Currency filter
 
         Returns:
-            dict: Summary of aggregations created
+            dict: Summary of aggregations created, with per-phase timings
+                in seconds
         """
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days_back)
 
-        # Generate daily aggregations
-        daily_count = CostAggregator.aggregate_daily(start_date, end_date, currency)
-
-        # Generate monthly aggregations
-        monthly_count = 0
-        current_date = start_date
-        processed_months = set()
-
-        while current_date <= end_date:
-            year_month = (current_date.year, current_date.month)
-            if year_month not in processed_months:
-                monthly_count += CostAggregator.aggregate_monthly(
-                    current_date.year, current_date.month, currency
-                )
-                processed_months.add(year_month)
+        daily = AggregationEngine('daily', start_date, end_date, currency)
+        daily_count = daily.run()
 
-            current_date += timedelta(days=1)
+        monthly = AggregationEngine('monthly', start_date, end_date, currency)
+        monthly_count = monthly.run()
 
         return {
             'daily_aggregations': daily_count,
             'monthly_aggregations': monthly_count,
             'period': f'{start_date} to {end_date}',
+            'timings': {
+                **{f'daily_{phase}': elapsed for phase, elapsed in daily.timings.items()},
+                **{f'monthly_{phase}': elapsed for phase, elapsed in monthly.timings.items()},
+            },
         }
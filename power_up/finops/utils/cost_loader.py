@@ -0,0 +1,127 @@
+"""
+Bulk loading of parsed FOCUS records into CostRecord
+
+PostgreSQL gets COPY into a temporary table followed by a single
+INSERT ... ON CONFLICT (record_hash) DO NOTHING, which is an order of
+magnitude faster than multi-row INSERTs for export-sized batches and still
+skips duplicates at the database level. Other backends (SQLite in
+development and tests) fall back to bulk_create(ignore_conflicts=True).
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from django.db import connections, transaction
+from django.utils import timezone
+from power_up.finops.models import CostRecord
+
+STAGING_TABLE = 'finops_costrecord_load'
+
+
+def _load_columns():
+    """Concrete CostRecord fields written by the loader (everything but the PK)"""
+    return [field for field in CostRecord._meta.concrete_fields if not field.primary_key]
+
+
+def _copy_value(field, value):
+    """Render one value for COPY ... (FORMAT csv); None stays None (NULL)"""
+    if value is None:
+        return None
+    if field.get_internal_type() == 'JSONField':
+        return json.dumps(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value)
+
+
+def _row_values(fields, record, cost_export_id, created_at):
+    values = []
+    for field in fields:
+        if field.attname == 'cost_export_id':
+            value = cost_export_id
+        elif field.attname == 'created_at':
+            value = created_at
+        elif field.attname in record:
+            value = record[field.attname]
+        else:
+            value = field.get_default()
+        values.append(value)
+    return values
+
+
+def _copy_records(cost_export, records, connection):
+    fields = _load_columns()
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in fields)
+    table = qn(CostRecord._meta.db_table)
+    staging = qn(STAGING_TABLE)
+    created_at = timezone.now()
+
+    buffer = io.StringIO()
+    # QUOTE_NOTNULL quotes every value except None, so an empty string stays
+    # an empty string and only None reaches COPY as NULL (unquoted empty)
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    for record in records:
+        writer.writerow([
+            _copy_value(field, value)
+            for field, value in zip(
+                fields, _row_values(fields, record, cost_export.pk, created_at)
+            )
+        ])
+    buffer.seek(0)
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            # ON COMMIT DROP only fires when the outermost transaction
+            # commits; under a caller's transaction this atomic is a
+            # savepoint and the previous batch's table is still there
+            cursor.execute(f'DROP TABLE IF EXISTS {staging}')
+            # CREATE TABLE AS copies no NOT NULL constraints or defaults, so
+            # the staging table takes rows without an id and without
+            # consuming the sequence
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {table} WITH NO DATA'
+            )
+            cursor.cursor.copy_expert(
+                f'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer
+            )
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} '
+                f'ON CONFLICT ({qn("record_hash")}) DO NOTHING'
+            )
+            return cursor.rowcount
+
+
+def load_cost_records(cost_export, records, batch_size=1000):
+    """
+    Insert parsed records for one export, skipping record_hash conflicts.
+
+    Args:
+        cost_export: CostExport the records belong to
+        records: list of dicts from FOCUSParser / FOCUSRowParser
+        batch_size: bulk_create batch size on the fallback path
+
+    Returns:
+        int: Number of rows actually inserted (PostgreSQL); the number of
+            rows submitted on the fallback path, where ignore_conflicts
+            cannot report it
+    """
+    if not records:
+        return 0
+
+    connection = connections[CostRecord.objects.db]
+    if connection.vendor == 'postgresql':
+        return _copy_records(cost_export, records, connection)
+
+    cost_records = [CostRecord(cost_export=cost_export, **record) for record in records]
+    with transaction.atomic():
+        CostRecord.objects.bulk_create(
+            cost_records,
+            batch_size=batch_size,
+            ignore_conflicts=True,  # Skip duplicates at DB level
+        )
+    return len(cost_records)
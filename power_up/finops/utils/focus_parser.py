@@ -267,3 +267,150 @@ class FOCUSParser:
             return False, "Missing required field: billed_cost"
 
         return True, None
+
+
+class FOCUSRowParser:
+    """
+    Column-typed fast path for FOCUSParser.parse_cost_record.
+
+    Resolves every column to its index and converter once per file, then
+    parses csv.reader list rows without building a dict per row or
+    re-normalizing the header. The output is identical to parse_cost_record,
+    record_hash included, so both paths deduplicate against each other.
+
+    Instances hold only plain data and are picklable, so a file's parser can
+    be shipped to worker processes.
+    """
+
+    # (CostRecord field, FOCUS column, kind, default for missing column)
+    FIELDS = [
+        ('billed_cost', 'BilledCost', 'decimal', None),
+        ('billing_currency', 'BillingCurrency', 'str', 'EUR'),
+        ('effective_cost', 'EffectiveCost', 'decimal', None),
+        ('list_cost', 'ListCost', 'decimal', None),
+        ('billing_period_start', 'BillingPeriodStart', 'date', None),
+        ('billing_period_end', 'BillingPeriodEnd', 'date', None),
+        ('charge_period_start', 'ChargePeriodStart', 'datetime', None),
+        ('charge_period_end', 'ChargePeriodEnd', 'datetime', None),
+        ('billing_account_id', 'BillingAccountId', 'str', ''),
+        ('billing_account_name', 'BillingAccountName', 'str', ''),
+        ('sub_account_id', 'SubAccountId', 'str', ''),
+        ('sub_account_name', 'SubAccountName', 'str', ''),
+        ('resource_id', 'ResourceId', 'str', ''),
+        ('resource_name', 'ResourceName', 'str', ''),
+        ('resource_type', 'ResourceType', 'str', ''),
+        ('resource_group_name', 'x_ResourceGroupName', 'str', ''),
+        ('service_name', 'ServiceName', 'str', ''),
+        ('service_category', 'ServiceCategory', 'str', ''),
+        ('provider_name', 'ProviderName', 'str', 'Microsoft'),
+        ('region_id', 'RegionId', 'str', ''),
+        ('region_name', 'RegionName', 'str', ''),
+        ('sku_id', 'SkuId', 'str', ''),
+        ('sku_description', 'x_SkuDescription', 'str', ''),
+        ('sku_meter_category', 'x_SkuMeterCategory', 'str', ''),
+        ('sku_meter_name', 'x_SkuMeterName', 'str', ''),
+        ('charge_category', 'ChargeCategory', 'str', ''),
+        ('charge_description', 'ChargeDescription', 'str', ''),
+        ('charge_frequency', 'ChargeFrequency', 'str', ''),
+        ('consumed_quantity', 'ConsumedQuantity', 'decimal', None),
+        ('consumed_unit', 'ConsumedUnit', 'str', ''),
+        ('pricing_quantity', 'PricingQuantity', 'decimal', None),
+        ('pricing_unit', 'PricingUnit', 'str', ''),
+        ('tags', 'Tags', 'json', None),
+    ]
+
+    def __init__(self, header):
+        index = {}
+        for position, name in enumerate(header):
+            # Later duplicates win, as in the dict DictReader builds
+            index[FOCUSParser.normalize_column_name(name)] = position
+        self.width = len(header)
+        self.columns = [
+            (field, index.get(column), kind, default)
+            for field, column, kind, default in self.FIELDS
+        ]
+        # Same column order as build_extended_data, restricted to what the
+        # file actually has
+        probe = {column: column for column in index}
+        self.extended = [
+            (column, index[column])
+            for column in FOCUSParser.build_extended_data(probe)
+        ]
+
+    @staticmethod
+    def _decimal(value):
+        if not value:
+            return Decimal('0.00')
+        try:
+            return Decimal(value)
+        except (InvalidOperation, ValueError):
+            return Decimal('0.00')
+
+    @staticmethod
+    def _datetime(value):
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    def parse(self, row):
+        """
+        Parse one csv.reader row (list of strings).
+
+        Returns:
+            dict: Same shape as FOCUSParser.parse_cost_record(..., calculate_hash=True)
+        """
+        from power_up.finops.models import CostRecord
+
+        if len(row) < self.width:
+            # Short row: DictReader would fill the missing columns with None
+            row = row + [None] * (self.width - len(row))
+
+        parsed = {}
+        for field, position, kind, default in self.columns:
+            value = row[position] if position is not None else None
+            if kind == 'str':
+                # A missing column gets the default; a short row's missing
+                # cell stays None, as DictReader leaves it
+                parsed[field] = default if position is None else value
+            elif kind == 'decimal':
+                parsed[field] = self._decimal(value)
+            elif kind == 'datetime':
+                parsed[field] = self._datetime(value)
+            elif kind == 'date':
+                moment = self._datetime(value)
+                parsed[field] = moment.date() if moment else None
+            else:
+                parsed[field] = FOCUSParser.parse_json_tags(value)
+
+        parsed['extended_data'] = {
+            column: row[position]
+            for column, position in self.extended
+            if row[position]
+        }
+        parsed['record_hash'] = CostRecord.generate_hash_from_dict(parsed)
+        return parsed
+
+    def parse_batch(self, rows):
+        """
+        Parse and validate a batch of rows.
+
+        Returns:
+            tuple: (valid parsed records, [error message per rejected row])
+        """
+        records = []
+        errors = []
+        for row in rows:
+            try:
+                parsed = self.parse(row)
+            except Exception as e:
+                errors.append(f'Failed to parse record - {e}')
+                continue
+            is_valid, error_msg = FOCUSParser.validate_record(parsed)
+            if not is_valid:
+                errors.append(f'Skipping invalid record - {error_msg}')
+                continue
+            records.append(parsed)
+        return records, errors